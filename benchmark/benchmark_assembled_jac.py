@@ -0,0 +1,96 @@
+"""
+Benchmark the update of a large assembled CSC jacobian from its sub-jacobians.
+"""
+from __future__ import print_function
+
+import unittest
+import time
+
+import numpy as np
+
+from openmdao.api import Problem, IndepVarComp, ExplicitComponent, DirectSolver
+
+
+class BandedComp(ExplicitComponent):
+    """
+    Component with a banded partial of y wrt x (3 nonzeros per row).
+    """
+
+    def initialize(self):
+        self.options.declare('size', types=int, default=10)
+
+    def setup(self):
+        size = self.options['size']
+        self.add_input('x', np.ones(size))
+        self.add_output('y', np.ones(size))
+
+        ar = np.arange(size)
+        rows = np.hstack([ar, ar[1:], ar[:-1]])
+        cols = np.hstack([ar, ar[:-1], ar[1:]])
+        self.declare_partials('y', 'x', rows=rows, cols=cols)
+
+    def compute(self, inputs, outputs):
+        x = inputs['x']
+        outputs['y'] = 2.0 * x
+        outputs['y'][1:] += x[:-1]
+        outputs['y'][:-1] += x[1:]
+
+    def compute_partials(self, inputs, partials):
+        size = self.options['size']
+        partials['y', 'x'][:size] = 2.0
+        partials['y', 'x'][size:] = 1.0
+
+
+def _build_model(ncomps, size):
+    prob = Problem()
+    model = prob.model
+    model.add_subsystem('indep', IndepVarComp('x', np.ones(size)))
+    for i in range(ncomps):
+        model.add_subsystem('C%d' % i, BandedComp(size=size))
+        model.connect('indep.x', 'C%d.x' % i)
+
+    model.linear_solver = DirectSolver(assemble_jac=True)
+    model.options['assembled_jac_type'] = 'csc'
+
+    prob.setup(check=False)
+    prob.run_model()
+    model.run_linearize()
+
+    return prob
+
+
+class BM(unittest.TestCase):
+    """
+    Update of an assembled jacobian with roughly 1M nonzeros.
+    """
+
+    def benchmark_csc_update_1M(self):
+        # each comp contributes 4 nonzeros per row (3 for the band plus 1 for its output).
+        prob = _build_model(5, 50000)
+        model = prob.model
+        jac = model._assembled_jac
+        for i in range(10):
+            jac._update(model)
+
+
+if __name__ == '__main__':
+    prob = _build_model(5, 50000)
+    model = prob.model
+    jac = model._assembled_jac
+    mtx = jac._int_mtx
+    print("nonzeros:", mtx._matrix.nnz)
+
+    niter = 20
+
+    t0 = time.time()
+    for i in range(niter):
+        jac._update(model)
+    print("stacked update: %f sec per call" % ((time.time() - t0) / niter))
+
+    _, _, set_keys, add_keys = jac._get_subjac_iters(model)
+    subjacs = model._subjacs_info
+    t0 = time.time()
+    for i in range(niter):
+        for key in set_keys:
+            mtx._update_submat(key, subjacs[key]['value'])
+    print("per sub-jacobian update: %f sec per call" % ((time.time() - t0) / niter))
@@ -41,6 +41,7 @@ from openmdao.components.vector_magnitude_comp import VectorMagnitudeComp
 from openmdao.solvers.linear.linear_block_gs import LinearBlockGS
 from openmdao.solvers.linear.linear_block_jac import LinearBlockJac
 from openmdao.solvers.linear.direct import DirectSolver
+from openmdao.solvers.linear.block_jacobi_precon import BlockJacobiPrecon
 from openmdao.solvers.linear.petsc_ksp import PETScKrylov, PetscKSP
 from openmdao.solvers.linear.linear_runonce import LinearRunOnce
 from openmdao.solvers.linear.scipy_iter_solver import ScipyKrylov, ScipyIterativeSolver
@@ -6,9 +6,12 @@ from six.moves import range
 from collections import defaultdict
 
 import numpy as np
+from numpy.random import rand
+from scipy.sparse import csc_matrix
 
 from openmdao.approximation_schemes.approximation_scheme import ApproximationScheme, \
     _gather_jac_results
+from openmdao.utils.coloring import _get_full_disjoint_cols
 from openmdao.utils.name_maps import abs_key2rel_key
 from openmdao.vectors.vector import Vector
 
@@ -20,6 +23,10 @@ DEFAULT_CS_OPTIONS = {
 
 _full_slice = slice(None)
 
+# number of randomly perturbed points whose complex step results are combined with those of the
+# current point to find the sparsity used by colored partials.
+_SPARSITY_REPEATS = 3
+
 
 class ComplexStep(ApproximationScheme):
     r"""
@@ -38,6 +45,12 @@ class ComplexStep(ApproximationScheme):
         A list of which derivatives (in execution order) to compute.
         The entries are of the form (of, wrt, options), where of and wrt are absolute names
         and options is a dictionary.
+    _results_tmp : tuple or None
+        The vector whose results are being approximated and a complex clone of it that is
+        reused to store results, so it isn't reallocated for every approximation.
+    _wrt_colors : dict
+        Column coloring data for each wrt, keyed by wrt name. Only used when the
+        'cs_colored_partials' option of the component is True.
     """
 
     def __init__(self):
@@ -46,6 +59,8 @@ class ComplexStep(ApproximationScheme):
         """
         super(ComplexStep, self).__init__()
         self._exec_list = []
+        self._results_tmp = None
+        self._wrt_colors = {}
 
     def add_approximation(self, abs_key, kwargs):
         """
@@ -63,6 +78,7 @@ class ComplexStep(ApproximationScheme):
         options.update(kwargs)
         self._exec_list.append((of, wrt, options))
         self._approx_groups = None
+        self._wrt_colors = {}
 
     @staticmethod
     def _key_fun(approx_tuple):
@@ -157,8 +173,10 @@ class ComplexStep(ApproximationScheme):
         else:
             current_vec = system._residuals
 
-        # Clean vector for results
-        results_clone = current_vec._clone(True)
+        # Reuse a clean vector for results if we already made one for this vector.
+        if self._results_tmp is None or self._results_tmp[0] is not current_vec:
+            self._results_tmp = (current_vec, current_vec._clone(True))
+        results_clone = self._results_tmp[1]
 
         # Turn on complex step.
         system._set_complex_step_mode(True)
@@ -174,6 +192,12 @@ class ComplexStep(ApproximationScheme):
         num_par_fd = system._num_par_fd if use_parallel_fd else 1
         is_parallel = use_parallel_fd or system.comm.size > 1
 
+        # structurally independent columns can share a single complex evaluation, since the
+        # imaginary part of each output is then the sum of the derivatives wrt the perturbed
+        # columns, and only one of those is nonzero.
+        colored = not (total or is_parallel) and 'cs_colored_partials' in system.options and \
+            system.options['cs_colored_partials']
+
         results = defaultdict(list)
         iproc = system.comm.rank
         owns = system._owning_rank
@@ -183,6 +207,11 @@ class ComplexStep(ApproximationScheme):
         approx_groups = self._get_approx_groups(system)
         for tup in approx_groups:
             wrt, delta, fact, in_idx, in_size, outputs = tup
+
+            if colored and wrt in self._wrt_colors:
+                self._run_colored(system, wrt, delta, in_idx, outputs, results_clone, total)
+                continue
+
             for i_count, idx in enumerate(in_idx):
                 if fd_count % num_par_fd == system._par_fd_id:
                     # Run the Finite Difference
@@ -199,6 +228,11 @@ class ComplexStep(ApproximationScheme):
 
                 fd_count += 1
 
+            if colored:
+                sparsity = self._get_wrt_sparsity(system, wrt, delta, in_idx, outputs,
+                                                  results_clone, total)
+                self._wrt_colors[wrt] = self._compute_wrt_coloring(sparsity)
+
         if is_parallel:
             results = _gather_jac_results(mycomm, results)
 
@@ -220,6 +254,127 @@ class ComplexStep(ApproximationScheme):
 
         # Turn off complex step.
         system._set_complex_step_mode(False)
+        results_clone.set_complex_step_mode(False)
+
+    def _get_wrt_sparsity(self, system, wrt, delta, in_idx, outputs, result_clone, total):
+        """
+        Find the nonzero entries of the subjacs of a wrt.
+
+        Entries that happen to be zero at the current point, like the derivative of x**2 at
+        x = 0, would be dropped for good by the coloring, so the nonzeros of the current
+        subjacs are combined with those found at several randomly perturbed points.
+
+        Parameters
+        ----------
+        system : System
+            The system having its derivs approximated.
+        wrt : str
+            Name of the variable being perturbed.
+        delta : complex
+            Perturbation amount.
+        in_idx : ndarray or range
+            Indices of wrt being perturbed.
+        outputs : list
+            List of (of, subjac, out_idx) tuples for all of the subjacs of the wrt, holding the
+            subjacs at the current point.
+        result_clone : Vector
+            A vector cloned from the outputs vector. Used to store the results.
+        total : bool
+            If True total derivatives are being approximated, else partials.
+
+        Returns
+        -------
+        list of ndarray
+            Boolean nonzero pattern of each subjac, in the order of outputs.
+        """
+        sparsity = [subjac != 0. for _, subjac, _ in outputs]
+
+        inputs = system._inputs
+        outs = system._outputs
+        in_tmp = inputs._data.copy()
+        out_tmp = outs._data.copy()
+
+        try:
+            for _ in range(_SPARSITY_REPEATS):
+                inputs._data[:] = in_tmp + (1.0 + np.abs(in_tmp)) * (rand(in_tmp.size) - 0.5)
+                outs._data[:] = out_tmp + (1.0 + np.abs(out_tmp)) * (rand(out_tmp.size) - 0.5)
+                in_rand = inputs._data.copy()
+                out_rand = outs._data.copy()
+
+                for i_count, idx in enumerate(in_idx):
+                    result = self._run_point_complex(system, wrt, idx, delta, result_clone,
+                                                     total)
+                    for nzs, (of, _, out_idx) in zip(sparsity, outputs):
+                        nzs[:, i_count] |= result._views_flat[of][out_idx].imag != 0.
+
+                    # a solve may have changed the outputs
+                    inputs._data[:] = in_rand
+                    outs._data[:] = out_rand
+        finally:
+            inputs._data[:] = in_tmp
+            outs._data[:] = out_tmp
+
+        return sparsity
+
+    def _compute_wrt_coloring(self, sparsity):
+        """
+        Compute groups of structurally independent columns from the sparsity of a wrt.
+
+        Parameters
+        ----------
+        sparsity : list of ndarray
+            Boolean nonzero pattern of each subjac of the wrt.
+
+        Returns
+        -------
+        list
+            List of (columns, nonzero rows, nonzero columns) tuples for each color, where the
+            nonzero rows and columns are given for each subjac.
+        """
+        nzs = [np.nonzero(nz) for nz in sparsity]
+        sparsity = csc_matrix(np.vstack(sparsity))
+
+        colors = []
+        for cols in _get_full_disjoint_cols(sparsity):
+            cols = np.array(cols, dtype=int)
+            color_nzs = []
+            for rows, nzcols in nzs:
+                mask = np.in1d(nzcols, cols)
+                color_nzs.append((rows[mask], nzcols[mask]))
+            colors.append((cols, color_nzs))
+
+        return colors
+
+    def _run_colored(self, system, wrt, delta, in_idx, outputs, result_clone, total):
+        """
+        Compute the subjacs of a wrt using one complex evaluation per column color.
+
+        Parameters
+        ----------
+        system : System
+            The system having its derivs approximated.
+        wrt : str
+            Name of the variable being perturbed.
+        delta : complex
+            Perturbation amount.
+        in_idx : ndarray or range
+            Indices of wrt being perturbed.
+        outputs : list
+            List of (of, subjac, out_idx) tuples for all of the subjacs of the wrt.
+        result_clone : Vector
+            A vector cloned from the outputs vector. Used to store the results.
+        total : bool
+            If True total derivatives are being approximated, else partials.
+        """
+        in_idx = np.asarray(in_idx)
+        for _, subjac, _ in outputs:
+            subjac[:] = 0.
+
+        for cols, color_nzs in self._wrt_colors[wrt]:
+            result = self._run_point_complex(system, wrt, in_idx[cols], delta, result_clone,
+                                             total)
+            for (of, subjac, out_idx), (rows, nzcols) in zip(outputs, color_nzs):
+                subjac[rows, nzcols] = result._views_flat[of][out_idx].imag[rows]
 
     def _run_point_complex(self, system, in_name, idxs, delta, result_clone, total=False):
         """
@@ -233,11 +233,6 @@ class FiniteDifference(ApproximationScheme):
         else:
             current_vec = system._residuals
 
-        result = system._outputs._clone(True)
-        result_array = result._data.copy()
-        out_tmp = current_vec._data.copy()
-        in_tmp = system._inputs._data.copy()
-
         # To support driver src_indices, we need to override some checks in Jacobian, but do it
         # selectively.
         uses_src_indices = (system._owns_approx_of_idx or system._owns_approx_wrt_idx) and \
@@ -254,35 +249,27 @@ class FiniteDifference(ApproximationScheme):
         mycomm = system._full_comm if use_parallel_fd else system.comm
 
         fd_count = 0
+        columns = []
         approx_groups = self._get_approx_groups(system)
         for wrt, deltas, coeffs, current_coeff, in_idx, in_size, outputs in approx_groups:
 
             for i_count, idx in enumerate(in_idx):
                 if fd_count % num_par_fd == system._par_fd_id:
-                    if current_coeff:
-                        result._data[:] = current_vec._data
-                        result._data *= current_coeff
-                    else:
-                        result._data[:] = 0.
-
-                    # Run the Finite Difference
-                    for delta, coeff in zip(deltas, coeffs):
-                        self._run_point(system, wrt, idx, delta, out_tmp, in_tmp, result_array,
-                                        total)
-                        result_array *= coeff
-                        result._data += result_array
-
-                    if is_parallel:
-                        for of, _, out_idx in outputs:
-                            if owns[of] == iproc:
-                                results[(of, wrt)].append(
-                                    (i_count, result._views_flat[of][out_idx].copy()))
-                    else:
-                        for of, subjac, out_idx in outputs:
-                            subjac[:, i_count] = result._views_flat[of][out_idx]
+                    columns.append((wrt, deltas, coeffs, current_coeff, idx, i_count, outputs))
 
                 fd_count += 1
 
+        for column, result in self._run_columns(system, columns, current_vec, total):
+            wrt, _, _, _, _, i_count, outputs = column
+            if is_parallel:
+                for of, _, out_idx in outputs:
+                    if owns[of] == iproc:
+                        results[(of, wrt)].append(
+                            (i_count, result._views_flat[of][out_idx].copy()))
+            else:
+                for of, subjac, out_idx in outputs:
+                    subjac[:, i_count] = result._views_flat[of][out_idx]
+
         if is_parallel:
             results = _gather_jac_results(mycomm, results)
 
@@ -302,6 +289,51 @@ class FiniteDifference(ApproximationScheme):
                 else:
                     jac[rel_key] = subjac
 
+    def _run_columns(self, system, columns, current_vec, total=False):
+        """
+        Run the points needed by each column of the Jacobian and combine their results.
+
+        Parameters
+        ----------
+        system : System
+            The system having its derivs approximated.
+        columns : list of tuple
+            Each entry is (wrt, deltas, coeffs, current_coeff, idx, i_count, outputs) for a
+            single column of the Jacobian.
+        current_vec : Vector
+            The vector of residuals (partials) or outputs (totals) at the unperturbed point.
+        total : bool
+            If True total derivatives are being approximated, else partials.
+
+        Yields
+        ------
+        tuple
+            The column entry from columns.
+        Vector
+            A vector holding the finite difference of each output for that column. It is
+            overwritten by the next column.
+        """
+        result = system._outputs._clone(True)
+        result_array = result._data.copy()
+        out_tmp = current_vec._data.copy()
+        in_tmp = system._inputs._data.copy()
+
+        for column in columns:
+            wrt, deltas, coeffs, current_coeff, idx, _, _ = column
+            if current_coeff:
+                result._data[:] = current_vec._data
+                result._data *= current_coeff
+            else:
+                result._data[:] = 0.
+
+            # Run the Finite Difference
+            for delta, coeff in zip(deltas, coeffs):
+                self._run_point(system, wrt, idx, delta, out_tmp, in_tmp, result_array, total)
+                result_array *= coeff
+                result._data += result_array
+
+            yield column, result
+
     def _run_point(self, system, in_name, idxs, delta, out_tmp, in_tmp, result_array, total=False):
         """
         Alter the specified inputs by the given deltas, runs the system, and returns the results.
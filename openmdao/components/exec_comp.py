@@ -1,14 +1,18 @@
 """Define the ExecComp class, a component that evaluates an expression."""
+import ast
 import re
 from itertools import product
 
 import numpy as np
 from numpy import ndarray, imag, complex as npcomplex
 
-from six import string_types
+from six import string_types, iteritems
 from six.moves import range
 
 from openmdao.core.explicitcomponent import ExplicitComponent
+from openmdao.vectors.vector import Vector
+from openmdao.components.exec_comp_derivs import ExprDerivatives, ExprNotDifferentiable, \
+    dense_values, sparse_values
 
 # regex to check for variable names.
 VAR_RGX = re.compile('([.]*[_a-zA-Z]\w*[ ]*\(?)')
@@ -42,14 +46,22 @@ class ExecComp(ExplicitComponent):
         Initial values of variables.
     _exprs : list
         List of expressions.
-    _codes : list
-        List of code objects.
+    _compute_func : function or None
+        Function, compiled from all of the expressions, that computes the outputs.
+    _view_cache : dict
+        Views of the input and output variables keyed by relative name, along with the
+        views dict of the vector they came from, keyed by 'input' or 'output'.
     _vectorize : bool
         If True, treat all array/array partials as diagonal if both arrays have size > 1.
         All arrays with size > 1 must have the same flattened size or an exception will be raised.
     complex_stepsize : double
         Step size used for complex step which is used for derivatives.
-
+    _derivs : <ExprDerivatives> or None
+        Object used to compute the partial derivatives analytically, or None if the
+        expressions can't be differentiated and complex step is used instead.
+    _sparsity : dict
+        (rows, cols) of each declared partial derivative when _derivs is used. Both are None
+        for dense partials. Sparse partials are only declared when vectorize is True.
     """
 
     def __init__(self, exprs, vectorize=False, **kwargs):
@@ -61,7 +73,9 @@ class ExecComp(ExplicitComponent):
         appearing on the left-hand side of an assignment are outputs,
         and the rest are inputs.  Each variable is assumed to be of
         type float unless the initial value for that variable is supplied
-        in \*\*kwargs.  Derivatives are calculated using complex step.
+        in \*\*kwargs.  Derivatives are calculated by differentiating the expressions.
+        If an expression uses something that can't be differentiated, such as a function
+        without a derivative or keyword arguments, complex step is used instead.
 
         The following functions are available for use in expressions:
 
@@ -127,7 +141,8 @@ class ExecComp(ExplicitComponent):
         vectorize : bool
             If True, treat all array/array partials as diagonal if both arrays have size > 1.
             All arrays with size > 1 must have the same flattened size or an exception will be
-            raised.
+            raised. When the expressions can be differentiated, only the nonzero entries found
+            by differentiating them are declared.
 
         **kwargs : dict of named args
             Initial values of variables can be set by setting a named
@@ -173,9 +188,12 @@ class ExecComp(ExplicitComponent):
             exprs = [exprs]
 
         self._exprs = exprs[:]
-        self._codes = None
+        self._compute_func = None
+        self._view_cache = {}
         self._kwargs = kwargs
         self._vectorize = vectorize
+        self._derivs = None
+        self._sparsity = {}
 
     def setup(self):
         """
@@ -216,6 +234,8 @@ class ExecComp(ExplicitComponent):
             else:
                 init_vals[arg] = val
 
+        in_vals = {}
+        out_vals = {}
         for var in sorted(allvars):
             # if user supplied an initial value, use it, otherwise set to 1.0
             if var in init_vals:
@@ -225,9 +245,18 @@ class ExecComp(ExplicitComponent):
             meta = kwargs2.get(var, {})
 
             if var in outs:
-                self.add_output(var, val, **meta)
+                out_vals[var] = self.add_output(var, val, **meta)['value']
             else:
-                self.add_input(var, val, **meta)
+                in_vals[var] = self.add_input(var, val, **meta)['value']
+
+        self._derivs = self._setup_derivs()
+        self._sparsity = {}
+        if self._derivs is not None:
+            try:
+                sparsity = self._derivs.sparsity(in_vals, out_vals)
+            except Exception:
+                # let complex step deal with it (or report the error when computing)
+                self._derivs = None
 
         if self._vectorize:
             # check that sizes of any input/output vars match or one of them is size 1
@@ -246,22 +275,102 @@ class ExecComp(ExplicitComponent):
                         inds = np.arange(oval.size, dtype=int)
                     else:
                         inds = None
-                    self.declare_partials(of=out, wrt=inp, rows=inds, cols=inds)
+                    if self._derivs is None:
+                        self.declare_partials(of=out, wrt=inp, rows=inds, cols=inds)
+
+            if self._derivs is not None:
+                # declare only the nonzero entries found by differentiating the expressions
+                self._sparsity = sparsity
+                for (out, inp), (rows, cols) in sorted(iteritems(sparsity)):
+                    self.declare_partials(of=out, wrt=inp, rows=rows, cols=cols)
         else:
             # All derivatives are defined as dense
             self.declare_partials(of='*', wrt='*')
 
-        self._codes = self._compile_exprs(self._exprs)
+            if self._derivs is not None:
+                for out in self._var_rel_names['output']:
+                    for inp in self._var_rel_names['input']:
+                        self._sparsity[out, inp] = (None, None)
 
-    def _compile_exprs(self, exprs):
-        compiled = []
-        for i, expr in enumerate(exprs):
+        self._compute_func = self._compile_exprs(self._exprs, outs, allvars.difference(outs))
+        self._view_cache = {}
+
+    def _setup_derivs(self):
+        """
+        Parse the expressions for analytic differentiation.
+
+        Returns
+        -------
+        <ExprDerivatives> or None
+            Object that computes the partial derivatives, or None if complex step must be used.
+        """
+        try:
+            return ExprDerivatives(self._exprs, _expr_dict)
+        except ExprNotDifferentiable:
+            return None
+
+    def _compile_exprs(self, exprs, outs, ins):
+        """
+        Compile all of the expressions into a single function that computes the outputs.
+
+        The inputs and any outputs that are read by the expressions are bound to local
+        variables once per call, and each assigned output is copied into its array right after
+        the expression that assigns it. This gives the same results as executing each
+        expression with the outputs and inputs as its namespace, without the cost of exec and
+        the name lookups of a dict wrapper on every call.
+
+        Parameters
+        ----------
+        exprs : list of str
+            The expressions.
+        outs : set of str
+            Names of the outputs.
+        ins : set of str
+            Names of the inputs.
+
+        Returns
+        -------
+        function
+            Function that computes the outputs. It takes the inputs and outputs as mappings
+            from variable name to array.
+        """
+        trees = []
+        for expr in exprs:
             try:
-                compiled.append(compile(expr, expr, 'exec'))
+                compile(expr, expr, 'exec')
+                trees.append(ast.parse(expr, mode='exec'))
             except Exception:
                 raise RuntimeError("%s: failed to compile expression '%s'." %
-                                   (self.pathname, exprs[i]))
-        return compiled
+                                   (self.pathname, expr))
+
+        stored = []
+        loaded = []
+        for tree in trees:
+            names = [node for node in ast.walk(tree) if isinstance(node, ast.Name)]
+            stored.append(sorted(set(node.id for node in names
+                                     if isinstance(node.ctx, ast.Store) and node.id in outs)))
+            loaded.append(set(node.id for node in names if isinstance(node.ctx, ast.Load)))
+
+        lines = ['def _exec_comp_compute(_exec_inputs, _exec_outputs):']
+        for name in sorted(ins):
+            lines.append('    %s = _exec_inputs[%r]' % (name, name))
+        for name in sorted(outs.intersection(set().union(*loaded))):
+            lines.append('    %s = _exec_outputs[%r]' % (name, name))
+
+        for i, expr in enumerate(exprs):
+            lines.extend('    ' + line for line in expr.strip().splitlines())
+            loaded_later = set().union(*loaded[i + 1:])
+            for name in stored[i]:
+                lines.append('    _exec_outputs[%r][...] = %s' % (name, name))
+                if name in loaded_later:
+                    # later expressions see the value as it was stored in the outputs
+                    lines.append('    %s = _exec_outputs[%r]' % (name, name))
+        lines.append('    pass')
+
+        namespace = {}
+        code = compile('\n'.join(lines), '<ExecComp %s>' % self.pathname, 'exec')
+        exec(code, _expr_dict, namespace)
+        return namespace['_exec_comp_compute']
 
     def _parse_for_out_vars(self, s):
         vnames = set([x.strip() for x in re.findall(VAR_RGX, s)
@@ -298,7 +407,9 @@ class ExecComp(ExplicitComponent):
             State to get.
         """
         state = self.__dict__.copy()
-        del state['_codes']
+        state['_compute_func'] = self._compute_func is not None
+        state['_view_cache'] = {}
+        state['_derivs'] = self._derivs is not None
         return state
 
     def __setstate__(self, state):
@@ -311,7 +422,13 @@ class ExecComp(ExplicitComponent):
             State to restore.
         """
         self.__dict__.update(state)
-        self._codes = self._compile_exprs(self._exprs)
+        if self._compute_func:
+            outs = set(self._var_rel_names['output'])
+            ins = set(self._var_rel_names['input'])
+            self._compute_func = self._compile_exprs(self._exprs, outs, ins)
+        else:
+            self._compute_func = None
+        self._derivs = self._setup_derivs() if self._derivs else None
 
     def compute(self, inputs, outputs):
         """
@@ -325,12 +442,42 @@ class ExecComp(ExplicitComponent):
         outputs : `Vector`
             `Vector` containing outputs.
         """
-        for expr in self._codes:
-            exec(expr, _expr_dict, _IODict(outputs, inputs))
+        self._compute_func(self._get_views(inputs, 'input'), self._get_views(outputs, 'output'))
+
+    def _get_views(self, vec, typ):
+        """
+        Return the views of the variables of one of our vectors, keyed by relative name.
+
+        The views are cached until the vector switches to a different set of views, e.g. when
+        complex step mode is turned on or off.
+
+        Parameters
+        ----------
+        vec : <Vector> or dict-like
+            Input or output vector.
+        typ : str
+            'input' or 'output'.
+
+        Returns
+        -------
+        dict or dict-like
+            The views, or vec itself if it is not one of our own vectors.
+        """
+        if not isinstance(vec, Vector) or vec._system is not self or vec._icol is not None:
+            return vec
+
+        views = vec._views
+        cache = self._view_cache.get(typ)
+        if cache is None or cache[0] is not views:
+            prefix = self.pathname + '.' if self.pathname else ''
+            cache = (views, {name: views[prefix + name] for name in self._var_rel_names[typ]})
+            self._view_cache[typ] = cache
+
+        return cache[1]
 
     def compute_partials(self, inputs, partials):
         """
-        Use complex step method to update the given Jacobian.
+        Compute the partial derivatives of the expressions, or complex step them.
 
         Parameters
         ----------
@@ -340,6 +487,20 @@ class ExecComp(ExplicitComponent):
         partials : `Jacobian`
             Contains sub-jacobians.
         """
+        if self._derivs is not None:
+            in_vals = {name: inputs[name] for name in inputs}
+            out_vals = {name: self._outputs[name] for name in self._outputs}
+            jac = self._derivs.jacobian(in_vals, out_vals)
+
+            for key, (rows, cols) in iteritems(self._sparsity):
+                if key not in jac:
+                    partials[key] = 0.0
+                elif rows is None:
+                    partials[key] = dense_values(jac[key])
+                else:
+                    partials[key] = sparse_values(jac[key], rows, cols)
+            return
+
         # our complex step
         step = self.complex_stepsize * 1j
         out_names = self._var_allprocs_prom2abs_list['output']
@@ -444,54 +605,6 @@ class _TmpDict(object):
         return getattr(self._inner, name)
 
 
-class _IODict(object):
-    """
-    A dict wrapper that contains 2 different dicts.
-
-    Items are first looked for in the outputs
-    and then the inputs.
-
-    Attributes
-    ----------
-    _inputs : dict-like
-        The inputs object to be wrapped.
-    _outputs : dict-like
-        The outputs object to be wrapped.
-    """
-
-    def __init__(self, outputs, inputs):
-        """
-        Create the dict wrapper.
-
-        Parameters
-        ----------
-        outputs : dict-like
-            The outputs object to be wrapped.
-
-        inputs : dict-like
-            The inputs object to be wrapped.
-        """
-        self._outputs = outputs
-        self._inputs = inputs
-
-    def __getitem__(self, name):
-        if name in self._outputs:
-            return self._outputs[name]
-        else:
-            return self._inputs[name]
-
-    def __setitem__(self, name, value):
-        if name in self._outputs:
-            self._outputs[name] = value
-        elif name in self._inputs:
-            self._inputs[name] = value
-        else:
-            self._outputs[name] = value  # will raise KeyError
-
-    def __contains__(self, name):
-        return name in self._outputs or name in self._inputs
-
-
 def _import_functs(mod, dct, names=None):
     """
     Map attributes attrs from the given module into the given dict.
@@ -0,0 +1,866 @@
+"""Forward mode differentiation of the assignment statements used by ExecComp."""
+from __future__ import division
+
+import ast
+
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix, diags, identity, kron
+
+from six import iteritems
+
+
+class ExprNotDifferentiable(Exception):
+    """
+    Exception raised when an expression uses something that cannot be differentiated.
+    """
+
+    pass
+
+
+_ufunc_derivs = {
+    'sin': lambda x: np.cos(x),
+    'cos': lambda x: -np.sin(x),
+    'tan': lambda x: 1.0 / np.cos(x) ** 2,
+    'arcsin': lambda x: 1.0 / np.sqrt(1.0 - x * x),
+    'arccos': lambda x: -1.0 / np.sqrt(1.0 - x * x),
+    'arctan': lambda x: 1.0 / (1.0 + x * x),
+    'sinh': lambda x: np.cosh(x),
+    'cosh': lambda x: np.sinh(x),
+    'tanh': lambda x: 1.0 - np.tanh(x) ** 2,
+    'arcsinh': lambda x: 1.0 / np.sqrt(x * x + 1.0),
+    'arccosh': lambda x: 1.0 / np.sqrt(x * x - 1.0),
+    'exp': lambda x: np.exp(x),
+    'expm1': lambda x: np.exp(x),
+    'log': lambda x: 1.0 / x,
+    'log10': lambda x: 1.0 / (x * np.log(10.0)),
+    'log1p': lambda x: 1.0 / (1.0 + x),
+    'abs': lambda x: np.where(np.real(x) < 0.0, -1.0, 1.0),
+    'erf': lambda x: 2.0 / np.sqrt(np.pi) * np.exp(-x * x),
+    'erfc': lambda x: -2.0 / np.sqrt(np.pi) * np.exp(-x * x),
+}
+for _name, _alias in [('arcsin', 'asin'), ('arccos', 'acos'), ('arctan', 'atan'),
+                      ('arcsinh', 'asinh'), ('arccosh', 'acosh')]:
+    _ufunc_derivs[_alias] = _ufunc_derivs[_name]
+
+# functions whose result does not depend continuously on their arguments
+_constant_funcs = {'arange', 'ones', 'zeros', 'linspace', 'isinf', 'isnan'}
+
+_binary_funcs = {'power', 'maximum', 'minimum', 'fmax', 'fmin'}
+
+_product_funcs = {'dot', 'matmul', 'inner', 'outer'}
+
+_reductions = {'sum', 'prod'}
+
+# ast node types of numbers and other constants
+_constant_nodes = {'Num', 'Constant', 'NameConstant'}
+
+# derivatives are stored as dense arrays when no variable is larger than this
+_max_dense_size = 100
+
+_supported_funcs = set(_ufunc_derivs).union(_constant_funcs, _binary_funcs, _product_funcs,
+                                            _reductions)
+
+
+def _idx_code(slice_node):
+    """
+    Compile an expression that indexes the array named '_ad_arr' like the given subscript.
+
+    Parameters
+    ----------
+    slice_node : ast node
+        The slice of an ast.Subscript node.
+
+    Returns
+    -------
+    code
+        Code object that evaluates to the indexed array.
+    """
+    node = ast.Subscript(value=ast.Name(id='_ad_arr', ctx=ast.Load()), slice=slice_node,
+                         ctx=ast.Load())
+    expr = ast.Expression(body=node)
+    ast.fix_missing_locations(expr)
+    return compile(expr, '<subscript>', 'eval')
+
+
+def _as_sparse(mat):
+    """
+    Return a derivative matrix as a sparse matrix.
+
+    Parameters
+    ----------
+    mat : ndarray or csr_matrix
+        The matrix. A 1D array holds the diagonal of a square matrix.
+
+    Returns
+    -------
+    ndarray or csr_matrix
+        The matrix, with diagonals converted to csr_matrix.
+    """
+    if isinstance(mat, np.ndarray) and mat.ndim == 1:
+        return diags(mat, format='csr')
+    return mat
+
+
+def dense_values(mat):
+    """
+    Return a derivative matrix as a dense array.
+
+    Parameters
+    ----------
+    mat : ndarray or csr_matrix
+        The matrix. A 1D array holds the diagonal of a square matrix.
+
+    Returns
+    -------
+    ndarray
+        The dense matrix.
+    """
+    if isinstance(mat, np.ndarray):
+        return np.diag(mat) if mat.ndim == 1 else mat
+    return mat.toarray()
+
+
+def sparse_values(mat, rows, cols):
+    """
+    Return the entries of a derivative matrix at the given locations.
+
+    Parameters
+    ----------
+    mat : ndarray or csr_matrix
+        The matrix. A 1D array holds the diagonal of a square matrix. If sparse, it must not
+        have stored entries outside of the given locations.
+    rows : ndarray of int
+        Row indices.
+    cols : ndarray of int
+        Column indices.
+
+    Returns
+    -------
+    ndarray
+        Entries of mat at (rows, cols).
+    """
+    if isinstance(mat, np.ndarray):
+        if mat.ndim == 1:
+            return np.where(rows == cols, mat[rows], 0.0)
+        return mat[rows, cols]
+
+    mat.sum_duplicates()
+    coo = mat.tocoo()
+    ncols = mat.shape[1]
+    locs = rows * ncols + cols
+    order = np.argsort(locs)
+    idxs = order[np.searchsorted(locs[order], coo.row * ncols + coo.col)]
+
+    vals = np.zeros(rows.size, dtype=coo.data.dtype)
+    vals[idxs] = coo.data
+    return vals
+
+
+class ExprDerivatives(object):
+    """
+    Forward mode differentiation of a list of assignment statements.
+
+    The statements are parsed once into an AST. Each node is then evaluated together with its
+    derivatives with respect to all of the inputs, stored as matrices with one row per entry
+    of the node value and one column per entry of the input. The matrices are dense when all
+    variables are small and sparse otherwise, with diagonal matrices stored as 1D arrays
+    of their diagonal so that elementwise expressions stay cheap. The same evaluation can
+    be run in a structural mode, where all local derivatives are replaced with ones, to find
+    the sparsity pattern of each partial derivative.
+
+    Attributes
+    ----------
+    _stmts : list of (str, code or None, ast node)
+        Target name, code of the target subscript (or None) and right hand side of each
+        assignment.
+    _namespace : dict
+        Functions and constants available to the expressions.
+    _idx_codes : dict
+        Code objects used to evaluate subscripts, keyed by the id of the ast.Subscript node.
+    _pattern : bool
+        True while the sparsity pattern is being computed.
+    _dense : bool
+        True if derivatives are currently stored as dense arrays.
+    """
+
+    def __init__(self, exprs, namespace):
+        """
+        Parse the expressions and check that they can be differentiated.
+
+        Parameters
+        ----------
+        exprs : list of str
+            Assignment statements.
+        namespace : dict
+            Functions and constants available to the expressions.
+        """
+        self._namespace = namespace
+        self._idx_codes = {}
+        self._pattern = False
+        self._dense = False
+        self._stmts = []
+
+        for expr in exprs:
+            try:
+                tree = ast.parse(expr.strip(), mode='exec')
+            except SyntaxError:
+                raise ExprNotDifferentiable(expr)
+
+            for stmt in tree.body:
+                if not isinstance(stmt, ast.Assign) or len(stmt.targets) != 1:
+                    raise ExprNotDifferentiable(expr)
+
+                target = stmt.targets[0]
+                if isinstance(target, ast.Name):
+                    self._stmts.append((target.id, None, stmt.value))
+                elif isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name):
+                    self._stmts.append((target.value.id, _idx_code(target.slice), stmt.value))
+                else:
+                    raise ExprNotDifferentiable(expr)
+
+                self._check(stmt.value)
+
+    def _check(self, node):
+        """
+        Raise ExprNotDifferentiable if the given node uses anything we can't differentiate.
+
+        Parameters
+        ----------
+        node : ast node
+            Node to check, along with all of its children.
+        """
+        if isinstance(node, ast.Name) or type(node).__name__ in _constant_nodes:
+            return
+
+        if isinstance(node, ast.Subscript):
+            # the slice is evaluated without derivatives, so anything goes there
+            self._idx_codes[id(node)] = _idx_code(node.slice)
+            self._check(node.value)
+
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+            self._check(node.operand)
+
+        elif isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub, ast.Mult,
+                                                                  ast.Div, ast.Pow)):
+            self._check(node.left)
+            self._check(node.right)
+
+        elif isinstance(node, ast.Call) and not node.keywords:
+            func = node.func
+            if isinstance(func, ast.Attribute) and func.attr == 'dot':
+                self._check(func.value)
+            elif not (isinstance(func, ast.Name) and func.id in _supported_funcs):
+                raise ExprNotDifferentiable(node)
+            for arg in node.args:
+                self._check(arg)
+
+        else:
+            raise ExprNotDifferentiable(node)
+
+    def sparsity(self, inputs, outputs):
+        """
+        Compute the sparsity pattern of the partial derivatives.
+
+        Parameters
+        ----------
+        inputs : dict
+            Values of the inputs keyed by name.
+        outputs : dict
+            Values of the outputs keyed by name.
+
+        Returns
+        -------
+        dict
+            (rows, cols) of the nonzero entries of each nonzero partial derivative, keyed by
+            (output, input). rows and cols are None if the partial derivative is dense.
+        """
+        self._pattern = True
+        try:
+            with np.errstate(all='ignore'):
+                jac = self.jacobian(inputs, outputs)
+        finally:
+            self._pattern = False
+
+        pattern = {}
+        for key, mat in iteritems(jac):
+            coo = coo_matrix(_as_sparse(mat))
+            coo.sum_duplicates()
+            coo.eliminate_zeros()
+            if coo.nnz == 0:
+                continue
+            if coo.nnz == coo.shape[0] * coo.shape[1]:
+                pattern[key] = (None, None)
+            else:
+                pattern[key] = (coo.row, coo.col)
+        return pattern
+
+    def jacobian(self, inputs, outputs):
+        """
+        Compute the partial derivatives of the assigned outputs with respect to the inputs.
+
+        Parameters
+        ----------
+        inputs : dict
+            Values of the inputs keyed by name.
+        outputs : dict
+            Values of the outputs keyed by name.
+
+        Returns
+        -------
+        dict
+            Partial derivative of each output with respect to each input it depends on, keyed
+            by (output, input). They are ndarrays if all variables are small and csr_matrix
+            otherwise.
+        """
+        sizes = [np.size(val) for val in inputs.values()]
+        sizes.extend(np.size(val) for val in outputs.values())
+        self._dense = max(sizes) <= _max_dense_size if sizes else True
+
+        env = {}
+        for name, val in iteritems(inputs):
+            if self._dense:
+                env[name] = (val, {name: np.eye(np.size(val))})
+            else:
+                env[name] = (val, {name: np.ones(np.size(val))})
+        for name, val in iteritems(outputs):
+            env[name] = (val, {})
+
+        assigned = []
+        for name, idx_code, rhs in self._stmts:
+            if name not in outputs:
+                raise ExprNotDifferentiable(name)
+            val, tans = self._eval(rhs, env)
+            old_val, old_tans = env[name]
+            shape = np.shape(old_val)
+
+            if idx_code is None:
+                env[name] = self._assign(val, tans, shape)
+            else:
+                env[name] = self._assign_subscript(idx_code, env, old_val, old_tans, val, tans)
+
+            if name not in assigned:
+                assigned.append(name)
+
+        jac = {}
+        for name in assigned:
+            for wrt, mat in iteritems(env[name][1]):
+                jac[name, wrt] = mat
+        return jac
+
+    def _assign(self, val, tans, shape):
+        """
+        Return the value and derivatives of a variable after it's set to the given value.
+
+        Parameters
+        ----------
+        val : ndarray or scalar
+            Assigned value.
+        tans : dict
+            Derivatives of the assigned value.
+        shape : tuple
+            Shape of the variable.
+
+        Returns
+        -------
+        ndarray
+            New value of the variable.
+        dict
+            Derivatives of the new value.
+        """
+        size = int(np.prod(shape))
+        if np.size(val) == size:
+            return np.reshape(val, shape), tans
+        return np.broadcast_to(val, shape), self._broadcast(tans, np.shape(val), shape)
+
+    def _assign_subscript(self, idx_code, env, old_val, old_tans, val, tans):
+        """
+        Return the value and derivatives of a variable after part of it is set.
+
+        Parameters
+        ----------
+        idx_code : code
+            Code that indexes '_ad_arr' like the target of the assignment.
+        env : dict
+            Current values and derivatives of all variables.
+        old_val : ndarray
+            Value of the variable before the assignment.
+        old_tans : dict
+            Derivatives of the variable before the assignment.
+        val : ndarray or scalar
+            Assigned value.
+        tans : dict
+            Derivatives of the assigned value.
+
+        Returns
+        -------
+        ndarray
+            New value of the variable.
+        dict
+            Derivatives of the new value.
+        """
+        shape = np.shape(old_val)
+        size = int(np.prod(shape))
+        grid = np.arange(size).reshape(shape)
+        idxs = np.asarray(self._index(idx_code, env, grid))
+        idx_shape = idxs.shape
+        idxs = idxs.ravel()
+
+        new_val = np.array(old_val, dtype=np.result_type(old_val, val))
+        target = self._index(idx_code, env, new_val)
+        if np.ndim(target) == 0:
+            new_val.flat[idxs[0]] = np.asarray(val).ravel()[0]
+        else:
+            target[...] = val
+
+        tans = self._broadcast(tans, np.shape(val), idx_shape)
+
+        keep = np.ones(size)
+        keep[idxs] = 0.0
+        keep = diags(keep)
+        place = csr_matrix((np.ones(idxs.size), (idxs, np.arange(idxs.size))),
+                           shape=(size, idxs.size))
+
+        new_tans = {}
+        for wrt, mat in iteritems(old_tans):
+            new_tans[wrt] = self._format(keep.dot(_as_sparse(mat)))
+        for wrt, mat in iteritems(tans):
+            prod = self._format(place.dot(_as_sparse(mat)))
+            new_tans[wrt] = new_tans[wrt] + prod if wrt in new_tans else prod
+
+        return new_val, new_tans
+
+    def _locals(self, env):
+        """
+        Return the values of all variables.
+
+        Parameters
+        ----------
+        env : dict
+            Current values and derivatives of all variables.
+
+        Returns
+        -------
+        dict
+            Values keyed by variable name.
+        """
+        return {name: val for name, (val, _) in iteritems(env)}
+
+    def _index(self, code, env, arr):
+        """
+        Apply a compiled subscript to an array.
+
+        Parameters
+        ----------
+        code : code
+            Code that indexes '_ad_arr'.
+        env : dict
+            Current values and derivatives of all variables.
+        arr : ndarray
+            Array to index.
+
+        Returns
+        -------
+        ndarray or scalar
+            The indexed array.
+        """
+        loc = self._locals(env)
+        loc['_ad_arr'] = arr
+        return eval(code, self._namespace, loc)
+
+    def _broadcast(self, tans, from_shape, to_shape):
+        """
+        Return derivatives of a value after it has been broadcast to a new shape.
+
+        Parameters
+        ----------
+        tans : dict
+            Derivatives of the value.
+        from_shape : tuple
+            Shape of the value.
+        to_shape : tuple
+            Shape it's broadcast to.
+
+        Returns
+        -------
+        dict
+            Derivatives of the broadcast value.
+        """
+        if not tans or tuple(from_shape) == tuple(to_shape):
+            return tans
+        size = int(np.prod(from_shape))
+        idxs = np.broadcast_to(np.arange(size).reshape(from_shape), to_shape).ravel()
+        return {wrt: _as_sparse(mat)[idxs] for wrt, mat in iteritems(tans)}
+
+    def _scale(self, tans, factor, shape):
+        """
+        Multiply each row of the derivatives by the matching entry of factor.
+
+        Parameters
+        ----------
+        tans : dict
+            Derivatives of a value.
+        factor : ndarray or scalar
+            Elementwise factor, broadcastable to shape.
+        shape : tuple
+            Shape of the value.
+
+        Returns
+        -------
+        dict
+            The scaled derivatives.
+        """
+        if self._pattern or not tans:
+            return tans
+        if np.ndim(factor) == 0:
+            return {wrt: mat * factor for wrt, mat in iteritems(tans)}
+
+        if np.shape(factor) != shape:
+            factor = np.broadcast_to(factor, shape)
+        factor = np.ravel(factor)
+        if self._dense:
+            factor = factor[:, np.newaxis]
+            return {wrt: factor * mat for wrt, mat in iteritems(tans)}
+
+        scaled = {}
+        for wrt, mat in iteritems(tans):
+            if mat.ndim == 1:
+                scaled[wrt] = factor * mat
+                continue
+            # scale the stored entries of each row directly rather than forming diag(factor)
+            data = mat.data * np.repeat(factor, np.diff(mat.indptr))
+            scaled[wrt] = csr_matrix((data, mat.indices, mat.indptr), shape=mat.shape)
+        return scaled
+
+    def _matmul(self, tans, mat):
+        """
+        Left-multiply the derivatives by a matrix.
+
+        Parameters
+        ----------
+        tans : dict
+            Derivatives of a value.
+        mat : ndarray or sparse matrix
+            Matrix mapping entries of the value to entries of the result.
+
+        Returns
+        -------
+        dict
+            Derivatives of the result.
+        """
+        if not self._dense:
+            mat = csr_matrix(mat)
+        return {wrt: self._format(mat.dot(_as_sparse(tan))) for wrt, tan in iteritems(tans)}
+
+    def _format(self, mat):
+        """
+        Convert a derivative matrix to the current storage format.
+
+        Parameters
+        ----------
+        mat : ndarray or sparse matrix
+            The matrix.
+
+        Returns
+        -------
+        ndarray or csr_matrix
+            The matrix as a dense array or in CSR format.
+        """
+        if self._dense:
+            return mat.toarray() if hasattr(mat, 'toarray') else np.asarray(mat)
+        return mat.tocsr()
+
+    def _add(self, tans1, tans2):
+        """
+        Return the sum of two sets of derivatives.
+
+        Parameters
+        ----------
+        tans1 : dict
+            Derivatives of the first value.
+        tans2 : dict
+            Derivatives of the second value.
+
+        Returns
+        -------
+        dict
+            Derivatives of the sum.
+        """
+        if not tans1:
+            return tans2
+        if not tans2:
+            return tans1
+        tans = dict(tans1)
+        for wrt, mat in iteritems(tans2):
+            if wrt not in tans:
+                tans[wrt] = mat
+            elif mat.ndim == tans[wrt].ndim or self._dense:
+                tans[wrt] = tans[wrt] + mat
+            else:
+                tans[wrt] = _as_sparse(tans[wrt]) + _as_sparse(mat)
+        return tans
+
+    def _ones(self, val):
+        """
+        Return val, or an array of ones with its shape in pattern mode.
+
+        Parameters
+        ----------
+        val : ndarray or scalar
+            Value used to build a local derivative.
+
+        Returns
+        -------
+        ndarray or scalar
+            The value to use.
+        """
+        if self._pattern:
+            return np.ones(np.shape(val))
+        return val
+
+    def _eval(self, node, env):
+        """
+        Evaluate a node along with its derivatives.
+
+        Parameters
+        ----------
+        node : ast node
+            Node to evaluate.
+        env : dict
+            Current values and derivatives of all variables.
+
+        Returns
+        -------
+        ndarray or scalar
+            Value of the node.
+        dict
+            Derivatives of the node value keyed by input name.
+        """
+        if isinstance(node, ast.Name):
+            if node.id in env:
+                return env[node.id]
+            return self._namespace[node.id], {}
+
+        if type(node).__name__ in _constant_nodes:
+            return getattr(node, 'value', getattr(node, 'n', None)), {}
+
+        if isinstance(node, ast.UnaryOp):
+            val, tans = self._eval(node.operand, env)
+            if isinstance(node.op, ast.USub):
+                return -val, self._scale(tans, -1.0, np.shape(val))
+            return val, tans
+
+        if isinstance(node, ast.BinOp):
+            a, atans = self._eval(node.left, env)
+            b, btans = self._eval(node.right, env)
+            op = type(node.op).__name__.lower()
+            if op == 'mult':
+                op = 'multiply'
+            elif op == 'div':
+                op = 'divide'
+            elif op == 'pow':
+                op = 'power'
+            elif op == 'sub':
+                op = 'subtract'
+            return self._binary(op, a, atans, b, btans)
+
+        if isinstance(node, ast.Subscript):
+            val, tans = self._eval(node.value, env)
+            code = self._idx_codes[id(node)]
+            result = self._index(code, env, val)
+            if tans:
+                grid = np.arange(np.size(val)).reshape(np.shape(val))
+                idxs = np.asarray(self._index(code, env, grid)).ravel()
+                tans = {wrt: _as_sparse(mat)[idxs] for wrt, mat in iteritems(tans)}
+            return result, tans
+
+        if isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Attribute):
+                # x.dot(y)
+                args = [node.func.value] + list(node.args)
+                fname = 'dot'
+            else:
+                args = node.args
+                fname = node.func.id
+            args = [self._eval(arg, env) for arg in args]
+            return self._call(fname, args)
+
+        raise ExprNotDifferentiable(node)
+
+    def _binary(self, op, a, atans, b, btans):
+        """
+        Evaluate an elementwise binary operation along with its derivatives.
+
+        Parameters
+        ----------
+        op : str
+            Name of the operation.
+        a : ndarray or scalar
+            First operand.
+        atans : dict
+            Derivatives of the first operand.
+        b : ndarray or scalar
+            Second operand.
+        btans : dict
+            Derivatives of the second operand.
+
+        Returns
+        -------
+        ndarray or scalar
+            Value of the result.
+        dict
+            Derivatives of the result.
+        """
+        val = getattr(np, op)(a, b)
+        shape = np.shape(val)
+        atans = self._broadcast(atans, np.shape(a), shape)
+        btans = self._broadcast(btans, np.shape(b), shape)
+
+        if op == 'add':
+            da, db = None, None
+        elif op == 'subtract':
+            da, db = None, -1.0
+        elif op == 'multiply':
+            da, db = b, a
+        elif op == 'divide':
+            da, db = 1.0 / b, -a / (b * b)
+        elif op == 'power':
+            da = b * np.power(a, b - 1) if atans else None
+            db = np.log(a) * val if btans else None
+        else:
+            if op in ('maximum', 'fmax'):
+                mask = np.real(a) >= np.real(b)
+            else:
+                mask = np.real(a) <= np.real(b)
+            da, db = mask.astype(float), (~mask).astype(float)
+
+        if da is not None:
+            atans = self._scale(atans, da, shape)
+        if db is not None:
+            btans = self._scale(btans, db, shape)
+
+        return val, self._add(atans, btans)
+
+    def _call(self, fname, args):
+        """
+        Evaluate a function call along with its derivatives.
+
+        Parameters
+        ----------
+        fname : str
+            Name of the function.
+        args : list of (value, dict)
+            Value and derivatives of each argument.
+
+        Returns
+        -------
+        ndarray or scalar
+            Value of the result.
+        dict
+            Derivatives of the result.
+        """
+        vals = [val for val, _ in args]
+        func = self._namespace[fname]
+
+        if fname in _constant_funcs:
+            return func(*vals), {}
+
+        if fname in _ufunc_derivs:
+            if len(args) != 1:
+                raise ExprNotDifferentiable(fname)
+            x, tans = args[0]
+            val = func(x)
+            if tans:
+                tans = self._scale(tans, _ufunc_derivs[fname](np.asarray(x)), np.shape(val))
+            return val, tans
+
+        if fname in _binary_funcs:
+            if len(args) != 2:
+                raise ExprNotDifferentiable(fname)
+            (a, atans), (b, btans) = args
+            return self._binary(fname, a, atans, b, btans)
+
+        if fname in _reductions:
+            if len(args) != 1:
+                raise ExprNotDifferentiable(fname)
+            x, tans = args[0]
+            val = func(x)
+            if tans:
+                x = np.asarray(x).ravel()
+                if fname == 'sum':
+                    row = np.ones(x.size)
+                else:
+                    # product of all other entries, without dividing by x
+                    left = np.concatenate(([1.0], np.cumprod(x[:-1])))
+                    right = np.concatenate((np.cumprod(x[::-1][:-1])[::-1], [1.0]))
+                    row = self._ones(left * right)
+                tans = self._matmul(tans, row[np.newaxis, :])
+            return val, tans
+
+        # products
+        if len(args) != 2:
+            raise ExprNotDifferentiable(fname)
+        (a, atans), (b, btans) = args
+        return self._product(fname, func, a, atans, b, btans)
+
+    def _product(self, fname, func, a, atans, b, btans):
+        """
+        Evaluate a product of two arrays along with its derivatives.
+
+        Parameters
+        ----------
+        fname : str
+            Name of the function ('dot', 'matmul', 'inner' or 'outer').
+        func : callable
+            The function.
+        a : ndarray or scalar
+            First operand.
+        atans : dict
+            Derivatives of the first operand.
+        b : ndarray or scalar
+            Second operand.
+        btans : dict
+            Derivatives of the second operand.
+
+        Returns
+        -------
+        ndarray or scalar
+            Value of the result.
+        dict
+            Derivatives of the result.
+        """
+        val = func(a, b)
+        a = np.asarray(a)
+        b = np.asarray(b)
+
+        if fname == 'outer':
+            a = a.ravel()
+            b = b.ravel()
+            dA = kron(identity(a.size), self._ones(b)[:, np.newaxis])
+            dB = kron(self._ones(a)[:, np.newaxis], identity(b.size))
+        elif a.ndim == 0 or b.ndim == 0:
+            if fname == 'matmul':
+                raise ExprNotDifferentiable(fname)
+            return self._binary('multiply', a, atans, b, btans)
+        elif fname == 'inner' and (a.ndim > 1 or b.ndim > 1):
+            raise ExprNotDifferentiable(fname)
+        elif a.ndim == 1 and b.ndim == 1:
+            dA = self._ones(b)[np.newaxis, :]
+            dB = self._ones(a)[np.newaxis, :]
+        elif a.ndim == 2 and b.ndim == 1:
+            dA = kron(identity(a.shape[0]), self._ones(b)[np.newaxis, :])
+            dB = self._ones(a)
+        elif a.ndim == 1 and b.ndim == 2:
+            dA = self._ones(b).T
+            dB = kron(self._ones(a)[np.newaxis, :], identity(b.shape[1]))
+        elif a.ndim == 2 and b.ndim == 2:
+            dA = kron(identity(a.shape[0]), self._ones(b).T)
+            dB = kron(self._ones(a), identity(b.shape[1]))
+        else:
+            raise ExprNotDifferentiable(fname)
+
+        tans = {}
+        if atans:
+            tans = self._matmul(atans, dA)
+        if btans:
+            tans = self._add(tans, self._matmul(btans, dB))
+        return val, tans
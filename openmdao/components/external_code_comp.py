@@ -1,17 +1,243 @@
 """Define the ExternalCodeComp and ExternalCodeImplicitComp classes."""
 from __future__ import print_function
 
+import hashlib
 import os
+import select
+import shutil
+import signal
 import sys
+import tempfile
+import traceback
+from collections import deque
+
+from six import iteritems, string_types
+from six.moves import cPickle as pickle
 
 import numpy.distutils
 from numpy.distutils.exec_command import find_executable
 
+from openmdao.approximation_schemes.finite_difference import FiniteDifference
 from openmdao.core.analysis_error import AnalysisError
 from openmdao.core.explicitcomponent import ExplicitComponent
 from openmdao.core.implicitcomponent import ImplicitComponent
 from openmdao.utils.shell_proc import STDOUT, DEV_NULL, ShellProc
 from openmdao.utils.general_utils import warn_deprecation
+from openmdao.utils.mpi import MPI
+from openmdao.recorders.recording_iteration_stack import recording_iteration
+
+
+def _stage_files(sandbox, files):
+    """
+    Copy the given files into a sandbox directory, keeping their paths relative to it.
+
+    Paths that aren't existing files and files given by an absolute path are skipped.
+
+    Parameters
+    ----------
+    sandbox : str
+        The sandbox directory.
+    files : iterable
+        Paths of the files to copy, relative to the current working directory.
+    """
+    for path in files:
+        if os.path.isabs(path) or not os.path.isfile(path):
+            continue
+        dest = os.path.join(sandbox, path)
+        dest_dir = os.path.dirname(dest)
+        if not os.path.isdir(dest_dir):
+            os.makedirs(dest_dir)
+        shutil.copy2(path, dest)
+
+
+class _SandboxedFiniteDifference(FiniteDifference):
+    """
+    Finite difference that runs its points concurrently, each in its own working directory.
+
+    Each point is run in a forked copy of the process whose working directory is a new
+    temporary directory holding copies of the component's 'external_input_files' and of any
+    files named in its command, so the files written and read by concurrent runs of the
+    external code don't collide. Results are collected as the runs finish. The number of
+    concurrent runs is given by the component's 'fd_num_procs' option.
+    """
+
+    def _run_columns(self, system, columns, current_vec, total=False):
+        """
+        Run the points needed by each column of the Jacobian and combine their results.
+
+        Parameters
+        ----------
+        system : System
+            The system having its derivs approximated.
+        columns : list of tuple
+            Each entry is (wrt, deltas, coeffs, current_coeff, idx, i_count, outputs) for a
+            single column of the Jacobian.
+        current_vec : Vector
+            The vector of residuals (partials) or outputs (totals) at the unperturbed point.
+        total : bool
+            If True total derivatives are being approximated, else partials.
+
+        Yields
+        ------
+        tuple
+            The column entry from columns.
+        Vector
+            A vector holding the finite difference of each output for that column. It is
+            overwritten by the next column.
+        """
+        num_procs = system.options['fd_num_procs']
+        if num_procs < 2 or total or MPI is not None or not hasattr(os, 'fork'):
+            for column, result in super(_SandboxedFiniteDifference,
+                                        self)._run_columns(system, columns, current_vec, total):
+                yield column, result
+            return
+
+        result = system._outputs._clone(True)
+        sums = {}
+        remaining = {}
+        points = deque()
+        for i, (wrt, deltas, coeffs, current_coeff, idx, _, _) in enumerate(columns):
+            sums[i] = current_vec._data * current_coeff
+            remaining[i] = len(deltas)
+            points.extend((i, wrt, idx, delta, coeff) for delta, coeff in zip(deltas, coeffs))
+
+        # maps the read end of each child's pipe to (pid, sandbox, column, coeff, chunks)
+        running = {}
+        try:
+            while points or running:
+                while points and len(running) < num_procs:
+                    i, wrt, idx, delta, coeff = points.popleft()
+                    fd, pid, sandbox = self._launch_point(system, wrt, idx, delta)
+                    running[fd] = (pid, sandbox, i, coeff, [])
+
+                for fd in select.select(list(running), [], [])[0]:
+                    pid, sandbox, i, coeff, chunks = running[fd]
+                    data = os.read(fd, 1 << 16)
+                    if data:
+                        chunks.append(data)
+                        continue
+
+                    del running[fd]
+                    os.close(fd)
+                    os.waitpid(pid, 0)
+                    shutil.rmtree(sandbox, ignore_errors=True)
+
+                    if not chunks:
+                        raise RuntimeError("%s: finite difference run ended without returning "
+                                           "a result." % system.pathname)
+                    success, value = pickle.loads(b''.join(chunks))
+                    if not success:
+                        raise value
+
+                    sums[i] += coeff * value
+                    remaining[i] -= 1
+                    if remaining[i] == 0:
+                        result._data[:] = sums.pop(i)
+                        yield columns[i], result
+        finally:
+            for fd, (pid, sandbox, _, _, _) in running.items():
+                os.close(fd)
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:
+                    pass
+                os.waitpid(pid, 0)
+                shutil.rmtree(sandbox, ignore_errors=True)
+
+    def _launch_point(self, system, in_name, idxs, delta):
+        """
+        Start a run of the system, perturbed by the given delta, in a new sandbox directory.
+
+        Parameters
+        ----------
+        system : System
+            The system having its derivs approximated.
+        in_name : str
+            Input name.
+        idxs : ndarray
+            Input indices.
+        delta : float
+            Perturbation amount.
+
+        Returns
+        -------
+        int
+            File descriptor the pickled residuals of the run, or its exception, are read from.
+        int
+            Process id of the run.
+        str
+            The sandbox directory of the run.
+        """
+        inputs = system._inputs
+        outputs = system._outputs
+
+        options = system.options
+        command = options['command_apply'] if 'command_apply' in options else options['command']
+        if isinstance(command, str):
+            command = command.split()
+
+        sandbox = tempfile.mkdtemp(prefix='fd_')
+        _stage_files(sandbox, list(options['external_input_files']) + list(command))
+
+        if in_name in outputs._views_flat:
+            vec = outputs
+        elif in_name in inputs._views_flat:
+            vec = inputs
+        else:
+            # If we make it here, this variable is remote, so don't increment by any delta.
+            vec = None
+
+        if vec is not None:
+            view = vec._views_flat[in_name]
+            tmp = view[idxs].copy()
+            view[idxs] += delta
+        try:
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:  # child
+                self._run_child(system, sandbox, write_fd)
+        finally:
+            if vec is not None:
+                view[idxs] = tmp
+
+        os.close(write_fd)
+        return read_fd, pid, sandbox
+
+    def _run_child(self, system, sandbox, write_fd):
+        """
+        Run the system in the sandbox directory and send back its residuals.
+
+        This runs in the forked process and never returns.
+
+        Parameters
+        ----------
+        system : System
+            The system having its derivs approximated.
+        sandbox : str
+            The sandbox directory to run in.
+        write_fd : int
+            File descriptor the pickled residuals, or the exception raised, are written to.
+        """
+        try:
+            try:
+                # The parent owns any recorders, so nothing is recorded here.
+                recording_iteration.stack.append(('_run_apply', 0))
+                options = system.options
+                if options['cache_dir'] is not None:
+                    options['cache_dir'] = os.path.abspath(options['cache_dir'])
+                os.chdir(sandbox)
+                system.run_apply_nonlinear()
+                data = pickle.dumps((True, system._residuals._data), 2)
+            except BaseException as err:
+                try:
+                    data = pickle.dumps((False, err), 2)
+                except Exception:
+                    data = pickle.dumps((False, RuntimeError(traceback.format_exc())), 2)
+
+            with os.fdopen(write_fd, 'wb') as f:
+                f.write(data)
+        finally:
+            os._exit(0)
 
 
 class ExternalCodeDelegate(object):
@@ -61,6 +287,31 @@ class ExternalCodeDelegate(object):
                                   "(AnalysisError).")
         comp.options.declare('allowed_return_codes', [0],
                              desc="List of return codes that are considered successful.")
+        comp.options.declare('fd_num_procs', 1, types=int, lower=1,
+                             desc="Number of finite difference points that are run at the "
+                                  "same time, each in a separate process whose working "
+                                  "directory is a temporary directory holding copies of the "
+                                  "external input files and of the files named in the "
+                                  "command. Ignored under MPI or where processes can't be "
+                                  "forked.")
+        comp.options.declare('cache_dir', None, types=string_types, allow_none=True,
+                             desc="If set, the external output files of each successful run "
+                                  "are saved in this directory, keyed by the command and the "
+                                  "contents of the external input files. When a later run "
+                                  "has the same key, the saved output files are restored "
+                                  "instead of running the command.")
+        comp.options.declare('cache_max_size', 1 << 30, types=int, lower=0,
+                             desc="Maximum total size in bytes of the saved output files in "
+                                  "'cache_dir'. When it is exceeded, the least recently used "
+                                  "runs are removed.")
+
+    def setup_partials(self):
+        """
+        Replace the component's finite difference scheme with one that can run in parallel.
+        """
+        approx_schemes = self._comp._approx_schemes
+        if type(approx_schemes.get('fd')) is FiniteDifference:
+            approx_schemes['fd'] = _SandboxedFiniteDifference()
 
     def check_config(self, logger):
         """
@@ -146,6 +397,13 @@ class ExternalCodeDelegate(object):
             if missing:
                 raise err_class("The following input files are missing: %s"
                                 % sorted(missing))
+
+            cache_key = self._cache_key(command)
+            if cache_key is not None:
+                return_code = self._load_cached_outputs(cache_key)
+                if return_code is not None:
+                    return
+
             return_code, error_msg = self._execute_local(command)
 
             if return_code is None:
@@ -171,9 +429,128 @@ class ExternalCodeDelegate(object):
                 raise err_class("The following output files are missing: %s"
                                 % sorted(missing))
 
+            if cache_key is not None:
+                self._save_outputs(cache_key, return_code)
+
         finally:
             comp.return_code = -999999 if return_code is None else return_code
 
+    def _cache_key(self, command):
+        """
+        Compute the key of a run from its command, environment variables and files.
+
+        The names of the output files are part of the key because the saved output files are
+        stored by their position in 'external_output_files'.
+
+        Parameters
+        ----------
+        command : List
+            List containing OS command string.
+
+        Returns
+        -------
+        str or None
+            The key of the run, or None if runs aren't cached.
+        """
+        options = self._comp.options
+        if options['cache_dir'] is None or not options['external_output_files']:
+            return None
+
+        key = hashlib.sha1()
+        key.update(repr((command, sorted(iteritems(options['env_vars'])),
+                         list(options['external_output_files']))).encode('utf-8'))
+        for path in options['external_input_files']:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            key.update(repr((path, digest)).encode('utf-8'))
+
+        return key.hexdigest()
+
+    def _load_cached_outputs(self, key):
+        """
+        Restore the output files saved for the given key.
+
+        Parameters
+        ----------
+        key : str
+            The key of the run.
+
+        Returns
+        -------
+        int or None
+            The return code of the saved run, or None if no run with that key is saved.
+        """
+        options = self._comp.options
+        entry = os.path.join(options['cache_dir'], key)
+        if not os.path.isdir(entry):
+            return None
+
+        try:
+            with open(os.path.join(entry, 'return_code'), 'r') as f:
+                return_code = int(f.read())
+            for i, path in enumerate(options['external_output_files']):
+                shutil.copyfile(os.path.join(entry, str(i)), path)
+            # mark the entry as the most recently used
+            os.utime(entry, None)
+        except (IOError, OSError, ValueError):
+            # the entry was removed by another process while we were reading it
+            return None
+
+        return return_code
+
+    def _save_outputs(self, key, return_code):
+        """
+        Save the output files of a run and remove the least recently used runs if needed.
+
+        Parameters
+        ----------
+        key : str
+            The key of the run.
+        return_code : int
+            The return code of the run.
+        """
+        options = self._comp.options
+        cache_dir = options['cache_dir']
+        if not os.path.isdir(cache_dir):
+            try:
+                os.makedirs(cache_dir)
+            except OSError:
+                # another process created it first
+                pass
+
+        # Fill a temporary directory and then rename it so that other processes never see an
+        # incomplete entry.
+        tmp = tempfile.mkdtemp(prefix='.tmp_', dir=cache_dir)
+        try:
+            for i, path in enumerate(options['external_output_files']):
+                shutil.copyfile(path, os.path.join(tmp, str(i)))
+            with open(os.path.join(tmp, 'return_code'), 'w') as f:
+                f.write(str(return_code))
+            os.rename(tmp, os.path.join(cache_dir, key))
+        except OSError:
+            # another process saved the same run first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        entries = []
+        total_size = 0
+        for name in os.listdir(cache_dir):
+            if name.startswith('.'):
+                continue
+            entry = os.path.join(cache_dir, name)
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+                entries.append((os.path.getmtime(entry), size, entry))
+            except OSError:
+                continue
+            total_size += size
+
+        entries.sort()
+        for _, size, entry in entries:
+            if total_size <= options['cache_max_size']:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
     def _execute_local(self, command):
         """
         Run the command.
@@ -289,6 +666,18 @@ class ExternalCodeComp(ExplicitComponent):
         # check for the command
         self._external_code_runner.check_config(logger)
 
+    def _setup_partials(self, recurse=True):
+        """
+        Process all partials and approximations that the user declared.
+
+        Parameters
+        ----------
+        recurse : bool
+            Whether to call this method in subsystems.
+        """
+        self._external_code_runner.setup_partials()
+        super(ExternalCodeComp, self)._setup_partials(recurse)
+
     def compute(self, inputs, outputs):
         """
         Run this component.
@@ -393,6 +782,18 @@ class ExternalCodeImplicitComp(ImplicitComponent):
         """
         self._external_code_runner.check_config(logger)
 
+    def _setup_partials(self, recurse=True):
+        """
+        Process all partials and approximations that the user declared.
+
+        Parameters
+        ----------
+        recurse : bool
+            Whether to call this method in subsystems.
+        """
+        self._external_code_runner.setup_partials()
+        super(ExternalCodeImplicitComp, self)._setup_partials(recurse)
+
     def apply_nonlinear(self, inputs, outputs, residuals):
         """
         Compute residuals given inputs and outputs.
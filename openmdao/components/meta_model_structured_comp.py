@@ -1,6 +1,7 @@
 """Define the RegularGridInterpComp class."""
 from __future__ import division, print_function, absolute_import
 
+import hashlib
 import warnings
 
 from six import raise_from, iteritems
@@ -8,7 +9,7 @@ from six.moves import range, zip
 
 from scipy import __version__ as scipy_version
 try:
-    from scipy.interpolate._bsplines import make_interp_spline
+    from scipy.interpolate._bsplines import make_interp_spline, BSpline
 except ImportError:
     make_interp_spline = False
 
@@ -19,6 +20,9 @@ from openmdao.core.explicitcomponent import ExplicitComponent
 from openmdao.utils.general_utils import warn_deprecation, simple_warning
 from openmdao.core.analysis_error import AnalysisError
 
+# maximum number of spline coefficients gathered at once when evaluating the splines
+_max_gather_size = 2 ** 20
+
 
 class OutOfBoundsError(Exception):
     """
@@ -60,6 +64,87 @@ class OutOfBoundsError(Exception):
         self.upper = upper
 
 
+def _cell_polynomials(knots, k, grid):
+    """
+    Compute the nonzero B-spline basis functions on each grid cell as polynomials.
+
+    Every knot of the interpolating splines is a grid point, so in each grid cell there are
+    k + 1 nonzero basis functions and each of them is a polynomial of degree k in the normalized
+    distance from the lower edge of the cell.
+
+    Parameters
+    ----------
+    knots : ndarray
+        Knots of the spline.
+    k : int
+        Spline interpolation order.
+    grid : ndarray
+        Points of the grid along this dimension.
+
+    Returns
+    -------
+    ndarray
+        Index of the first nonzero basis function in each grid cell.
+    ndarray
+        Array of shape (ncells, k + 1, k + 1) holding the coefficient of each power of the
+        normalized distance for each nonzero basis function.
+    ndarray
+        Width of each grid cell.
+    """
+    lower = grid[:-1]
+    widths = grid[1:] - lower
+    span = np.searchsorted(knots, lower + 0.5 * widths, side='right') - 1
+    first = span - k
+
+    # sample the basis functions at k + 1 points inside each cell and fit the polynomials
+    samples = 0.5 - 0.5 * np.cos(np.pi * (np.arange(k + 1) + 0.5) / (k + 1))
+    x = lower[:, np.newaxis] + widths[:, np.newaxis] * samples
+    ncoeffs = knots.size - k - 1
+    basis = BSpline(knots, np.eye(ncoeffs), k)(x)
+    cells = np.arange(lower.size)[:, np.newaxis, np.newaxis]
+    local = basis[cells, np.arange(k + 1)[:, np.newaxis], first[:, np.newaxis, np.newaxis] +
+                  np.arange(k + 1)]
+    polys = np.linalg.solve(np.vander(samples, k + 1, increasing=True), local)
+
+    return first, polys, widths
+
+
+def _hash_values(values):
+    """
+    Return a hash of an array of training values.
+
+    Parameters
+    ----------
+    values : ndarray
+        The training values.
+
+    Returns
+    -------
+    str
+        Hex digest of the array contents.
+    """
+    return hashlib.sha1(np.ascontiguousarray(values).view(np.uint8)).hexdigest()
+
+
+def _contract(arr, basis):
+    """
+    Contract the last axis of an array of per-point coefficients with per-point basis values.
+
+    Parameters
+    ----------
+    arr : ndarray
+        Array of shape (npts, ..., nbasis).
+    basis : ndarray
+        Array of shape (npts, nbasis).
+
+    Returns
+    -------
+    ndarray
+        Array of shape (npts, ...).
+    """
+    return np.einsum('p...j,pj->p...', arr, basis)
+
+
 class _RegularGridInterp(object):
     """
     Interpolation on a regular grid in arbitrary dimensions.
@@ -106,6 +191,14 @@ class _RegularGridInterp(object):
         Default is `np.nan`.
     grid : tuple
         Collection of points that determine the regular grid.
+    _splines : dict
+        Cache of spline coefficients, per-cell basis polynomials and per-axis coefficient
+        matrices keyed by the tuple of spline orders.
+    _spline_refs : dict
+        The training values that each entry of _splines was fully computed from, along with
+        the resulting coefficients, keyed by the tuple of spline orders.
+    _values_hash : str
+        Hash of the training values that the cached spline coefficients were computed from.
 
     Methods
     -------
@@ -251,10 +344,13 @@ class _RegularGridInterp(object):
 
         self.grid = tuple([np.asarray(p) for p in points])
         self.values = values
+        self._values_hash = _hash_values(values)
         self._xi = None
         self._all_gradients = None
         self._spline_dim_error = spline_dim_error
         self._gmethod = None
+        self._splines = {}
+        self._spline_refs = {}
 
     def __call__(self, xi, method=None, compute_gradients=True):
         """
@@ -323,13 +419,7 @@ class _RegularGridInterp(object):
                 if n_p <= k:
                     ki[-1] = n_p - 1
 
-        interpolator = make_interp_spline
-        result = self._evaluate_splines(self.values[:].T,
-                                        xi,
-                                        indices,
-                                        interpolator,
-                                        method,
-                                        ki,
+        result = self._evaluate_splines(xi, indices, norm_distances, method, ki,
                                         compute_gradients=compute_gradients)
 
         if not self.bounds_error and self.fill_value is not None:
@@ -338,21 +428,157 @@ class _RegularGridInterp(object):
         return result.reshape(xi_shape[:-1] +
                               self.values.shape[ndim:])
 
-    def _evaluate_splines(self, data_values, xi, indices, interpolator, method,
-                          ki, compute_gradients=True):
+    def set_values(self, values):
         """
-        Perform interpolation using the given interpolator.
+        Replace the training values, updating any cached spline coefficients.
+
+        Nothing is done if the hash of the new values matches the current ones. Otherwise, since
+        the spline coefficients are linear in the training values, the cached coefficients are
+        corrected using only the block of training values that differ from the ones they were
+        last fully computed from. Correcting from that reference rather than from the previous
+        values keeps round-off from accumulating, e.g. over finite difference steps. If most
+        of the values changed, the coefficients are recomputed when next needed.
+
+        Parameters
+        ----------
+        values : array_like, shape (m1, ..., mn)
+            The new data on the regular grid in n dimensions.
+        """
+        # copy, since the values may be a view into a vector that changes later
+        values = np.array(values, dtype=float)
+        if values.shape != self.values.shape:
+            raise ValueError("The new values have shape %s, but the grid has shape %s." %
+                             (values.shape, self.values.shape))
+
+        values_hash = _hash_values(values)
+        if values_hash == self._values_hash:
+            return
+
+        for key, (ref_values, ref_coeffs) in list(iteritems(self._spline_refs)):
+            delta = values - ref_values
+            # indices along each axis of the block of values that changed
+            changed = delta != 0.
+            block = [np.nonzero(changed.any(axis=tuple(j for j in range(delta.ndim) if j != i)))[0]
+                     for i in range(delta.ndim)]
+            delta = delta[np.ix_(*block)]
+
+            if 2 * delta.size > values.size:
+                del self._splines[key]
+                del self._spline_refs[key]
+                continue
+
+            _, cells, axis_coeffs = self._splines[key]
+            update = delta
+            for i, (mat, idx) in enumerate(zip(axis_coeffs, block)):
+                update = np.moveaxis(np.tensordot(mat[:, idx], update, axes=(1, i)), 0, i)
+            self._splines[key] = (ref_coeffs + update, cells, axis_coeffs)
+
+        self.values = values
+        self._values_hash = values_hash
+        # cached gradients are no longer valid
+        self._xi = None
+
+    def _spline_tables(self, ki):
+        """
+        Return the spline coefficients and per-cell basis polynomials for the given orders.
+
+        The tensor-product spline coefficients are computed from the training values once for
+        each combination of spline orders and then cached. They are kept up to date by
+        set_values without being recomputed from scratch.
+
+        Parameters
+        ----------
+        ki : list
+            List of spline interpolation orders.
+
+        Returns
+        -------
+        ndarray
+            Spline coefficients, with one axis per dimension of the grid.
+        list of tuple
+            For each dimension, the index of the first coefficient used in each grid cell, the
+            polynomial coefficients of the nonzero basis functions in each grid cell and the
+            width of each grid cell.
+        list of ndarray
+            For each dimension, the matrix mapping training values to spline coefficients.
+        """
+        key = tuple(ki)
+        if key in self._splines:
+            return self._splines[key]
+
+        coeffs = np.asarray(self.values[:], dtype=float)
+        cells = []
+        axis_coeffs = []
+        for i, (grid, k) in enumerate(zip(self.grid, ki)):
+            # the coefficients of the spline that interpolates the identity map from data values
+            # to spline coefficients along this axis
+            spline = make_interp_spline(grid, np.eye(grid.size), k=k, axis=0)
+            coeffs = np.moveaxis(np.tensordot(spline.c, coeffs, axes=(1, i)), 0, i)
+            cells.append(_cell_polynomials(spline.t, k, grid))
+            axis_coeffs.append(spline.c)
+
+        self._splines[key] = tables = (coeffs, cells, axis_coeffs)
+        self._spline_refs[key] = (self.values, coeffs)
+        return tables
+
+    def _local_bases(self, cells, ki, indices, norm_distances, pts, compute_gradients):
+        """
+        Evaluate the nonzero basis functions of each dimension at a set of points.
+
+        Parameters
+        ----------
+        cells : list of tuple
+            Per-cell tables for each dimension, as returned by _spline_tables.
+        ki : list
+            List of spline interpolation orders.
+        indices : list
+            Indices for search lookup
+        norm_distances : list
+            Norm of the distance to the lower edge of the grid cells.
+        pts : slice
+            The points to evaluate.
+        compute_gradients : bool
+            Whether the derivatives of the basis functions are needed.
+
+        Returns
+        -------
+        list of ndarray
+            Values of the k + 1 nonzero basis functions at each point, for each dimension.
+        list of ndarray
+            Derivatives of the nonzero basis functions, or an empty list.
+        list of ndarray
+            Index of the first nonzero basis function at each point, for each dimension.
+        """
+        bases = []
+        dbases = []
+        firsts = []
+        for i, (k, (first, polys, widths)) in enumerate(zip(ki, cells)):
+            cell = indices[i][pts]
+            dist = norm_distances[i][pts]
+            poly = polys[cell]
+
+            powers = dist[:, np.newaxis] ** np.arange(k + 1)
+            bases.append(np.einsum('ps,psj->pj', powers, poly))
+            if compute_gradients:
+                dpowers = np.arange(1, k + 1) * powers[:, :-1]
+                dbases.append(np.einsum('ps,psj->pj', dpowers, poly[:, 1:]) /
+                              widths[cell][:, np.newaxis])
+            firsts.append(first[cell])
+
+        return bases, dbases, firsts
+
+    def _evaluate_splines(self, xi, indices, norm_distances, method, ki, compute_gradients=True):
+        """
+        Evaluate the tensor-product splines at all points at once.
 
         Parameters
         ----------
-        data_values : array_like
-            The data on the regular grid in n dimensions.
         xi : ndarray
             The coordinates to sample the gridded data at
         indices : list
             Indices for search lookup
-        interpolator : <scipy.interpolate.BSpline>
-            A BSpline object that is used for interpolation.
+        norm_distances : list
+            Norm of the distance to the lower edge of the grid cells.
         method : str, optional
             The method of interpolation to perform. Supported are 'slinear', 'cubic', and
             'quintic'. Default is None, which will use the method defined at the construction
@@ -368,86 +594,40 @@ class _RegularGridInterp(object):
         array_like
             Value of interpolant at all sample points.
         """
-        # for spline based methods
-
-        # requires floating point input
-        xi = xi.astype(np.float)
-
-        # ensure xi is 2D list of points to evaluate
-        if xi.ndim == 1:
-            xi = xi.reshape((1, xi.size))
+        coeffs, cells, _ = self._spline_tables(ki)
         m, n = xi.shape
 
-        # create container arrays for output and gradients
         result = np.empty(m)
         if compute_gradients:
-            all_gradients = np.empty_like(xi)
-
-        # Non-stationary procedure: difficult to vectorize this part entirely
-        # into numpy-level operations. Unfortunately this requires explicit
-        # looping over each point in xi.
-
-        # can at least vectorize the first pass across all points in the
-        # last variable of xi. This provides one dimension of the entire
-        # gradient output array.
-        i = n - 1
-        first_values, first_derivs = self._do_spline_fit(interpolator,
-                                                         self.grid[i],
-                                                         data_values,
-                                                         xi[:, i],
-                                                         ki[i],
-                                                         compute_gradients)
-
-        # the rest of the dimensions have to be on a per point-in-xi basis
-        for j, x in enumerate(xi):
-            gradient = np.empty_like(x)
-            values = data_values[:]
-
-            # Main process: Apply 1D interpolate in each dimension
-            # sequentially, starting with the last dimension. These are then
-            # "folded" into the next dimension in-place.
-            for i in range(n - 1, 0, -1):
-                if i == n - 1:
-                    values = first_values[j]
-                    if compute_gradients:
-                        local_derivs = first_derivs[j]
-                else:
-                    # Interpolate and collect gradients for each 1D in this
-                    # last dimensions. This collapses each 1D sequence into a
-                    # scalar.
-                    values, local_derivs = self._do_spline_fit(interpolator,
-                                                               self.grid[i],
-                                                               values,
-                                                               x[i],
-                                                               ki[i],
-                                                               compute_gradients)
-
-                # Chain rule: to compute gradients of the output w.r.t. xi
-                # across the dimensions, apply interpolation to the collected
-                # gradients. This is equivalent to multiplication by
-                # dResults/dValues at each level.
-                if compute_gradients:
-                    gradient[i] = self._evaluate_splines(local_derivs,
-                                                         x[: i],
-                                                         indices,
-                                                         interpolator,
-                                                         method,
-                                                         ki,
-                                                         compute_gradients=False)
-
-            # All values have been folded down to a single dimensional array
-            # compute the final interpolated results, and gradient w.r.t. the
-            # first dimension
-            output_value, gradient[0] = self._do_spline_fit(interpolator,
-                                                            self.grid[0],
-                                                            values,
-                                                            x[0],
-                                                            ki[0],
-                                                            compute_gradients)
+            all_gradients = np.empty((m, n))
+
+        # limit the size of the gathered coefficient array by working on chunks of points
+        chunk = max(1, _max_gather_size // np.prod([k + 1 for k in ki]))
+
+        for start in range(0, m, chunk):
+            pts = slice(start, start + chunk)
+            bases, dbases, firsts = self._local_bases(cells, ki, indices, norm_distances, pts,
+                                                      compute_gradients)
+
+            idxs = []
+            for i, (k, first) in enumerate(zip(ki, firsts)):
+                shape = [first.size] + [1] * n
+                shape[i + 1] = k + 1
+                idxs.append((first[:, np.newaxis] + np.arange(k + 1)).reshape(shape))
+
+            # Contract the coefficients of each point with the basis functions, starting with
+            # the last dimension. The partially contracted arrays are kept for the gradients.
+            contracted = [coeffs[tuple(idxs)]]
+            for i in range(n - 1, -1, -1):
+                contracted.append(_contract(contracted[-1], bases[i]))
+            result[pts] = contracted[-1]
 
             if compute_gradients:
-                all_gradients[j] = gradient
-            result[j] = output_value
+                for i in range(n):
+                    grad = _contract(contracted[n - i - 1], dbases[i])
+                    for j in range(i - 1, -1, -1):
+                        grad = _contract(grad, bases[j])
+                    all_gradients[pts, i] = grad
 
         # Cache the computed gradients for return by the gradient method
         if compute_gradients:
@@ -456,39 +636,38 @@ class _RegularGridInterp(object):
             self._gmethod = method
         return result
 
-    def _do_spline_fit(self, interpolator, x, y, pt, k, compute_gradients):
+    def training_gradients(self, xi):
         """
-        Do a single interpolant call, and compute the gradient if needed.
+        Compute the derivatives of the interpolated values with respect to the training values.
 
         Parameters
         ----------
-        interpolator : <scipy.interpolate.BSpline>
-            A BSpline object that is used for interpolation.
-        x : array_like, shape (n,)
-            Abscissas.
-        y : array_like, shape (n, ...)
-            Ordinates.
-        pt : array_like
-            Points to evaluate the spline at.
-        k : float
-            Spline interpolation order.
-        compute_gradients : bool
-            If a spline interpolation method is chosen, this determines whether gradient
-            calculations should be made and cached.
+        xi : ndarray of shape (m, ndim)
+            The coordinates to sample the gridded data at.
 
         Returns
         -------
-        array_like
-            Value of interpolant at point of interest.
-        None or array_like, optional
-            Value of gradient of interpolant at point of interest.
-        """
-        local_interp = interpolator(x, y, k=k, axis=0)
-        values = local_interp(pt)
-        local_derivs = None
-        if compute_gradients:
-            local_derivs = local_interp(pt, 1)
-        return values, local_derivs
+        ndarray of shape (m, m1, ..., mn)
+            Derivatives of the value at each point with respect to each training value.
+        """
+        xi = np.atleast_2d(xi)
+        _, cells, axis_coeffs = self._spline_tables(self._ki)
+        indices, norm_distances, _ = self._find_indices(xi.T)
+        m = xi.shape[0]
+        bases, _, firsts = self._local_bases(cells, self._ki, indices, norm_distances,
+                                             slice(None), False)
+
+        grads = np.ones((m,) + (1,) * len(self.grid))
+        for i, (k, basis, first, mat) in enumerate(zip(self._ki, bases, firsts, axis_coeffs)):
+            # the weights of the training values along this axis are combinations of the rows
+            # of the coefficient matrix for the nonzero basis functions
+            rows = mat[first[:, np.newaxis] + np.arange(k + 1)]
+            weights = np.einsum('pj,pjn->pn', basis, rows)
+            shape = [m] + [1] * len(self.grid)
+            shape[i + 1] = weights.shape[1]
+            grads = grads * weights.reshape(shape)
+
+        return grads
 
     def _find_indices(self, xi):
         """
@@ -516,7 +695,7 @@ class _RegularGridInterp(object):
         out_of_bounds = np.zeros((xi.shape[1]), dtype=bool)
         # iterate through dimensions
         for x, grid in zip(xi, self.grid):
-            i = np.searchsorted(grid, x) - 1
+            i = np.searchsorted(grid, x, side="right") - 1
             i[i < 0] = 0
             i[i > grid.size - 2] = grid.size - 2
             indices.append(i)
@@ -741,15 +920,8 @@ class MetaModelStructuredComp(ExplicitComponent):
         pt = np.array([inputs[pname].flatten() for pname in self.pnames]).T
         for out_name in self.interps:
             if self.options['training_data_gradients']:
-                values = inputs["%s_train" % out_name]
-                method = self.options['method']
-                bounds_error = not self.options['extrapolate']
-                self.interps[out_name] = _RegularGridInterp(self.params,
-                                                            values,
-                                                            method=method,
-                                                            bounds_error=bounds_error,
-                                                            fill_value=None,
-                                                            spline_dim_error=False)
+                # only recomputes the spline coefficients if the training values changed
+                self.interps[out_name].set_values(inputs["%s_train" % out_name])
 
             try:
                 val = self.interps[out_name](pt)
@@ -781,24 +953,21 @@ class MetaModelStructuredComp(ExplicitComponent):
             sub-jac components written to partials[output_name, input_name]
         """
         pt = np.array([inputs[pname].flatten() for pname in self.pnames]).T
-        if self.options['training_data_gradients']:
-            dy_ddata = np.zeros(self.sh)
-            for j in range(self.options['vec_size']):
-                for i, axis in enumerate(self.params):
-                    e_i = np.eye(axis.size)
-                    interp = make_interp_spline(axis, e_i, k=self._ki[i], axis=0)
-                    if i == 0:
-                        val = interp(pt[j, i])
-                    else:
-                        val = np.outer(val, interp(pt[j, i]))
-                dy_ddata[j] = val.reshape(self.sh[1:])
+        dy_ddata = None
 
         for out_name in self.interps:
-            dval = self.interps[out_name].gradient(pt).T
+            interp = self.interps[out_name]
+            if self.options['training_data_gradients']:
+                interp.set_values(inputs["%s_train" % out_name])
+
+            dval = interp.gradient(pt).T
             for i, p in enumerate(self.pnames):
                 partials[out_name, p] = dval[i]
 
             if self.options['training_data_gradients']:
+                # the derivatives wrt the training values only depend on the grid
+                if dy_ddata is None:
+                    dy_ddata = interp.training_gradients(pt).reshape(self.sh)
                 partials[out_name, "%s_train" % out_name] = dy_ddata
 
 
@@ -1,7 +1,12 @@
 """MetaModel provides basic meta modeling capability."""
-from six.moves import range
+from six import string_types
+from six.moves import range, cPickle as pickle
 from copy import deepcopy
 from itertools import chain, product
+import hashlib
+import numbers
+import os
+import tempfile
 
 import numpy as np
 
@@ -13,6 +18,74 @@ from openmdao.utils.general_utils import warn_deprecation, simple_warning
 from openmdao.utils.name_maps import rel_key2abs_key
 
 
+def _surrogate_hash(surrogate, training_data):
+    """
+    Compute a hash of a surrogate, including its options, and of its training data.
+
+    Parameters
+    ----------
+    surrogate : <SurrogateModel>
+        The surrogate, before training.
+    training_data : tuple
+        Training inputs and outputs.
+
+    Returns
+    -------
+    str
+        Hex digest of the hash.
+    """
+    sha = hashlib.sha1()
+    _update_hash(sha, surrogate, set())
+    _update_hash(sha, training_data, set())
+    return sha.hexdigest()
+
+
+def _update_hash(sha, value, seen):
+    """
+    Add a canonical representation of a value to a hash.
+
+    Unlike a pickle, the representation doesn't depend on dict ordering or object identity.
+    Arrays contribute their dtype, shape and raw bytes, and other objects contribute their
+    class and, recursively, their attributes.
+
+    Parameters
+    ----------
+    sha : hashlib hash object
+        The hash to be updated.
+    value : object
+        The value to be added.
+    seen : set of int
+        Ids of the objects that have already been added, so that cycles are skipped.
+    """
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        sha.update(repr(('ndarray', value.dtype.str, value.shape)).encode('utf-8'))
+        sha.update(np.ascontiguousarray(value).tobytes())
+    elif value is None or isinstance(value, (numbers.Number, string_types, np.bool_)):
+        sha.update(repr((type(value).__name__, value)).encode('utf-8'))
+    elif id(value) in seen:
+        sha.update(b'cycle')
+    else:
+        seen.add(id(value))
+        if isinstance(value, dict):
+            sha.update(repr(('dict', len(value))).encode('utf-8'))
+            for key in sorted(value, key=repr):
+                _update_hash(sha, key, seen)
+                _update_hash(sha, value[key], seen)
+        elif isinstance(value, (list, tuple, np.ndarray)):
+            sha.update(repr((type(value).__name__, len(value))).encode('utf-8'))
+            for item in value:
+                _update_hash(sha, item, seen)
+        else:
+            cls = type(value)
+            sha.update(repr((cls.__module__, cls.__name__)).encode('utf-8'))
+            name = getattr(value, '__qualname__', getattr(value, '__name__', None))
+            if name is not None:
+                # functions and classes are identified by name
+                sha.update(repr((getattr(value, '__module__', None), name)).encode('utf-8'))
+            elif hasattr(value, '__dict__'):
+                _update_hash(sha, value.__dict__, seen)
+
+
 class MetaModelUnStructuredComp(ExplicitComponent):
     """
     Class that creates a reduced order model for outputs from inputs.
@@ -72,6 +145,10 @@ class MetaModelUnStructuredComp(ExplicitComponent):
         self.options.declare('vec_size', types=int, default=1, lower=1,
                              desc='Number of points that will be simultaneously predicted by '
                                   'the surrogate.')
+        self.options.declare('cache_dir', types=string_types, default=None, allow_none=True,
+                             desc='Directory where trained surrogates are saved, keyed by a hash '
+                                  'of the surrogate and its training data. Surrogates found '
+                                  'there are reloaded instead of being trained again.')
 
     def add_input(self, name, val=1.0, training_data=None, **kwargs):
         """
@@ -318,6 +395,11 @@ class MetaModelUnStructuredComp(ExplicitComponent):
         for name, shape in self._surrogate_output_names:
             surrogate = self._metadata(name).get('surrogate')
 
+            if isinstance(shape, tuple):
+                output_shape = (vec_size, ) + shape
+            else:
+                output_shape = (vec_size, )
+
             if vec_size == 1:
                 # Non vectorized.
                 predicted = surrogate.predict(flat_inputs)
@@ -328,19 +410,14 @@ class MetaModelUnStructuredComp(ExplicitComponent):
 
             elif overrides_method('vectorized_predict', surrogate, SurrogateModel):
                 # Vectorized; surrogate provides vectorized computation.
-                # TODO: This code is untested because no surrogates provide this option.
-                predicted = surrogate.vectorized_predict(flat_inputs.flat)
+                predicted = surrogate.vectorized_predict(flat_inputs)
                 if isinstance(predicted, tuple):  # rmse option
                     self._metadata(name)['rmse'] = predicted[1]
                     predicted = predicted[0]
-                outputs[name] = np.reshape(predicted, shape)
+                outputs[name] = np.reshape(predicted, output_shape)
 
             else:
                 # Vectorized; must call surrogate multiple times.
-                if isinstance(shape, tuple):
-                    output_shape = (vec_size, ) + shape
-                else:
-                    output_shape = (vec_size, )
                 predicted = np.zeros(output_shape)
                 rmse = self._metadata(name)['rmse'] = []
                 for i in range(vec_size):
@@ -400,15 +477,14 @@ class MetaModelUnStructuredComp(ExplicitComponent):
 
         arr = np.zeros((vec_size, self._input_size))
 
-        for row in range(vec_size):
-            idx = 0
-            for name, sz in self._surrogate_input_names:
-                val = vec[name]
-                if array_real and np.issubdtype(val.dtype, np.complexfloating):
-                    array_real = False
-                    arr = arr.astype(np.complexfloating)
-                arr[row][idx:idx + sz] = val[row].flat
-                idx += sz
+        idx = 0
+        for name, sz in self._surrogate_input_names:
+            val = vec[name]
+            if array_real and np.issubdtype(val.dtype, np.complexfloating):
+                array_real = False
+                arr = arr.astype(np.complexfloating)
+            arr[:, idx:idx + sz] = val.reshape((vec_size, sz))
+            idx += sz
 
         return arr
 
@@ -482,7 +558,15 @@ class MetaModelUnStructuredComp(ExplicitComponent):
 
         for out_name, out_shape in self._surrogate_output_names:
             surrogate = self._metadata(out_name).get('surrogate')
-            if vec_size > 1:
+            if vec_size > 1 and overrides_method('vectorized_linearize', surrogate,
+                                                 SurrogateModel):
+                derivs = surrogate.vectorized_linearize(flat_inputs)
+                idx = 0
+                for in_name, sz in self._surrogate_input_names:
+                    partials[out_name, in_name] = derivs[:, :, idx:idx + sz].flat
+                    idx += sz
+
+            elif vec_size > 1:
                 out_size = np.prod(out_shape)
                 for j in range(vec_size):
                     flat_input = flat_inputs[j]
@@ -568,11 +652,80 @@ class MetaModelUnStructuredComp(ExplicitComponent):
                 raise RuntimeError("Metamodel '%s': No surrogate specified for output '%s'"
                                    % (self.pathname, name))
             else:
-                surrogate.train(self._training_input,
-                                self._training_output[name])
+                self._train_surrogate(surrogate, surrogate.train, self._training_input,
+                                      self._training_output[name])
 
         self.train = False
 
+    def _train_surrogate(self, surrogate, train_func, *training_data):
+        """
+        Train a surrogate, or reload it from the cache if it was already trained with this data.
+
+        Under MPI, the surrogate is only trained or loaded on the root proc of this component
+        and its trained state is broadcast to the other procs.
+
+        Parameters
+        ----------
+        surrogate : <SurrogateModel>
+            The surrogate to be trained.
+        train_func : function
+            The training method of the surrogate.
+        *training_data : list
+            Training inputs and outputs passed to train_func.
+        """
+        cache_dir = self.options['cache_dir']
+        if cache_dir is None:
+            train_func(*training_data)
+            return
+
+        state = None
+        if self.comm.rank == 0:
+            cache_file = os.path.join(cache_dir, 'surrogate_%s.pkl' %
+                                      _surrogate_hash(surrogate, training_data))
+            if os.path.isfile(cache_file):
+                try:
+                    with open(cache_file, 'rb') as f:
+                        state = pickle.load(f)
+                except Exception:
+                    # an unreadable file is treated as a cache miss and replaced
+                    state = None
+
+            if state is not None:
+                surrogate.__dict__.update(state)
+            else:
+                train_func(*training_data)
+                state = surrogate.__dict__
+
+                if not os.path.isdir(cache_dir):
+                    try:
+                        os.makedirs(cache_dir)
+                    except OSError:
+                        # another process created it first
+                        pass
+
+                # Write to a temporary file and then rename it so that other processes never
+                # see an incomplete file.
+                fd, tmp = tempfile.mkstemp(prefix='.tmp_', suffix='.pkl', dir=cache_dir)
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        pickle.dump(state, f, 2)
+                except Exception as err:
+                    os.remove(tmp)
+                    simple_warning("%s: the trained %s surrogate could not be saved in "
+                                   "the cache: %s" % (self.pathname, type(surrogate).__name__,
+                                                      err))
+                else:
+                    try:
+                        os.rename(tmp, cache_file)
+                    except OSError:
+                        # this can fail on Windows if another process wrote the file first
+                        os.remove(tmp)
+
+        if self.comm.size > 1:
+            state = self.comm.bcast(state, root=0)
+            if self.comm.rank != 0:
+                surrogate.__dict__.update(state)
+
     def _metadata(self, name):
         return self._var_rel2data_io[name]['metadata']
 
@@ -279,7 +279,8 @@ class MultiFiMetaModelUnStructuredComp(MetaModelUnStructuredComp):
                 msg = "MultiFiMetaModelUnStructured '{}': No surrogate specified for output '{}'"
                 raise RuntimeError(msg.format(self.pathname, name_root))
             else:
-                surrogate.train_multifi(inputs, self._training_output[name])
+                self._train_surrogate(surrogate, surrogate.train_multifi, inputs,
+                                      self._training_output[name])
 
         self._training_input = inputs
         self.train = False
@@ -13,7 +13,7 @@ from parameterized import parameterized
 
 from openmdao.api import IndepVarComp, Group, Problem, ExecComp
 from openmdao.components.exec_comp import _expr_dict
-from openmdao.utils.assert_utils import assert_rel_error
+from openmdao.utils.assert_utils import assert_rel_error, assert_check_partials
 
 _ufunc_test_data = {'abs': {'str': 'f=abs(x)',
                             'check_func': np.abs,
@@ -542,6 +542,144 @@ class TestExecComp(unittest.TestCase):
         self.assertEqual(str(context.exception),
                          "comp: vectorize is True but partial(y, A) is not square (shape=(3, 15)).")
 
+    def test_analytic_partials(self):
+        np.random.seed(11)
+        cases = [
+            (['y = 2.0*x**2 + z[1]*x - sin(x)/z[0]'],
+             dict(x=np.arange(1., 4.), z=np.array([2., 3.]), y=np.ones(3))),
+            (['y[0] = 2.0*x[0]+7.0*x[1]', 'y[1] = y[0]*x[1]'],
+             dict(x=np.array([1.5, 2.]), y=np.zeros(2))),
+            (['y = A.dot(x)', 'z = matmul(A, B)', 'w = outer(x, x)'],
+             dict(A=np.random.random((2, 3)), x=np.random.random(3), B=np.random.random((3, 4)),
+                  y=np.ones(2), z=np.ones((2, 4)), w=np.ones((3, 3)))),
+            (['y = a*b + power(a, b) - prod(b)'],
+             dict(a=np.random.random((3, 1)) + .5, b=np.random.random((1, 4)) + .5,
+                  y=np.ones((3, 4)))),
+            (['y = maximum(x, z) + abs(x - z) + exp(-x)*log(z) + arctan(x)*tanh(z)'],
+             dict(x=np.random.random(5), z=np.random.random(5) + .1, y=np.ones(5))),
+            (['y = dot(x, x) + inner(x, z) + erf(z[0])', 'w = y*2 + sum(z)'],
+             dict(x=np.random.random(5), z=np.random.random(5), y=0.)),
+            # large enough for the derivatives to be stored as sparse matrices
+            (['y = 3.0*x**2 - x[::-1]*sqrt_z', 'w = sum(y) + dot(x, x)'],
+             dict(x=np.random.random(150), sqrt_z=np.random.random(150), y=np.ones(150))),
+        ]
+
+        for exprs, kwargs in cases:
+            prob = Problem()
+            comp = prob.model.add_subsystem('comp', ExecComp(exprs, **kwargs))
+            prob.setup(check=False, force_alloc_complex=True)
+            prob.run_model()
+
+            self.assertTrue(comp._derivs is not None, exprs)
+
+            data = prob.check_partials(method='cs', out_stream=None)
+            assert_check_partials(data, atol=1e-8, rtol=1e-8)
+
+    def test_analytic_partials_sparsity(self):
+        prob = Problem()
+        comp = prob.model.add_subsystem('comp', ExecComp(['y = 3.0*x**2 + z[::-1]', 'w = sum(x)'],
+                                                         vectorize=True, x=np.arange(5.),
+                                                         z=np.ones(5), y=np.ones(5)))
+        prob.setup(check=False, force_alloc_complex=True)
+        prob.run_model()
+
+        subjacs = comp._subjacs_info
+        assert_almost_equal(subjacs['comp.y', 'comp.x']['rows'], np.arange(5))
+        assert_almost_equal(subjacs['comp.y', 'comp.x']['cols'], np.arange(5))
+        assert_almost_equal(subjacs['comp.y', 'comp.z']['rows'], np.arange(5))
+        assert_almost_equal(subjacs['comp.y', 'comp.z']['cols'], np.arange(5)[::-1])
+        self.assertTrue(subjacs['comp.w', 'comp.x']['rows'] is None)
+        self.assertFalse(('comp.w', 'comp.z') in subjacs)
+
+        data = prob.check_partials(method='cs', out_stream=None)
+        assert_check_partials(data, atol=1e-8, rtol=1e-8)
+
+    def test_analytic_partials_single_evaluation(self):
+        prob = Problem()
+        comp = prob.model.add_subsystem('comp', ExecComp('y = 2.0*x**2 + sin(x)*z',
+                                                         x=np.random.random(1000),
+                                                         z=np.random.random(1000),
+                                                         y=np.ones(1000)))
+        prob.setup(check=False)
+        prob.run_model()
+
+        ncalls = []
+        compute = comp.compute
+
+        def counting_compute(inputs, outputs):
+            ncalls.append(1)
+            compute(inputs, outputs)
+
+        comp.compute = counting_compute
+        comp._linearize()
+
+        # the partials come from differentiating the expression, not from complex step
+        self.assertEqual(len(ncalls), 0)
+
+        x = prob['comp.x']
+        z = prob['comp.z']
+        assert_rel_error(self, comp._jacobian['y', 'x'], np.diag(4.0 * x + np.cos(x) * z), 1e-12)
+        assert_rel_error(self, comp._jacobian['y', 'z'], np.diag(np.sin(x)), 1e-12)
+
+    def test_complex_step_fallback(self):
+        prob = Problem()
+        comp = prob.model.add_subsystem('comp', ExecComp(['y = kron(x, x)', 'w = sum(x, axis=0)'],
+                                                         x=np.array([1., 2., 3.]),
+                                                         y=np.ones(9), w=0.))
+        prob.setup(check=False, force_alloc_complex=True)
+        prob.run_model()
+
+        self.assertTrue(comp._derivs is None)
+
+        data = prob.check_partials(method='cs', out_stream=None)
+        assert_check_partials(data, atol=1e-8, rtol=1e-8)
+
+    def test_compiled_exprs(self):
+        prob = Problem()
+        comp = prob.model.add_subsystem('comp', ExecComp(['y1 = 2.0*x + y3[1]',
+                                                          'y2 = sum(y1) * z',
+                                                          'y3[0] = x[2]',
+                                                          'y4 = 7.0'],
+                                                         x=np.array([1., 2., 3.]),
+                                                         y1=np.zeros(3), y2=np.zeros(2),
+                                                         y3=np.array([5., 6.]),
+                                                         y4=np.zeros(4)))
+        prob.setup(check=False)
+        prob.run_model()
+
+        # outputs that are read before they are assigned keep their current value
+        assert_rel_error(self, prob['comp.y1'], np.array([8., 10., 12.]), 1e-12)
+        assert_rel_error(self, prob['comp.y2'], np.array([30., 30.]), 1e-12)
+        assert_rel_error(self, prob['comp.y3'], np.array([3., 6.]), 1e-12)
+        assert_rel_error(self, prob['comp.y4'], 7.0 * np.ones(4), 1e-12)
+
+        # the outputs are written into the existing arrays
+        y1 = comp._outputs['y1']
+        prob['comp.x'] = np.array([0., 0., 1.])
+        prob.run_model()
+        self.assertTrue(comp._outputs['y1'] is y1)
+        assert_rel_error(self, y1, np.array([6., 6., 8.]), 1e-12)
+
+    def test_compiled_exprs_complex_step(self):
+        prob = Problem()
+        model = prob.model
+        model.add_subsystem('p', IndepVarComp('x', np.array([1., 2., 3.])))
+        model.add_subsystem('comp', ExecComp(['y = 2.0*x**2', 'z = sum(y)'],
+                                             x=np.ones(3), y=np.ones(3)))
+        model.connect('p.x', 'comp.x')
+        model.approx_totals(method='cs')
+
+        prob.setup(check=False)
+        prob.run_model()
+
+        J = prob.compute_totals(of=['comp.z'], wrt=['p.x'], return_format='array')
+        assert_rel_error(self, J, np.array([[4., 8., 12.]]), 1e-12)
+
+        # real views are used again once complex step is done
+        prob['p.x'] = np.array([1., 1., 1.])
+        prob.run_model()
+        assert_rel_error(self, prob['comp.z'], 6.0, 1e-12)
+
     def test_feature_vectorize(self):
         p = Problem()
         model = p.model
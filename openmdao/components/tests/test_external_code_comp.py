@@ -440,6 +440,32 @@ class TestExternalCodeCompFeature(unittest.TestCase):
         # print the output
         self.assertEqual(prob['p.f_xy'], -15.0)
 
+    def test_main_cache(self):
+        from openmdao.api import Problem, IndepVarComp
+        from openmdao.components.tests.test_external_code_comp import ParaboloidExternalCodeComp
+
+        prob = Problem()
+        model = prob.model
+
+        # create and connect inputs
+        model.add_subsystem('p1', IndepVarComp('x', 3.0))
+        model.add_subsystem('p2', IndepVarComp('y', -4.0))
+
+        # save the output files of each run in the 'extcode_cache' directory
+        model.add_subsystem('p', ParaboloidExternalCodeComp(cache_dir='extcode_cache'))
+
+        model.connect('p1.x', 'p.x')
+        model.connect('p2.y', 'p.y')
+
+        prob.setup()
+        prob.run_model()
+        self.assertEqual(prob['p.f_xy'], -15.0)
+
+        # running again with the same inputs restores the saved output file
+        # instead of running the external code
+        prob.run_model()
+        self.assertEqual(prob['p.f_xy'], -15.0)
+
     def test_optimize_fd(self):
         from openmdao.api import Problem, IndepVarComp
         from openmdao.api import ScipyOptimizeDriver
@@ -475,6 +501,43 @@ class TestExternalCodeCompFeature(unittest.TestCase):
         assert_rel_error(self, prob['p1.x'], 6.66666667, 1e-6)
         assert_rel_error(self, prob['p2.y'], -7.3333333, 1e-6)
 
+    def test_optimize_fd_parallel(self):
+        from openmdao.api import Problem, IndepVarComp
+        from openmdao.api import ScipyOptimizeDriver
+        from openmdao.components.tests.test_external_code_comp import ParaboloidExternalCodeCompFD
+
+        prob = Problem()
+        model = prob.model
+
+        # create and connect inputs
+        model.add_subsystem('p1', IndepVarComp('x', 3.0))
+        model.add_subsystem('p2', IndepVarComp('y', -4.0))
+
+        # run up to 2 finite difference points at the same time
+        model.add_subsystem('p', ParaboloidExternalCodeCompFD(fd_num_procs=2))
+
+        model.connect('p1.x', 'p.x')
+        model.connect('p2.y', 'p.y')
+
+        # find optimal solution with SciPy optimize
+        # solution (minimum): x = 6.6667; y = -7.3333
+        prob.driver = ScipyOptimizeDriver()
+        prob.driver.options['optimizer'] = 'SLSQP'
+
+        prob.model.add_design_var('p1.x', lower=-50, upper=50)
+        prob.model.add_design_var('p2.y', lower=-50, upper=50)
+
+        prob.model.add_objective('p.f_xy')
+
+        prob.driver.options['tol'] = 1e-9
+        prob.driver.options['disp'] = True
+
+        prob.setup()
+        prob.run_driver()
+
+        assert_rel_error(self, prob['p1.x'], 6.66666667, 1e-6)
+        assert_rel_error(self, prob['p2.y'], -7.3333333, 1e-6)
+
     def test_optimize_derivs(self):
         from openmdao.api import Problem, IndepVarComp
         from openmdao.api import ScipyOptimizeDriver
@@ -511,6 +574,159 @@ class TestExternalCodeCompFeature(unittest.TestCase):
         assert_rel_error(self, prob['p2.y'], -7.3333333, 1e-6)
 
 
+@unittest.skipUnless(hasattr(os, 'fork'), 'Parallel finite difference requires fork.')
+class TestExternalCodeCompParallelFD(unittest.TestCase):
+
+    def setUp(self):
+        self.startdir = os.getcwd()
+        self.tempdir = tempfile.mkdtemp(prefix='test_extcode-')
+        os.chdir(self.tempdir)
+        shutil.copy(os.path.join(DIRECTORY, 'extcode_paraboloid.py'),
+                    os.path.join(self.tempdir, 'extcode_paraboloid.py'))
+
+    def tearDown(self):
+        os.chdir(self.startdir)
+        try:
+            shutil.rmtree(self.tempdir)
+        except OSError:
+            pass
+
+    def _totals(self, comp):
+        from openmdao.api import IndepVarComp
+
+        prob = Problem()
+        model = prob.model
+        model.add_subsystem('p1', IndepVarComp('x', 3.0))
+        model.add_subsystem('p2', IndepVarComp('y', -4.0))
+        model.add_subsystem('p', comp)
+        model.connect('p1.x', 'p.x')
+        model.connect('p2.y', 'p.y')
+
+        prob.setup()
+        prob.run_model()
+        return prob.compute_totals(of=['p.f_xy'], wrt=['p1.x', 'p2.y'], return_format='array')
+
+    def test_matches_serial(self):
+        class CentralComp(ParaboloidExternalCodeCompFD):
+            def setup(self):
+                super(CentralComp, self).setup()
+                self.declare_partials(of='*', wrt='*', method='fd', form='central')
+
+        serial = self._totals(CentralComp())
+        parallel = self._totals(CentralComp(fd_num_procs=4))
+
+        assert_rel_error(self, parallel, serial, 1e-12)
+        assert_rel_error(self, parallel, [[-4.0, 3.0]], 1e-6)
+
+        # the points were run in their own directories, so the input file written here by
+        # run_model is untouched
+        with open('paraboloid_input.dat', 'r') as f:
+            x, y = [float(line) for line in f]
+        self.assertEqual((x, y), (3.0, -4.0))
+
+    def test_error(self):
+        class FailingComp(ParaboloidExternalCodeCompFD):
+            def compute(self, inputs, outputs):
+                if inputs['y'] != -4.0:
+                    raise AnalysisError('y was perturbed')
+                super(FailingComp, self).compute(inputs, outputs)
+
+        with self.assertRaises(AnalysisError) as cm:
+            self._totals(FailingComp(fd_num_procs=2))
+
+        self.assertEqual(str(cm.exception), 'y was perturbed')
+
+
+class TestExternalCodeCompCache(unittest.TestCase):
+
+    def setUp(self):
+        self.startdir = os.getcwd()
+        self.tempdir = tempfile.mkdtemp(prefix='test_extcode-')
+        os.chdir(self.tempdir)
+        shutil.copy(os.path.join(DIRECTORY, 'extcode_paraboloid.py'),
+                    os.path.join(self.tempdir, 'extcode_paraboloid.py'))
+
+    def tearDown(self):
+        os.chdir(self.startdir)
+        try:
+            shutil.rmtree(self.tempdir)
+        except OSError:
+            pass
+
+    def _problem(self, **options):
+        prob = Problem()
+        prob.model.add_subsystem('p', ParaboloidExternalCodeComp(**options))
+        prob.setup()
+        prob['p.y'] = -4.0
+        return prob
+
+    def _run(self, prob, x):
+        prob['p.x'] = x
+        prob.run_model()
+        return prob['p.f_xy'][0]
+
+    def _entries(self):
+        return [name for name in os.listdir('cache') if not name.startswith('.')]
+
+    def test_cache(self):
+        prob = self._problem(cache_dir='cache')
+        self.assertEqual(self._run(prob, 3.0), -15.0)
+        self.assertEqual(self._run(prob, 4.0), -18.0)
+        self.assertEqual(len(self._entries()), 2)
+
+        # without the script, only the saved runs succeed
+        os.remove('extcode_paraboloid.py')
+        self.assertEqual(self._run(prob, 3.0), -15.0)
+        self.assertEqual(prob.model.p.return_code, 0)
+        self.assertEqual(self._run(prob, 4.0), -18.0)
+        with self.assertRaises(RuntimeError):
+            self._run(prob, 5.0)
+
+        # a different command is a different run
+        prob.model.p.options['env_vars'] = {'FOO': 'bar'}
+        with self.assertRaises(RuntimeError):
+            self._run(prob, 3.0)
+
+    def test_output_files_in_key(self):
+        prob = self._problem(cache_dir='cache')
+        self.assertEqual(self._run(prob, 3.0), -15.0)
+
+        # the saved run can't be used for a different list of output files
+        prob.model.p.options['external_output_files'] = ['paraboloid_output.dat',
+                                                         'paraboloid_input.dat']
+        self.assertEqual(self._run(prob, 3.0), -15.0)
+        self.assertEqual(len(self._entries()), 2)
+
+        with open('paraboloid_input.dat', 'r') as f:
+            self.assertEqual(f.read(), '3.0000000000000000\n-4.0000000000000000\n')
+
+    def test_eviction(self):
+        # each saved run takes 22 bytes, so only two of them fit
+        prob = self._problem(cache_dir='cache', cache_max_size=50)
+        for x in (3.0, 4.0, 5.0):
+            self._run(prob, x)
+        self.assertEqual(len(self._entries()), 2)
+
+        # using the run at x=4 makes the run at x=5 the least recently used one
+        self._run(prob, 4.0)
+        self.assertEqual(self._run(prob, 6.0), -18.0)
+        self.assertEqual(len(self._entries()), 2)
+
+        os.remove('extcode_paraboloid.py')
+        self.assertEqual(self._run(prob, 4.0), -18.0)
+        self.assertEqual(self._run(prob, 6.0), -18.0)
+        for x in (3.0, 5.0):
+            with self.assertRaises(RuntimeError):
+                self._run(prob, x)
+
+    def test_no_output_files(self):
+        # with nothing to restore, runs are not saved
+        prob = self._problem(cache_dir='cache')
+        prob.model.p.options['external_output_files'] = []
+        self.assertEqual(self._run(prob, 3.0), -15.0)
+        self.assertFalse(os.path.exists('cache'))
+
+
 # ------------------------------------------------------
 # run same test as above, only with the deprecated component,
 # to ensure we get the warning and the correct answer.
@@ -662,6 +662,88 @@ class TestRegularGridInterpolator(unittest.TestCase):
             assert_array_equal(
                 interp._all_gradients.flatten(), computed.flatten())
 
+    def test_vectorized_splines(self):
+        # compare against folding 1D scipy splines through each dimension, point by point
+        points, values = self._get_sample_4d_large()
+        np.random.seed(11)
+        sample = np.array([np.random.uniform(p[0] - 1., p[-1] + 1., 25) for p in points]).T
+        # include grid points, where the slinear gradients are discontinuous
+        sample[:4] = [[p[j] for p in points] for j in range(4)]
+
+        for method in self.valid_methods:
+            interp = _RegularGridInterp(points, values, method, bounds_error=False,
+                                        fill_value=None)
+            computed = interp(sample)
+            computed_grad = interp.gradient(sample)
+
+            for pt, val, grad in zip(sample, computed, computed_grad):
+                expected_grad = np.empty(4)
+                for d in range(5):
+                    folded = values
+                    for i in range(3, -1, -1):
+                        spline = make_interp_spline(points[i], np.moveaxis(folded, -1, 0),
+                                                    k=interp._ki[i], axis=0)
+                        folded = spline(pt[i], 1 if i == d else 0, extrapolate=True)
+                    if d < 4:
+                        expected_grad[d] = folded
+                assert_allclose(val, folded, rtol=1e-10, atol=1e-10)
+                assert_allclose(grad, expected_grad, rtol=1e-9, atol=1e-9)
+
+    def test_set_values(self):
+        points, values = self._get_sample_4d_large()
+        np.random.seed(12)
+        sample = np.array([np.random.uniform(p[0], p[-1], 10) for p in points]).T
+
+        for method in self.valid_methods:
+            interp = _RegularGridInterp(points, values, method)
+            interp(sample)
+            coeffs = interp._splines[tuple(interp._ki)][0]
+
+            # same values, the coefficients are kept
+            interp.set_values(values.copy())
+            self.assertIs(interp._splines[tuple(interp._ki)][0], coeffs)
+
+            # a few changed values, the coefficients are updated from the reference ones
+            new_values = values.copy()
+            new_values[1, 2, 3, 4] += 3.
+            new_values[4, 2, 0, 1] -= 1.
+            interp.set_values(new_values)
+            self.assertIn(tuple(interp._ki), interp._splines)
+            expected = _RegularGridInterp(points, new_values, method)
+            assert_allclose(interp(sample), expected(sample), rtol=1e-12)
+            assert_allclose(interp.gradient(sample), expected.gradient(sample), rtol=1e-12)
+
+            # going back to the reference values gives back the exact coefficients
+            interp.set_values(values)
+            assert_array_equal(interp._splines[tuple(interp._ki)][0], coeffs)
+
+            # most values changed, the coefficients are recomputed when needed
+            interp.set_values(2. * values)
+            self.assertNotIn(tuple(interp._ki), interp._splines)
+            expected = _RegularGridInterp(points, values, method)
+            assert_allclose(interp(sample), 2. * expected(sample), rtol=1e-12)
+
+            with self.assertRaises(ValueError) as cm:
+                interp.set_values(values[1:])
+            self.assertEqual(str(cm.exception), "The new values have shape (5, 7, 6, 8), but "
+                             "the grid has shape (6, 7, 6, 8).")
+
+    def test_training_gradients(self):
+        points, values = self._get_sample_4d_large()
+        np.random.seed(13)
+        sample = np.array([np.random.uniform(p[0], p[-1], 5) for p in points]).T
+
+        for method in self.valid_methods:
+            interp = _RegularGridInterp(points, values, method)
+            computed = interp.training_gradients(sample)
+
+            for pt, grad in zip(sample, computed):
+                expected = 1.
+                for i, axis in enumerate(points):
+                    weights = make_interp_spline(axis, np.eye(axis.size), k=interp._ki[i])(pt[i])
+                    expected = np.multiply.outer(expected, weights)
+                assert_allclose(grad, expected, rtol=1e-10, atol=1e-12)
+
     def test_gradients_returned_by_xi(self):
         # verifies that gradients with respect to xi are returned if cached
         points, values, func, df = self. _get_sample_2d()
@@ -2,12 +2,15 @@
 Unit tests for the unstructured metamodel component.
 """
 from math import sin
+import os
+import shutil
+import tempfile
 import numpy as np
 import unittest
 import warnings
 
 from openmdao.api import Group, Problem, MetaModelUnStructuredComp, IndepVarComp, ResponseSurface, \
-    FloatKrigingSurrogate, KrigingSurrogate, ScipyOptimizeDriver, SurrogateModel
+    FloatKrigingSurrogate, KrigingSurrogate, ScipyOptimizeDriver, SurrogateModel, NearestNeighbor
 
 from openmdao.utils.assert_utils import assert_rel_error
 from openmdao.utils.logger_utils import TestLogger
@@ -551,6 +554,43 @@ class MetaModelTestCase(unittest.TestCase):
                          1e-4)
         self.assertEqual(len(prob.model.trig._metadata('y')['rmse']), 3)
 
+    def test_vectorized_surrogates(self):
+        # surrogates that predict and linearize at all points in one call
+        size = 20
+        np.random.seed(8)
+        x_train = np.random.uniform(0, 3, (30, 2))
+        y_train = np.column_stack((np.sin(x_train[:, 0]) * x_train[:, 1],
+                                   x_train[:, 0] + x_train[:, 1] ** 2))
+
+        for surrogate in [KrigingSurrogate(eval_rmse=True), FloatKrigingSurrogate(),
+                          ResponseSurface(), NearestNeighbor(interpolant_type='rbf'),
+                          NearestNeighbor(interpolant_type='weighted')]:
+            mm = MetaModelUnStructuredComp(vec_size=size, default_surrogate=surrogate)
+            mm.add_input('x', np.zeros((size, 2)), training_data=x_train)
+            mm.add_output('y', np.zeros((size, 2)), training_data=y_train)
+
+            prob = Problem()
+            prob.model.add_subsystem('mm', mm)
+            prob.setup()
+
+            prob['mm.x'] = np.random.uniform(.5, 2.5, (size, 2))
+            prob.run_model()
+
+            # the default surrogate is copied for each output
+            trained = mm._metadata('y')['surrogate']
+            for x, y in zip(prob['mm.x'], prob['mm.y']):
+                expected = trained.predict(x.copy())
+                if isinstance(expected, tuple):
+                    expected = expected[0]
+                assert_rel_error(self, y, np.reshape(expected, 2), 1e-10)
+
+            if isinstance(surrogate, KrigingSurrogate) and surrogate.eval_rmse:
+                self.assertEqual(mm._metadata('y')['rmse'].shape, (size, 2))
+
+            data = prob.check_partials(out_stream=None)
+            assert_rel_error(self, data['mm'][('y', 'x')]['J_fwd'],
+                             data['mm'][('y', 'x')]['J_fd'], 1e-4)
+
     def test_derivatives_vectorized_multiD(self):
         vec_size = 5
 
@@ -1128,5 +1168,127 @@ class MetaModelTestCase(unittest.TestCase):
         assert_rel_error(self, deriv_using_fd[0], np.cos(prob['indep.x']), 1e-4)
 
 
+class CountingSurrogate(KrigingSurrogate):
+    train_count = 0
+
+    def train(self, x, y):
+        super(CountingSurrogate, self).train(x, y)
+        CountingSurrogate.train_count += 1
+
+
+class MetaModelCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.startdir = os.getcwd()
+        self.tempdir = tempfile.mkdtemp(prefix='test_metamodel-')
+        os.chdir(self.tempdir)
+        CountingSurrogate.train_count = 0
+
+    def tearDown(self):
+        os.chdir(self.startdir)
+        try:
+            shutil.rmtree(self.tempdir)
+        except OSError:
+            pass
+
+    def _run(self, x_train, y_train):
+        mm = MetaModelUnStructuredComp(cache_dir='surrogates')
+        mm.add_input('x', 0., training_data=x_train)
+        mm.add_output('y', 0., training_data=y_train, surrogate=CountingSurrogate())
+
+        prob = Problem()
+        prob.model.add_subsystem('mm', mm)
+        prob.setup(check=False)
+
+        prob['mm.x'] = 2.1
+        prob.run_model()
+
+        return prob['mm.y']
+
+    def test_cache_dir(self):
+        x_train = np.linspace(0, 10, 20)
+
+        y1 = self._run(x_train, np.sin(x_train))
+        self.assertEqual(CountingSurrogate.train_count, 1)
+        self.assertEqual(len(os.listdir('surrogates')), 1)
+
+        # the trained surrogate is reloaded
+        y2 = self._run(x_train, np.sin(x_train))
+        self.assertEqual(CountingSurrogate.train_count, 1)
+        self.assertEqual(len(os.listdir('surrogates')), 1)
+        assert_rel_error(self, y2, y1, 1e-15)
+        assert_rel_error(self, y2, np.sin(2.1), 1e-4)
+
+        # different training data requires training
+        y3 = self._run(x_train, np.cos(x_train))
+        self.assertEqual(CountingSurrogate.train_count, 2)
+        self.assertEqual(len(os.listdir('surrogates')), 2)
+        assert_rel_error(self, y3, np.cos(2.1), 1e-4)
+
+    def test_unreadable_cache_file(self):
+        x_train = np.linspace(0, 10, 20)
+        self._run(x_train, np.sin(x_train))
+        self.assertEqual(CountingSurrogate.train_count, 1)
+
+        # a file truncated by a crash is a cache miss, and is replaced
+        cache_file = os.path.join('surrogates', os.listdir('surrogates')[0])
+        with open(cache_file, 'rb') as f:
+            data = f.read()
+        with open(cache_file, 'wb') as f:
+            f.write(data[:len(data) // 2])
+
+        y = self._run(x_train, np.sin(x_train))
+        self.assertEqual(CountingSurrogate.train_count, 2)
+        assert_rel_error(self, y, np.sin(2.1), 1e-4)
+
+        self._run(x_train, np.sin(x_train))
+        self.assertEqual(CountingSurrogate.train_count, 2)
+        self.assertEqual(os.listdir('surrogates'), [os.path.basename(cache_file)])
+
+    def test_surrogate_hash(self):
+        from openmdao.components.meta_model_unstructured_comp import _surrogate_hash
+        from openmdao.surrogate_models.nearest_neighbor import NearestNeighbor
+
+        x = np.linspace(0, 1, 5).reshape((5, 1))
+        data = (x, np.sin(x))
+
+        # the order of keyword arguments doesn't matter
+        s1 = NearestNeighbor(interpolant_type='rbf', num_neighbors=3, rbf_family=2)
+        s2 = NearestNeighbor(interpolant_type='rbf', rbf_family=2, num_neighbors=3)
+        self.assertEqual(_surrogate_hash(s1, data), _surrogate_hash(s2, data))
+
+        # but the options and the training data do
+        s3 = NearestNeighbor(interpolant_type='rbf', rbf_family=1, num_neighbors=3)
+        self.assertNotEqual(_surrogate_hash(s1, data), _surrogate_hash(s3, data))
+        self.assertNotEqual(_surrogate_hash(s1, data), _surrogate_hash(s1, (x, np.cos(x))))
+        self.assertNotEqual(_surrogate_hash(s1, data), _surrogate_hash(s1, (x, np.sin(x).T)))
+
+        # attributes that can't be pickled are fine
+        s1.func = lambda x: x
+        self.assertEqual(len(_surrogate_hash(s1, data)), 40)
+
+    def test_metamodel_feature_cache(self):
+        # save the trained surrogates so that later runs don't need to train them again
+        import numpy as np
+
+        from openmdao.api import Problem, MetaModelUnStructuredComp, FloatKrigingSurrogate
+
+        trig = MetaModelUnStructuredComp(default_surrogate=FloatKrigingSurrogate(),
+                                         cache_dir='surrogate_cache')
+
+        x_train = np.linspace(0, 10, 20)
+        trig.add_input('x', 0., training_data=x_train)
+        trig.add_output('sin_x', 0., training_data=.5*np.sin(x_train))
+
+        prob = Problem()
+        prob.model.add_subsystem('trig', trig)
+        prob.setup(check=False)
+
+        prob['trig.x'] = 2.1
+        prob.run_model()
+
+        assert_rel_error(self, prob['trig.sin_x'], .5*np.sin(prob['trig.x']), 1e-4)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import numpy as np
 import unittest
 
@@ -22,6 +25,14 @@ class MockSurrogate(MultiFiSurrogateModel):
         return 0.0
 
 
+class CountingCoKrigingSurrogate(MultiFiCoKrigingSurrogate):
+    train_count = 0
+
+    def train_multifi(self, x, y):
+        super(CountingCoKrigingSurrogate, self).train_multifi(x, y)
+        CountingCoKrigingSurrogate.train_count += 1
+
+
 class MultiFiMetaModelTestCase(unittest.TestCase):
 
     def test_error_messages(self):
@@ -179,6 +190,41 @@ class MultiFiMetaModelTestCase(unittest.TestCase):
         np.testing.assert_array_equal(surr.ytrain[0], expected_ytrain[0])
         np.testing.assert_array_equal(surr.ytrain[1], expected_ytrain[1])
 
+    def test_cache_dir(self):
+        startdir = os.getcwd()
+        tempdir = tempfile.mkdtemp(prefix='test_multifi-')
+        os.chdir(tempdir)
+
+        try:
+            predictions = []
+            for i in range(2):
+                mm = MultiFiMetaModelUnStructuredComp(nfi=2, cache_dir='surrogates')
+                surr = CountingCoKrigingSurrogate()
+                mm.add_input('x', 0.)
+                mm.add_output('y', 0., surrogate=surr)
+
+                prob = Problem(Group())
+                prob.model.add_subsystem('mm', mm)
+                prob.setup(check=False)
+
+                x = np.linspace(0., 1., 11)
+                mm.options['train:x'] = x[::2]
+                mm.options['train:x_fi2'] = x
+                mm.options['train:y'] = np.sin(6. * x[::2])
+                mm.options['train:y_fi2'] = np.sin(6. * x) + 0.2 * x
+
+                prob['mm.x'] = 0.35
+                prob.run_model()
+                predictions.append(prob['mm.y'].copy())
+
+            # the second surrogate was loaded from the cache
+            self.assertEqual(len(os.listdir('surrogates')), 1)
+            self.assertEqual(CountingCoKrigingSurrogate.train_count, 1)
+            assert_rel_error(self, predictions[1], predictions[0], 1e-15)
+        finally:
+            os.chdir(startdir)
+            shutil.rmtree(tempdir, ignore_errors=True)
+
     def test_two_dim_bi_fidelity_training(self):
         mm = MultiFiMetaModelUnStructuredComp(nfi=2)
         surr_y1 = MockSurrogate()
@@ -118,6 +118,19 @@ class Component(System):
         self.options.declare('distributed', False,
                              desc='True if the component has variables that are distributed '
                                   'across multiple processes.')
+        self.options.declare('cs_colored_partials', types=bool, default=False,
+                             desc='If True, complex step partials perturb groups of '
+                                  'structurally independent columns together, using the '
+                                  'sparsity found by the first complex step evaluation at the '
+                                  'current point and at several randomly perturbed points. '
+                                  'Only set this if that sparsity does not depend on the '
+                                  'inputs.')
+        self.options.declare('compile_jacobian', types=bool, default=False,
+                             desc='If True, all of the partial derivatives of this component are '
+                                  'gathered into one sparse matrix after each linearization, so '
+                                  'that each jacobian-vector product is a single sparse '
+                                  'product. This is faster for components with many declared '
+                                  'partials.')
 
     @property
     def distributed(self):
@@ -323,7 +336,8 @@ class Component(System):
             Whether to call this method in subsystems.
         """
         self._subjacs_info = {}
-        self._jacobian = DictionaryJacobian(system=self)
+        self._jacobian = DictionaryJacobian(system=self,
+                                            compiled=self.options['compile_jacobian'])
 
         for of, wrt, dependent, rows, cols, val in self._declared_partials:
             self._declare_partials(of, wrt, dependent=dependent, rows=rows, cols=cols, val=val)
@@ -722,7 +722,8 @@ class Driver(object):
         return_format : string
             Format to return the derivatives. Default is a 'flat_dict', which
             returns them in a dictionary whose keys are tuples of form (of, wrt). For
-            the scipy optimizer, 'array' is also supported.
+            the scipy optimizer, 'array' is also supported. 'coo' and 'csc' return a scipy
+            sparse matrix containing only the entries in the known total jacobian sparsity.
         global_names : bool
             Set to True when passing in global names to skip some translation steps.
 
@@ -366,6 +366,8 @@ class ExplicitComponent(Component):
                 finally:
                     self._inputs.read_only = False
 
+        self._jacobian._update(self)
+
     def compute(self, inputs, outputs):
         """
         Compute outputs given inputs. The model is assumed to be in an unscaled state.
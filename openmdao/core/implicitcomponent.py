@@ -305,6 +305,8 @@ class ImplicitComponent(Component):
             finally:
                 self._inputs.read_only = self._outputs.read_only = False
 
+        self._jacobian._update(self)
+
         if (jac is None or jac is self._assembled_jac) and self._assembled_jac is not None:
             self._assembled_jac._update(self)
 
@@ -1237,7 +1237,8 @@ class Problem(object):
 
     def check_totals(self, of=None, wrt=None, out_stream=_DEFAULT_OUT_STREAM, compact_print=False,
                      driver_scaling=False, abs_err_tol=1e-6, rel_err_tol=1e-6,
-                     method='fd', step=None, form='forward', step_calc='abs'):
+                     method='fd', step=None, form='forward', step_calc='abs',
+                     directional=False, num_directions=3):
         """
         Check total derivatives for the model vs. finite difference.
 
@@ -1275,19 +1276,34 @@ class Problem(object):
         step_calc : string
             Step type for finite difference, can be 'abs' for absolute', or 'rel' for relative.
             Default is 'abs'.
+        directional : bool
+            If True, instead of computing the full jacobian, compare derivatives along
+            num_directions random directions in design var space against a finite difference
+            along each direction.  In fwd mode J.v is compared for each response. In rev mode
+            u.J.v is compared, where u is a random vector spanning a single response.  Each
+            direction costs one model evaluation, or two for central differences. Default is
+            False.
+        num_directions : int
+            Number of random directions to check when directional is True. Default is 3.
 
         Returns
         -------
         Dict of Dicts of Tuples of Floats
 
             First key:
-                is the (output, input) tuple of strings;
+                is the (output, input) tuple of strings; input is 'directional' if directional
+                is True.
             Second key:
                 is one of ['rel error', 'abs error', 'magnitude', 'fdstep'];
 
             For 'rel error', 'abs error', 'magnitude' the value is: A tuple containing norms for
                 forward - fd, adjoint - fd, forward - adjoint.
         """
+        if directional:
+            return self._check_totals_directional(of, wrt, out_stream, compact_print,
+                                                  driver_scaling, abs_err_tol, rel_err_tol,
+                                                  method, step, form, step_calc, num_directions)
+
         model = self.model
 
         # TODO: Once we're tracking iteration counts, run the model if it has not been run before.
@@ -1341,6 +1357,212 @@ class Problem(object):
                                   [model], {'': fd_args}, totals=True)
         return data['']
 
+    def _check_totals_directional(self, of, wrt, out_stream, compact_print, driver_scaling,
+                                  abs_err_tol, rel_err_tol, method, step, form, step_calc,
+                                  num_directions):
+        """
+        Check total derivatives along random directions vs. finite difference.
+
+        Parameters
+        ----------
+        of : list of variable name strings or None
+            Variables whose derivatives will be computed.
+        wrt : list of variable name strings or None
+            Variables with respect to which the derivatives will be computed.
+        out_stream : file-like object
+            Where to send human readable output.
+        compact_print : bool
+            Set to True to just print the essentials, one line per response.
+        driver_scaling : bool
+            Set to True to scale derivative values by the driver scaling.
+        abs_err_tol : float
+            Threshold value for absolute error.
+        rel_err_tol : float
+            Threshold value for relative error.
+        method : str
+            Method, 'fd' for finite difference or 'cs' for complex step.
+        step : float or None
+            Step size along each (unit length) direction.
+        form : string
+            Form for finite difference, can be 'forward', 'backward', or 'central'.
+        step_calc : string
+            Step type for finite difference, can be 'abs' for absolute', or 'rel' for relative
+            to the norm of the design vars.
+        num_directions : int
+            Number of random directions to check.
+
+        Returns
+        -------
+        dict
+            Derivative check data keyed by (response, 'directional').
+        """
+        model = self.model
+
+        if method == 'cs' and not model._outputs._alloc_complex:
+            raise RuntimeError("In order to use complex step in a directional check_totals, you "
+                               "need to set 'force_alloc_complex' to True during setup. e.g. "
+                               "'problem.setup(force_alloc_complex=True)'")
+
+        if step is None:
+            step = DEFAULT_CS_OPTIONS['step'] if method == 'cs' else DEFAULT_FD_OPTIONS['step']
+
+        total_info = _TotalJacInfo(self, of, wrt, False, return_format='array')
+        mode = total_info.mode
+        if mode not in total_info.in_idx_map:
+            # coloring may only have been done in the other direction
+            mode = list(total_info.in_idx_map)[0]
+
+        of_meta = total_info.of_meta
+        wrt_meta = total_info.wrt_meta
+
+        # driver scaling is J_scaled = diag(row_scaler) J diag(1 / col_scaler)
+        row_scaler = np.ones(total_info.of_size)
+        col_scaler = np.ones(total_info.wrt_size)
+        if driver_scaling:
+            for name in total_info.of:
+                scaler = total_info.responses[name]['scaler']
+                if scaler is not None:
+                    row_scaler[of_meta[name][0]] = scaler
+            for name in total_info.wrt:
+                scaler = total_info.design_vars[name]['scaler']
+                if scaler is not None:
+                    col_scaler[wrt_meta[name][0]] = scaler
+
+        directions = np.random.normal(size=(total_info.wrt_size, num_directions))
+        directions /= np.linalg.norm(directions, axis=0)
+        phys_directions = directions / col_scaler[:, np.newaxis]
+
+        with model._scaled_context_all():
+            if mode == 'fwd':
+                Jv = total_info.directional_derivatives(phys_directions, 'fwd')
+            else:
+                # one random vector for each response, so results can be checked by response.
+                useeds = np.zeros((total_info.of_size, len(total_info.of) * num_directions))
+                for i, name in enumerate(total_info.of):
+                    slc = of_meta[name][0]
+                    cols = slice(i * num_directions, (i + 1) * num_directions)
+                    useeds[slc, cols] = np.random.normal(size=(slc.stop - slc.start,
+                                                               num_directions))
+                    useeds[slc, cols] /= np.linalg.norm(useeds[slc, cols], axis=0)
+                uJ = total_info.directional_derivatives(useeds * row_scaler[:, np.newaxis],
+                                                        'rev')
+
+        Jv_fd = self._directional_fd(total_info, phys_directions, method, step, form,
+                                     step_calc)
+
+        data = {}
+        data[''] = {}
+        for i, name in enumerate(total_info.of):
+            slc = of_meta[name][0]
+            if mode == 'fwd':
+                calc = row_scaler[slc, np.newaxis] * Jv[slc]
+                check = row_scaler[slc, np.newaxis] * Jv_fd[slc]
+            else:
+                cols = slice(i * num_directions, (i + 1) * num_directions)
+                calc = np.sum(uJ[:, cols] * phys_directions, axis=0)
+                check = np.sum(useeds[slc, cols] * row_scaler[slc, np.newaxis] * Jv_fd[slc],
+                               axis=0)
+
+            key = (total_info.prom_of[i], 'directional')
+            data[''][key] = {'J_fwd': calc, 'J_fd': check}
+
+        fd_args = {'step': step, 'form': form, 'step_calc': step_calc, 'method': method}
+
+        if out_stream == _DEFAULT_OUT_STREAM:
+            out_stream = sys.stdout
+
+        _assemble_derivative_data(data, rel_err_tol, abs_err_tol, out_stream, compact_print,
+                                  [model], {'': fd_args}, totals=True)
+        return data['']
+
+    def _directional_fd(self, total_info, directions, method, step, form, step_calc):
+        """
+        Approximate the product of the total jacobian with each direction.
+
+        Parameters
+        ----------
+        total_info : _TotalJacInfo
+            Total jacobian metadata for the responses and design vars.
+        directions : ndarray
+            2D array with one direction in design var space per column.
+        method : str
+            Method, 'fd' for finite difference or 'cs' for complex step.
+        step : float
+            Step size along each direction.
+        form : string
+            Form for finite difference, can be 'forward', 'backward', or 'central'.
+        step_calc : string
+            Step type for finite difference, can be 'abs' for absolute', or 'rel' for relative
+            to the norm of the design vars.
+
+        Returns
+        -------
+        ndarray
+            2D array with the approximated jacobian product for each direction in each column.
+        """
+        model = self.model
+        outputs = model._outputs
+
+        def set_desvars(delta):
+            for name in total_info.wrt:
+                slc, indices, _ = total_info.wrt_meta[name]
+                view = outputs._views_flat[name]
+                if indices is None:
+                    view += delta[slc]
+                else:
+                    view[indices] += delta[slc]
+
+        def get_responses():
+            resp = np.zeros(total_info.of_size, dtype=outputs._data.dtype)
+            for name in total_info.of:
+                slc, indices, _ = total_info.of_meta[name]
+                view = outputs._views_flat[name]
+                resp[slc] = view if indices is None else view[indices]
+            return resp
+
+        if step_calc == 'rel':
+            x = np.hstack([outputs._views_flat[name] for name in total_info.wrt])
+            xnorm = np.linalg.norm(x)
+            if xnorm > 0.:
+                step *= xnorm
+
+        derivs = np.zeros((total_info.of_size, directions.shape[1]))
+
+        if method == 'cs':
+            model._set_complex_step_mode(True)
+            try:
+                for i in range(directions.shape[1]):
+                    delta = directions[:, i] * step * 1j
+                    set_desvars(delta)
+                    model.run_solve_nonlinear()
+                    derivs[:, i] = get_responses().imag / step
+                    set_desvars(-delta)
+            finally:
+                model._set_complex_step_mode(False)
+            return derivs
+
+        if form == 'central':
+            steps = [(step, .5 / step), (-step, -.5 / step)]
+        else:
+            if form == 'backward':
+                step = -step
+            steps = [(step, 1. / step)]
+            model.run_solve_nonlinear()
+            derivs -= (get_responses() / step)[:, np.newaxis]
+
+        for i in range(directions.shape[1]):
+            for delta, coeff in steps:
+                delta = directions[:, i] * delta
+                set_desvars(delta)
+                model.run_solve_nonlinear()
+                derivs[:, i] += get_responses() * coeff
+                set_desvars(-delta)
+
+        # restore the model to its unperturbed state
+        model.run_solve_nonlinear()
+
+        return derivs
+
     def compute_totals(self, of=None, wrt=None, return_format='flat_dict', debug_print=False,
                        driver_scaling=False):
         """
@@ -1355,9 +1577,10 @@ class Problem(object):
             Variables with respect to which the derivatives will be computed.
             Default is None, which uses the driver's desvars.
         return_format : string
-            Format to return the derivatives. Can be either 'dict' or 'flat_dict'.
+            Format to return the derivatives. Can be 'dict', 'flat_dict', 'coo' or 'csc'.
             Default is a 'flat_dict', which returns them in a dictionary whose keys are
-            tuples of form (of, wrt).
+            tuples of form (of, wrt). 'coo' and 'csc' return a scipy sparse matrix that only
+            contains the entries in the driver's total jacobian sparsity, if known.
         debug_print : bool
             Set to True to print out some debug information during linear solve.
         driver_scaling : bool
@@ -12,7 +12,7 @@ from six import iteritems, string_types
 import numpy as np
 
 import openmdao
-from openmdao.jacobians.assembled_jacobian import DenseJacobian, CSCJacobian
+from openmdao.jacobians.assembled_jacobian import DenseJacobian, CSCJacobian, BlockDiagJacobian
 from openmdao.utils.general_utils import determine_adder_scaler, \
     format_as_float_or_array, warn_deprecation, ContainsAll
 from openmdao.recorders.recording_manager import RecordingManager
@@ -32,6 +32,7 @@ _empty_frozen_set = frozenset()
 _asm_jac_types = {
     'csc': CSCJacobian,
     'dense': DenseJacobian,
+    'block_diag': BlockDiagJacobian,
 }
 
 
@@ -254,7 +255,8 @@ class System(object):
         # System options
         self.options = OptionsDictionary()
 
-        self.options.declare('assembled_jac_type', values=['csc', 'dense'], default='csc',
+        self.options.declare('assembled_jac_type', values=['csc', 'dense', 'block_diag'],
+                             default='csc',
                              desc='Linear solver(s) in this group, if using an assembled '
                                   'jacobian, will use this type.')
 
@@ -2890,10 +2892,13 @@ class System(object):
             Complex mode flag; set to True prior to commencing complex step.
         """
         for sub in self.system_iter(include_self=True, recurse=True):
+            # subsystem vectors are views into ours, so only our vectors need to copy their
+            # real data into the preallocated complex arrays.
+            copy_data = sub is self
             sub.under_complex_step = active
-            sub._inputs.set_complex_step_mode(active)
-            sub._outputs.set_complex_step_mode(active)
-            sub._residuals.set_complex_step_mode(active)
+            sub._inputs.set_complex_step_mode(active, copy_data)
+            sub._outputs.set_complex_step_mode(active, copy_data)
+            sub._residuals.set_complex_step_mode(active, copy_data)
 
     def cleanup(self):
         """
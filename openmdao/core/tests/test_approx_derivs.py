@@ -1241,6 +1241,108 @@ class TestComponentComplexStep(unittest.TestCase):
         assert_rel_error(self, derivs['comp.y1', 'px.x'][2][2], 1.0, 1e-6)
         assert_rel_error(self, derivs['comp.y1', 'px.x'][3][3], 1.0/2.34, 1e-6)
 
+    def test_colored_partials(self):
+
+        class WideComp(ExplicitComponent):
+
+            def initialize(self):
+                self.options.declare('size', types=int)
+                self.ncompute = 0
+
+            def setup(self):
+                size = self.options['size']
+                self.add_input('x', np.arange(size, dtype=float) + 1.)
+                self.add_input('y', np.arange(size, dtype=float) + 2.)
+                self.add_input('z', 3.0)
+                self.add_output('f', np.ones(size))
+                self.add_output('g', np.ones(size - 1))
+
+                self.declare_partials('*', '*', method='cs')
+
+            def compute(self, inputs, outputs):
+                self.ncompute += 1
+                x = inputs['x']
+                y = inputs['y']
+                outputs['f'] = x ** 2 * y + np.sin(x) * inputs['z']
+                outputs['g'] = x[1:] * x[:-1] - y[1:] ** 3
+
+        def run(colored):
+            prob = Problem()
+            model = prob.model
+            ivc = model.add_subsystem('ivc', IndepVarComp())
+            ivc.add_output('x', np.linspace(0.5, 2.0, 10))
+            ivc.add_output('y', np.linspace(-1.0, 1.0, 10))
+            ivc.add_output('z', 1.5)
+            comp = model.add_subsystem('comp', WideComp(size=10, cs_colored_partials=colored))
+            model.connect('ivc.x', 'comp.x')
+            model.connect('ivc.y', 'comp.y')
+            model.connect('ivc.z', 'comp.z')
+
+            prob.setup(check=False)
+            prob.run_model()
+
+            # the first linearize finds the sparsity, so the coloring is used on the second
+            model.run_linearize()
+            comp.ncompute = 0
+            model.run_linearize()
+
+            return comp
+
+        expected = run(False)
+        comp = run(True)
+
+        self.assertEqual(expected.ncompute, 21)
+
+        # x needs 2 colors since g is bidiagonal in x, while y and z need only 1 each.
+        self.assertEqual(comp.ncompute, 4)
+
+        for key in [('comp.f', 'comp.x'), ('comp.f', 'comp.y'), ('comp.f', 'comp.z'),
+                    ('comp.g', 'comp.x'), ('comp.g', 'comp.y'), ('comp.g', 'comp.z')]:
+            assert_rel_error(self, comp._jacobian[key], expected._jacobian[key], 1e-12)
+
+    def test_colored_partials_accidental_zeros(self):
+
+        class RollComp(ExplicitComponent):
+
+            def setup(self):
+                self.add_input('x', np.zeros(6))
+                self.add_output('f', np.zeros(6))
+
+                self.declare_partials('*', '*', method='cs')
+
+            def compute(self, inputs, outputs):
+                x = inputs['x']
+                outputs['f'] = x ** 2 + np.roll(x, 1) ** 2
+
+        def run(colored):
+            prob = Problem()
+            model = prob.model
+            model.add_subsystem('ivc', IndepVarComp('x', np.zeros(6)))
+            comp = model.add_subsystem('comp', RollComp(cs_colored_partials=colored))
+            model.connect('ivc.x', 'comp.x')
+
+            prob.setup(check=False)
+
+            # at x = 0 every derivative is zero, so the sparsity can't be found from it alone
+            prob.run_model()
+            model.run_linearize()
+
+            prob['ivc.x'] = np.arange(6, dtype=float) + 1.0
+            prob.run_model()
+            model.run_linearize()
+
+            return comp
+
+        expected = run(False)
+        comp = run(True)
+
+        x = np.arange(6, dtype=float) + 1.0
+        J = np.diag(2.0 * x)
+        J[np.arange(6), np.roll(np.arange(6), 1)] = 2.0 * np.roll(x, 1)
+
+        assert_rel_error(self, expected._jacobian['comp.f', 'comp.x'], J, 1e-12)
+        assert_rel_error(self, comp._jacobian['comp.f', 'comp.x'], J, 1e-12)
+
     def test_sellar_comp_cs(self):
         # Basic sellar test.
 
@@ -2204,6 +2204,144 @@ class TestProblemCheckTotals(unittest.TestCase):
         assert_rel_error(self, cderiv['comp.y1', 'px.x']['J_fwd'], J, 1.0e-3)
 
 
+class TestProblemCheckTotalsDirectional(unittest.TestCase):
+
+    def _build_model(self, mode, bad_partial=False):
+        prob = Problem()
+        model = prob.model
+
+        ivc = model.add_subsystem('p', IndepVarComp())
+        ivc.add_output('x', np.array([1.5, -0.5, 2.0]))
+        ivc.add_output('z', np.array([3.0, 0.7]))
+
+        model.add_subsystem('comp1', ExecComp(['y = x[0] * x[1] + z[0] * sin(x[2])',
+                                               'w = x * z[1] + x**2'],
+                                              x=np.ones(3), z=np.ones(2), w=np.ones(3)))
+        model.add_subsystem('comp2', ExecComp(['obj = y**2 + exp(0.1 * z[0])',
+                                               'con = w * y - z[1]'],
+                                              z=np.ones(2), w=np.ones(3), con=np.ones(3)))
+
+        model.connect('p.x', 'comp1.x')
+        model.connect('p.z', ['comp1.z', 'comp2.z'])
+        model.connect('comp1.y', 'comp2.y')
+        model.connect('comp1.w', 'comp2.w')
+
+        model.add_design_var('p.x', ref=3.0)
+        model.add_design_var('p.z', indices=[1])
+        model.add_objective('comp2.obj', ref=2.0)
+        model.add_constraint('comp1.w', upper=0.0, indices=[0, 2])
+        model.add_constraint('comp2.con', upper=0.0, scaler=5.0)
+
+        model.linear_solver = DirectSolver()
+
+        prob.set_solver_print(level=0)
+        prob.setup(force_alloc_complex=True, mode=mode)
+        prob.run_model()
+
+        if bad_partial:
+            comp2 = model.comp2
+            orig_compute_partials = comp2.compute_partials
+
+            def compute_partials(inputs, partials):
+                orig_compute_partials(inputs, partials)
+                partials['obj', 'y'] *= 1.5
+
+            comp2.compute_partials = compute_partials
+
+        return prob
+
+    def _check(self, mode, method, driver_scaling=False):
+        prob = self._build_model(mode)
+        np.random.seed(11)
+        totals = prob.check_totals(method=method, step=1e-7 if method == 'fd' else None,
+                                   directional=True, num_directions=2,
+                                   driver_scaling=driver_scaling, out_stream=None)
+
+        self.assertEqual(sorted(totals), [('comp1.w', 'directional'),
+                                          ('comp2.con', 'directional'),
+                                          ('comp2.obj', 'directional')])
+
+        tol = 1e-6 if method == 'fd' else 1e-12
+        sizes = {'comp1.w': 2, 'comp2.con': 3, 'comp2.obj': 1}
+        for key, val in iteritems(totals):
+            shape = (sizes[key[0]], 2) if mode == 'fwd' else (2,)
+            self.assertEqual(val['J_fwd'].shape, shape)
+            self.assertEqual(val['J_fd'].shape, shape)
+            self.assertTrue(val['magnitude'].fd > 1e-3)
+            self.assertTrue(val['rel error'].forward < tol, "%s: %s" % (key, val['rel error']))
+
+    def test_fwd_fd(self):
+        self._check('fwd', 'fd')
+
+    def test_rev_fd(self):
+        self._check('rev', 'fd')
+
+    def test_fwd_cs(self):
+        self._check('fwd', 'cs')
+
+    def test_rev_cs(self):
+        self._check('rev', 'cs', driver_scaling=True)
+
+    def test_fwd_driver_scaling(self):
+        self._check('fwd', 'cs', driver_scaling=True)
+
+    def test_bad_derivative(self):
+        for mode in ('fwd', 'rev'):
+            prob = self._build_model(mode, bad_partial=True)
+            totals = prob.check_totals(method='cs', directional=True, out_stream=None)
+
+            self.assertTrue(totals['comp2.obj', 'directional']['rel error'].forward > 1e-3)
+            self.assertTrue(totals['comp2.con', 'directional']['rel error'].forward < 1e-12)
+
+    def test_num_evaluations(self):
+        prob = self._build_model('fwd')
+
+        counts = []
+        orig_run = prob.model.run_solve_nonlinear
+
+        def run_solve_nonlinear():
+            counts.append(1)
+            orig_run()
+
+        prob.model.run_solve_nonlinear = run_solve_nonlinear
+
+        # one base point, one per direction, and one to restore the model.
+        prob.check_totals(directional=True, num_directions=4, out_stream=None)
+        self.assertEqual(len(counts), 6)
+
+        # complex step doesn't need the base point or the restore
+        del counts[:]
+        prob.check_totals(method='cs', directional=True, num_directions=4, out_stream=None)
+        self.assertEqual(len(counts), 4)
+
+    def test_output(self):
+        prob = self._build_model('fwd')
+
+        stream = cStringIO()
+        prob.check_totals(method='cs', directional=True, compact_print=True, out_stream=stream)
+        lines = stream.getvalue().splitlines()
+
+        self.assertTrue("'comp2.obj'" in lines[2] and "'directional'" in lines[2], lines[2])
+
+    def test_cs_requires_complex(self):
+        prob = Problem()
+        prob.model.add_subsystem('p', IndepVarComp('x', 3.0))
+        prob.model.add_subsystem('comp', ExecComp('y = 2.0 * x'))
+        prob.model.connect('p.x', 'comp.x')
+        prob.model.add_design_var('p.x')
+        prob.model.add_objective('comp.y')
+        prob.setup()
+        prob.run_model()
+
+        with self.assertRaises(RuntimeError) as cm:
+            prob.check_totals(method='cs', directional=True, out_stream=None)
+
+        self.assertEqual(str(cm.exception),
+                         "In order to use complex step in a directional check_totals, you need "
+                         "to set 'force_alloc_complex' to True during setup. e.g. "
+                         "'problem.setup(force_alloc_complex=True)'")
+
+
 @unittest.skipUnless(MPI and PETScVector, "only run under MPI with PETSc.")
 class TestProblemCheckTotalsMPI(unittest.TestCase):
 
@@ -1,6 +1,8 @@
 from __future__ import print_function
 
+import argparse
 import os
+import sys
 import shutil
 import tempfile
 import warnings
@@ -12,6 +14,7 @@ import math
 from distutils.version import LooseVersion
 from numpy.testing import assert_array_almost_equal, assert_almost_equal
 import scipy
+from scipy.sparse import csc_matrix
 try:
     from scipy.sparse import load_npz
 except ImportError:
@@ -22,7 +25,9 @@ from openmdao.api import Problem, IndepVarComp, ExecComp, DirectSolver,\
 from openmdao.utils.assert_utils import assert_rel_error
 
 from openmdao.utils.general_utils import set_pyoptsparse_opt
-from openmdao.utils.coloring import get_simul_meta, _solves_info
+from openmdao.utils.coloring import get_simul_meta, _solves_info, \
+    _simul_coloring_setup_parser
+from openmdao.core.total_jac import _TotalJacInfo
 from openmdao.utils.mpi import MPI
 from openmdao.test_suite.tot_jac_builder import TotJacBuilder
 import openmdao.test_suite
@@ -619,6 +624,35 @@ class SimulColoringScipyTestCase(unittest.TestCase):
         self.assertEqual((p.model.linear_solver._solve_count - 21) / 21,
                          (p_color.model.linear_solver._solve_count - 21 * 4) / 5)
 
+    def test_dynamic_simul_coloring_cache(self):
+        startdir = os.getcwd()
+        tempdir = tempfile.mkdtemp()
+        os.chdir(tempdir)
+        try:
+            p = run_opt(ScipyOptimizeDriver, 'auto', optimizer='SLSQP', disp=False,
+                        dynamic_simul_derivs=True, dynamic_derivs_cache=True)
+            cache_files = os.listdir('coloring_files')
+            self.assertEqual(len(cache_files), 1)
+
+            # second run reloads the cached coloring, so the 3 full compute_totals used to
+            # compute the coloring (21 * 3 solves) are skipped.
+            p_cached = run_opt(ScipyOptimizeDriver, 'auto', optimizer='SLSQP', disp=False,
+                               dynamic_simul_derivs=True, dynamic_derivs_cache=True)
+            self.assertEqual(os.listdir('coloring_files'), cache_files)
+
+            assert_almost_equal(p['circle.area'], np.pi, decimal=7)
+            assert_almost_equal(p_cached['circle.area'], np.pi, decimal=7)
+            self.assertEqual(p.model.linear_solver._solve_count - 21 * 3,
+                             p_cached.model.linear_solver._solve_count)
+
+            # a different mode changes the structural hash, so a new coloring is computed.
+            run_opt(ScipyOptimizeDriver, 'fwd', optimizer='SLSQP', disp=False,
+                    dynamic_simul_derivs=True, dynamic_derivs_cache=True)
+            self.assertEqual(len(os.listdir('coloring_files')), 2)
+        finally:
+            os.chdir(startdir)
+            shutil.rmtree(tempdir, ignore_errors=True)
+
     def test_simul_coloring_example(self):
 
         from openmdao.api import Problem, IndepVarComp, ExecComp, ScipyOptimizeDriver
@@ -888,6 +922,82 @@ class SparsityTestCase(unittest.TestCase):
         assert_almost_equal(p_sparsity['circle.area'], np.pi, decimal=7)
 
 
+class SparseTotalJacTestCase(unittest.TestCase):
+
+    def _check_sparse_totals(self, p, nnz=None):
+        J_expected = p.compute_totals(return_format='array')
+        if nnz is None:
+            nnz = np.count_nonzero(J_expected)
+
+        J = p.compute_totals(return_format='coo')
+        self.assertEqual(J.format, 'coo')
+        self.assertEqual(J.nnz, nnz)
+        assert_almost_equal(J.toarray(), J_expected, decimal=12)
+
+        J = p.compute_totals(return_format='csc')
+        self.assertEqual(J.format, 'csc')
+        assert_almost_equal(J.toarray(), J_expected, decimal=12)
+
+        # driver scaling is applied to the stored entries
+        driver = p.driver
+        driver._total_jac = None
+        J_expected = driver._compute_totals(return_format='array')
+        driver._total_jac = None
+        J = driver._compute_totals(return_format='coo')
+        assert_almost_equal(J.toarray(), J_expected, decimal=12)
+
+    def test_fwd_coloring(self):
+        p = run_opt(ScipyOptimizeDriver, 'fwd', optimizer='SLSQP', disp=False,
+                    dynamic_simul_derivs=True)
+        self._check_sparse_totals(p)
+
+    def test_rev_coloring(self):
+        p = run_opt(ScipyOptimizeDriver, 'rev', optimizer='SLSQP', disp=False,
+                    dynamic_simul_derivs=True)
+        self._check_sparse_totals(p)
+
+    def test_total_jac_sparsity(self):
+        p = run_opt(ScipyOptimizeDriver, 'fwd', optimizer='SLSQP', disp=False)
+
+        # give every subjac the sparsity of its computed nonzeros
+        J_dense = p.compute_totals(return_format='array')
+        totals = _TotalJacInfo(p, None, None, True, 'array')
+        sparsity = {}
+        for of in totals.of:
+            sparsity[of] = {}
+            for wrt in totals.wrt:
+                sub = J_dense[totals.of_meta[of][0], totals.wrt_meta[wrt][0]]
+                rows, cols = np.nonzero(sub)
+                sparsity[of][wrt] = (rows, cols, sub.shape)
+
+        p.driver._total_jac_sparsity = sparsity
+        self._check_sparse_totals(p)
+
+        # the data for each subjac is contiguous and in the order given by the sparsity
+        totals = p.driver._total_jac
+        J = totals.J
+        slc = J.subjac_slices['delta_theta_con.g', 'indeps.x']
+        rows, cols, _ = sparsity['delta_theta_con.g']['indeps.x']
+        of_start = totals.of_meta['delta_theta_con.g'][0].start
+        assert_almost_equal(J.rows[slc] - of_start, rows)
+        assert_almost_equal(J.cols[slc], cols)
+
+    def test_no_sparsity(self):
+        p = run_opt(ScipyOptimizeDriver, 'fwd', optimizer='SLSQP', disp=False)
+        self._check_sparse_totals(p, 22 * 21)
+
+    def test_approx_not_supported(self):
+        p = run_opt(ScipyOptimizeDriver, 'fwd', optimizer='SLSQP', disp=False)
+        p.model.approx_totals()
+        p.setup(mode='fwd')
+        p.run_model()
+
+        with self.assertRaises(ValueError) as ctx:
+            p.compute_totals(return_format='coo')
+        self.assertEqual(str(ctx.exception), "Return format 'coo' is not supported when total "
+                         "derivatives are approximated.")
+
+
 class BidirectionalTestCase(unittest.TestCase):
     def test_eisenstat(self):
         for n in range(6, 20, 2):
@@ -956,6 +1066,112 @@ class BidirectionalTestCase(unittest.TestCase):
         self.assertEqual(tot_colors, 105)
 
 
+class SparseColoringTestCase(unittest.TestCase):
+    # expected colorings were generated with the dense coloring implementation that the
+    # sparse one replaced, so both dense and sparse inputs must reproduce them exactly.
+
+    def _check(self, J, expected):
+        for mode in ('fwd', 'rev', 'auto'):
+            for jac in (J, csc_matrix(J)):
+                meta = get_simul_meta(None, mode, include_sparsity=False, bool_jac=jac,
+                                      stream=None)
+                colors = {m: meta[m][0] for m in ('fwd', 'rev') if m in meta}
+                self.assertEqual(colors, expected[mode])
+
+    def test_sparse_matches_dense(self):
+        np.random.seed(11)
+        J = np.random.random((20, 15)) < 0.2
+        self._check(J, {
+            'fwd': {'fwd': [[11], [10, 8], [0, 9, 12], [1, 3], [2, 14, 5], [4, 6], [13, 7]]},
+            'rev': {'rev': [[17], [0, 5, 9, 4], [1, 18, 13, 8], [2, 14, 11, 6], [3, 16, 7],
+                            [10, 15], [12, 19]]},
+            'auto': {'fwd': [[11], [8, 10], [0, 9, 12], [1, 3], [2, 5, 14], [4, 6], [7, 13]]},
+        })
+
+    def test_sparse_matches_dense_bidirectional(self):
+        np.random.seed(11)
+        J = np.random.random((20, 15)) < 0.2
+        J[0, :] = True
+        J[:, 0] = True
+        self._check(J, {
+            'fwd': {'fwd': [list(range(15))]},
+            'rev': {'rev': [list(range(20))]},
+            'auto': {'fwd': [[0, 10, 7], [2, 4, 5, 11, 13, 14], [3, 6, 8, 12]],
+                     'rev': [[0, 1, 19]]},
+        })
+
+    def _check_valid(self, J, mode, coloring):
+        # every column (or row in rev) is in one group, and no two columns of the same color
+        # have nonzeros in the same row. The first group holds the uncolored columns.
+        M = J if mode == 'fwd' else J.T
+        colored = sorted(c for color in coloring[mode][0] for c in color)
+        self.assertEqual(colored, list(range(M.shape[1])))
+        for color in coloring[mode][0][1:]:
+            self.assertLessEqual(np.max(np.sum(M[:, color], axis=1)), 1)
+
+    def test_orderings(self):
+        np.random.seed(11)
+        J = np.random.random((20, 15)) < 0.2
+        ID = {'fwd': [[11], [10, 8], [0, 9, 12], [1, 3], [2, 14, 5], [4, 6], [13, 7]],
+              'rev': [[17], [0, 5, 9, 4], [1, 18, 13, 8], [2, 14, 11, 6], [3, 16, 7],
+                      [10, 15], [12, 19]]}
+        for mode in ('fwd', 'rev'):
+            # the default order is ID, which gives the colorings of the dense algorithm
+            for kwargs in ({}, {'order': 'ID'}):
+                coloring = get_simul_meta(None, mode, include_sparsity=False, bool_jac=J,
+                                          stream=None, **kwargs)
+                self.assertEqual(coloring[mode][0], ID[mode])
+
+            # LF and SL give different colorings, so only check that they are valid
+
+            for order in ('LF', 'SL'):
+                dense = get_simul_meta(None, mode, include_sparsity=False, bool_jac=J,
+                                       stream=None, order=order)
+                sparse = get_simul_meta(None, mode, include_sparsity=False,
+                                        bool_jac=csc_matrix(J), stream=None, order=order)
+                self.assertEqual(dense[mode][0], sparse[mode][0])
+                self._check_valid(J, mode, dense)
+
+                # and it needs at least as many solves as the densest row (or column) has
+                # nonzeros
+                M = J if mode == 'fwd' else J.T
+                tot_size, tot_colors, fwd_solves, rev_solves, pct = _solves_info(dense)
+                self.assertGreaterEqual(tot_colors, np.max(np.sum(M, axis=1)))
+
+        # block diagonal with a dense last row, colored in rev mode
+        builder = TotJacBuilder(41, 40)
+        builder.add_block_diag([(1, 1)] * 40, 0, 0)
+        builder.add_row(40)
+        J = builder.J
+        for order in ('ID', 'LF', 'SL'):
+            coloring = get_simul_meta(None, 'rev', include_sparsity=False, bool_jac=J,
+                                      stream=None, order=order)
+            tot_size, tot_colors, fwd_solves, rev_solves, pct = _solves_info(coloring)
+            self.assertEqual(tot_colors, 2)
+            self._check_valid(J, 'rev', coloring)
+
+        for mode in ('fwd', 'auto'):
+            with self.assertRaises(ValueError) as cm:
+                get_simul_meta(None, mode, include_sparsity=False, bool_jac=J, stream=None,
+                               order='foo')
+            self.assertEqual(str(cm.exception),
+                             "Coloring order 'foo' is not one of ['ID', 'LF', 'SL'].")
+
+    def test_order_cmd_option(self):
+        parser = argparse.ArgumentParser()
+        _simul_coloring_setup_parser(parser)
+        self.assertEqual(parser.parse_args(['model.py']).order, 'ID')
+        self.assertEqual(parser.parse_args(['model.py', '--order', 'SL']).order, 'SL')
+        with self.assertRaises(SystemExit):
+            with open(os.devnull, 'w') as devnull:
+                stderr = sys.stderr
+                sys.stderr = devnull
+                try:
+                    parser.parse_args(['model.py', '--order', 'foo'])
+                finally:
+                    sys.stderr = stderr
+
+
 def _get_mat(rows, cols):
     if MPI:
         if MPI.COMM_WORLD.rank == 0:
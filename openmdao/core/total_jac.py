@@ -6,13 +6,16 @@ from __future__ import print_function, division
 import warnings
 from collections import OrderedDict, defaultdict
 from copy import deepcopy
+import json
+from numbers import Integral
 import pprint
-from six import iteritems, itervalues
+from six import iteritems, itervalues, string_types
 from six.moves import zip
 import sys
 import time
 
 import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
 
 try:
     from petsc4py import PETSc
@@ -28,6 +31,10 @@ from openmdao.utils.mpi import MPI
 
 
 _contains_all = ContainsAll()
+_full_slice = slice(None)
+
+# return formats that store only the known nonzeros of the total jacobian
+_sparse_formats = ('coo', 'csc')
 
 
 class _TotalJacInfo(object):
@@ -44,18 +51,23 @@ class _TotalJacInfo(object):
         If True, this total jacobian contains linear constraints.
     idx_iter_dict : dict
         A dict containing an entry for each outer iteration of the total jacobian computation.
-    J : ndarray
-        The dense array form of the total jacobian.
-    J_dict : dict
-        Nested or flat dict with views of the jacobian.
-    J_final : ndarray or dict
-        If return_format is 'array', Jfinal is J.  Otherwise it's either a nested dict (if
-        return_format is 'dict') or a flat dict (return_format 'flat_dict') with views into
-        the array jacobian.
+    J : ndarray or _SparseTotalJac
+        The dense array form of the total jacobian, or its sparse form if return_format is
+        'coo' or 'csc'.
+    J_dict : dict or _SparseTotalJac
+        Nested or flat dict with views of the jacobian, or the sparse jacobian itself for
+        sparse return formats.
+    J_final : ndarray or dict or None
+        If return_format is 'array', Jfinal is J.  For sparse return formats it is None since
+        a new scipy sparse matrix wrapping the data of J is returned each time.  Otherwise it's
+        either a nested dict (if return_format is 'dict') or a flat dict (return_format
+        'flat_dict') with views into the array jacobian.
     lin_sol_cache : dict
         Dict of indices keyed to solution vectors.
     mode : str
         If 'fwd' compute deriv in forward mode, else if 'rev', reverse (adjoint) mode.
+    multi_rhs : bool
+        If True, the top level linear solver solves all single index right-hand sides at once.
     model : <System>
         The top level System of the System tree.
     out_meta : dict
@@ -77,7 +89,7 @@ class _TotalJacInfo(object):
         Cache containing names of desvars or responses for each parallel derivative color.
     return_format : str
         Indicates the desired return format of the total jacobian. Can have value of
-        'array', 'dict', or 'flat_dict'.
+        'array', 'dict', 'flat_dict', 'coo', or 'csc'.
     simul_coloring : tuple of the form (column_lists, row_map, sparsity) or None
         Contains all data necessary to simultaneously solve for groups of total derivatives.
     """
@@ -99,7 +111,7 @@ class _TotalJacInfo(object):
             If True, names in of and wrt are global names.
         return_format : str
             Indicates the desired return format of the total jacobian. Can have value of
-            'array', 'dict', or 'flat_dict'.
+            'array', 'dict', 'flat_dict', 'coo', or 'csc'.
         approx : bool
             If True, the object will compute approx total jacobians.
         debug_print : bool
@@ -155,6 +167,10 @@ class _TotalJacInfo(object):
 
         abs2meta = model._var_allprocs_abs2meta
 
+        if approx and return_format in _sparse_formats:
+            raise ValueError("Return format '%s' is not supported when total derivatives are "
+                             "approximated." % return_format)
+
         if approx:
             self._initialize_approx()
         else:
@@ -181,6 +197,14 @@ class _TotalJacInfo(object):
 
             self.has_lin_cons = has_lin_cons
 
+            # a top level solver holding a factorization (DirectSolver) can solve all of the
+            # single index right-hand sides in one shot instead of one at a time.
+            linear_solver = model._linear_solver
+            self.multi_rhs = (linear_solver is not None and
+                              linear_solver.supports['multi_rhs'] and
+                              self.comm.size == 1 and
+                              (model._full_comm is None or model._full_comm.size == 1))
+
             if self.simul_coloring is None:
                 modes = [self.mode]
             else:
@@ -213,9 +237,14 @@ class _TotalJacInfo(object):
         self.wrt_meta, self.wrt_size = self._get_tuple_map(wrt, design_vars, abs2meta)
         self.out_meta = {'fwd': self.of_meta, 'rev': self.wrt_meta}
 
-        # always allocate a 2D dense array and we can assign views to dict keys later if
-        # return format is 'dict' or 'flat_dict'.
-        self.J = J = np.zeros((self.of_size, self.wrt_size))
+        if return_format in _sparse_formats:
+            # only store the entries in the known total sparsity pattern so that the dense
+            # jacobian is never allocated.
+            self.J = J = self._get_sparse_J(driver._total_jac_sparsity)
+        else:
+            # always allocate a 2D dense array and we can assign views to dict keys later if
+            # return format is 'dict' or 'flat_dict'.
+            self.J = J = np.zeros((self.of_size, self.wrt_size))
 
         if not approx:
             self.solvec_map = {}
@@ -242,6 +271,9 @@ class _TotalJacInfo(object):
                                                self.wrt_meta, self.of_meta, 'dict')
             else:
                 self.J_dict = None
+        elif return_format in _sparse_formats:
+            self.J_final = None
+            self.J_dict = J
         else:
             self.J_final = self.J_dict = self._get_dict_J(J, wrt, prom_wrt, of, prom_of,
                                                           self.wrt_meta, self.of_meta,
@@ -250,6 +282,8 @@ class _TotalJacInfo(object):
         if self.has_scaling:
             self.prom_design_vars = {prom_wrt[i]: design_vars[dv] for i, dv in enumerate(wrt)}
             self.prom_responses = {prom_of[i]: responses[r] for i, r in enumerate(of)}
+            if return_format in _sparse_formats:
+                self._sparse_scaler = self._get_sparse_scaler()
 
     def _compute_jac_scatters(self, mode, size, has_remote_vars):
         rank = self.comm.rank
@@ -367,6 +401,106 @@ class _TotalJacInfo(object):
 
         return J_dict
 
+    def _get_sparse_J(self, sparsity):
+        """
+        Allocate a sparse total jacobian containing only the known nonzero entries.
+
+        The nonzero structure comes from the driver's total jacobian sparsity if it is known,
+        otherwise from the simultaneous derivative coloring if there is one.  Any subjac
+        not covered by either is treated as dense.  Data for each subjac is stored
+        contiguously, in the row/col order given by the sparsity.
+
+        Parameters
+        ----------
+        sparsity : dict or str or None
+            Total jacobian sparsity of the form sparsity[response][desvar] = (rows, cols, shape),
+            or the name of a json file containing it.
+
+        Returns
+        -------
+        _SparseTotalJac
+            The sparse total jacobian.
+        """
+        if isinstance(sparsity, string_types):
+            with open(sparsity, 'r') as f:
+                sparsity = json.load(f)
+
+        pattern = None
+        if sparsity is None and self.simul_coloring is not None:
+            pattern = _coloring_pattern(self.simul_coloring, (self.of_size, self.wrt_size))
+
+        rows = []
+        cols = []
+        subjac_slices = OrderedDict()
+        start = 0
+
+        for i, of in enumerate(self.of):
+            prom_of = self.prom_of[i]
+            out_slice = self.of_meta[of][0]
+            nrows = out_slice.stop - out_slice.start
+
+            resdict = None
+            if sparsity is not None:
+                resdict = sparsity.get(of, sparsity.get(prom_of))
+
+            for j, wrt in enumerate(self.wrt):
+                prom_wrt = self.prom_wrt[j]
+                in_slice = self.wrt_meta[wrt][0]
+                ncols = in_slice.stop - in_slice.start
+
+                subjac = None
+                if resdict is not None:
+                    subjac = resdict.get(wrt, resdict.get(prom_wrt))
+
+                if subjac is not None:
+                    r = np.asarray(subjac[0], dtype=INT_DTYPE)
+                    c = np.asarray(subjac[1], dtype=INT_DTYPE)
+                elif pattern is not None:
+                    sub = pattern[out_slice, in_slice].tocoo()
+                    r = sub.row.astype(INT_DTYPE)
+                    c = sub.col.astype(INT_DTYPE)
+                else:
+                    r = np.repeat(np.arange(nrows, dtype=INT_DTYPE), ncols)
+                    c = np.tile(np.arange(ncols, dtype=INT_DTYPE), nrows)
+
+                rows.append(r + out_slice.start)
+                cols.append(c + in_slice.start)
+                subjac_slices[prom_of, prom_wrt] = slice(start, start + r.size)
+                start += r.size
+
+        if rows:
+            rows = np.hstack(rows)
+            cols = np.hstack(cols)
+        else:
+            rows = np.zeros(0, dtype=INT_DTYPE)
+            cols = np.zeros(0, dtype=INT_DTYPE)
+
+        return _SparseTotalJac(rows, cols, (self.of_size, self.wrt_size), subjac_slices)
+
+    def _get_sparse_scaler(self):
+        """
+        Compute the driver scale factor for each stored entry of the sparse total jacobian.
+
+        Returns
+        -------
+        ndarray
+            Scale factor for each entry of the sparse jacobian data array.
+        """
+        row_scaler = np.ones(self.of_size)
+        col_scaler = np.ones(self.wrt_size)
+
+        for i, of in enumerate(self.of):
+            oscaler = self.prom_responses[self.prom_of[i]]['scaler']
+            if oscaler is not None:
+                row_scaler[self.of_meta[of][0]] = oscaler
+
+        for j, wrt in enumerate(self.wrt):
+            iscaler = self.prom_design_vars[self.prom_wrt[j]]['scaler']
+            if iscaler is not None:
+                col_scaler[self.wrt_meta[wrt][0]] = iscaler
+
+        return row_scaler[self.J.rows] / col_scaler[self.J.cols]
+
     def _create_in_idx_map(self, mode):
         """
         Create a list that maps a global index to a name, col/row range, and other data.
@@ -1193,6 +1327,116 @@ class _TotalJacInfo(object):
         for matmat_idxs in inds:
             self.matmat_jac_setter(matmat_idxs, mode)
 
+    def _multi_rhs_solve(self, inds, mode):
+        """
+        Solve for many total jacobian rows or columns using a single multi-RHS linear solve.
+
+        Parameters
+        ----------
+        inds : ndarray of int
+            Total jacobian row or column indices.
+        mode : str
+            Direction of derivative solution.
+        """
+        model = self.model
+        in_vec = self.input_vec[mode]['linear']
+
+        loc_idxs = self.in_loc_idxs[mode][inds]
+        cols = np.arange(inds.size)
+        mask = loc_idxs >= 0
+
+        # We apply a -1 here because the derivative of the output is minus the derivative of
+        # the residual in openmdao.
+        rhs = np.zeros((in_vec._data.size, inds.size))
+        rhs[loc_idxs[mask], cols[mask]] = -1.0
+
+        sol = model._linear_solver._solve_multi_rhs(rhs, mode)
+
+        deriv_idxs, jac_idxs = self.solvec_map[mode]
+        derivs = sol[deriv_idxs['linear']]
+        jac_inds = jac_idxs['linear']
+
+        if mode == 'fwd':
+            if isinstance(jac_inds, slice):
+                self.J[:, inds] = derivs
+            else:
+                self.J[np.ix_(jac_inds, inds)] = derivs
+        else:  # rev
+            if isinstance(jac_inds, slice):
+                self.J[inds, :] = derivs.T
+            else:
+                self.J[np.ix_(inds, jac_inds)] = derivs.T
+
+    def directional_derivatives(self, seeds, mode):
+        """
+        Compute products of the total jacobian with a few seed vectors.
+
+        In fwd mode this computes J.dot(seeds) and in rev mode J.T.dot(seeds), using one
+        linear solve per seed rather than one per row or column of the jacobian.
+
+        Parameters
+        ----------
+        seeds : ndarray
+            2D array with one seed per column. Seeds span the design vars in fwd mode and the
+            responses in rev mode.
+        mode : str
+            Direction of derivative solution.
+
+        Returns
+        -------
+        ndarray
+            2D array with the jacobian product for each seed in the corresponding column.
+        """
+        model = self.model
+        fwd = mode == 'fwd'
+        nseeds = seeds.shape[1]
+
+        vecnames = set(tup[0] for tup in self.in_idx_map[mode])
+        if vecnames != {'linear'} or self.jac_scatters[mode]['linear'] is not None:
+            # vectorized or distributed derivatives, so just use the full jacobian
+            J = self.J if self.return_format == 'array' else None
+            if J is None:
+                raise RuntimeError("Return format must be 'array' to compute directional "
+                                   "derivatives of models with vectorized or distributed "
+                                   "derivatives.")
+            self.compute_totals()
+            return J.dot(seeds) if fwd else J.T.dot(seeds)
+
+        vec_dinput = model._vectors['input']
+        vec_doutput = model._vectors['output']
+        vec_dresid = model._vectors['residual']
+        for vec_name in model._lin_vec_names:
+            vec_dinput[vec_name]._data[:] = 0.0
+            vec_doutput[vec_name]._data[:] = 0.0
+            vec_dresid[vec_name]._data[:] = 0.0
+
+        model._linearize(model._assembled_jac, sub_do_ln=model._linear_solver._linearize_children())
+        model._linear_solver._linearize()
+
+        in_vec = self.input_vec[mode]['linear']
+        out_vec = self.output_vec[mode]['linear']
+        loc_idxs = self.in_loc_idxs[mode]
+        mask = loc_idxs >= 0
+        loc_idxs = loc_idxs[mask]
+        deriv_idxs, jac_idxs = self.solvec_map[mode]
+
+        derivs = np.zeros((self.of_size if fwd else self.wrt_size, nseeds))
+
+        # the derivative of the output is minus the derivative of the residual
+        if self.multi_rhs:
+            rhs = np.zeros((in_vec._data.size, nseeds))
+            rhs[loc_idxs] = -seeds[mask]
+            sol = model._linear_solver._solve_multi_rhs(rhs, mode)
+            derivs[jac_idxs['linear']] = sol[deriv_idxs['linear']]
+        else:
+            for i in range(nseeds):
+                in_vec._data[:] = 0.0
+                in_vec._data[loc_idxs] = -seeds[mask, i]
+                model._solve_linear(model._lin_vec_names, mode, _contains_all)
+                derivs[jac_idxs['linear'], i] = out_vec._data[deriv_idxs['linear']]
+
+        return derivs
+
     def compute_totals(self):
         """
         Compute derivatives of desired quantities with respect to desired inputs.
@@ -1225,8 +1469,15 @@ class _TotalJacInfo(object):
 
         # Main loop over columns (fwd) or rows (rev) of the jacobian
         for mode in self.idx_iter_dict:
+            multi_idxs = []
             for key, idx_info in iteritems(self.idx_iter_dict[mode]):
                 imeta, idx_iter = idx_info
+
+                # defer single index solves so they can be done as a single block solve.
+                if self.multi_rhs and idx_iter == self.single_index_iter:
+                    multi_idxs.append(imeta['idx_list'])
+                    continue
+
                 for inds, input_setter, jac_setter, itermeta in idx_iter(imeta, mode):
 
                     rel_systems, vec_names, cache_key = input_setter(inds, itermeta, mode)
@@ -1256,6 +1507,18 @@ class _TotalJacInfo(object):
 
                     jac_setter(inds, mode)
 
+            if multi_idxs:
+                if debug_print:
+                    print('Solving block of %d right-hand sides' % sum(len(i) for i in multi_idxs))
+                    sys.stdout.flush()
+                    t0 = time.time()
+
+                self._multi_rhs_solve(np.hstack(multi_idxs), mode)
+
+                if debug_print:
+                    print('Elapsed Time:', time.time() - t0, '\n')
+                    sys.stdout.flush()
+
         if self.has_scaling:
             self._do_scaling(self.J_dict)
 
@@ -1265,6 +1528,11 @@ class _TotalJacInfo(object):
 
         # np.save("total_jac.npy", self.J)
 
+        if self.return_format == 'coo':
+            return self.J.tocoo()
+        elif self.return_format == 'csc':
+            return self.J.tocsc()
+
         return self.J_final
 
     def compute_totals_approx(self, initialize=False):
@@ -1393,7 +1661,7 @@ class _TotalJacInfo(object):
 
         Parameters
         ----------
-        J : dict
+        J : dict or _SparseTotalJac
             Jacobian to be scaled.
         """
         # use promoted names for design vars and responses
@@ -1415,6 +1683,9 @@ class _TotalJacInfo(object):
                     if iscaler is not None:
                         val *= 1.0 / iscaler
 
+        elif self.return_format in _sparse_formats:
+            J.data *= self._sparse_scaler
+
         elif self.return_format == 'flat_dict':
             for tup, val in iteritems(J):
                 prom_out, prom_in = tup
@@ -1442,7 +1713,7 @@ class _TotalJacInfo(object):
                 for wrt in self.wrt:
                     pprint.pprint({(of, wrt): J[of][wrt]})
         else:
-            J = self.J
+            J = self.J.toarray() if self.return_format in _sparse_formats else self.J
             for i, of in enumerate(self.of):
                 out_slice = self.of_meta[of][0]
                 for j, wrt in enumerate(self.wrt):
@@ -1465,7 +1736,8 @@ class _TotalJacInfo(object):
         recording_iteration.stack.append((requester._get_name(), requester.iter_count))
 
         try:
-            totals = self._get_dict_J(self.J, self.wrt, self.prom_wrt, self.of, self.prom_of,
+            J = self.J.toarray() if self.return_format in _sparse_formats else self.J
+            totals = self._get_dict_J(J, self.wrt, self.prom_wrt, self.of, self.prom_of,
                                       self.wrt_meta, self.of_meta, 'flat_dict_structured_key')
             requester._rec_mgr.record_derivatives(requester, totals, metadata)
 
@@ -1473,6 +1745,236 @@ class _TotalJacInfo(object):
             recording_iteration.stack.pop()
 
 
+class _SparseTotalJac(object):
+    """
+    Total jacobian that stores only the entries of a fixed sparsity pattern.
+
+    Supports the row and column assignments done by the _TotalJacInfo jacobian setters so
+    that the setters don't need to know whether the jacobian is dense or sparse.
+
+    Attributes
+    ----------
+    cols : ndarray of int
+        Column index of each stored entry.
+    data : ndarray
+        Value of each stored entry.
+    rows : ndarray of int
+        Row index of each stored entry.
+    shape : tuple of int
+        Shape of the full total jacobian.
+    subjac_slices : OrderedDict
+        Slice into data for each (of, wrt) subjac, keyed by promoted name tuple.
+    _col_ptr : ndarray of int
+        Start of each column in _col_rows and _col_pos.
+    _col_rows : ndarray of int
+        Row indices of the stored entries, sorted by column, then row.
+    _col_pos : ndarray of int
+        Location in data of each entry in _col_rows.
+    _row_ptr : ndarray of int
+        Start of each row in _row_cols and _row_pos.
+    _row_cols : ndarray of int
+        Column indices of the stored entries, sorted by row, then column.
+    _row_pos : ndarray of int
+        Location in data of each entry in _row_cols.
+    """
+
+    def __init__(self, rows, cols, shape, subjac_slices):
+        """
+        Initialize all attributes.
+
+        Parameters
+        ----------
+        rows : ndarray of int
+            Row index of each stored entry.
+        cols : ndarray of int
+            Column index of each stored entry.
+        shape : tuple of int
+            Shape of the full total jacobian.
+        subjac_slices : OrderedDict
+            Slice into data for each (of, wrt) subjac, keyed by promoted name tuple.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.shape = shape
+        self.subjac_slices = subjac_slices
+        self.data = np.zeros(rows.size)
+
+        nrows, ncols = shape
+
+        self._col_pos = np.lexsort((rows, cols))
+        self._col_rows = rows[self._col_pos]
+        self._col_ptr = np.zeros(ncols + 1, dtype=INT_DTYPE)
+        self._col_ptr[1:] = np.cumsum(np.bincount(cols, minlength=ncols))
+
+        self._row_pos = np.lexsort((cols, rows))
+        self._row_cols = cols[self._row_pos]
+        self._row_ptr = np.zeros(nrows + 1, dtype=INT_DTYPE)
+        self._row_ptr[1:] = np.cumsum(np.bincount(rows, minlength=nrows))
+
+    def __setitem__(self, key, val):
+        """
+        Set entries for a row, a column, or a block of rows or columns.
+
+        Values that fall outside of the sparsity pattern are ignored.
+
+        Parameters
+        ----------
+        key : int or tuple
+            Index in any of the forms J[i], J[rows, i], J[i, cols], J[rows, inds] or
+            J[inds, cols] where rows and cols are slices or index arrays.
+        val : ndarray
+            Values being set.
+        """
+        if isinstance(key, tuple):
+            rows, cols = key
+        else:
+            rows, cols = key, _full_slice
+
+        if isinstance(cols, Integral):
+            self._set_line(cols, rows, val, self._col_ptr, self._col_rows, self._col_pos)
+        elif isinstance(rows, Integral):
+            self._set_line(rows, cols, val, self._row_ptr, self._row_cols, self._row_pos)
+        elif not isinstance(cols, slice):
+            # block of columns, possibly from np.ix_
+            if not isinstance(rows, slice):
+                rows = np.asarray(rows).ravel()
+            for j, col in enumerate(np.asarray(cols).ravel()):
+                self._set_line(col, rows, val[:, j], self._col_ptr, self._col_rows,
+                               self._col_pos)
+        else:
+            # block of rows
+            for j, row in enumerate(np.asarray(rows).ravel()):
+                self._set_line(row, cols, val[j], self._row_ptr, self._row_cols,
+                               self._row_pos)
+
+    def _set_line(self, i, idxs, vals, ptr, nz_idxs, pos):
+        """
+        Set the stored entries of a single row or column.
+
+        Parameters
+        ----------
+        i : int
+            Row or column index.
+        idxs : slice or ndarray of int
+            Indices within the row or column corresponding to vals.  A slice always
+            covers the full row or column.
+        vals : ndarray
+            Values being set.
+        ptr : ndarray of int
+            Start of each row or column in nz_idxs.
+        nz_idxs : ndarray of int
+            Indices of the stored entries within each row or column.
+        pos : ndarray of int
+            Location in data of each entry in nz_idxs.
+        """
+        start, end = ptr[i], ptr[i + 1]
+        if start == end:
+            return
+
+        nz = nz_idxs[start:end]
+        loc = pos[start:end]
+
+        if isinstance(idxs, slice):  # always a full slice
+            self.data[loc] = vals[nz]
+            return
+
+        idxs = np.asarray(idxs)
+        if idxs.size > 1 and np.any(idxs[1:] < idxs[:-1]):
+            srt = np.argsort(idxs)
+            idxs = idxs[srt]
+            vals = vals[srt]
+
+        found = np.searchsorted(idxs, nz)
+        mask = found < idxs.size
+        mask[mask] = idxs[found[mask]] == nz[mask]
+
+        self.data[loc[mask]] = vals[found[mask]]
+
+    def tocoo(self):
+        """
+        Return a scipy COO matrix that shares this jacobian's data array.
+
+        Returns
+        -------
+        coo_matrix
+            The total jacobian in COO form.
+        """
+        return coo_matrix((self.data, (self.rows, self.cols)), shape=self.shape)
+
+    def tocsc(self):
+        """
+        Return a scipy CSC matrix containing this jacobian's data.
+
+        Returns
+        -------
+        csc_matrix
+            The total jacobian in CSC form.
+        """
+        return self.tocoo().tocsc()
+
+    def toarray(self):
+        """
+        Return a dense array version of this jacobian.
+
+        Returns
+        -------
+        ndarray
+            The dense total jacobian.
+        """
+        return self.tocoo().toarray()
+
+
+def _coloring_pattern(coloring, shape):
+    """
+    Return the nonzero structure of the total jacobian implied by a simul coloring.
+
+    Parameters
+    ----------
+    coloring : dict
+        Simultaneous derivative coloring with 'fwd' and/or 'rev' entries.
+    shape : tuple of int
+        Shape of the total jacobian.
+
+    Returns
+    -------
+    csr_matrix
+        Sparse matrix with a nonzero at each location in the total jacobian that the
+        coloring solves for.
+    """
+    rows = []
+    cols = []
+
+    if 'fwd' in coloring:
+        col2row = coloring['fwd'][1]
+        for grp in coloring['fwd'][0]:
+            for c in grp:
+                nzrows = col2row[c]
+                if nzrows is None or isinstance(nzrows, slice):
+                    nzrows = np.arange(shape[0], dtype=INT_DTYPE)
+                rows.append(np.asarray(nzrows, dtype=INT_DTYPE))
+                cols.append(np.full(len(nzrows), c, dtype=INT_DTYPE))
+
+    if 'rev' in coloring:
+        row2col = coloring['rev'][1]
+        for grp in coloring['rev'][0]:
+            for r in grp:
+                nzcols = row2col[r]
+                if nzcols is None or isinstance(nzcols, slice):
+                    nzcols = np.arange(shape[1], dtype=INT_DTYPE)
+                cols.append(np.asarray(nzcols, dtype=INT_DTYPE))
+                rows.append(np.full(len(nzcols), r, dtype=INT_DTYPE))
+
+    if rows:
+        rows = np.hstack(rows)
+        cols = np.hstack(cols)
+    else:
+        rows = cols = np.zeros(0, dtype=INT_DTYPE)
+
+    pattern = csr_matrix((np.ones(rows.size, dtype=bool), (rows, cols)), shape=shape)
+    pattern.sort_indices()
+    return pattern
+
+
 def _get_subjac(jac_meta, prom_out, prom_in, of_idx, wrt_idx):
     """
     Return proper subjacobian based on input/output names and indices.
@@ -95,6 +95,9 @@ class pyOptSparseDriver(Driver):
         Contains all objective info.
     _quantities : list
         Contains the objectives plus nonlinear constraints.
+    _res_jacs : dict
+        Sub-jacobian metadata in 'coo' form for each constraint/design var pair with known
+        total sparsity.
     _responses : dict
         Contains all response info.
     """
@@ -138,6 +141,7 @@ class pyOptSparseDriver(Driver):
 
         self._indep_list = []
         self._quantities = []
+        self._res_jacs = {}
         self.fail = False
 
         self.cite = CITATIONS
@@ -162,6 +166,9 @@ class pyOptSparseDriver(Driver):
         self.options.declare('dynamic_derivs_repeats', default=3, types=int,
                              desc='Number of compute_totals calls during dynamic computation of '
                                   'simultaneous derivative coloring or derivatives sparsity')
+        self.options.declare('dynamic_derivs_cache', default=False, types=bool,
+                             desc='If True, save a dynamically computed coloring to a file keyed '
+                                  'by a hash of the model structure and reuse it on later runs')
 
     def _setup_driver(self, problem):
         """
@@ -221,7 +228,8 @@ class pyOptSparseDriver(Driver):
         if coloring_mod._use_sparsity:
             if self.options['dynamic_simul_derivs']:
                 coloring_mod.dynamic_simul_coloring(self, run_model=optimizer not in run_required,
-                                                    do_sparsity=True)
+                                                    do_sparsity=True,
+                                                    use_cache=self.options['dynamic_derivs_cache'])
             elif self.options['dynamic_derivs_sparsity']:
                 coloring_mod.dynamic_sparsity(self)
 
@@ -488,10 +496,14 @@ class pyOptSparseDriver(Driver):
 
         try:
 
+            # when the total sparsity is known, compute the totals directly into sparse
+            # storage so that no dense jacobian is ever formed.
+            sparse = bool(self._res_jacs) and not prob.model._owns_approx_jac
+
             try:
                 sens_dict = self._compute_totals(of=self._quantities,
                                                  wrt=self._indep_list,
-                                                 return_format='dict')
+                                                 return_format='coo' if sparse else 'dict')
             # Let the optimizer try to handle the error
             except AnalysisError:
                 self._problem.model._clear_iprint()
@@ -508,23 +520,25 @@ class pyOptSparseDriver(Driver):
                         isize = len(ival)
                         sens_dict[okey][ikey] = np.zeros((osize, isize))
             else:
-                # if we don't convert to 'coo' here, pyoptsparse will do a
-                # conversion of our dense array into a fully dense 'coo', which is bad.
-                # TODO: look into getting rid of all of these conversions!
-                new_sens = OrderedDict()
-                res_jacs = self._res_jacs
-                for okey in func_dict:
-                    new_sens[okey] = newdv = OrderedDict()
-                    for ikey in dv_dict:
-                        if okey in res_jacs and ikey in res_jacs[okey]:
-                            arr = sens_dict[okey][ikey]
-                            coo = res_jacs[okey][ikey]
-                            row, col, data = coo['coo']
-                            coo['coo'][2] = arr[row, col].flatten()
-                            newdv[ikey] = coo
-                        else:
-                            newdv[ikey] = sens_dict[okey][ikey]
-                sens_dict = new_sens
+                if sparse:
+                    sens_dict = self._get_sparse_sens(sens_dict, func_dict, dv_dict)
+                else:
+                    # if we don't convert to 'coo' here, pyoptsparse will do a
+                    # conversion of our dense array into a fully dense 'coo', which is bad.
+                    new_sens = OrderedDict()
+                    res_jacs = self._res_jacs
+                    for okey in func_dict:
+                        new_sens[okey] = newdv = OrderedDict()
+                        for ikey in dv_dict:
+                            if okey in res_jacs and ikey in res_jacs[okey]:
+                                arr = sens_dict[okey][ikey]
+                                coo = res_jacs[okey][ikey]
+                                row, col, data = coo['coo']
+                                coo['coo'][2] = arr[row, col].flatten()
+                                newdv[ikey] = coo
+                            else:
+                                newdv[ikey] = sens_dict[okey][ikey]
+                    sens_dict = new_sens
 
         except Exception as msg:
             tb = traceback.format_exc()
@@ -540,6 +554,49 @@ class pyOptSparseDriver(Driver):
         # print(sens_dict)
         return sens_dict, fail
 
+    def _get_sparse_sens(self, J, func_dict, dv_dict):
+        """
+        Split a sparse total jacobian into the sub-jacobians passed to pyoptsparse.
+
+        Sub-jacobians with known sparsity are passed in 'coo' form and take their data directly
+        from the sparse total jacobian.  The rest are small (e.g. objectives) and passed dense.
+
+        Parameters
+        ----------
+        J : coo_matrix
+            Sparse total jacobian.
+        func_dict : dict
+            Dictionary of all functional variables evaluated at design point.
+        dv_dict : dict
+            Dictionary of design variable values.
+
+        Returns
+        -------
+        OrderedDict
+            Nested dict of sub-jacobians keyed by function name, then design var name.
+        """
+        total_jac = self._total_jac
+        subjac_slices = total_jac.J.subjac_slices
+        res_jacs = self._res_jacs
+        data = J.data
+
+        sens_dict = OrderedDict()
+        for okey, oval in iteritems(func_dict):
+            sens_dict[okey] = newdv = OrderedDict()
+            for ikey, ival in iteritems(dv_dict):
+                slc = subjac_slices[okey, ikey]
+                if okey in res_jacs and ikey in res_jacs[okey]:
+                    coo = res_jacs[okey][ikey]
+                    coo['coo'][2] = data[slc].copy()
+                    newdv[ikey] = coo
+                else:
+                    arr = np.zeros((len(oval), len(ival)))
+                    arr[J.row[slc] - total_jac.of_meta[okey][0].start,
+                        J.col[slc] - total_jac.wrt_meta[ikey][0].start] = data[slc]
+                    newdv[ikey] = arr
+
+        return sens_dict
+
     def _get_name(self):
         """
         Get name of current optimizer.
@@ -580,6 +637,7 @@ class pyOptSparseDriver(Driver):
         """
         Set up total jacobian subjac sparsity.
         """
+        self._res_jacs = {}
         if self._total_jac_sparsity is None:
             return
 
@@ -587,7 +645,6 @@ class pyOptSparseDriver(Driver):
             with open(self._total_jac_sparsity, 'r') as f:
                 self._total_jac_sparsity = json.load(f)
 
-        self._res_jacs = {}
         for res, resdict in iteritems(self._total_jac_sparsity):
             if res in self._objs:  # skip objectives
                 continue
@@ -140,6 +140,9 @@ class ScipyOptimizeDriver(Driver):
         self.options.declare('dynamic_derivs_repeats', default=3, types=int,
                              desc='Number of compute_totals calls during dynamic computation of '
                                   'simultaneous derivative coloring')
+        self.options.declare('dynamic_derivs_cache', default=False, types=bool,
+                             desc='If True, save a dynamically computed coloring to a file keyed '
+                                  'by a hash of the model structure and reuse it on later runs')
 
     def _get_name(self):
         """
@@ -320,7 +323,8 @@ class ScipyOptimizeDriver(Driver):
 
         # compute dynamic simul deriv coloring if option is set
         if coloring_mod._use_sparsity and self.options['dynamic_simul_derivs']:
-            coloring_mod.dynamic_simul_coloring(self, run_model=False, do_sparsity=False)
+            coloring_mod.dynamic_simul_coloring(self, run_model=False, do_sparsity=False,
+                                                use_cache=self.options['dynamic_derivs_cache'])
 
         # optimize
         try:
@@ -13,6 +13,7 @@ from openmdao.matrices.dense_matrix import DenseMatrix
 from openmdao.matrices.coo_matrix import COOMatrix
 from openmdao.matrices.csr_matrix import CSRMatrix
 from openmdao.matrices.csc_matrix import CSCMatrix
+from openmdao.matrices.block_diag_matrix import BlockDiagMatrix
 from openmdao.utils.units import get_conversion
 
 SUBJAC_META_DEFAULTS = {
@@ -45,6 +46,9 @@ class AssembledJacobian(Jacobian):
         by the input._names set.
     _matrix_class : type
         Class used to create Matrix objects.
+    _ext_matrix_class : type
+        Class used to create the Matrix objects for the derivatives with respect to inputs
+        connected to outputs outside of the system.
     _subjac_iters : dict
         Mapping of system pathname to tuple of lists of absolute key tuples used to index into
         the jacobian.
@@ -52,6 +56,13 @@ class AssembledJacobian(Jacobian):
         Column ranges for inputs.
     _out_ranges : dict
         Row ranges for outputs.
+    _scaling : (ndarray, ndarray) or None
+        Row and column scale factors folded into the internal matrix, or None if the owning
+        system has no scaling. The matrix holds the jacobian with respect to the scaled
+        outputs and residuals, so linear solves with it are done entirely in scaled space.
+    _rev_scaling : (ndarray, ndarray) or None
+        Factors applied to the residuals and outputs before and after products with the
+        transpose of the internal matrix, or None if the owning system has no scaling.
     """
 
     def __init__(self, matrix_class, system):
@@ -76,8 +87,11 @@ class AssembledJacobian(Jacobian):
         self._keymap = {}
         self._mask_caches = {}
         self._matrix_class = matrix_class
+        self._ext_matrix_class = matrix_class
         self._in_ranges = None
         self._out_ranges = None
+        self._scaling = None
+        self._rev_scaling = None
 
         self._subjac_iters = defaultdict(lambda: None)
         self._init_ranges()
@@ -118,7 +132,7 @@ class AssembledJacobian(Jacobian):
         abs2meta = system._var_abs2meta
 
         self._int_mtx = int_mtx = self._matrix_class(system.comm)
-        ext_mtx = self._matrix_class(system.comm)
+        ext_mtx = self._ext_matrix_class(system.comm)
 
         iproc = system.comm.rank
         abs2idx = system._var_allprocs_abs2idx['nonlinear']
@@ -190,6 +204,54 @@ class AssembledJacobian(Jacobian):
 
         self._ext_mtx[system.pathname] = ext_mtx
 
+        self._setup_scaling()
+        if self._scaling is not None:
+            row_scale, col_scale = self._scaling
+            int_mtx._set_scaling(row_scale, col_scale)
+            if ext_mtx is not None:
+                # inputs are not scaled in linear solves
+                ext_mtx._set_scaling(row_scale, np.ones(in_size))
+
+    def _setup_scaling(self):
+        """
+        Compute the row and column scale factors of the internal matrix.
+
+        The internal matrix holds Dr^-1 * J * Do, so products in fwd mode and solves need no
+        rescaling of the vectors. In rev mode, the transpose product in scaled space is
+        Do^-2 * (Dr^-1 * J * Do)^T * Dr^2, so only these two diagonals are needed.
+        """
+        self._scaling = self._get_scale_factors()
+        if self._scaling is None:
+            self._rev_scaling = None
+            return
+
+        row_scale, col_scale = self._scaling
+        self._rev_scaling = (1.0 / row_scale ** 2, 1.0 / col_scale ** 2)
+
+    def _get_scaling(self, system, rev=False):
+        """
+        Return the scale factors of the part of the internal matrix used by the given system.
+
+        Parameters
+        ----------
+        system : System
+            System using this jacobian or a sub-view of it.
+        rev : bool
+            If True, return the factors used for rev mode products.
+
+        Returns
+        -------
+        (ndarray, ndarray) or None
+            Row and column factors (or residual and output factors in rev mode), or None if
+            the matrix is not scaled.
+        """
+        scaling = self._rev_scaling if rev else self._scaling
+        if scaling is None or system.pathname not in self._view_ranges:
+            return scaling
+
+        start, end = self._view_ranges[system.pathname][:2]
+        return scaling[0][start:end], scaling[1][start:end]
+
     def _init_view(self, system):
         """
         Determine the _ext_mtx for a sub-view of the assembled jacobian.
@@ -222,7 +284,7 @@ class AssembledJacobian(Jacobian):
         ranges = self._view_ranges[system.pathname] = (
             min_res_offset, max_res_offset, min_in_offset, max_in_offset)
 
-        ext_mtx = self._matrix_class(system.comm)
+        ext_mtx = self._ext_matrix_class(system.comm)
         conns = {} if isinstance(system, Component) else system._conn_global_abs_in2out
 
         iproc = self._system.comm.rank
@@ -256,6 +318,8 @@ class AssembledJacobian(Jacobian):
             out_size = np.sum(sizes['nonlinear']['output'][iproc, :])
             in_size = np.sum(sizes['nonlinear']['input'][iproc, :])
             ext_mtx._build(out_size, in_size, in_ranges, out_ranges)
+            if self._scaling is not None:
+                ext_mtx._set_scaling(self._scaling[0][ranges[0]:ranges[1]], np.ones(in_size))
         else:
             ext_mtx = None
 
@@ -315,7 +379,11 @@ class AssembledJacobian(Jacobian):
                     elif ext_mtx is not None:
                         iters_in_ext.append(abs_key)
 
-            self._subjac_iters[system.pathname] = subjac_iters = (iters, iters_in_ext)
+            set_keys = [key for _, key, do_add in iters if not do_add]
+            add_keys = [key for _, key, do_add in iters if do_add]
+
+            self._subjac_iters[system.pathname] = subjac_iters = (iters, iters_in_ext,
+                                                                  set_keys, add_keys)
 
         return subjac_iters
 
@@ -332,16 +400,16 @@ class AssembledJacobian(Jacobian):
         ext_mtx = self._ext_mtx[system.pathname]
         subjacs = system._subjacs_info
 
-        iters, iters_in_ext = self._get_subjac_iters(system)
+        iters, iters_in_ext, set_keys, add_keys = self._get_subjac_iters(system)
 
-        for _, key, do_add in iters:
-            if do_add:
-                int_mtx._update_add_submat(key, subjacs[key]['value'])
-            else:
-                int_mtx._update_submat(key, subjacs[key]['value'])
+        int_mtx._update_submats(set_keys, subjacs, system.pathname)
 
-        for key in iters_in_ext:
-            ext_mtx._update_submat(key, subjacs[key]['value'])
+        # keys that map to an already set location must be added one by one afterward
+        for key in add_keys:
+            int_mtx._update_add_submat(key, subjacs[key]['value'])
+
+        if iters_in_ext:
+            ext_mtx._update_submats(iters_in_ext, subjacs, system.pathname)
 
     def _apply(self, d_inputs, d_outputs, d_residuals, mode):
         """
@@ -371,41 +439,48 @@ class AssembledJacobian(Jacobian):
         else:
             int_ranges = None
 
-        # TODO: remove the _unscaled_context call here (and in DictionaryJacobian)
-        # and do it outside so that we can avoid an unnecessary extra unscaling/rescaling
-        # in _apply_linear
-        with system._unscaled_context(
-                outputs=[d_outputs], residuals=[d_residuals]):
-            if mode == 'fwd':
-                if d_outputs._names and d_residuals._names:
-                    d_residuals._data += int_mtx._prod(d_outputs._data, mode, int_ranges)
-
-                if ext_mtx is not None and d_inputs._names and d_residuals._names:
-
-                    # Masking
-                    try:
-                        mask = self._mask_caches[d_inputs._names]
-                    except KeyError:
-                        mask = ext_mtx._create_mask_cache(d_inputs)
-                        self._mask_caches[d_inputs._names] = mask
-
-                    d_residuals._data += ext_mtx._prod(d_inputs._data, mode, None, mask=mask)
-
-            else:  # rev
-                dresids = d_residuals._data
-                if d_outputs._names and d_residuals._names:
+        # the internal matrix is scaled, so fwd products need no rescaling of the vectors
+        if mode == 'fwd':
+            if d_outputs._names and d_residuals._names:
+                d_residuals._data += int_mtx._prod(d_outputs._data, mode, int_ranges)
+
+            if ext_mtx is not None and d_inputs._names and d_residuals._names:
+
+                # Masking
+                try:
+                    mask = self._mask_caches[d_inputs._names]
+                except KeyError:
+                    mask = ext_mtx._create_mask_cache(d_inputs)
+                    self._mask_caches[d_inputs._names] = mask
+
+                d_residuals._data += ext_mtx._prod(d_inputs._data, mode, None, mask=mask)
+
+        else:  # rev
+            dresids = d_residuals._data
+            scaling = self._get_scaling(system, rev=True)
+            if scaling is not None:
+                res_scale, out_scale = scaling
+                if dresids.ndim > 1:
+                    res_scale = res_scale[:, np.newaxis]
+                    out_scale = out_scale[:, np.newaxis]
+                dresids = dresids * res_scale
+
+            if d_outputs._names and d_residuals._names:
+                if scaling is None:
                     d_outputs._data += int_mtx._prod(dresids, mode, int_ranges)
+                else:
+                    d_outputs._data += out_scale * int_mtx._prod(dresids, mode, int_ranges)
 
-                if ext_mtx is not None and d_inputs._names and d_residuals._names:
+            if ext_mtx is not None and d_inputs._names and d_residuals._names:
 
-                    # Masking
-                    try:
-                        mask = self._mask_caches[d_inputs._names]
-                    except KeyError:
-                        mask = ext_mtx._create_mask_cache(d_inputs)
-                        self._mask_caches[d_inputs._names] = mask
+                # Masking
+                try:
+                    mask = self._mask_caches[d_inputs._names]
+                except KeyError:
+                    mask = ext_mtx._create_mask_cache(d_inputs)
+                    self._mask_caches[d_inputs._names] = mask
 
-                    d_inputs._data += ext_mtx._prod(dresids, mode, None, mask=mask)
+                d_inputs._data += ext_mtx._prod(dresids, mode, None, mask=mask)
 
 
 class DenseJacobian(AssembledJacobian):
@@ -474,3 +549,25 @@ class CSCJacobian(AssembledJacobian):
             Parent system to this jacobian.
         """
         super(CSCJacobian, self).__init__(CSCMatrix, system=system)
+
+
+class BlockDiagJacobian(AssembledJacobian):
+    """
+    Assemble global <Jacobian> as dense diagonal blocks.
+
+    This is intended for models that are vectorized over independent nodes, where the
+    internal Jacobian is block diagonal after a symmetric permutation. Derivatives with
+    respect to inputs connected outside of the system are stored in CSC format.
+    """
+
+    def __init__(self, system):
+        """
+        Initialize all attributes.
+
+        Parameters
+        ----------
+        system : System
+            Parent system to this jacobian.
+        """
+        super(BlockDiagJacobian, self).__init__(BlockDiagMatrix, system=system)
+        self._ext_matrix_class = CSCMatrix
@@ -2,6 +2,8 @@
 from __future__ import division
 
 import numpy as np
+from numpy import ndarray
+from scipy.sparse import csr_matrix
 from six.moves import range
 
 from openmdao.jacobians.jacobian import Jacobian
@@ -15,10 +17,14 @@ class DictionaryJacobian(Jacobian):
     ----------
     _iter_keys : list of (vname, vname) tuples
         List of tuples of variable names that match subjacs in the this Jacobian.
-
+    _compiled : bool
+        If True, all of the subjacs are gathered into one sparse matrix so that each product
+        is a single sparse matrix-vector product.
+    _operators : dict
+        _SubjacOperator for each (system pathname, vec_name) when compiled.
     """
 
-    def __init__(self, system, **kwargs):
+    def __init__(self, system, compiled=False, **kwargs):
         """
         Initialize all attributes.
 
@@ -26,12 +32,53 @@ class DictionaryJacobian(Jacobian):
         ----------
         system : System
             Parent system to this jacobian.
+        compiled : bool
+            If True, gather all of the subjacs into one sparse matrix for products.
         **kwargs : dict
             options dictionary.
         """
         super(DictionaryJacobian, self).__init__(system, **kwargs)
 
         self._iter_keys = {}
+        self._compiled = compiled
+        self._operators = {}
+
+    def _update(self, system):
+        """
+        Flag the compiled sparse matrices as out of date after the subjacs have changed.
+
+        Parameters
+        ----------
+        system : System
+            System that is updating this jacobian.
+        """
+        for op in self._operators.values():
+            op.valid = False
+
+    def _get_operator(self, vec_name):
+        """
+        Return the up to date sparse operator of the current system for the given vector.
+
+        Parameters
+        ----------
+        vec_name : str
+            The name of the current RHS vector.
+
+        Returns
+        -------
+        _SubjacOperator or None
+            The operator, or None if the subjacs can't be gathered into one real matrix.
+        """
+        entry = (self._system.pathname, vec_name)
+        try:
+            op = self._operators[entry]
+        except KeyError:
+            op = self._operators[entry] = _SubjacOperator(self, vec_name)
+
+        if not op.valid:
+            op.update(self._subjacs_info)
+
+        return op if op.valid else None
 
     def _iter_abs_keys(self, vec_name):
         """
@@ -94,6 +141,14 @@ class DictionaryJacobian(Jacobian):
         iflat = d_inputs._views_flat
         np_add_at = np.add.at
 
+        op = self._get_operator(d_residuals._name) if self._compiled else None
+        if op is not None:
+            # the compiled matrix is scaled, so the vectors need no rescaling
+            op.apply(d_inputs, d_outputs, d_residuals, fwd)
+            return
+
+        # the subjacs themselves are unscaled, so products with them still have to be done
+        # with unscaled vectors
         with system._unscaled_context(outputs=[d_outputs], residuals=[d_residuals]):
             ncol = d_residuals._ncol
             subjacs_info = self._subjacs_info
@@ -156,3 +211,262 @@ class DictionaryJacobian(Jacobian):
                                 rflat[res_name] += subjac.dot(iflat[other_name])
                             else:  # rev
                                 iflat[other_name] += subjac.T.dot(rflat[res_name])
+
+
+class _SubjacOperator(object):
+    """
+    All of the subjacs of a system gathered into one sparse matrix.
+
+    The matrix maps the outputs followed by the inputs to the residuals. Its sparsity
+    structure is computed once, and each update only gathers the current subjac values into
+    its data array.
+
+    Attributes
+    ----------
+    valid : bool
+        True if the matrix holds the current subjac values.
+    _keys : list of (str, str)
+        Keys of the subjacs in the matrix.
+    _kinds : list of str
+        How the values of each subjac are stored: 'dense', 'sparse', 'list' or 'identity'.
+    _sizes : list of int
+        Number of entries of each subjac.
+    _order : ndarray of int
+        Index of the stacked subjac value that goes into each entry of the matrix data.
+    _matrix : csr_matrix
+        The matrix.
+    _nout : int
+        Number of columns that belong to the outputs.
+    _ranges : dict
+        Slice of the columns of each output and input. The rows of the residuals are the same
+        as the columns of the outputs.
+    _masks : dict
+        Row and column masks that zero out the variables that are not part of a product,
+        keyed by the sets of residual, output and input names of the product.
+    _scale : ndarray or None
+        Scale factor of each entry of the matrix data, or None if the system has no scaling.
+        The matrix holds the jacobian with respect to the scaled outputs and residuals.
+    _rev_scaling : (ndarray, ndarray) or None
+        Factors applied to the residuals and to the outputs and inputs before and after
+        products with the transpose of the matrix, or None if the system has no scaling.
+    """
+
+    def __init__(self, jac, vec_name):
+        """
+        Compute the sparsity structure of the matrix.
+
+        Parameters
+        ----------
+        jac : DictionaryJacobian
+            The jacobian holding the subjacs.
+        vec_name : str
+            The name of the RHS vector that the products are done with.
+        """
+        # avoid circular import
+        from openmdao.core.explicitcomponent import ExplicitComponent
+
+        system = jac._system
+        explicit = isinstance(system, ExplicitComponent)
+        subjacs = jac._subjacs_info
+        iproc = system.comm.rank
+        abs2idx = system._var_allprocs_abs2idx[vec_name]
+        out_sizes = system._var_sizes[vec_name]['output']
+        in_sizes = system._var_sizes[vec_name]['input']
+
+        nout = np.sum(out_sizes[iproc, :])
+        self._ranges = ranges = {}
+        for name in system._var_relevant_names[vec_name]['output']:
+            start = np.sum(out_sizes[iproc, :abs2idx[name]])
+            ranges[name] = slice(start, start + out_sizes[iproc, abs2idx[name]])
+        for name in system._var_relevant_names[vec_name]['input']:
+            start = nout + np.sum(in_sizes[iproc, :abs2idx[name]])
+            ranges[name] = slice(start, start + in_sizes[iproc, abs2idx[name]])
+
+        self.valid = False
+        self._keys = keys = []
+        self._kinds = kinds = []
+        self._sizes = sizes = []
+        self._nout = nout
+        self._masks = {}
+
+        rows = []
+        cols = []
+        for key in jac._iter_abs_keys(vec_name):
+            res_name, other_name = key
+            info = subjacs[key]
+            val = info['value']
+            if info['rows'] is not None:
+                jrows = info['rows']
+                jcols = info['cols']
+                kind = 'identity' if res_name is other_name and explicit else 'list'
+            elif isinstance(val, ndarray):
+                nrows, ncols = val.shape
+                jrows = np.repeat(np.arange(nrows), ncols)
+                jcols = np.tile(np.arange(ncols), nrows)
+                kind = 'dense'
+            else:
+                coo = val.tocoo()
+                jrows = coo.row
+                jcols = coo.col
+                kind = 'sparse'
+
+            keys.append(key)
+            kinds.append(kind)
+            sizes.append(len(jrows))
+            rows.append(np.asarray(jrows) + ranges[res_name].start)
+            cols.append(np.asarray(jcols) + ranges[other_name].start)
+
+        size = nout + np.sum(in_sizes[iproc, :])
+        if rows:
+            rows = np.concatenate(rows)
+            cols = np.concatenate(cols)
+        else:
+            rows = cols = np.zeros(0, dtype=int)
+
+        # build the csr structure directly so that we know where each value goes. Repeated
+        # entries are kept, and get summed by the products.
+        self._order = order = np.lexsort((cols, rows))
+        indptr = np.zeros(nout + 1, dtype=int)
+        np.cumsum(np.bincount(rows, minlength=nout), out=indptr[1:])
+        self._matrix = csr_matrix((np.zeros(order.size), cols[order], indptr),
+                                  shape=(nout, size))
+
+        # fold the scaling into the matrix as in AssembledJacobian. Inputs are not scaled.
+        scaling = jac._get_scale_factors()
+        if scaling is None:
+            self._scale = self._rev_scaling = None
+        else:
+            row_scale, col_scale = scaling
+            col_scale = np.hstack((col_scale, np.ones(size - nout)))
+            self._scale = row_scale[rows[order]] * col_scale[cols[order]]
+            self._rev_scaling = (1.0 / row_scale ** 2, 1.0 / col_scale ** 2)
+
+    def update(self, subjacs):
+        """
+        Gather the current subjac values into the matrix.
+
+        If the values can't be used, for instance because they are complex or their sparsity
+        changed, the matrix stays invalid.
+
+        Parameters
+        ----------
+        subjacs : dict
+            Sub-jacobian metadata keyed by (output, input) name.
+        """
+        vals = []
+        for key, kind, size in zip(self._keys, self._kinds, self._sizes):
+            if kind == 'identity':
+                vals.append(np.full(size, -1.0))
+                continue
+
+            val = subjacs[key]['value']
+            if kind == 'sparse':
+                val = val.data
+            val = np.asarray(val).ravel()
+            if val.size != size or np.iscomplexobj(val):
+                self.valid = False
+                return
+            vals.append(val)
+
+        if vals:
+            data = self._matrix.data
+            np.take(np.concatenate(vals), self._order, out=data)
+            if self._scale is not None:
+                data *= self._scale
+        self.valid = True
+
+    def _get_masks(self, d_inputs, d_outputs, d_residuals):
+        """
+        Return the row and column masks for the variables that are part of a product.
+
+        Parameters
+        ----------
+        d_inputs : Vector
+            inputs linear vector.
+        d_outputs : Vector
+            outputs linear vector.
+        d_residuals : Vector
+            residuals linear vector.
+
+        Returns
+        -------
+        ndarray or None
+            Row mask, or None if all residuals are included.
+        ndarray or None
+            Column mask, or None if all outputs and inputs are included.
+        """
+        mask_key = (d_residuals._names, d_outputs._names, d_inputs._names)
+        try:
+            return self._masks[mask_key]
+        except KeyError:
+            pass
+
+        row_mask = None
+        if len(d_residuals._names) < len(d_residuals._views):
+            row_mask = np.zeros(self._matrix.shape[0])
+            for name in d_residuals._names:
+                row_mask[self._ranges[name]] = 1.0
+
+        col_mask = None
+        if (len(d_outputs._names) < len(d_outputs._views) or
+                len(d_inputs._names) < len(d_inputs._views)):
+            col_mask = np.zeros(self._matrix.shape[1])
+            for name in d_outputs._names:
+                col_mask[self._ranges[name]] = 1.0
+            for name in d_inputs._names:
+                col_mask[self._ranges[name]] = 1.0
+
+        self._masks[mask_key] = masks = (row_mask, col_mask)
+        return masks
+
+    def apply(self, d_inputs, d_outputs, d_residuals, fwd):
+        """
+        Compute the product with the matrix or its transpose.
+
+        Parameters
+        ----------
+        d_inputs : Vector
+            inputs linear vector.
+        d_outputs : Vector
+            outputs linear vector.
+        d_residuals : Vector
+            residuals linear vector.
+        fwd : bool
+            If True, compute the fwd product, else the rev product.
+        """
+        row_mask, col_mask = self._get_masks(d_inputs, d_outputs, d_residuals)
+        if d_residuals._ncol > 1:
+            if row_mask is not None:
+                row_mask = row_mask[:, np.newaxis]
+            if col_mask is not None:
+                col_mask = col_mask[:, np.newaxis]
+
+        mat = self._matrix
+        nout = self._nout
+
+        rev_scaling = self._rev_scaling
+        if rev_scaling is not None and not fwd:
+            res_scale, col_scale = rev_scaling
+            if d_residuals._ncol > 1:
+                res_scale = res_scale[:, np.newaxis]
+                col_scale = col_scale[:, np.newaxis]
+            row_mask = res_scale if row_mask is None else row_mask * res_scale
+            col_mask = col_scale if col_mask is None else col_mask * col_scale
+
+        if fwd:
+            vec = np.concatenate((d_outputs._data, d_inputs._data))
+            if col_mask is not None:
+                vec *= col_mask
+            prod = mat.dot(vec)
+            if row_mask is not None:
+                prod *= row_mask
+            d_residuals._data += prod
+        else:
+            vec = d_residuals._data
+            if row_mask is not None:
+                vec = vec * row_mask
+            prod = mat.T.dot(vec)
+            if col_mask is not None:
+                prod *= col_mask
+            d_outputs._data += prod[:nout]
+            d_inputs._data += prod[nout:]
@@ -179,6 +179,34 @@ class Jacobian(object):
         else:
             subjacs_info['value'] = subjac
 
+    def _get_scale_factors(self):
+        """
+        Return the factors that scale the jacobian of the system to scaled outputs and residuals.
+
+        With Do the output scaling (ref - ref0) and Dr the residual scaling (res_ref), the
+        jacobian in scaled space is Dr^-1 * J * Do. Inputs are not scaled in linear solves.
+
+        Returns
+        -------
+        (ndarray, ndarray) or None
+            Row (Dr^-1) and column (Do) factors, or None if the system has no scaling.
+        """
+        system = self._system
+        if not (system._has_output_scaling or system._has_resid_scaling):
+            return None
+
+        size = len(system._outputs._data)
+        if system._outputs._do_scaling:
+            col_scale = system._outputs._scaling['phys'][1].copy()
+        else:
+            col_scale = np.ones(size)
+        if system._residuals._do_scaling:
+            row_scale = system._residuals._scaling['norm'][1].copy()
+        else:
+            row_scale = np.ones(size)
+
+        return row_scale, col_scale
+
     def _initialize(self):
         """
         Allocate the global matrices.
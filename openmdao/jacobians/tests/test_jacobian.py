@@ -4,7 +4,7 @@ import itertools
 import unittest
 from parameterized import parameterized
 
-from six import assertRaisesRegex
+from six import assertRaisesRegex, iteritems
 from six.moves import range
 
 import numpy as np
@@ -17,7 +17,9 @@ from openmdao.api import IndepVarComp, Group, Problem, \
 from openmdao.utils.assert_utils import assert_rel_error
 from openmdao.test_suite.components.paraboloid import Paraboloid
 from openmdao.test_suite.components.sellar import SellarDis1withDerivatives, \
-     SellarDis2withDerivatives
+     SellarDis2withDerivatives, SellarDerivatives
+from openmdao.test_suite.components.quad_implicit import QuadraticComp
+from openmdao.core.component import Component
 
 
 class MyExplicitComp(ExplicitComponent):
@@ -193,7 +195,7 @@ def _test_func_name(func, num, param):
 class TestJacobian(unittest.TestCase):
 
     @parameterized.expand(itertools.product(
-        ['dense', 'csc'],
+        ['dense', 'csc', 'block_diag'],
         [np.array, coo_matrix, csr_matrix, inverted_coo, inverted_csr, arr2list, arr2revlist],
         [False, True],  # not nested, nested
         [0, 1],  # extra calls to linearize
@@ -765,5 +767,334 @@ class TestJacobian(unittest.TestCase):
         assert_rel_error(self, J['G1.C1.z', 'indeps.x'], np.eye(10)*5.0, .0001)
 
 
+class UpdateMapComp(ExplicitComponent):
+    def setup(self):
+        self.add_input('x', np.ones(4), units='m')
+        self.add_input('y', np.ones(4), units='m')
+        self.add_input('z', np.ones(4), units='cm')
+        self.add_output('f', np.ones(4))
+        self.add_output('g', np.ones(4))
+
+        self.declare_partials('f', ['x', 'y'])
+        self.declare_partials('g', 'z', rows=[0, 1, 2, 3, 3], cols=[0, 1, 2, 3, 0])
+        self.declare_partials('g', 'x', val=csr_matrix(np.eye(4)[::-1]))
+
+    def compute(self, inputs, outputs):
+        x, y, z = inputs['x'], inputs['y'], inputs['z']
+        outputs['f'] = x ** 2 + 3.0 * y
+        outputs['g'] = z ** 2 + 0.5 * z[0] + x[::-1]
+
+    def compute_partials(self, inputs, partials):
+        x, z = inputs['x'], inputs['z']
+        partials['f', 'x'] = np.diag(2.0 * x)
+        partials['f', 'y'] = 3.0 * np.eye(4)
+        partials['g', 'z'] = np.hstack([2.0 * z, 0.5])
+
+
+class TestAssembledJacobianUpdate(unittest.TestCase):
+
+    def test_update_map(self):
+        prob = Problem()
+        model = prob.model
+        indep = model.add_subsystem('indep', IndepVarComp())
+        indep.add_output('x', np.arange(4, dtype=float) + 1.0, units='m')
+        indep.add_output('w', np.arange(4, dtype=float) + 1.0, units='m')
+        model.add_subsystem('C1', UpdateMapComp())
+        model.connect('indep.x', ['C1.x', 'C1.y'])
+        model.connect('indep.w', 'C1.z')
+
+        model.linear_solver = DirectSolver(assemble_jac=True)
+        model.options['assembled_jac_type'] = 'csc'
+
+        prob.setup(check=False)
+        prob.run_model()
+        model.run_linearize()
+
+        jac = model.linear_solver._assembled_jac
+        int_mtx = jac._int_mtx
+
+        # C1.x and C1.y both map to the same location in the matrix
+        _, _, set_keys, add_keys = jac._get_subjac_iters(model)
+        self.assertEqual(add_keys, [('C1.f', 'C1.y')])
+
+        # all the nonzeros are set, so the update is a single gather
+        gather = int_mtx._update_maps[''][2]
+        self.assertTrue(gather is not None)
+
+        for xval in (2.0, -3.0):
+            prob['indep.x'] = xval
+            prob['indep.w'] = xval
+            prob.run_model()
+            model.run_linearize()
+
+            # compare with the sub-jacobian by sub-jacobian update
+            data = int_mtx._matrix.data.copy()
+            int_mtx._matrix.data[:] = 0.0
+            subjacs = model._subjacs_info
+            for key in set_keys:
+                int_mtx._update_submat(key, subjacs[key]['value'])
+            for key in add_keys:
+                int_mtx._update_add_submat(key, subjacs[key]['value'])
+            assert_rel_error(self, data, int_mtx._matrix.data, 1e-15)
+
+            J = prob.compute_totals(of=['C1.f', 'C1.g'], wrt=['indep.x', 'indep.w'],
+                                    return_format='dict')
+            x = np.ones(4) * xval
+            assert_rel_error(self, J['C1.f']['indep.x'], np.diag(2.0 * x + 3.0), 1e-12)
+            assert_rel_error(self, J['C1.g']['indep.x'], np.eye(4)[::-1], 1e-12)
+
+            # z is in cm, so the unit conversion factor of 100 is applied twice to the
+            # derivative wrt indep.w in m.
+            J_g = np.diag(2.0 * x * 100.0 * 100.0)
+            J_g[3, 0] += 0.5 * 100.0
+            assert_rel_error(self, J['C1.g']['indep.w'], J_g, 1e-12)
+
+
+def _build_scaled_model(assembled, jac_type='csc', compiled=False):
+    prob = Problem()
+    model = prob.model
+    model.add_subsystem('px', IndepVarComp('x', 1.0), promotes=['x'])
+    model.add_subsystem('pz', IndepVarComp('z', np.array([5.0, 2.0])), promotes=['z'])
+
+    sub = model.add_subsystem('sub', Group(), promotes=['*'])
+    sub.add_subsystem('d1', ExecComp('y1 = z[0]**2 + z[1] + x - 0.2*y2', z=np.zeros(2),
+                                     y1={'ref': 3.0, 'ref0': 1.0, 'res_ref': 7.0}),
+                      promotes=['*'])
+    sub.add_subsystem('d2', ExecComp('y2 = y1**.5 + z[0] + z[1]', z=np.zeros(2),
+                                     y2={'ref': 0.1, 'res_ref': 0.01}),
+                      promotes=['*'])
+    model.add_subsystem('obj', ExecComp('obj = x**2 + z[1] + y1 + exp(-y2)', z=np.zeros(2),
+                                        obj={'ref': 5.0}),
+                        promotes=['*'])
+
+    model.nonlinear_solver = NewtonSolver()
+    model.linear_solver = DirectSolver(assemble_jac=assembled)
+    model.options['assembled_jac_type'] = jac_type
+
+    # the subgroup solves with a sub-view of its own assembled jacobian, which has
+    # derivatives with respect to inputs connected outside of the group.
+    sub.nonlinear_solver = NewtonSolver()
+    sub.linear_solver = DirectSolver(assemble_jac=assembled)
+    sub.options['assembled_jac_type'] = jac_type
+
+    prob.set_solver_print(level=0)
+    prob.setup(check=False)
+
+    for comp in model.system_iter(recurse=True, typ=Component):
+        comp.options['compile_jacobian'] = compiled
+
+    prob.run_model()
+
+    return prob
+
+
+def _linear_operator(system, mode):
+    # build the matrix of the fwd or rev products of the system, column by column
+    d_inputs = system._vectors['input']['linear']
+    d_outputs = system._vectors['output']['linear']
+    d_residuals = system._vectors['residual']['linear']
+    seed, prod = (d_outputs, d_residuals) if mode == 'fwd' else (d_residuals, d_outputs)
+    scope_out, scope_in = system._get_scope()
+
+    system.run_linearize()
+    n = d_outputs._data.size
+    mtx = np.empty((n, n))
+    for i in range(n):
+        d_inputs.set_const(0.0)
+        d_outputs.set_const(0.0)
+        d_residuals.set_const(0.0)
+        seed._data[i] = 1.0
+        system._apply_linear(None, ['linear'], None, mode, scope_out, scope_in)
+        mtx[:, i] = prod._data
+
+    return mtx
+
+
+class TestAssembledJacobianScaling(unittest.TestCase):
+
+    @parameterized.expand(['csc', 'dense', 'block_diag'],
+                          name_func=lambda f, n, p: 'test_scaled_products_' + p.args[0])
+    def test_scaled_products(self, jac_type):
+        prob = _build_scaled_model(False)
+        expected = _linear_operator(prob.model, 'fwd')
+
+        prob = _build_scaled_model(True, jac_type)
+        model = prob.model
+        fwd = _linear_operator(model, 'fwd')
+        assert_rel_error(self, fwd, expected, 1e-12)
+
+        # rev products are the transpose of the unscaled jacobian applied in unscaled form
+        out_scale = np.ones(fwd.shape[0])
+        res_scale = np.ones(fwd.shape[0])
+        for name, (start, end) in iteritems(model._assembled_jac._out_ranges):
+            meta = model._var_abs2meta[name]
+            out_scale[start:end] = meta['ref'] - meta['ref0']
+            res_scale[start:end] = meta['res_ref']
+
+        jac = res_scale[:, np.newaxis] * fwd / out_scale
+        rev = _linear_operator(model, 'rev')
+        assert_rel_error(self, rev, jac.T * res_scale / out_scale[:, np.newaxis], 1e-12)
+
+        # and rev solves invert them
+        d_outputs = model._vectors['output']['linear']
+        d_outputs._data[:] = np.arange(1.0, d_outputs._data.size + 1)
+        model.linear_solver.solve(['linear'], 'rev')
+        d_residuals = model._vectors['residual']['linear']
+        assert_rel_error(self, rev.dot(d_residuals._data), np.arange(1.0, rev.shape[0] + 1),
+                         1e-12)
+
+    @parameterized.expand(['csc', 'dense', 'block_diag'],
+                          name_func=lambda f, n, p: 'test_scaled_totals_' + p.args[0])
+    def test_scaled_totals(self, jac_type):
+        of = ['obj', 'y1', 'y2']
+        wrt = ['x', 'z']
+
+        expected = _build_scaled_model(False).compute_totals(of=of, wrt=wrt,
+                                                             return_format='array')
+
+        prob = _build_scaled_model(True, jac_type)
+        J = prob.compute_totals(of=of, wrt=wrt, return_format='array')
+        assert_rel_error(self, J, expected, 1e-12)
+
+    def test_matrix_holds_scaled_jacobian(self):
+        prob = _build_scaled_model(True, 'dense')
+        model = prob.model
+        model.run_linearize()
+
+        jac = model._assembled_jac
+        mtx = jac._int_mtx._matrix
+        y1 = jac._out_ranges['sub.d1.y1'][0]
+        y2 = jac._out_ranges['sub.d2.y2'][0]
+
+        # d(y2)/d(y1) is scaled by (ref - ref0) of y1 over res_ref of y2
+        dy2_dy1 = 0.5 * prob['y1'][0] ** -0.5
+        assert_rel_error(self, mtx[y2, y1], dy2_dy1 * 2.0 / 0.01, 1e-12)
+
+        # the explicit output diagonal is scaled by (ref - ref0) over res_ref
+        assert_rel_error(self, mtx[y1, y1], -2.0 / 7.0, 1e-12)
+        assert_rel_error(self, mtx[y2, y2], -0.1 / 0.01, 1e-12)
+
+        # the derivatives of sub wrt inputs connected outside of it are only row scaled
+        ext_mtx = model.sub._assembled_jac._ext_mtx['sub']._matrix
+        sub_jac = model.sub._assembled_jac
+        row = sub_jac._out_ranges['sub.d1.y1'][0]
+        col = sub_jac._in_ranges['sub.d1.x'][0]
+        assert_rel_error(self, ext_mtx[row, col], 1.0 / 7.0, 1e-12)
+
+
+class TestCompiledDictionaryJacobian(unittest.TestCase):
+
+    def _build(self, linear_solver, mode, compiled):
+        prob = Problem()
+        model = prob.model
+        model.add_subsystem('sellar', SellarDerivatives(linear_solver=linear_solver,
+                                                        nonlinear_solver=NewtonSolver))
+
+        indep = model.add_subsystem('indep', IndepVarComp())
+        indep.add_output('x', np.arange(4, dtype=float) + 1.0, units='m')
+        indep.add_output('w', np.arange(4, dtype=float) + 1.0, units='m')
+        model.add_subsystem('C1', UpdateMapComp())
+        model.connect('indep.x', ['C1.x', 'C1.y'])
+        model.connect('indep.w', 'C1.z')
+
+        model.add_subsystem('quad', QuadraticComp())
+        model.connect('sellar.y1', 'quad.c', src_indices=[0])
+        model.connect('C1.f', 'quad.b', src_indices=[1])
+        model.nonlinear_solver = NewtonSolver()
+        model.linear_solver = linear_solver()
+
+        prob.set_solver_print(level=0)
+        prob.setup(check=False, mode=mode)
+
+        for comp in model.system_iter(recurse=True, typ=Component):
+            comp.options['compile_jacobian'] = compiled
+
+        prob['sellar.x'] = 3.0
+        prob['quad.a'] = -2.0
+        prob.run_model()
+
+        return prob
+
+    @parameterized.expand(itertools.product([LinearBlockGS, ScipyKrylov, DirectSolver],
+                                            ['fwd', 'rev']),
+                          name_func=lambda f, n, p: 'test_totals_' + '_'.join(
+                              [p.args[0].__name__, p.args[1]]))
+    def test_totals(self, linear_solver, mode):
+        of = ['sellar.obj', 'sellar.con1', 'C1.g', 'quad.x']
+        wrt = ['sellar.z', 'indep.x', 'indep.w']
+
+        expected = self._build(linear_solver, mode, False).compute_totals(
+            of=of, wrt=wrt, return_format='array')
+
+        prob = self._build(linear_solver, mode, True)
+        J = prob.compute_totals(of=of, wrt=wrt, return_format='array')
+        assert_rel_error(self, J, expected, 1e-10)
+
+        # one sparse operator per component
+        comp = prob.model.C1
+        self.assertEqual(list(comp._jacobian._operators), [('C1', 'linear')])
+        self.assertTrue(comp._jacobian._operators['C1', 'linear'].valid)
+
+        # values change after relinearizing
+        prob['indep.x'] = -3.0
+        prob['indep.w'] = 2.0
+        prob.run_model()
+        J = prob.compute_totals(of=of, wrt=wrt, return_format='array')
+
+        expected_prob = self._build(linear_solver, mode, False)
+        expected_prob['indep.x'] = -3.0
+        expected_prob['indep.w'] = 2.0
+        expected_prob.run_model()
+        expected = expected_prob.compute_totals(of=of, wrt=wrt, return_format='array')
+        assert_rel_error(self, J, expected, 1e-10)
+
+    @parameterized.expand(['fwd', 'rev'],
+                          name_func=lambda f, n, p: 'test_scaled_products_' + p.args[0])
+    def test_scaled_products(self, mode):
+        expected = _linear_operator(_build_scaled_model(False).model, mode)
+
+        prob = _build_scaled_model(False, compiled=True)
+        J = _linear_operator(prob.model, mode)
+        assert_rel_error(self, J, expected, 1e-12)
+
+        # the scaling is folded into the operators instead of rescaling the vectors
+        op = prob.model.sub.d1._jacobian._operators['sub.d1', 'linear']
+        self.assertTrue(op.valid)
+        self.assertIsNotNone(op._scale)
+
+        J = prob.compute_totals(of=['obj', 'y1', 'y2'], wrt=['x', 'z'], return_format='array')
+        expected = _build_scaled_model(False).compute_totals(of=['obj', 'y1', 'y2'],
+                                                             wrt=['x', 'z'],
+                                                             return_format='array')
+        assert_rel_error(self, J, expected, 1e-12)
+
+    def test_scoped_products(self):
+        prob = self._build(DirectSolver, 'fwd', True)
+        comp = prob.model.C1
+        comp.run_linearize()
+
+        d_inputs, d_outputs, d_residuals = comp.get_linear_vectors()
+        compiled = comp._jacobian
+
+        for mode in ('fwd', 'rev'):
+            for scope_out, scope_in in [(None, None),
+                                        (frozenset(['C1.f']), frozenset(['C1.x', 'C1.z'])),
+                                        (frozenset(), frozenset(['C1.y']))]:
+                results = []
+                for is_compiled in (True, False):
+                    compiled._compiled = is_compiled
+                    d_inputs._data[:] = np.arange(1.0, 13.0)
+                    d_outputs._data[:] = np.arange(2.0, 10.0)
+                    d_residuals._data[:] = np.arange(3.0, 11.0)
+
+                    comp._apply_linear(None, ['linear'], None, mode, scope_out, scope_in)
+                    if mode == 'fwd':
+                        results.append(d_residuals._data.copy())
+                    else:
+                        results.append(np.hstack([d_inputs._data, d_outputs._data]))
+
+                assert_rel_error(self, results[0], results[1], 1e-15)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -579,6 +579,38 @@ class TestJacobianForDocs(unittest.TestCase):
         assert_rel_error(self, totals['example.f', 'input.x'], [[1., 0., 0., 0.], [0., 2., 3., 4.]])
         assert_rel_error(self, totals['example.f', 'input.y'], [[1., 0.], [0., 1.]])
 
+    def test_compile_jacobian(self):
+        import numpy as np
+
+        from openmdao.api import Problem, IndepVarComp, ExplicitComponent
+
+        class ManyPartialsComp(ExplicitComponent):
+            def setup(self):
+                for i in range(50):
+                    self.add_input('x%d' % i, np.ones(3))
+                    self.add_output('y%d' % i, np.ones(3))
+                    self.declare_partials('y%d' % i, 'x%d' % i, rows=np.arange(3),
+                                          cols=np.arange(3))
+
+            def compute(self, inputs, outputs):
+                for i in range(50):
+                    outputs['y%d' % i] = 2.0 * inputs['x%d' % i] ** 2
+
+            def compute_partials(self, inputs, partials):
+                for i in range(50):
+                    partials['y%d' % i, 'x%d' % i] = 4.0 * inputs['x%d' % i]
+
+        problem = Problem()
+        problem.model.add_subsystem('input', IndepVarComp('x', np.arange(3.0)))
+        problem.model.add_subsystem('example', ManyPartialsComp(compile_jacobian=True))
+        problem.model.connect('input.x', 'example.x7')
+
+        problem.setup(check=False)
+        problem.run_model()
+        totals = problem.compute_totals(['example.y7'], ['input.x'])
+
+        assert_rel_error(self, totals['example.y7', 'input.x'], np.diag([0., 4., 8.]))
+
     def test_fd_glob(self):
         import numpy as np
 
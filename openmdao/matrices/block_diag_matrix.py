@@ -0,0 +1,507 @@
+"""Define the BlockDiagMatrix class."""
+from __future__ import division, print_function
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from six import iteritems
+
+from openmdao.matrices.coo_matrix import _get_dup_partials
+from openmdao.matrices.csc_matrix import CSCMatrix
+from openmdao.utils.general_utils import simple_warning
+
+# Dense blocks larger than this, or storing more than this many times the number of nonzeros
+# in total, cost more than a sparse factorization, so CSC storage is used instead.
+_MAX_BLOCK_SIZE = 100
+_MAX_FILL = 10.
+
+
+class BlockDiagMatrix(CSCMatrix):
+    """
+    Square sparse matrix stored as dense diagonal blocks after a symmetric permutation.
+
+    The blocks are the connected components of the sparsity graph of the matrix, so a model
+    that is vectorized over nodes, with no coupling between nodes, gets one small block per
+    node. Blocks of the same size are stacked into a single 3D array so that products and
+    factorizations are done with batched BLAS/LAPACK calls. If the blocks are too large or
+    too sparse for that to pay off, the matrix is stored in CSC format instead.
+    """
+
+    def _build(self, num_rows, num_cols, in_ranges, out_ranges):
+        """
+        Allocate the matrix.
+
+        Parameters
+        ----------
+        num_rows : int
+            number of rows in the matrix.
+        num_cols : int
+            number of cols in the matrix.
+        in_ranges : dict
+            Maps input var name to column range.
+        out_ranges : dict
+            Maps output var name to row range.
+        """
+        if num_rows != num_cols:
+            raise RuntimeError("BlockDiagMatrix must be square but has shape (%d, %d)." %
+                               (num_rows, num_cols))
+
+        data, rows, cols = self._build_sparse(num_rows, num_cols)
+
+        nblocks, label = _find_blocks(rows, cols, num_rows)
+        block_size = np.bincount(label, minlength=nblocks)
+        max_size = block_size.max() if nblocks else 0
+        stored = np.sum(block_size ** 2)
+        if max_size > _MAX_BLOCK_SIZE or stored > _MAX_FILL * max(rows.size, num_rows):
+            simple_warning("BlockDiagMatrix: the largest diagonal block has %d rows and the "
+                           "blocks would store %d entries for %d nonzeros, so the matrix is "
+                           "stored in CSC format instead." % (max_size, stored, rows.size))
+            super(BlockDiagMatrix, self)._build(num_rows, num_cols, in_ranges, out_ranges)
+            return
+
+        self._matrix = _BlockDiag(rows, cols, num_rows, (nblocks, label))
+        positions = self._matrix._positions(rows, cols)
+
+        if np.unique(positions).size != positions.size:
+            raise ValueError("BlockDiagMatrix data contains the following duplicate row/col "
+                             "entries: %s\nThis would break internal indexing." %
+                             sorted(_get_dup_partials(rows, cols, in_ranges, out_ranges).items()))
+
+        metadata = self._metadata
+        for key, (ind1, ind2, idxs, jac_type, factor) in iteritems(metadata):
+            if idxs is None:
+                metadata[key] = (positions[ind1:ind2], jac_type, factor)
+            else:
+                metadata[key] = (positions[ind1:ind2][np.argsort(idxs)], jac_type, factor)
+
+    def _prod(self, in_vec, mode, ranges, mask=None):
+        """
+        Perform a matrix vector product.
+
+        Parameters
+        ----------
+        in_vec : ndarray[:]
+            incoming vector to multiply.
+        mode : str
+            'fwd' or 'rev'.
+        ranges : (int, int, int, int)
+            Min row, max row, min col, max col for the current system.
+        mask : ndarray of type bool, or None
+            Array used to zero out part of the matrix data.
+
+        Returns
+        -------
+        ndarray[:]
+            vector resulting from the product.
+        """
+        mat = self._matrix
+        if not isinstance(mat, _BlockDiag):
+            return super(BlockDiagMatrix, self)._prod(in_vec, mode, ranges, mask)
+
+        if ranges is not None:
+            rstart, rend, cstart, cend = ranges
+            if rstart != 0 or cstart != 0 or rend != mat.shape[0] or cend != mat.shape[1]:
+                # products on a sub-range use a cached csc submatrix
+                return super(BlockDiagMatrix, self)._prod(in_vec, mode, ranges, mask)
+
+        return mat.dot(in_vec, mode == 'rev')
+
+
+class _BlockDiag(object):
+    """
+    Storage for a permuted block diagonal matrix.
+
+    Attributes
+    ----------
+    shape : tuple
+        Shape of the matrix.
+    data : ndarray
+        Flat storage of all of the blocks. Entries that are not part of the sparsity pattern
+        are stored as zeros.
+    _groups : list of (ndarray, ndarray)
+        For each distinct block size k, the (nblocks, k) array of the row/col indices of each
+        block and the (nblocks, k, k) view of the block values in data.
+    _label : ndarray of int
+        Block index of each row/col.
+    _local : ndarray of int
+        Position of each row/col within its block.
+    _block_size : ndarray of int
+        Size of each block.
+    _block_start : ndarray of int
+        Start of each block in data.
+    _rows : ndarray of int
+        Row index of each entry of data.
+    _cols : ndarray of int
+        Column index of each entry of data.
+    """
+
+    def __init__(self, rows, cols, size, blocks=None):
+        """
+        Find the diagonal blocks of the given sparsity pattern and allocate storage.
+
+        Parameters
+        ----------
+        rows : ndarray of int
+            Row indices of the nonzeros.
+        cols : ndarray of int
+            Column indices of the nonzeros.
+        size : int
+            Number of rows (and columns) in the matrix.
+        blocks : (int, ndarray of int) or None
+            The number of blocks and the block index of each row/col, if already found by
+            _find_blocks.
+        """
+        self.shape = (size, size)
+
+        if blocks is None:
+            blocks = _find_blocks(rows, cols, size)
+        nblocks, label = blocks
+
+        block_size = np.bincount(label, minlength=nblocks)
+
+        # group the blocks by size, keeping each block's indices in ascending order
+        order = np.lexsort((np.arange(size), label, block_size[label]))
+        local = np.empty(size, dtype=int)
+        block_start = np.empty(nblocks, dtype=int)
+        groups = []
+        data_rows = []
+        data_cols = []
+
+        start = 0
+        offset = 0
+        for k in np.unique(block_size):
+            nb = np.count_nonzero(block_size == k)
+            idxs = order[start:start + nb * k].reshape((nb, k))
+            start += nb * k
+
+            blocks = label[idxs[:, 0]]
+            block_start[blocks] = offset + np.arange(nb) * k * k
+            local[idxs] = np.arange(k)
+            groups.append((idxs, offset, nb, k))
+
+            data_rows.append(np.repeat(idxs, k, axis=1).ravel())
+            data_cols.append(np.tile(idxs, (1, k)).ravel())
+            offset += nb * k * k
+
+        self.data = np.zeros(offset)
+        self._groups = [(idxs, self.data[off:off + nb * k * k].reshape((nb, k, k)))
+                        for idxs, off, nb, k in groups]
+        self._label = label
+        self._local = local
+        self._block_size = block_size
+        self._block_start = block_start
+        self._rows = np.hstack(data_rows) if data_rows else np.zeros(0, dtype=int)
+        self._cols = np.hstack(data_cols) if data_cols else np.zeros(0, dtype=int)
+
+    def __getitem__(self, idx):
+        """
+        Return a square submatrix given row and column slices.
+
+        Parameters
+        ----------
+        idx : (slice, slice)
+            Row and column slices.
+
+        Returns
+        -------
+        _BlockDiag or csc_matrix
+            This matrix if the slices cover all of it, else the submatrix in CSC format.
+        """
+        size = self.shape[0]
+        for slc in idx:
+            if slc.indices(size) != (0, size, 1):
+                return self.tocsc()[idx]
+        return self
+
+    def _positions(self, rows, cols):
+        """
+        Return the positions in data of the given entries.
+
+        Parameters
+        ----------
+        rows : ndarray of int
+            Row indices of the entries.
+        cols : ndarray of int
+            Column indices of the entries.
+
+        Returns
+        -------
+        ndarray of int
+            Index into data of each entry.
+        """
+        blocks = self._label[rows]
+        return (self._block_start[blocks] + self._local[rows] * self._block_size[blocks] +
+                self._local[cols])
+
+    def dot(self, vec, transpose=False):
+        """
+        Multiply the matrix (or its transpose) by a vector or a 2D array of column vectors.
+
+        Parameters
+        ----------
+        vec : ndarray
+            1D or 2D array to be multiplied.
+        transpose : bool
+            If True, multiply by the transpose of the matrix.
+
+        Returns
+        -------
+        ndarray
+            The product.
+        """
+        out = np.empty_like(vec)
+        for idxs, blocks in self._groups:
+            if transpose:
+                blocks = blocks.transpose((0, 2, 1))
+            out[idxs] = _batched_matvec(blocks, vec[idxs])
+        return out
+
+    def tocoo(self):
+        """
+        Return the matrix in COO format, with one entry for each entry of data.
+
+        Returns
+        -------
+        coo_matrix
+            The matrix.
+        """
+        return coo_matrix((self.data, (self._rows, self._cols)), shape=self.shape)
+
+    def tocsc(self):
+        """
+        Return the matrix in CSC format.
+
+        Returns
+        -------
+        csc_matrix
+            The matrix.
+        """
+        return self.tocoo().tocsc()
+
+    def toarray(self):
+        """
+        Return the matrix as a dense array.
+
+        Returns
+        -------
+        ndarray
+            The matrix.
+        """
+        return self.tocoo().toarray()
+
+    def lu(self):
+        """
+        Factor all of the blocks.
+
+        Returns
+        -------
+        _BlockDiagLU
+            The factorization.
+        """
+        return _BlockDiagLU(self)
+
+
+class _BlockDiagLU(object):
+    """
+    Factorization of a permuted block diagonal matrix.
+
+    Each stack of same-sized blocks is LU factored with partial pivoting all at once, with the
+    elimination vectorized over the blocks, and solves are batched substitutions with the
+    factors.
+
+    Attributes
+    ----------
+    _groups : list of (ndarray, ndarray, ndarray)
+        For each distinct block size k, the (nblocks, k) array of the row/col indices of each
+        block, the (nblocks, k, k) array of LU factors of the blocks and the (nblocks, k)
+        array of their pivot indices, in the format of scipy.linalg.lu_factor.
+    """
+
+    def __init__(self, matrix):
+        """
+        Factor the blocks of the given matrix.
+
+        Parameters
+        ----------
+        matrix : _BlockDiag
+            The matrix to be factored.
+        """
+        self._groups = groups = []
+        for idxs, blocks in matrix._groups:
+            lu, piv, bad = _batched_lu_factor(blocks)
+
+            if np.any(bad):
+                ibad = np.argmax(bad)
+                block = blocks[ibad]
+                finite = np.isfinite(block).all(axis=1)
+                if np.all(finite):
+                    # report the first row that is a linear combination of the rows above it
+                    local = 0
+                    while local < block.shape[0] - 1 and \
+                            np.linalg.matrix_rank(block[:local + 1]) == local + 1:
+                        local += 1
+                else:
+                    local = np.argmin(finite)
+                row = idxs[ibad, local]
+                raise RuntimeError("Matrix is exactly singular in the block containing row %d."
+                                   % row, row)
+
+            groups.append((idxs, lu, piv))
+
+    def solve(self, rhs, trans='N'):
+        """
+        Solve the linear system for one or more right-hand sides.
+
+        Parameters
+        ----------
+        rhs : ndarray
+            1D or 2D array of right-hand sides.
+        trans : str
+            'N' to solve A x = b or 'T' to solve A^T x = b.
+
+        Returns
+        -------
+        ndarray
+            Solution array with the same shape as rhs.
+        """
+        sol = np.empty_like(rhs)
+        for idxs, lu, piv in self._groups:
+            sol[idxs] = _batched_lu_solve(lu, piv, rhs[idxs], trans)
+        return sol
+
+
+def _find_blocks(rows, cols, size):
+    """
+    Find the diagonal blocks of a square sparsity pattern after a symmetric permutation.
+
+    Parameters
+    ----------
+    rows : ndarray of int
+        Row indices of the nonzeros.
+    cols : ndarray of int
+        Column indices of the nonzeros.
+    size : int
+        Number of rows (and columns) in the matrix.
+
+    Returns
+    -------
+    int
+        Number of blocks.
+    ndarray of int
+        Block index of each row/col.
+    """
+    graph = coo_matrix((np.ones(rows.size), (rows, cols)), shape=(size, size))
+    return connected_components(graph, directed=False)
+
+
+def _batched_lu_factor(blocks):
+    """
+    Compute the LU factorization with partial pivoting of a stack of square blocks.
+
+    Parameters
+    ----------
+    blocks : ndarray
+        (nblocks, k, k) array of blocks.
+
+    Returns
+    -------
+    ndarray
+        (nblocks, k, k) array holding U in its upper triangle and the unit lower triangular L
+        below it, for each block.
+    ndarray
+        (nblocks, k) array of pivots. Row j of a block was swapped with row piv[j].
+    ndarray
+        (nblocks,) boolean array that is True for the blocks that are singular or not finite.
+    """
+    lu = blocks.copy()
+    nblocks, k, _ = lu.shape
+    piv = np.empty((nblocks, k), dtype=int)
+    blk = np.arange(nblocks)
+    bad = ~np.isfinite(lu).all(axis=(1, 2))
+
+    with np.errstate(all='ignore'):
+        for j in range(k):
+            p = j + np.argmax(np.abs(lu[:, j:, j]), axis=1)
+            piv[:, j] = p
+            row = lu[blk, j].copy()
+            lu[blk, j] = lu[blk, p]
+            lu[blk, p] = row
+
+            pivot = lu[:, j, j]
+            bad |= pivot == 0.
+            lu[:, j + 1:, j] /= pivot[:, np.newaxis]
+            lu[:, j + 1:, j + 1:] -= lu[:, j + 1:, j, np.newaxis] * lu[:, np.newaxis, j, j + 1:]
+
+    return lu, piv, bad
+
+
+def _batched_lu_solve(lu, piv, rhs, trans='N'):
+    """
+    Solve with each block of a stack, given its LU factorization from _batched_lu_factor.
+
+    Parameters
+    ----------
+    lu : ndarray
+        (nblocks, k, k) array of LU factors.
+    piv : ndarray
+        (nblocks, k) array of pivots.
+    rhs : ndarray
+        (nblocks, k) array, or (nblocks, k, m) array for m right-hand sides.
+    trans : str
+        'N' to solve A x = b or 'T' to solve A^T x = b.
+
+    Returns
+    -------
+    ndarray
+        Solution array with the same shape as rhs.
+    """
+    x = rhs.reshape(rhs.shape[:2] + (-1,)).copy()
+    nblocks, k, _ = lu.shape
+    blk = np.arange(nblocks)
+
+    if trans == 'T':
+        # A = P^T L U, so solve U^T y = b, then L^T z = y and x = P^T z
+        for j in range(k):
+            x[:, j] /= lu[:, j, j, np.newaxis]
+            x[:, j + 1:] -= lu[:, j, j + 1:, np.newaxis] * x[:, np.newaxis, j]
+        for j in range(k - 1, 0, -1):
+            x[:, :j] -= lu[:, j, :j, np.newaxis] * x[:, np.newaxis, j]
+        for j in range(k - 1, -1, -1):
+            p = piv[:, j]
+            row = x[blk, j].copy()
+            x[blk, j] = x[blk, p]
+            x[blk, p] = row
+    else:
+        for j in range(k):
+            p = piv[:, j]
+            row = x[blk, j].copy()
+            x[blk, j] = x[blk, p]
+            x[blk, p] = row
+        for j in range(k - 1):
+            x[:, j + 1:] -= lu[:, j + 1:, j, np.newaxis] * x[:, np.newaxis, j]
+        for j in range(k - 1, -1, -1):
+            x[:, j] /= lu[:, j, j, np.newaxis]
+            x[:, :j] -= lu[:, :j, j, np.newaxis] * x[:, np.newaxis, j]
+
+    return x.reshape(rhs.shape)
+
+
+def _batched_matvec(blocks, vecs):
+    """
+    Multiply each block by its part of one or more vectors.
+
+    Parameters
+    ----------
+    blocks : ndarray
+        (nblocks, k, k) array of blocks.
+    vecs : ndarray
+        (nblocks, k) array, or (nblocks, k, m) array for m vectors.
+
+    Returns
+    -------
+    ndarray
+        Array with the same shape as vecs.
+    """
+    if vecs.ndim == 2:
+        return np.matmul(blocks, vecs[:, :, np.newaxis])[:, :, 0]
+    return np.matmul(blocks, vecs)
@@ -23,6 +23,9 @@ class COOMatrix(Matrix):
     _mat_range_cache : dict
         Dictionary of cached CSC matrices needed for solving on a sub-range of the
         parent CSC matrix.
+    _update_maps : dict
+        Scatter maps from the stacked values of a list of sub-jacobians into the data array of
+        the matrix, keyed by the cache_key passed to _update_submats.
     """
 
     def __init__(self, comm):
@@ -36,6 +39,7 @@ class COOMatrix(Matrix):
         """
         super(COOMatrix, self).__init__(comm)
         self._mat_range_cache = {}
+        self._update_maps = {}
 
     def _build_sparse(self, num_rows, num_cols):
         """
@@ -175,6 +179,31 @@ class COOMatrix(Matrix):
         self._matrix = coo_matrix((data, (rows, cols)),
                                   shape=(num_rows, num_cols))
 
+    def _set_scaling(self, row_scale, col_scale):
+        """
+        Scale the rows and columns of the matrix every time the sub-jacobians are updated.
+
+        The scaling is folded into the conversion factor of each sub-jacobian, so the matrix
+        holds diag(row_scale) * J * diag(col_scale) and can be used directly with scaled vectors.
+
+        Parameters
+        ----------
+        row_scale : ndarray
+            Scale factor for each row.
+        col_scale : ndarray
+            Scale factor for each column.
+        """
+        # the coo form of every subclass keeps the order of the data array
+        coo = self._matrix.tocoo()
+        scale = row_scale[coo.row] * col_scale[coo.col]
+
+        metadata = self._metadata
+        for key, (idxs, jac_type, factor) in iteritems(metadata):
+            factor = scale[idxs] if factor is None else scale[idxs] * factor
+            metadata[key] = (idxs, jac_type, factor)
+
+        self._update_maps = {}
+
     def _update_submat(self, key, jac):
         """
         Update the values of a sub-jacobian.
@@ -200,6 +229,108 @@ class COOMatrix(Matrix):
         if factor is not None:
             self._matrix.data[idxs] *= factor
 
+    def _get_update_map(self, keys):
+        """
+        Compute the map from the stacked values of the given sub-jacobians into our data array.
+
+        Parameters
+        ----------
+        keys : list of (str, str)
+            the global output and input variable names of the sub-jacobians.
+
+        Returns
+        -------
+        tuple
+            (is_sparse, positions, gather, factor_idxs, factors, size). is_sparse has a flag for
+            each key. positions holds the data index of each stacked value. gather is the inverse
+            of positions, or None if the keys don't cover every nonzero. factor_idxs and factors
+            are the stacked indices and values of unit conversion factors, or None.
+            size is the number of stacked values.
+        """
+        metadata = self._metadata
+        is_sparse = []
+        positions = []
+        factor_idxs = []
+        factors = []
+        start = 0
+
+        for key in keys:
+            idxs, jac_type, factor = metadata[key]
+            if isinstance(idxs, slice):
+                idxs = np.arange(idxs.start, idxs.stop)
+            is_sparse.append(jac_type in sparse_types)
+            positions.append(idxs)
+            end = start + idxs.size
+            if factor is not None:
+                factor_idxs.append(np.arange(start, end))
+                factors.append(np.full(idxs.size, factor))
+            start = end
+
+        positions = np.concatenate(positions) if positions else np.zeros(0, dtype=int)
+
+        nnz = self._matrix.data.size
+        if positions.size == nnz and np.array_equal(np.sort(positions), np.arange(nnz)):
+            # every nonzero is set exactly once, so the update can be done as a gather
+            # directly into the data array.
+            gather = np.argsort(positions)
+        else:
+            gather = None
+
+        if factors:
+            factor_idxs = np.concatenate(factor_idxs)
+            factors = np.concatenate(factors)
+        else:
+            factor_idxs = factors = None
+
+        return is_sparse, positions, gather, factor_idxs, factors, start
+
+    def _update_submats(self, keys, subjacs, cache_key):
+        """
+        Update the values of several sub-jacobians.
+
+        Rather than updating one sub-jacobian at a time, the values of all of them are stacked
+        and moved into the data array of the matrix with a single precomputed index map.
+
+        Parameters
+        ----------
+        keys : list of (str, str)
+            the global output and input variable names of the sub-jacobians.
+        subjacs : dict
+            sub-jacobian metadata keyed by (output, input) name.
+        cache_key : hashable
+            key used to cache the index map for this list of keys.
+        """
+        try:
+            update_map = self._update_maps[cache_key]
+        except KeyError:
+            update_map = self._update_maps[cache_key] = self._get_update_map(keys)
+
+        is_sparse, positions, gather, factor_idxs, factors, size = update_map
+
+        vals = []
+        for key, sparse in zip(keys, is_sparse):
+            val = subjacs[key]['value']
+            vals.append(val.data if sparse else val.ravel())
+
+        try:
+            stacked = np.concatenate(vals) if vals else np.zeros(0)
+            valid = stacked.size == size and stacked.dtype == self._matrix.data.dtype
+        except (AttributeError, TypeError, ValueError):
+            valid = False
+
+        if not valid:
+            # values of an unexpected type or size, so let _update_submat deal with them
+            super(COOMatrix, self)._update_submats(keys, subjacs, cache_key)
+            return
+
+        if factors is not None:
+            stacked[factor_idxs] *= factors
+
+        if gather is None:
+            self._matrix.data[positions] = stacked
+        else:
+            np.take(stacked, gather, out=self._matrix.data)
+
     def _update_add_submat(self, key, jac):
         """
         Add the subjac values to an existing sub-jacobian.
@@ -75,6 +75,31 @@ class DenseMatrix(Matrix):
 
                 metadata[key] = (irows, icols, list, factor)
 
+    def _set_scaling(self, row_scale, col_scale):
+        """
+        Scale the rows and columns of the matrix every time the sub-jacobians are updated.
+
+        The scaling is folded into the conversion factor of each sub-jacobian, so the matrix
+        holds diag(row_scale) * J * diag(col_scale) and can be used directly with scaled vectors.
+
+        Parameters
+        ----------
+        row_scale : ndarray
+            Scale factor for each row.
+        col_scale : ndarray
+            Scale factor for each column.
+        """
+        metadata = self._metadata
+        for key, (irows, icols, jac_type, factor) in iteritems(metadata):
+            if isinstance(irows, slice):
+                # dense block
+                scale = np.outer(row_scale[irows], col_scale[icols])
+            else:
+                scale = row_scale[irows] * col_scale[icols]
+            if factor is not None:
+                scale *= factor
+            metadata[key] = (irows, icols, jac_type, scale)
+
     def _update_submat(self, key, jac):
         """
         Update the values of a sub-jacobian.
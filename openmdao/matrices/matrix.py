@@ -82,6 +82,22 @@ class Matrix(object):
         """
         pass
 
+    def _set_scaling(self, row_scale, col_scale):
+        """
+        Scale the rows and columns of the matrix every time the sub-jacobians are updated.
+
+        The scaling is folded into the conversion factor of each sub-jacobian, so the matrix
+        holds diag(row_scale) * J * diag(col_scale) and can be used directly with scaled vectors.
+
+        Parameters
+        ----------
+        row_scale : ndarray
+            Scale factor for each row.
+        col_scale : ndarray
+            Scale factor for each column.
+        """
+        pass
+
     def _update_submat(self, key, jac):
         """
         Update the values of a sub-jacobian.
@@ -95,6 +111,22 @@ class Matrix(object):
         """
         pass
 
+    def _update_submats(self, keys, subjacs, cache_key):
+        """
+        Update the values of several sub-jacobians.
+
+        Parameters
+        ----------
+        keys : list of (str, str)
+            the global output and input variable names of the sub-jacobians.
+        subjacs : dict
+            sub-jacobian metadata keyed by (output, input) name.
+        cache_key : hashable
+            key used by subclasses to cache data that depends on the list of keys.
+        """
+        for key in keys:
+            self._update_submat(key, subjacs[key]['value'])
+
     def _prod(self, vec, mode, ranges):
         """
         Perform a matrix vector product.
@@ -0,0 +1,314 @@
+"""Define the BlockJacobiPrecon class."""
+
+from __future__ import division, print_function
+
+import sys
+
+import numpy as np
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import splu
+from six import reraise
+
+from openmdao.solvers.solver import LinearSolver
+from openmdao.recorders.recording_iteration_stack import Recording
+
+
+class BlockJacobiPrecon(LinearSolver):
+    """
+    Block Jacobi / restricted additive Schwarz preconditioner based on an assembled jacobian.
+
+    Each subsystem of the owning system defines one diagonal block of the assembled jacobian.
+    All of the blocks are factored once per linearization and applied together, without
+    recursing into the subsystems or doing any data transfers. This is meant to be used as the
+    precon of a Krylov solver.
+
+    Attributes
+    ----------
+    _blocks : list of (str, ndarray, ndarray)
+        Subsystem name, indices of all rows/cols of the (possibly overlapping) block and mask
+        of the rows/cols owned by the block, for each block.
+    _lus : list of SuperLU
+        Factorization of each overlapping block.
+    _lu : SuperLU or None
+        Factorization of the whole block diagonal matrix when blocks don't overlap.
+    """
+
+    SOLVER = 'LN: BJacPrecon'
+
+    def __init__(self, **kwargs):
+        """
+        Initialize all attributes.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            options dictionary.
+        """
+        super(BlockJacobiPrecon, self).__init__(**kwargs)
+
+        self._blocks = []
+        self._lus = []
+        self._lu = None
+
+    def _declare_options(self):
+        """
+        Declare options before kwargs are processed in the init method.
+        """
+        super(BlockJacobiPrecon, self)._declare_options()
+
+        self.options.declare('overlap', types=int, default=0, lower=0,
+                             desc='Number of layers of neighboring rows, found from the sparsity '
+                                  'of the assembled jacobian, that are added to each block. 0 '
+                                  'gives block Jacobi, larger values give restricted additive '
+                                  'Schwarz.')
+
+        # the blocks come from the assembled jacobian
+        self.options['assemble_jac'] = True
+
+        # this solver does not iterate
+        self.options.undeclare("maxiter")
+        self.options.undeclare("err_on_maxiter")
+
+        self.options.undeclare("atol")
+        self.options.undeclare("rtol")
+
+    def _setup_solvers(self, system, depth):
+        """
+        Assign system instance, set depth, and optionally perform setup.
+
+        Parameters
+        ----------
+        system : <System>
+            pointer to the owning system.
+        depth : int
+            depth of the current system (already incremented).
+        """
+        super(BlockJacobiPrecon, self)._setup_solvers(system, depth)
+
+        if not self.options['assemble_jac']:
+            raise RuntimeError("BlockJacobiPrecon in system '%s' requires an assembled "
+                               "jacobian." % system.pathname)
+
+        self._blocks = []
+        self._lus = []
+        self._lu = None
+
+    def _linearize_children(self):
+        """
+        Return a flag that is True when we need to call linearize on our subsystems' solvers.
+
+        Returns
+        -------
+        boolean
+            Flag for indicating child linearization.
+        """
+        return False
+
+    def _get_matrix(self):
+        """
+        Return the part of the assembled jacobian that belongs to our system in CSC format.
+
+        Returns
+        -------
+        csc_matrix
+            The matrix.
+        """
+        system = self._system
+        mtx = self._assembled_jac._int_mtx
+        ranges = self._assembled_jac._view_ranges[system.pathname]
+        matrix = mtx._matrix[ranges[0]:ranges[1], ranges[0]:ranges[1]]
+
+        if isinstance(matrix, np.ndarray):
+            return csc_matrix(matrix)
+        return matrix.tocsc()
+
+    def _setup_blocks(self, matrix):
+        """
+        Compute the rows/cols of each block.
+
+        Parameters
+        ----------
+        matrix : csc_matrix
+            Assembled jacobian of our system.
+        """
+        system = self._system
+        out_ranges = self._assembled_jac._out_ranges
+        offset = self._assembled_jac._view_ranges[system.pathname][0]
+        size = matrix.shape[0]
+
+        if system._subsystems_myproc:
+            subs = [(s.name, s._var_abs_names['output']) for s in system._subsystems_myproc]
+        else:
+            subs = [(system.name, system._var_abs_names['output'])]
+
+        # symmetric sparsity pattern used to grow the blocks
+        graph = (abs(matrix) + abs(matrix.T)).tocsr()
+        graph.data[:] = 1.0
+
+        self._blocks = blocks = []
+        for name, outputs in subs:
+            if not outputs:
+                continue
+            start = out_ranges[outputs[0]][0] - offset
+            end = out_ranges[outputs[-1]][1] - offset
+            if end <= start:
+                continue
+
+            inblock = np.zeros(size, dtype=bool)
+            inblock[start:end] = True
+            owned = inblock.copy()
+            for i in range(self.options['overlap']):
+                inblock |= graph.dot(inblock.astype(float)) != 0.0
+
+            idxs = np.nonzero(inblock)[0]
+            blocks.append((name, idxs, owned[idxs]))
+
+    def _linearize(self):
+        """
+        Factor the diagonal blocks.
+        """
+        matrix = self._get_matrix()
+
+        if not self._blocks:
+            self._setup_blocks(matrix)
+
+        blocks = self._blocks
+        self._lus = []
+        self._lu = None
+
+        if self.options['overlap'] == 0:
+            # blocks don't overlap, so drop the entries outside of them and factor all of the
+            # blocks at once.
+            label = np.full(matrix.shape[0], -1, dtype=int)
+            for i, (_, idxs, _) in enumerate(blocks):
+                label[idxs] = i
+            coo = matrix.tocoo()
+            keep = label[coo.row] == label[coo.col]
+            diag = csc_matrix((coo.data[keep], (coo.row[keep], coo.col[keep])),
+                              shape=matrix.shape)
+            try:
+                self._lu = splu(diag)
+            except RuntimeError as err:
+                if 'exactly singular' not in str(err):
+                    reraise(*sys.exc_info())
+                # factor the blocks one at a time to find the singular one
+                for name, idxs, _ in blocks:
+                    self._factor(matrix[idxs, :][:, idxs], name)
+                reraise(*sys.exc_info())
+        else:
+            for name, idxs, _ in blocks:
+                self._lus.append(self._factor(matrix[idxs, :][:, idxs], name))
+
+    def _factor(self, matrix, name):
+        """
+        Return the sparse LU factorization of a block.
+
+        Parameters
+        ----------
+        matrix : csc_matrix
+            Matrix to be factored.
+        name : str
+            Name of the subsystem that the block belongs to.
+
+        Returns
+        -------
+        SuperLU
+            The factorization.
+        """
+        try:
+            return splu(matrix)
+        except RuntimeError as err:
+            if 'exactly singular' in str(err):
+                raise RuntimeError("Singular entry found in the block of subsystem '%s' of "
+                                   "BlockJacobiPrecon in system '%s'." %
+                                   (name, self._system.pathname))
+            reraise(*sys.exc_info())
+
+    def _apply(self, rhs, mode):
+        """
+        Apply the preconditioner to a right-hand side.
+
+        Parameters
+        ----------
+        rhs : ndarray
+            Right-hand side.
+        mode : str
+            'fwd' or 'rev'.
+
+        Returns
+        -------
+        ndarray
+            Preconditioned array.
+        """
+        trans = 'N' if mode == 'fwd' else 'T'
+
+        if self._lu is not None:
+            return self._lu.solve(rhs, trans)
+
+        sol = np.zeros(rhs.size)
+        for (_, idxs, owned), lu in zip(self._blocks, self._lus):
+            if mode == 'fwd':
+                # restricted additive Schwarz only keeps the owned part of each local solution
+                sol[idxs[owned]] = lu.solve(rhs[idxs], trans)[owned]
+            else:
+                # the transpose restricts the right-hand side instead
+                local_rhs = np.where(owned, rhs[idxs], 0.0)
+                sol[idxs] += lu.solve(local_rhs, trans)
+
+        return sol
+
+    def solve(self, vec_names, mode, rel_systems=None):
+        """
+        Run the solver.
+
+        Parameters
+        ----------
+        vec_names : [str, ...]
+            list of names of the right-hand-side vectors.
+        mode : str
+            'fwd' or 'rev'.
+        rel_systems : set of str
+            Names of systems relevant to the current solve.
+
+        Returns
+        -------
+        boolean
+            Failure flag; True if failed to converge, False is successful.
+        float
+            absolute error.
+        float
+            relative error.
+        """
+        self._vec_names = vec_names
+        system = self._system
+
+        with Recording('BlockJacobiPrecon', 0, self) as rec:
+            for vec_name in vec_names:
+                if vec_name not in system._rel_vec_names:
+                    continue
+                d_residuals = system._vectors['residual'][vec_name]
+                d_outputs = system._vectors['output'][vec_name]
+
+                if mode == 'fwd':
+                    x_vec = d_outputs
+                    b_vec = d_residuals
+                else:  # rev
+                    x_vec = d_residuals
+                    b_vec = d_outputs
+
+                # the blocks come from the scaled assembled jacobian, so only rev mode needs
+                # the diagonal factors of the transpose.
+                scaling = None
+                if mode == 'rev':
+                    scaling = self._assembled_jac._get_scaling(system, rev=True)
+
+                if scaling is None:
+                    x_vec._data[:] = self._apply(b_vec._data, mode)
+                else:
+                    res_scale, out_scale = scaling
+                    x_vec._data[:] = self._apply(b_vec._data / out_scale, mode) / res_scale
+
+            rec.abs = 0.0
+            rec.rel = 0.0
+
+        return False, 0., 0.
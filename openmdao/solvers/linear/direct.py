@@ -10,12 +10,14 @@ from six.moves import range
 import numpy as np
 import scipy.linalg
 import scipy.sparse.linalg
+from scipy.sparse import csc_matrix
 
 from openmdao.solvers.solver import LinearSolver
 from openmdao.matrices.coo_matrix import COOMatrix
 from openmdao.matrices.csr_matrix import CSRMatrix
 from openmdao.matrices.csc_matrix import CSCMatrix
 from openmdao.matrices.dense_matrix import DenseMatrix
+from openmdao.matrices.block_diag_matrix import BlockDiagMatrix
 from openmdao.recorders.recording_iteration_stack import Recording
 
 
@@ -68,7 +70,7 @@ def format_singular_error(err, system, mtx):
     return msg.format(system.pathname, loc_txt, varname)
 
 
-def format_singular_csc_error(system, matrix):
+def format_singular_csc_error(system, matrix, row=None):
     """
     Format a coherent error message when the CSC matrix is singular.
 
@@ -78,6 +80,9 @@ def format_singular_csc_error(system, matrix):
         System containing the Directsolver.
     matrix : ndarray
         Matrix of interest.
+    row : int or None
+        Index of a row known to be part of a singular block, used when the matrix has no
+        rows or columns of all zeros.
 
     Returns
     -------
@@ -90,6 +95,9 @@ def format_singular_csc_error(system, matrix):
     if np.any(np.isnan(dense)):
         # There is a nan in the matrix.
         return(format_nan_error(system, dense))
+    elif row is not None and zero_rows.size == 0 and zero_cols.size == 0:
+        loc_txt = "row"
+        loc = row
     elif zero_cols.size <= zero_rows.size:
         loc_txt = "row"
         loc = zero_rows[0]
@@ -146,13 +154,93 @@ def format_nan_error(system, matrix):
     return msg.format(system.pathname, ', '.join(varname))
 
 
+class _PermutedSuperLU(object):
+    """
+    Wrapper around a SuperLU factorization of a column-permuted matrix.
+
+    The factorization is of B = A[:, perm_c], so solutions must be permuted back to the
+    ordering of A.
+
+    Attributes
+    ----------
+    _lu : SuperLU
+        Factorization of the column-permuted matrix.
+    _perm_c : ndarray of int
+        Column permutation that was applied to the original matrix.
+    """
+
+    def __init__(self, lu, perm_c):
+        """
+        Store the factorization and the permutation.
+
+        Parameters
+        ----------
+        lu : SuperLU
+            Factorization of the column-permuted matrix.
+        perm_c : ndarray of int
+            Column permutation that was applied to the original matrix.
+        """
+        self._lu = lu
+        self._perm_c = perm_c
+
+    def solve(self, rhs, trans='N'):
+        """
+        Solve the linear system with the original (unpermuted) matrix.
+
+        Parameters
+        ----------
+        rhs : ndarray
+            1D or 2D array of right-hand sides.
+        trans : str
+            'N' to solve A x = b or 'T' to solve A^T x = b.
+
+        Returns
+        -------
+        ndarray
+            Solution array with the same shape as rhs.
+        """
+        if trans == 'N':
+            sol = np.empty_like(rhs)
+            sol[self._perm_c] = self._lu.solve(rhs, trans)
+            return sol
+        return self._lu.solve(rhs[self._perm_c], trans)
+
+
 class DirectSolver(LinearSolver):
     """
     LinearSolver that uses linalg.solve or LU factor/solve.
+
+    Attributes
+    ----------
+    _lu : SuperLU or _PermutedSuperLU or None
+        Sparse LU factorization.
+    _lup : tuple or None
+        Dense LU factorization returned by scipy.linalg.lu_factor.
+    _symbolic : tuple or None
+        Cached column ordering of the sparse matrix, stored as (indptr, indices, perm_c,
+        permuted indptr, permuted indices, data map).
+    _mtx_data : ndarray or None
+        Copy of the matrix values used in the most recent factorization.
     """
 
     SOLVER = 'LN: Direct'
 
+    def __init__(self, **kwargs):
+        """
+        Declare the solver options.
+
+        Parameters
+        ----------
+        **kwargs : {}
+            dictionary of options set by the instantiating class/script.
+        """
+        super(DirectSolver, self).__init__(**kwargs)
+
+        self._lu = None
+        self._lup = None
+        self._symbolic = None
+        self._mtx_data = None
+
     def _declare_options(self):
         """
         Declare options before kwargs are processed in the init method.
@@ -161,6 +249,15 @@ class DirectSolver(LinearSolver):
 
         self.options.declare('err_on_singular', default=True,
                              desc="Raise an error if LU decomposition is singular.")
+        self.options.declare('reuse_symbolic', types=bool, default=True,
+                             desc="Reuse the column ordering computed during the first sparse LU "
+                                  "factorization for all later factorizations. The sparsity "
+                                  "pattern of an assembled jacobian is fixed after setup.")
+        self.options.declare('skip_unchanged', types=bool, default=True,
+                             desc="Skip the LU factorization when the matrix values are "
+                                  "identical to those of the previous factorization.")
+
+        self.supports['multi_rhs'] = True
 
         # this solver does not iterate
         self.options.undeclare("maxiter")
@@ -169,6 +266,101 @@ class DirectSolver(LinearSolver):
         self.options.undeclare("atol")
         self.options.undeclare("rtol")
 
+    def _setup_solvers(self, system, depth):
+        """
+        Assign system instance, set depth, and optionally perform setup.
+
+        Parameters
+        ----------
+        system : <System>
+            pointer to the owning system.
+        depth : int
+            depth of the current system (already incremented).
+        """
+        super(DirectSolver, self)._setup_solvers(system, depth)
+
+        # the matrix structure may have changed, so discard any cached factorization data
+        self._lu = None
+        self._lup = None
+        self._symbolic = None
+        self._mtx_data = None
+
+    def _is_unchanged(self, data):
+        """
+        Return True if the previous factorization can be reused for the given matrix values.
+
+        If it can't, the previous factorization is discarded and a copy of the values is stored
+        for comparison at the next linearization.
+
+        Parameters
+        ----------
+        data : ndarray
+            Current matrix values.
+
+        Returns
+        -------
+        bool
+            True if the previous factorization can be reused.
+        """
+        if not self.options['skip_unchanged']:
+            return False
+
+        old = self._mtx_data
+        if (self._lu is not None or self._lup is not None) and old is not None and \
+                old.shape == data.shape and np.array_equal(old, data):
+            return True
+
+        self._lu = self._lup = None
+        self._mtx_data = data.copy()
+        return False
+
+    def _sparse_lu(self, matrix):
+        """
+        Compute the sparse LU factorization of the given matrix.
+
+        When the 'reuse_symbolic' option is set, the column ordering from the first
+        factorization is applied directly to the matrix data so that later factorizations
+        skip the fill-reducing ordering step.
+
+        Parameters
+        ----------
+        matrix : csc_matrix or csr_matrix
+            Matrix to be factored.
+
+        Returns
+        -------
+        SuperLU or _PermutedSuperLU
+            The factorization.
+        """
+        matrix = matrix.tocsc()
+
+        if not self.options['reuse_symbolic']:
+            return scipy.sparse.linalg.splu(matrix)
+
+        sym = self._symbolic
+        if sym is not None and np.array_equal(sym[0], matrix.indptr) and \
+                np.array_equal(sym[1], matrix.indices):
+            _, _, perm_c, pindptr, pindices, data_map = sym
+            permuted = csc_matrix((matrix.data[data_map], pindices, pindptr), shape=matrix.shape)
+            return _PermutedSuperLU(scipy.sparse.linalg.splu(permuted, permc_spec='NATURAL'),
+                                    perm_c)
+
+        lu = scipy.sparse.linalg.splu(matrix)
+
+        # Gather map from the data of the original matrix into the data of the column-permuted
+        # matrix. Column j of the permuted matrix is column perm_c[j] of the original.
+        perm_c = lu.perm_c
+        indptr = matrix.indptr
+        counts = np.diff(indptr)[perm_c]
+        pindptr = np.zeros(indptr.size, dtype=indptr.dtype)
+        np.cumsum(counts, out=pindptr[1:])
+        data_map = np.repeat(indptr[perm_c] - pindptr[:-1], counts) + np.arange(pindptr[-1])
+
+        self._symbolic = (indptr.copy(), matrix.indices.copy(), perm_c,
+                          pindptr, matrix.indices[data_map], data_map)
+
+        return lu
+
     def _linearize_children(self):
         """
         Return a flag that is True when we need to call linearize on our subsystems' solvers.
@@ -235,6 +427,9 @@ class DirectSolver(LinearSolver):
 
             # Perform dense or sparse lu factorization
             if isinstance(mtx, DenseMatrix):
+                if self._is_unchanged(matrix):
+                    return
+
                 # During LU decomposition, detect singularities and warn user.
                 with warnings.catch_warnings():
                     if self.options['err_on_singular']:
@@ -248,12 +443,19 @@ class DirectSolver(LinearSolver):
                     except ValueError as err:
                         raise RuntimeError(format_nan_error(system, matrix))
 
-            elif isinstance(mtx, (CSRMatrix, CSCMatrix)):
+            elif isinstance(mtx, (CSRMatrix, CSCMatrix, BlockDiagMatrix)):
+                if self._is_unchanged(matrix.data):
+                    return
+
                 try:
-                    self._lu = scipy.sparse.linalg.splu(matrix)
+                    if scipy.sparse.issparse(matrix):
+                        self._lu = self._sparse_lu(matrix)
+                    else:  # all of a block diagonal matrix, so factor each block
+                        self._lu = matrix.lu()
                 except RuntimeError as err:
-                    if 'exactly singular' in str(err):
-                        raise RuntimeError(format_singular_csc_error(system, matrix))
+                    if 'exactly singular' in str(err.args[0]):
+                        row = err.args[1] if len(err.args) > 1 else None
+                        raise RuntimeError(format_singular_csc_error(system, matrix, row))
                     else:
                         reraise(*sys.exc_info())
 
@@ -269,6 +471,9 @@ class DirectSolver(LinearSolver):
         else:
             mtx = self._build_mtx()
 
+            if self._is_unchanged(mtx):
+                return
+
             # During LU decomposition, detect singularities and warn user.
             with warnings.catch_warnings():
 
@@ -320,7 +525,9 @@ class DirectSolver(LinearSolver):
                     except ValueError as err:
                         raise RuntimeError(format_nan_error(system, matrix))
 
-            elif isinstance(mtx, (CSRMatrix, CSCMatrix)):
+            elif isinstance(mtx, (CSRMatrix, CSCMatrix, BlockDiagMatrix)):
+                if not scipy.sparse.issparse(matrix):
+                    matrix = matrix.tocsc()
                 try:
                     inv_jac = scipy.sparse.linalg.inv(matrix)
                 except RuntimeError as err:
@@ -332,6 +539,16 @@ class DirectSolver(LinearSolver):
                 raise RuntimeError("Direct solver not implemented for matrix type %s"
                                    " in system '%s'." % (type(mtx), system.pathname))
 
+            # the matrix is scaled, but Broyden works with the unscaled inverse
+            scaling = self._assembled_jac._get_scaling(system)
+            if scaling is not None:
+                row_scale, col_scale = scaling
+                if scipy.sparse.issparse(inv_jac):
+                    inv_jac = scipy.sparse.diags(col_scale).dot(inv_jac).dot(
+                        scipy.sparse.diags(row_scale))
+                else:
+                    inv_jac = col_scale[:, np.newaxis] * inv_jac * row_scale
+
         else:
             mtx = self._build_mtx()
 
@@ -353,6 +570,56 @@ class DirectSolver(LinearSolver):
 
         return inv_jac
 
+    def _solve_multi_rhs(self, rhs, mode):
+        """
+        Solve the linear system for a block of right-hand sides with one back-substitution.
+
+        Parameters
+        ----------
+        rhs : ndarray
+            2D array of right-hand sides, one per column, in scaled form.
+        mode : str
+            'fwd' or 'rev'.
+
+        Returns
+        -------
+        ndarray
+            2D array of solutions, one per column, in scaled form.
+        """
+        system = self._system
+
+        if mode == 'fwd':
+            trans_lu = 0
+            trans_splu = 'N'
+        else:  # rev
+            trans_lu = 1
+            trans_splu = 'T'
+
+        with Recording('DirectSolver', 0, self) as rec:
+            if self._assembled_jac is not None:
+                # AssembledJacobians hold the scaled jacobian, so only rev mode solves need
+                # to apply the diagonal factors of the transpose.
+                scaling = self._assembled_jac._get_scaling(system, rev=True)
+                if mode == 'rev' and scaling is not None:
+                    rhs = rhs / scaling[1][:, np.newaxis]
+
+                if isinstance(self._assembled_jac._int_mtx, (COOMatrix, CSRMatrix, CSCMatrix)):
+                    sol = self._lu.solve(rhs, trans_splu)
+                else:
+                    sol = scipy.linalg.lu_solve(self._lup, rhs, trans=trans_lu)
+
+                if mode == 'rev' and scaling is not None:
+                    sol /= scaling[0][:, np.newaxis]
+
+            # MVP-generated jacobians are scaled.
+            else:
+                sol = scipy.linalg.lu_solve(self._lup, rhs, trans=trans_lu)
+
+            rec.abs = 0.0
+            rec.rel = 0.0
+
+        return sol
+
     def solve(self, vec_names, mode, rel_systems=None):
         """
         Run the solver.
@@ -402,15 +669,26 @@ class DirectSolver(LinearSolver):
                     trans_lu = 1
                     trans_splu = 'T'
 
-                # AssembledJacobians are unscaled.
                 if self._assembled_jac is not None:
-                    with system._unscaled_context(outputs=[d_outputs], residuals=[d_residuals]):
-                        if (isinstance(self._assembled_jac._int_mtx,
-                                       (COOMatrix, CSRMatrix, CSCMatrix))):
-                            x_vec._data[:] = self._lu.solve(b_vec._data, trans_splu)
-                        else:
-                            x_vec._data[:] = scipy.linalg.lu_solve(self._lup, b_vec._data,
-                                                                   trans=trans_lu)
+                    # AssembledJacobians hold the scaled jacobian, so only rev mode solves need
+                    # to apply the diagonal factors of the transpose.
+                    b_data = b_vec._data
+                    scaling = self._assembled_jac._get_scaling(system, rev=True)
+                    if mode == 'rev' and scaling is not None:
+                        res_scale, out_scale = scaling
+                        if b_data.ndim > 1:
+                            res_scale = res_scale[:, np.newaxis]
+                            out_scale = out_scale[:, np.newaxis]
+                        b_data = b_data / out_scale
+
+                    if (isinstance(self._assembled_jac._int_mtx,
+                                   (COOMatrix, CSRMatrix, CSCMatrix))):
+                        x_vec._data[:] = self._lu.solve(b_data, trans_splu)
+                    else:
+                        x_vec._data[:] = scipy.linalg.lu_solve(self._lup, b_data, trans=trans_lu)
+
+                    if mode == 'rev' and scaling is not None:
+                        x_vec._data /= res_scale
 
                 # MVP-generated jacobians are scaled.
                 else:
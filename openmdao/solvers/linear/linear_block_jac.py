@@ -1,16 +1,63 @@
 """Define the LinearBlockJac class."""
 from six import iteritems
 
-from openmdao.solvers.solver import BlockLinearSolver
+from openmdao.solvers.solver import BlockLinearSolver, _subsystem_threads
+from openmdao.utils.concurrent import thread_map
 
 
 class LinearBlockJac(BlockLinearSolver):
     """
     Linear block Jacobi solver.
+
+    Attributes
+    ----------
+    _num_threads : int or None
+        Number of threads used to run the subsystems, computed on the first iteration.
     """
 
     SOLVER = 'LN: LNBJ'
 
+    def __init__(self, **kwargs):
+        """
+        Initialize all attributes.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            options dictionary.
+        """
+        super(LinearBlockJac, self).__init__(**kwargs)
+
+        self._num_threads = None
+
+    def _declare_options(self):
+        """
+        Declare options before kwargs are processed in the init method.
+        """
+        super(LinearBlockJac, self)._declare_options()
+
+        self.options.declare('num_threads', types=int, default=1, lower=1,
+                             desc='Number of local threads used to run the subsystems. This '
+                                  'only helps when the subsystems spend most of their time in '
+                                  'code that releases the GIL. Subsystems are run serially '
+                                  'under MPI or when anything below this system has a '
+                                  'recorder.')
+
+    def _setup_solvers(self, system, depth):
+        """
+        Assign system instance, set depth, and optionally perform setup.
+
+        Parameters
+        ----------
+        system : <System>
+            pointer to the owning system.
+        depth : int
+            depth of the current system (already incremented).
+        """
+        super(LinearBlockJac, self)._setup_solvers(system, depth)
+
+        self._num_threads = None
+
     def _iter_execute(self):
         """
         Perform the operations in the iteration loop.
@@ -18,32 +65,37 @@ class LinearBlockJac(BlockLinearSolver):
         system = self._system
         mode = self._mode
         vec_names = self._vec_names
+        rel_systems = self._rel_systems
+
+        if self._num_threads is None:
+            self._num_threads = _subsystem_threads(system, self.options['num_threads'])
+        num_threads = self._num_threads
 
         subs = [s for s in system._subsystems_myproc
-                if self._rel_systems is None or s.pathname in self._rel_systems]
+                if rel_systems is None or s.pathname in rel_systems]
+
+        def apply_linear(subsys):
+            scope_out, scope_in = system._get_scope(subsys)
+            subsys._apply_linear(None, vec_names, rel_systems, mode, scope_out, scope_in)
+
+        def solve_linear(subsys):
+            subsys._solve_linear(vec_names, mode, rel_systems)
 
         if mode == 'fwd':
             for vec_name in vec_names:
                 system._transfer(vec_name, mode)
 
-            for subsys in subs:
-                scope_out, scope_in = system._get_scope(subsys)
-                subsys._apply_linear(None, vec_names, self._rel_systems, mode,
-                                     scope_out, scope_in)
+            thread_map(apply_linear, subs, num_threads)
 
             for vec_name in vec_names:
                 b_vec = system._vectors['residual'][vec_name]
                 b_vec *= -1.0
                 b_vec._data += self._rhs_vecs[vec_name]
 
-            for subsys in subs:
-                subsys._solve_linear(vec_names, mode, self._rel_systems)
+            thread_map(solve_linear, subs, num_threads)
 
         else:  # rev
-            for subsys in subs:
-                scope_out, scope_in = system._get_scope(subsys)
-                subsys._apply_linear(None, vec_names, self._rel_systems, mode,
-                                     scope_out, scope_in)
+            thread_map(apply_linear, subs, num_threads)
 
             for vec_name in vec_names:
                 system._transfer(vec_name, mode)
@@ -52,5 +104,4 @@ class LinearBlockJac(BlockLinearSolver):
                 b_vec *= -1.0
                 b_vec._data += self._rhs_vecs[vec_name]
 
-            for subsys in subs:
-                subsys._solve_linear(vec_names, mode, self._rel_systems)
+            thread_map(solve_linear, subs, num_threads)
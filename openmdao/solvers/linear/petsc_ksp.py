@@ -10,6 +10,7 @@ except ImportError:
     PETSc = None
 
 from openmdao.solvers.solver import LinearSolver
+from openmdao.solvers.linear.recycled_subspace import get_recycled_subspace
 from openmdao.utils.general_utils import warn_deprecation
 from openmdao.recorders.recording_iteration_stack import Recording
 
@@ -171,6 +172,10 @@ class PETScKrylov(LinearSolver):
         Preconditioner for linear solve. Default is None for no preconditioner.
     _ksp : dist
         dictionary of KSP instances (keyed on vector name).
+    _recycled : dict
+        RecycledSubspace for each (vec_name, mode), kept until the next linearization.
+    _space : RecycledSubspace or None
+        Subspace used to deflate the operator during the current solve.
     """
 
     SOLVER = 'LN: PETScKrylov'
@@ -195,6 +200,9 @@ class PETScKrylov(LinearSolver):
         # initialize preconditioner to None
         self.precon = None
 
+        self._recycled = {}
+        self._space = None
+
     def _declare_options(self):
         """
         Declare options before kwargs are processed in the init method.
@@ -211,6 +219,13 @@ class PETScKrylov(LinearSolver):
         self.options.declare('precon_side', default='right', values=['left', 'right'],
                              desc='Preconditioner side, default is right.')
 
+        self.options.declare('recycle', default=0, types=int, lower=0,
+                             desc='Maximum number of vectors kept from previous solves with the '
+                                  'same linearization and used to deflate later solves. This '
+                                  'reduces the iterations needed when solving for many '
+                                  'right-hand sides, e.g. in compute_totals. 0 disables '
+                                  'recycling.')
+
         # changing the default maxiter from the base class
         self.options['maxiter'] = 100
 
@@ -237,6 +252,8 @@ class PETScKrylov(LinearSolver):
         """
         super(PETScKrylov, self)._setup_solvers(system, depth)
 
+        self._recycled = {}
+
         if self.precon is not None:
             self.precon._setup_solvers(self._system, self._depth + 1)
 
@@ -281,6 +298,28 @@ class PETScKrylov(LinearSolver):
         result : PetSC Vector
             Empty array into which we place the matrix-vector product.
         """
+        prod = self._mat_vec(_get_petsc_vec_array(in_vec))
+
+        if self._space is not None:
+            prod = self._space.project(prod)
+
+        # stuff resulting value of b vector into result for KSP
+        result.array[:] = prod
+
+    def _mat_vec(self, in_arr):
+        """
+        Compute matrix-vector product.
+
+        Parameters
+        ----------
+        in_arr : ndarray
+            the incoming array.
+
+        Returns
+        -------
+        ndarray
+            the outgoing array after the product.
+        """
         # assign x and b vectors based on mode
         system = self._system
         vec_name = self._vec_name
@@ -292,16 +331,14 @@ class PETScKrylov(LinearSolver):
             x_vec = system._vectors['residual'][vec_name]
             b_vec = system._vectors['output'][vec_name]
 
-        # set value of x vector to KSP provided value
-        x_vec._data[:] = _get_petsc_vec_array(in_vec)
+        x_vec._data[:] = in_arr
 
         # apply linear
         scope_out, scope_in = system._get_scope()
         system._apply_linear(self._assembled_jac, [vec_name], self._rel_systems, self._mode,
                              scope_out, scope_in)
 
-        # stuff resulting value of b vector into result for KSP
-        result.array[:] = b_vec._data
+        return b_vec._data
 
     def _linearize_children(self):
         """
@@ -319,6 +356,9 @@ class PETScKrylov(LinearSolver):
         """
         Perform any required linearization operations such as matrix factorization.
         """
+        # the recycled subspaces belong to the old operator
+        self._recycled = {}
+
         if self.precon is not None:
             self.precon._linearize()
 
@@ -373,6 +413,30 @@ class PETScKrylov(LinearSolver):
             sol_array = x_vec._data.copy()
             rhs_array = b_vec._data.copy()
 
+            if options['recycle'] > 0:
+                space = get_recycled_subspace(self._recycled, (self._vec_name, self._mode),
+                                              options['recycle'], sol_array.size,
+                                              self._system.comm, self._rel_systems)
+
+                # solve for the part of the residual in the recycled subspace, and use the
+                # deflated operator for the rest.
+                x0 = sol_array.copy()
+                res = rhs_array - self._mat_vec(x0) if np.any(x0) else rhs_array
+                dx, res = space.deflate(res)
+                x0 += dx
+
+                res_norm = space.norm(res)
+                rhs_norm = space.norm(rhs_array)
+                if res_norm <= max(atol, rtol * rhs_norm):
+                    x_vec._data[:] = x0
+                    continue
+
+                # keep rtol relative to the original right-hand side
+                rtol = min(rtol * rhs_norm / res_norm, 1.0)
+                self._space = space
+                rhs_array[:] = res
+                sol_array[:] = 0.0
+
             # create PETSc vectors from numpy arrays
             sol_petsc_vec = PETSc.Vec().createWithArray(sol_array, comm=system.comm)
             rhs_petsc_vec = PETSc.Vec().createWithArray(rhs_array, comm=system.comm)
@@ -382,6 +446,11 @@ class PETScKrylov(LinearSolver):
             ksp = self._get_ksp_solver(system, vec_name)
             ksp.setTolerances(max_it=maxiter, atol=atol, rtol=rtol)
             ksp.solve(rhs_petsc_vec, sol_petsc_vec)
+            rtol = options['rtol']
+
+            if self._space is not None:
+                self._space = None
+                sol_array = x0 + space.add(sol_array, self._mat_vec(sol_array).copy())
 
             # stuff the result into the x vector
             x_vec._data[:] = sol_array
@@ -0,0 +1,198 @@
+"""Define the RecycledSubspace class used by the Krylov solvers."""
+
+from __future__ import division, print_function
+
+import numpy as np
+
+
+class RecycledSubspace(object):
+    """
+    Subspace kept from previous Krylov solves and used to deflate later ones.
+
+    The subspace is stored as a pair of bases U and C = A U, where the columns of C are
+    orthonormal. The part of a new residual that lies in range(C) is solved for directly, and
+    the Krylov solver only works on the rest using the projected operator (I - C C^T) A
+    (the GCRO approach). The columns come from the corrections computed by earlier solves with
+    the same operator, so the subspace must be discarded whenever the operator changes.
+
+    Attributes
+    ----------
+    rel_systems : set of str or None
+        Relevant systems of the operator that the subspace was built for.
+    _maxvecs : int
+        Maximum number of vectors kept. The oldest ones are dropped first.
+    _comm : MPI.Comm or <FakeComm>
+        Communicator used to compute inner products of distributed vectors.
+    _U : ndarray
+        (k, n) array of the recycled directions.
+    _C : ndarray
+        (k, n) array of A times the recycled directions, with orthonormal rows.
+    """
+
+    def __init__(self, maxvecs, size, comm, rel_systems=None):
+        """
+        Initialize an empty subspace.
+
+        Parameters
+        ----------
+        maxvecs : int
+            Maximum number of vectors kept.
+        size : int
+            Local size of the vectors.
+        comm : MPI.Comm or <FakeComm>
+            Communicator used to compute inner products of distributed vectors.
+        rel_systems : set of str or None
+            Relevant systems of the operator that the subspace is built for.
+        """
+        self.rel_systems = rel_systems
+        self._maxvecs = maxvecs
+        self._comm = comm
+        self._U = np.zeros((0, size))
+        self._C = np.zeros((0, size))
+
+    def __len__(self):
+        """
+        Return the number of vectors in the subspace.
+
+        Returns
+        -------
+        int
+            Number of vectors.
+        """
+        return self._U.shape[0]
+
+    def _inner(self, mat, vec):
+        """
+        Return the inner products of each row of mat with vec.
+
+        Parameters
+        ----------
+        mat : ndarray
+            2D array of local vector parts.
+        vec : ndarray
+            Local part of a vector.
+
+        Returns
+        -------
+        ndarray
+            The inner products.
+        """
+        prods = mat.dot(vec)
+        if self._comm.size > 1:
+            prods = self._comm.allreduce(prods)
+        return prods
+
+    def norm(self, vec):
+        """
+        Return the 2-norm of a (possibly distributed) vector.
+
+        Parameters
+        ----------
+        vec : ndarray
+            Local part of the vector.
+
+        Returns
+        -------
+        float
+            The norm.
+        """
+        return np.sqrt(self._inner(vec[np.newaxis, :], vec)[0])
+
+    def deflate(self, res):
+        """
+        Solve for the part of a residual that lies in the subspace.
+
+        Parameters
+        ----------
+        res : ndarray
+            Residual of the current solution.
+
+        Returns
+        -------
+        ndarray
+            Correction to the solution that removes that part of the residual.
+        ndarray
+            The remaining residual.
+        """
+        coeffs = self._inner(self._C, res)
+        return self._U.T.dot(coeffs), res - self._C.T.dot(coeffs)
+
+    def project(self, vec):
+        """
+        Remove the components of vec that lie in range(C).
+
+        Parameters
+        ----------
+        vec : ndarray
+            Vector, usually the product of the operator with a Krylov vector.
+
+        Returns
+        -------
+        ndarray
+            (I - C C^T) vec.
+        """
+        if self._C.shape[0] == 0:
+            return vec
+        return vec - self._C.T.dot(self._inner(self._C, vec))
+
+    def add(self, sol, prod):
+        """
+        Add the solution of a deflated solve to the subspace.
+
+        Parameters
+        ----------
+        sol : ndarray
+            Solution y of (I - C C^T) A y = r.
+        prod : ndarray
+            The product A y.
+
+        Returns
+        -------
+        ndarray
+            y - U C^T A y, the correction to apply to the solution.
+        """
+        coeffs = self._inner(self._C, prod)
+        u = sol - self._U.T.dot(coeffs)
+        c = prod - self._C.T.dot(coeffs)
+
+        if self._maxvecs > 0:
+            norm = self.norm(c)
+            if norm > 1e-12 * self.norm(prod):
+                self._U = np.vstack((self._U, u / norm))[-self._maxvecs:]
+                self._C = np.vstack((self._C, c / norm))[-self._maxvecs:]
+
+        return u
+
+
+def get_recycled_subspace(spaces, key, maxvecs, size, comm, rel_systems):
+    """
+    Return the recycled subspace stored under key, creating it if needed.
+
+    A new subspace replaces the stored one if the relevant systems have changed, since the
+    old one was built for a different operator.
+
+    Parameters
+    ----------
+    spaces : dict
+        Subspaces of a solver, keyed by (vec_name, mode).
+    key : tuple
+        The (vec_name, mode) of the current solve.
+    maxvecs : int
+        Maximum number of vectors kept.
+    size : int
+        Local size of the solution vector.
+    comm : MPI.Comm or <FakeComm>
+        Communicator used to compute inner products of distributed vectors.
+    rel_systems : set of str or None
+        Relevant systems of the current operator.
+
+    Returns
+    -------
+    RecycledSubspace
+        The subspace.
+    """
+    space = spaces.get(key)
+    if space is None or (space.rel_systems is not rel_systems and
+                         space.rel_systems != rel_systems):
+        space = spaces[key] = RecycledSubspace(maxvecs, size, comm, rel_systems)
+    return space
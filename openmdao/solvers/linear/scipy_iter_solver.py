@@ -6,6 +6,7 @@ import numpy as np
 from scipy.sparse.linalg import LinearOperator, gmres
 
 from openmdao.solvers.solver import LinearSolver
+from openmdao.solvers.linear.recycled_subspace import get_recycled_subspace
 from openmdao.utils.general_utils import warn_deprecation
 from openmdao.recorders.recording_iteration_stack import Recording
 
@@ -26,6 +27,8 @@ class ScipyKrylov(LinearSolver):
     ----------
     precon : Solver
         Preconditioner for linear solve. Default is None for no preconditioner.
+    _recycled : dict
+        RecycledSubspace for each (vec_name, mode), kept until the next linearization.
     """
 
     SOLVER = 'LN: SCIPY'
@@ -44,6 +47,8 @@ class ScipyKrylov(LinearSolver):
         # initialize preconditioner to None
         self.precon = None
 
+        self._recycled = {}
+
     def _assembled_jac_solver_iter(self):
         """
         Return a generator of linear solvers using assembled jacs.
@@ -68,6 +73,13 @@ class ScipyKrylov(LinearSolver):
                                   'iteration cost, but may be necessary for convergence. This '
                                   'option applies only to gmres.')
 
+        self.options.declare('recycle', default=0, types=int, lower=0,
+                             desc='Maximum number of vectors kept from previous solves with the '
+                                  'same linearization and used to deflate later solves. This '
+                                  'reduces the iterations needed when solving for many '
+                                  'right-hand sides, e.g. in compute_totals. 0 disables '
+                                  'recycling.')
+
         # changing the default maxiter from the base class
         self.options['maxiter'] = 1000
         self.options['atol'] = 1.0e-12
@@ -85,6 +97,8 @@ class ScipyKrylov(LinearSolver):
         """
         super(ScipyKrylov, self)._setup_solvers(system, depth)
 
+        self._recycled = {}
+
         if self.precon is not None:
             self.precon._setup_solvers(self._system, self._depth + 1)
 
@@ -122,6 +136,9 @@ class ScipyKrylov(LinearSolver):
         """
         Perform any required linearization operations such as matrix factorization.
         """
+        # the recycled subspaces belong to the old operator
+        self._recycled = {}
+
         if self.precon is not None:
             self.precon._linearize()
 
@@ -213,6 +230,7 @@ class ScipyKrylov(LinearSolver):
 
         maxiter = self.options['maxiter']
         atol = self.options['atol']
+        recycle = self.options['recycle']
 
         fail = False
 
@@ -241,7 +259,11 @@ class ScipyKrylov(LinearSolver):
                 M = None
 
             self._iter_count = 0
-            if solver is gmres:
+            if recycle > 0 and solver is gmres:
+                x, info = self._recycled_solve(x_vec, b_vec, M, restart=restart,
+                                               maxiter=maxiter, tol=atol,
+                                               callback=self._monitor)
+            elif solver is gmres:
                 x, info = solver(linop, b_vec._data.copy(), M=M, restart=restart,
                                  x0=x_vec_combined, maxiter=maxiter, tol=atol,
                                  callback=self._monitor)
@@ -257,6 +279,57 @@ class ScipyKrylov(LinearSolver):
 
         return fail, 0., 0.
 
+    def _recycled_solve(self, x_vec, b_vec, M, **kwargs):
+        """
+        Solve using gmres, deflated by the subspace recycled from previous solves.
+
+        Parameters
+        ----------
+        x_vec : <Vector>
+            Solution vector, which holds the initial guess.
+        b_vec : <Vector>
+            Right-hand-side vector.
+        M : LinearOperator or None
+            Preconditioner.
+        **kwargs : dict
+            Other arguments passed to gmres.
+
+        Returns
+        -------
+        ndarray
+            The solution.
+        int
+            Convergence info from gmres.
+        """
+        x = x_vec._data.copy()
+        b = b_vec._data.copy()
+        size = x.size
+
+        space = get_recycled_subspace(self._recycled, (self._vec_name, self._mode),
+                                      self.options['recycle'], size,
+                                      self._system.comm, self._rel_systems)
+
+        res = b - self._mat_vec(x) if np.any(x) else b
+        dx, res = space.deflate(res)
+        x += dx
+
+        # the recycled subspace may already give a converged solution
+        res_norm = space.norm(res)
+        tol = kwargs['tol'] * space.norm(b)
+        if res_norm <= tol:
+            return x, 0
+
+        # gmres tolerance is relative to its right-hand side, so keep it relative to b instead
+        kwargs['tol'] = tol / res_norm
+
+        linop = LinearOperator((size, size), dtype=float,
+                               matvec=lambda v: space.project(self._mat_vec(v)))
+        y, info = gmres(linop, res, M=M, x0=np.zeros(size), **kwargs)
+
+        x += space.add(y, self._mat_vec(y).copy())
+
+        return x, info
+
     def _apply_precon(self, in_vec):
         """
         Apply preconditioner.
@@ -0,0 +1,166 @@
+"""Test the BlockJacobiPrecon class."""
+
+from __future__ import division, print_function
+
+import unittest
+
+import numpy as np
+
+from openmdao.api import Problem, Group, IndepVarComp, ExecComp, ScipyKrylov, DirectSolver, \
+    NewtonSolver, BlockJacobiPrecon
+from openmdao.utils.assert_utils import assert_rel_error
+from openmdao.test_suite.components.double_sellar import SubSellar
+
+
+def _build_model(linear_solver, mode):
+    prob = Problem()
+    model = prob.model
+
+    model.add_subsystem('p', IndepVarComp('z', np.array([5.0, 2.0])))
+    model.add_subsystem('g1', SubSellar())
+    model.add_subsystem('g2', SubSellar())
+
+    model.connect('g1.y2', 'g2.x')
+    model.connect('g2.y2', 'g1.x')
+    model.connect('p.z', ['g1.z', 'g2.z'])
+
+    model.nonlinear_solver = NewtonSolver()
+    model.linear_solver = linear_solver
+
+    prob.set_solver_print(level=0)
+    prob.setup(check=False, mode=mode)
+    prob.run_model()
+
+    return prob
+
+
+class TestBlockJacobiPrecon(unittest.TestCase):
+
+    def _check_totals(self, mode, overlap):
+        expected = _build_model(DirectSolver(), mode)
+        J_expected = expected.compute_totals(of=['g1.y1', 'g2.y2'], wrt=['p.z'],
+                                             return_format='array')
+
+        counts = []
+        for precon in (None, BlockJacobiPrecon(overlap=overlap)):
+            krylov = ScipyKrylov()
+            krylov.precon = precon
+            prob = _build_model(krylov, mode)
+
+            iters = []
+            orig_monitor = krylov._monitor
+
+            def monitor(res):
+                iters.append(1)
+                orig_monitor(res)
+
+            krylov._monitor = monitor
+
+            J = prob.compute_totals(of=['g1.y1', 'g2.y2'], wrt=['p.z'], return_format='array')
+            assert_rel_error(self, J, J_expected, 1e-9)
+
+            counts.append(len(iters))
+
+        return counts
+
+    def test_fwd_block_jacobi(self):
+        no_precon, precon = self._check_totals('fwd', 0)
+        self.assertTrue(precon <= no_precon)
+
+    def test_rev_block_jacobi(self):
+        no_precon, precon = self._check_totals('rev', 0)
+        self.assertTrue(precon < no_precon)
+
+    def test_fwd_schwarz(self):
+        no_precon, precon = self._check_totals('fwd', 1)
+        self.assertTrue(precon < no_precon)
+
+    def test_rev_schwarz(self):
+        no_precon, precon = self._check_totals('rev', 1)
+        self.assertTrue(precon < no_precon)
+
+    def test_factored_once_per_linearization(self):
+        krylov = ScipyKrylov()
+        krylov.precon = precon = BlockJacobiPrecon()
+        prob = _build_model(krylov, 'fwd')
+        prob.model.run_linearize()
+
+        # p, g1 and g2 each give one block
+        self.assertEqual([b[0] for b in precon._blocks], ['p', 'g1', 'g2'])
+        lu = precon._lu
+
+        prob.model.run_solve_linear(['linear'], 'fwd')
+        self.assertTrue(precon._lu is lu)
+
+    def test_requires_assembled_jac(self):
+        krylov = ScipyKrylov()
+        krylov.precon = BlockJacobiPrecon(assemble_jac=False)
+
+        with self.assertRaises(RuntimeError) as cm:
+            _build_model(krylov, 'fwd')
+
+        self.assertEqual(str(cm.exception),
+                         "BlockJacobiPrecon in system '' requires an assembled jacobian.")
+
+    def test_singular_block(self):
+        prob = Problem()
+        model = prob.model
+        model.add_subsystem('p', IndepVarComp('x', 1.0))
+        sub = model.add_subsystem('sub', Group())
+        sub.add_subsystem('c1', ExecComp('y = 2.0 * x'))
+        model.connect('p.x', 'sub.c1.x')
+
+        model.linear_solver = ScipyKrylov()
+        model.linear_solver.precon = BlockJacobiPrecon()
+        prob.setup(check=False)
+        prob.run_model()
+
+        # zero the diagonal entry of sub.c1.y so that the block for sub is singular
+        jac = model._assembled_jac
+        model.run_linearize()
+        mtx = jac._int_mtx._matrix
+        row = jac._out_ranges['sub.c1.y'][0]
+        mtx.data[mtx.indices == row] = 0.0
+
+        with self.assertRaises(RuntimeError) as cm:
+            model.linear_solver.precon._linearize()
+
+        self.assertEqual(str(cm.exception),
+                         "Singular entry found in the block of subsystem 'sub' of "
+                         "BlockJacobiPrecon in system ''.")
+
+
+class TestBlockJacobiPreconFeature(unittest.TestCase):
+
+    def test_feature_block_jacobi_precon(self):
+        import numpy as np
+
+        from openmdao.api import Problem, IndepVarComp, ScipyKrylov, NewtonSolver, \
+            BlockJacobiPrecon
+        from openmdao.test_suite.components.double_sellar import SubSellar
+
+        prob = Problem()
+        model = prob.model
+
+        model.add_subsystem('p', IndepVarComp('z', np.array([5.0, 2.0])))
+        model.add_subsystem('g1', SubSellar())
+        model.add_subsystem('g2', SubSellar())
+
+        model.connect('g1.y2', 'g2.x')
+        model.connect('g2.y2', 'g1.x')
+        model.connect('p.z', ['g1.z', 'g2.z'])
+
+        model.nonlinear_solver = NewtonSolver()
+        model.linear_solver = ScipyKrylov()
+        model.linear_solver.precon = BlockJacobiPrecon(overlap=1)
+
+        prob.setup()
+        prob.run_model()
+
+        J = prob.compute_totals(of=['g1.y1', 'g2.y2'], wrt=['p.z'])
+        assert_rel_error(self, J['g1.y1', 'p.z'], [[11.55476508, 1.92579418]], 1e-6)
+        assert_rel_error(self, J['g2.y2', 'p.z'], [[1.94345635, 1.15724273]], 1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ import numpy as np
 from openmdao.api import Problem, Group, IndepVarComp, DirectSolver, NewtonSolver, ExecComp, \
      NewtonSolver, BalanceComp, ExplicitComponent, ImplicitComponent
 from openmdao.utils.assert_utils import assert_rel_error
+from openmdao.solvers.linear.direct import _PermutedSuperLU
 from openmdao.solvers.linear.tests.linear_test_base import LinearSolverTests
 from openmdao.test_suite.components.sellar import SellarDerivatives
 from openmdao.test_suite.groups.implicit_group import TestImplicitGroup
@@ -78,6 +79,367 @@ class DupPartialsComp(ExplicitComponent):
     def compute_partials(self, inputs, partials):
         pass
 
+class ScaledLinearSystemComp(ImplicitComponent):
+    def initialize(self):
+        self.options.declare('size', types=int, default=5)
+
+    def setup(self):
+        size = self.options['size']
+        self.mtx = 4.0 * np.eye(size) + np.arange(size * size).reshape((size, size)) / 10.
+
+        self.add_input('b', np.ones(size), units='m')
+        self.add_output('x', np.ones(size), ref=10.0, ref0=1.0, res_ref=3.0)
+
+        self.declare_partials('x', 'x', val=self.mtx)
+        self.declare_partials('x', 'b', rows=np.arange(size), cols=np.arange(size), val=-1.0)
+
+    def apply_nonlinear(self, inputs, outputs, residuals):
+        residuals['x'] = self.mtx.dot(outputs['x']) - inputs['b']
+
+    def solve_nonlinear(self, inputs, outputs):
+        outputs['x'] = np.linalg.solve(self.mtx, inputs['b'])
+
+
+def _build_multi_rhs_model(linear_solver, size=5):
+    prob = Problem()
+    model = prob.model
+    ivc = model.add_subsystem('p', IndepVarComp())
+    ivc.add_output('b', np.arange(size, dtype=float) + 1.0, units='m')
+    ivc.add_output('c', 2.0)
+
+    model.add_subsystem('sys', ScaledLinearSystemComp(size=size))
+    model.add_subsystem('obj', ExecComp('f = c * sum(x**2)', x=np.ones(size)))
+    model.add_subsystem('con', ExecComp('g = 3.0 * x', x=np.ones(size), g=np.ones(size)))
+
+    model.connect('p.b', 'sys.b')
+    model.connect('p.c', 'obj.c')
+    model.connect('sys.x', ['obj.x', 'con.x'])
+
+    model.add_design_var('p.b', ref=2.0)
+    model.add_design_var('p.c')
+    model.add_objective('obj.f')
+    model.add_constraint('con.g', upper=0.0, indices=[0, 2, 3])
+
+    model.linear_solver = linear_solver
+
+    return prob
+
+
+class TestDirectSolverMultiRHS(unittest.TestCase):
+
+    def _check_totals(self, mode, assemble_jac=False, jac_type='csc'):
+        # the solve of one right-hand side at a time is the reference.
+        expected = _build_multi_rhs_model(DirectSolver(assemble_jac=assemble_jac))
+        expected.model.options['assembled_jac_type'] = jac_type
+        expected.model.linear_solver.supports['multi_rhs'] = False
+        expected.setup(check=False, mode=mode)
+        expected.run_model()
+        J_expected = expected.compute_totals(return_format='array')
+
+        prob = _build_multi_rhs_model(DirectSolver(assemble_jac=assemble_jac))
+        prob.model.options['assembled_jac_type'] = jac_type
+        prob.setup(check=False, mode=mode)
+        prob.run_model()
+
+        solver = prob.model.linear_solver
+        nsolves = []
+        orig_solve = solver.solve
+
+        def counting_solve(*args, **kwargs):
+            nsolves.append(1)
+            return orig_solve(*args, **kwargs)
+
+        solver.solve = counting_solve
+
+        J = prob.compute_totals(return_format='array')
+        assert_rel_error(self, J, J_expected, 1e-10)
+
+        # all single index solves are done as one block, so the per-RHS solve is never called.
+        self.assertEqual(len(nsolves), 0)
+
+        J = prob.compute_totals(return_format='flat_dict')
+        assert_rel_error(self, J['con.g', 'p.b'], J_expected[1:4, :5], 1e-10)
+
+        # with no known sparsity, the sparse formats store every entry.
+        J = prob.compute_totals(return_format='coo')
+        self.assertEqual(J.nnz, J_expected.size)
+        assert_rel_error(self, J.toarray(), J_expected, 1e-10)
+
+    def test_fwd(self):
+        self._check_totals('fwd')
+
+    def test_rev(self):
+        self._check_totals('rev')
+
+    def test_fwd_dense_jac(self):
+        self._check_totals('fwd', assemble_jac=True, jac_type='dense')
+
+    def test_rev_dense_jac(self):
+        self._check_totals('rev', assemble_jac=True, jac_type='dense')
+
+    def test_fwd_csc_jac(self):
+        self._check_totals('fwd', assemble_jac=True, jac_type='csc')
+
+    def test_rev_csc_jac(self):
+        self._check_totals('rev', assemble_jac=True, jac_type='csc')
+
+    def test_fwd_block_diag_jac(self):
+        self._check_totals('fwd', assemble_jac=True, jac_type='block_diag')
+
+    def test_rev_block_diag_jac(self):
+        self._check_totals('rev', assemble_jac=True, jac_type='block_diag')
+
+
+class TestDirectSolverFactorReuse(unittest.TestCase):
+
+    def _check_reuse(self, mode, jac_type):
+        expected = _build_multi_rhs_model(DirectSolver(assemble_jac=True, reuse_symbolic=False,
+                                                       skip_unchanged=False))
+        expected.model.options['assembled_jac_type'] = jac_type
+        expected.setup(check=False, mode=mode)
+
+        prob = _build_multi_rhs_model(DirectSolver(assemble_jac=True))
+        prob.model.options['assembled_jac_type'] = jac_type
+        prob.setup(check=False, mode=mode)
+
+        for c in (2.0, 2.0, -3.5):
+            for p in (expected, prob):
+                p['p.c'] = c
+                p.run_model()
+
+            J_expected = expected.compute_totals(return_format='array')
+            J = prob.compute_totals(return_format='array')
+            assert_rel_error(self, J, J_expected, 1e-10)
+
+        return prob.model.linear_solver
+
+    def test_fwd_csc(self):
+        solver = self._check_reuse('fwd', 'csc')
+        self.assertTrue(isinstance(solver._lu, _PermutedSuperLU))
+
+    def test_rev_csc(self):
+        solver = self._check_reuse('rev', 'csc')
+        self.assertTrue(isinstance(solver._lu, _PermutedSuperLU))
+
+    def test_rev_dense(self):
+        self._check_reuse('rev', 'dense')
+
+    def test_skip_unchanged(self):
+        for jac_type in ('csc', 'dense'):
+            prob = _build_multi_rhs_model(DirectSolver(assemble_jac=True))
+            prob.model.options['assembled_jac_type'] = jac_type
+            prob.setup(check=False, mode='fwd')
+            prob.run_model()
+
+            solver = prob.model.linear_solver
+            attr = '_lup' if jac_type == 'dense' else '_lu'
+
+            prob.model.run_linearize()
+            factors = getattr(solver, attr)
+            self.assertTrue(factors is not None)
+
+            # same matrix values, so the factorization is kept
+            prob.model.run_linearize()
+            self.assertTrue(getattr(solver, attr) is factors)
+
+            # new matrix values require a new factorization
+            prob['p.c'] = 5.0
+            prob.run_model()
+            prob.model.run_linearize()
+            self.assertFalse(getattr(solver, attr) is factors)
+
+            # the check can be turned off
+            factors = getattr(solver, attr)
+            solver.options['skip_unchanged'] = False
+            prob.model.run_linearize()
+            self.assertFalse(getattr(solver, attr) is factors)
+
+
+class NodeBlockComp(ImplicitComponent):
+    """Independent 2x2 linear systems A_i [x_i, y_i] = [b_i, 1] at each node."""
+
+    def initialize(self):
+        self.options.declare('size', types=int, default=4)
+        self.options.declare('singular_node', default=None)
+
+    def setup(self):
+        size = self.options['size']
+        self.mtx = np.empty((size, 2, 2))
+        self.mtx[:, 0, 0] = 4.0 + np.arange(size)
+        self.mtx[:, 0, 1] = 1.0
+        self.mtx[:, 1, 0] = -2.0
+        self.mtx[:, 1, 1] = 3.0
+        if self.options['singular_node'] is not None:
+            self.mtx[self.options['singular_node']] = [[1.0, 2.0], [2.0, 4.0]]
+
+        self.add_input('b', np.ones(size))
+        self.add_output('x', np.ones(size))
+        self.add_output('y', np.ones(size))
+
+        ar = np.arange(size)
+        self.declare_partials('x', ['x', 'y'], rows=ar, cols=ar)
+        self.declare_partials('y', ['x', 'y'], rows=ar, cols=ar)
+        self.declare_partials('x', 'b', rows=ar, cols=ar, val=-1.0)
+
+    def apply_nonlinear(self, inputs, outputs, residuals):
+        mtx = self.mtx
+        x, y = outputs['x'], outputs['y']
+        residuals['x'] = mtx[:, 0, 0] * x + mtx[:, 0, 1] * y - inputs['b']
+        residuals['y'] = mtx[:, 1, 0] * x + mtx[:, 1, 1] * y - 1.0
+
+    def linearize(self, inputs, outputs, partials):
+        mtx = self.mtx
+        partials['x', 'x'] = mtx[:, 0, 0]
+        partials['x', 'y'] = mtx[:, 0, 1]
+        partials['y', 'x'] = mtx[:, 1, 0]
+        partials['y', 'y'] = mtx[:, 1, 1]
+
+
+def _build_block_model(jac_type, size=4, singular_node=None):
+    prob = Problem()
+    model = prob.model
+    model.add_subsystem('p', IndepVarComp('b', np.arange(size, dtype=float)))
+    model.add_subsystem('comp', NodeBlockComp(size=size, singular_node=singular_node))
+    model.add_subsystem('obj', ExecComp('f = x * y', x=np.ones(size), y=np.ones(size),
+                                        f=np.ones(size), vectorize=True))
+    model.connect('p.b', 'comp.b')
+    model.connect('comp.x', 'obj.x')
+    model.connect('comp.y', 'obj.y')
+
+    model.nonlinear_solver = NewtonSolver()
+    model.linear_solver = DirectSolver(assemble_jac=True)
+    model.options['assembled_jac_type'] = jac_type
+    prob.set_solver_print(level=0)
+
+    return prob
+
+
+class DenseCoupledComp(ImplicitComponent):
+    """A x = b with a dense A, so the Jacobian is a single large block."""
+
+    def initialize(self):
+        self.options.declare('size', types=int, default=150)
+
+    def setup(self):
+        size = self.options['size']
+        self.mtx = np.random.RandomState(0).rand(size, size) + size * np.eye(size)
+
+        self.add_input('b', np.ones(size))
+        self.add_output('x', np.ones(size))
+
+        self.declare_partials('x', 'x', val=self.mtx)
+        self.declare_partials('x', 'b', rows=np.arange(size), cols=np.arange(size), val=-1.0)
+
+    def apply_nonlinear(self, inputs, outputs, residuals):
+        residuals['x'] = self.mtx.dot(outputs['x']) - inputs['b']
+
+
+class TestDirectSolverBlockDiag(unittest.TestCase):
+
+    def test_block_diag_solve(self):
+        size = 5
+        for mode in ('fwd', 'rev'):
+            expected = _build_block_model('csc', size)
+            expected.setup(check=False, mode=mode)
+            expected.run_model()
+
+            prob = _build_block_model('block_diag', size)
+            prob.setup(check=False, mode=mode)
+            prob.run_model()
+
+            assert_rel_error(self, prob['comp.x'], expected['comp.x'], 1e-12)
+            assert_rel_error(self, prob['comp.y'], expected['comp.y'], 1e-12)
+
+            of = ['obj.f', 'comp.x']
+            J_expected = expected.compute_totals(of=of, wrt=['p.b'], return_format='array')
+            J = prob.compute_totals(of=of, wrt=['p.b'], return_format='array')
+            assert_rel_error(self, J, J_expected, 1e-12)
+
+        # the p.b, comp.x, comp.y and obj.f entries of each node form a separate 4x4 block.
+        matrix = prob.model._assembled_jac._int_mtx._matrix
+        self.assertEqual(len(matrix._groups), 1)
+        idxs, blocks = matrix._groups[0]
+        self.assertEqual(blocks.shape, (size, 4, 4))
+        assert_rel_error(self, idxs[:, 0], np.arange(size), 1e-15)
+
+    def test_block_diag_fallback(self):
+        import warnings
+        from scipy.sparse import csc_matrix
+
+        def build(jac_type):
+            prob = Problem()
+            model = prob.model
+            model.add_subsystem('p', IndepVarComp('b', np.arange(150, dtype=float)))
+            model.add_subsystem('comp', DenseCoupledComp())
+            model.connect('p.b', 'comp.b')
+            model.nonlinear_solver = NewtonSolver()
+            model.linear_solver = DirectSolver(assemble_jac=True)
+            model.options['assembled_jac_type'] = jac_type
+            prob.set_solver_print(level=0)
+            prob.setup(check=False)
+            return prob
+
+        expected = build('csc')
+        expected.run_model()
+
+        prob = build('block_diag')
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            prob.run_model()
+
+        msgs = [str(warn.message) for warn in w]
+        self.assertTrue(any('stored in CSC format instead' in msg for msg in msgs), msgs)
+
+        # the coupled block is too large to store densely
+        self.assertIsInstance(prob.model._assembled_jac._int_mtx._matrix, csc_matrix)
+
+        assert_rel_error(self, prob['comp.x'], expected['comp.x'], 1e-12)
+        J_expected = expected.compute_totals(of=['comp.x'], wrt=['p.b'], return_format='array')
+        J = prob.compute_totals(of=['comp.x'], wrt=['p.b'], return_format='array')
+        assert_rel_error(self, J, J_expected, 1e-12)
+
+    def test_block_diag_lu(self):
+        from openmdao.matrices.block_diag_matrix import _BlockDiag
+
+        # blocks of sizes 1, 2 and 3 scattered over the rows, with zeros on the diagonal of
+        # the larger blocks so that their factorization has to pivot
+        blocks = [[0, 4, 7], [1, 5], [2], [3, 6, 8]]
+        rows = []
+        cols = []
+        for idxs in blocks:
+            r, c = np.meshgrid(idxs, idxs, indexing='ij')
+            rows.append(r.ravel())
+            cols.append(c.ravel())
+        rows = np.hstack(rows)
+        cols = np.hstack(cols)
+
+        matrix = _BlockDiag(rows, cols, 9)
+        rng = np.random.RandomState(11)
+        vals = rng.rand(rows.size)
+        vals[rows == cols] = 0.
+        vals[(rows == 2) & (cols == 2)] = 3.
+        matrix.data[matrix._positions(rows, cols)] = vals
+        dense = matrix.toarray()
+
+        lu = matrix.lu()
+        for rhs in (rng.rand(9), rng.rand(9, 3)):
+            assert_rel_error(self, lu.solve(rhs), np.linalg.solve(dense, rhs), 1e-12)
+            assert_rel_error(self, lu.solve(rhs, trans='T'), np.linalg.solve(dense.T, rhs),
+                             1e-12)
+
+    def test_block_diag_singular(self):
+        prob = _build_block_model('block_diag', 5, singular_node=3)
+        prob.setup(check=False)
+
+        with self.assertRaises(RuntimeError) as cm:
+            prob.run_model()
+
+        # comp.y is the first row of the singular node block that depends on the rows above it.
+        expected_msg = "Singular entry found in '' for row associated with state/residual " \
+                       "'comp.y'."
+        self.assertEqual(expected_msg, str(cm.exception))
+
+
 class TestDirectSolver(LinearSolverTests.LinearSolverTestCase):
 
     linear_solver_class = DirectSolver
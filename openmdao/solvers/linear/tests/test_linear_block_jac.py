@@ -3,6 +3,7 @@
 from __future__ import division, print_function
 
 import unittest
+from functools import partial
 
 import numpy as np
 
@@ -35,6 +36,11 @@ class TestLinearBlockJacSolver(LinearSolverTests.LinearSolverTestCase):
                              "Linear solver 'LN: LNBJ' doesn't support assembled jacobians.")
 
 
+class TestLinearBlockJacThreaded(LinearSolverTests.LinearSolverTestCase):
+
+    linear_solver_class = partial(LinearBlockJac, num_threads=4)
+
+
 class TestBJacSolverFeature(unittest.TestCase):
 
     def test_specify_solver(self):
@@ -17,6 +17,7 @@ from openmdao.solvers.linear.tests.linear_test_base import LinearSolverTests
 from openmdao.test_suite.components.expl_comp_simple import TestExplCompSimpleDense
 from openmdao.test_suite.components.misc_components import Comp4LinearCacheTest
 from openmdao.test_suite.components.sellar import SellarDis1withDerivatives, SellarDis2withDerivatives
+from openmdao.test_suite.components.double_sellar import SubSellar
 from openmdao.test_suite.groups.implicit_group import TestImplicitGroup
 
 
@@ -224,6 +225,75 @@ class TestScipyKrylov(LinearSolverTests.LinearSolverTestCase):
         # Should take less iterations when starting from previous solution.
         self.assertTrue(icount2 < icount1)
 
+    def _build_sellar_ring(self, mode, recycle, n=8):
+        prob = Problem()
+        model = prob.model
+
+        model.add_subsystem('p', IndepVarComp('z', np.array([5.0, 2.0])))
+        for i in range(n):
+            model.add_subsystem('g%d' % i, SubSellar())
+            model.connect('p.z', 'g%d.z' % i)
+        for i in range(n):
+            model.connect('g%d.y2' % i, 'g%d.x' % ((i + 1) % n))
+
+        model.nonlinear_solver = NewtonSolver()
+        model.linear_solver = ScipyKrylov(recycle=recycle)
+
+        prob.set_solver_print(level=0)
+        prob.setup(check=False, mode=mode)
+        prob.run_model()
+
+        return prob
+
+    def test_recycle(self):
+        of = ['g%d.y1' % i for i in range(8)]
+
+        for mode in ('fwd', 'rev'):
+            Js = []
+            counts = []
+            for recycle in (0, 10):
+                prob = self._build_sellar_ring(mode, recycle)
+                solver = prob.model.linear_solver
+
+                iters = []
+                orig_monitor = solver._monitor
+
+                def monitor(res):
+                    iters.append(1)
+                    orig_monitor(res)
+
+                solver._monitor = monitor
+
+                Js.append(prob.compute_totals(of=of, wrt=['p.z'], return_format='array'))
+                counts.append(len(iters))
+
+            assert_rel_error(self, Js[1], Js[0], 1e-10)
+            self.assertTrue(counts[1] <= counts[0])
+            if mode == 'rev':
+                # 8 right-hand sides share most of their Krylov subspace.
+                self.assertTrue(counts[1] < counts[0] // 2)
+
+    def test_recycle_reset_on_linearize(self):
+        prob = self._build_sellar_ring('rev', 4)
+        solver = prob.model.linear_solver
+        of = ['g%d.y1' % i for i in range(8)]
+
+        J1 = prob.compute_totals(of=of, wrt=['p.z'], return_format='array')
+        space = solver._recycled['linear', 'rev']
+        self.assertEqual(len(space), 4)
+
+        # a new point gives a new operator, so the old subspace must not be used
+        prob['p.z'] = np.array([3.0, 1.0])
+        prob.run_model()
+        J2 = prob.compute_totals(of=of, wrt=['p.z'], return_format='array')
+        self.assertTrue(solver._recycled['linear', 'rev'] is not space)
+
+        expected = self._build_sellar_ring('rev', 0)
+        expected['p.z'] = np.array([3.0, 1.0])
+        expected.run_model()
+        assert_rel_error(self, J2, expected.compute_totals(of=of, wrt=['p.z'],
+                                                           return_format='array'), 1e-10)
+
 
 class TestScipyKrylovFeature(unittest.TestCase):
 
@@ -402,5 +472,32 @@ class TestScipyKrylovFeature(unittest.TestCase):
         assert_rel_error(self, prob['y1'], 25.58830273, .00001)
         assert_rel_error(self, prob['y2'], 12.05848819, .00001)
 
+    def test_feature_recycle(self):
+        import numpy as np
+
+        from openmdao.api import Problem, IndepVarComp, ScipyKrylov, NewtonSolver
+        from openmdao.test_suite.components.double_sellar import SubSellar
+
+        prob = Problem()
+        model = prob.model
+
+        model.add_subsystem('p', IndepVarComp('z', np.array([5.0, 2.0])))
+        for i in range(4):
+            model.add_subsystem('g%d' % i, SubSellar())
+            model.connect('p.z', 'g%d.z' % i)
+        for i in range(4):
+            model.connect('g%d.y2' % i, 'g%d.x' % ((i + 1) % 4))
+
+        model.nonlinear_solver = NewtonSolver()
+        model.linear_solver = ScipyKrylov()
+        model.linear_solver.options['recycle'] = 4
+
+        prob.setup(mode='rev')
+        prob.run_model()
+
+        J = prob.compute_totals(of=['g0.y1', 'g1.y1', 'g2.y1', 'g3.y1'], wrt=['p.z'])
+        assert_rel_error(self, J['g0.y1', 'p.z'], [[11.55476508, 1.92579418]], 1e-6)
+        assert_rel_error(self, J['g3.y1', 'p.z'], [[11.55476508, 1.92579418]], 1e-6)
+
 if __name__ == "__main__":
     unittest.main()
@@ -34,6 +34,11 @@ class NewtonSolver(NonlinearSolver):
         'fwd' or 'rev', applicable to linear solvers only.
     _iter_count : int
         Number of iterations for the current invocation of the solver.
+    _jac_age : int or None
+        Number of iterations since the most recent linearization, or None if there is no
+        linearization that can be reused.
+    _norms : list of float
+        Residual norms of the two most recent iterations, oldest first.
     """
 
     SOLVER = 'NL: Newton'
@@ -55,6 +60,9 @@ class NewtonSolver(NonlinearSolver):
         # Slot for linesearch
         self.linesearch = None
 
+        self._jac_age = None
+        self._norms = [0.0, 0.0]
+
     @property
     def line_search(self):
         """
@@ -83,6 +91,14 @@ class NewtonSolver(NonlinearSolver):
                              desc='Set to True to turn on sub-solvers (Hybrid Newton).')
         self.options.declare('max_sub_solves', types=int, default=10,
                              desc='Maximum number of subsystem solves.')
+        self.options.declare('max_jac_reuse', types=int, default=0, lower=0,
+                             desc='Maximum number of consecutive iterations that reuse the most '
+                                  'recent linearization and factorization (modified Newton). '
+                                  'Set to 0 to relinearize at every iteration.')
+        self.options.declare('reuse_rate_tol', default=0.5, lower=0.0,
+                             desc='While reusing a linearization, relinearize as soon as the '
+                                  'ratio of the current residual norm to the previous one is '
+                                  'greater than this value.')
 
         self.supports['gradients'] = True
         self.supports['implicit_components'] = True
@@ -213,12 +229,47 @@ class NewtonSolver(NonlinearSolver):
 
                 self._solver_info.pop()
 
+        # the state may have changed since the last solve, so always start with a fresh
+        # linearization.
+        self._jac_age = None
+        self._norms = [0.0, 0.0]
+
         self._run_apply()
         norm = self._iter_get_norm()
 
         norm0 = norm if norm != 0.0 else 1.0
         return norm0, norm
 
+    def _iter_get_norm(self):
+        """
+        Return the norm of the residual.
+
+        Returns
+        -------
+        float
+            norm.
+        """
+        norm = super(NewtonSolver, self)._iter_get_norm()
+        self._norms = [self._norms[1], norm]
+        return norm
+
+    def _reuse_jac(self):
+        """
+        Return True if the previous linearization should be used for this iteration.
+
+        Returns
+        -------
+        bool
+            True if the linearization and factorization from a previous iteration are reused.
+        """
+        age = self._jac_age
+        if age is None or age >= self.options['max_jac_reuse']:
+            return False
+
+        # keep the old linearization only while the residual drops fast enough
+        old, new = self._norms
+        return old != 0.0 and new / old <= self.options['reuse_rate_tol']
+
     def _iter_execute(self):
         """
         Perform the operations in the iteration loop.
@@ -237,10 +288,14 @@ class NewtonSolver(NonlinearSolver):
         system._vectors['residual']['linear'] *= -1.0
         my_asm_jac = self.linear_solver._assembled_jac
 
-        system._linearize(my_asm_jac, sub_do_ln=do_sub_ln)
-        if (my_asm_jac is not None and system.linear_solver._assembled_jac is not my_asm_jac):
-            my_asm_jac._update(system)
-        self._linearize()
+        if self._reuse_jac():
+            self._jac_age += 1
+        else:
+            system._linearize(my_asm_jac, sub_do_ln=do_sub_ln)
+            if (my_asm_jac is not None and system.linear_solver._assembled_jac is not my_asm_jac):
+                my_asm_jac._update(system)
+            self._linearize()
+            self._jac_age = 0
 
         self.linear_solver.solve(['linear'], 'fwd')
 
@@ -1,15 +1,51 @@
 """Define the NonlinearBlockGS class."""
 
+from __future__ import division
+
+import numpy as np
+from scipy.linalg import solve_triangular
+
 from openmdao.solvers.solver import NonlinearSolver
 
 
 class NonlinearBlockGS(NonlinearSolver):
     """
     Nonlinear block Gauss-Seidel solver.
+
+    Attributes
+    ----------
+    _anderson_q : ndarray or None
+        (k, n) array whose orthonormal rows span the stored differences of the fixed point
+        residuals used by Anderson acceleration.
+    _anderson_r : ndarray or None
+        (k, k) upper triangular factor, so that the stored residual differences are Q^T R.
+    _anderson_dg : ndarray or None
+        (k, n) array of the stored differences of the Gauss-Seidel iterates.
+    _anderson_f : ndarray or None
+        Fixed point residual (change in outputs) of the previous iteration.
+    _anderson_g : ndarray or None
+        Outputs at the end of the Gauss-Seidel sweep of the previous iteration.
     """
 
     SOLVER = 'NL: NLBGS'
 
+    def __init__(self, **kwargs):
+        """
+        Initialize all attributes.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            options dictionary.
+        """
+        super(NonlinearBlockGS, self).__init__(**kwargs)
+
+        self._anderson_q = None
+        self._anderson_r = None
+        self._anderson_dg = None
+        self._anderson_f = None
+        self._anderson_g = None
+
     def _setup_solvers(self, system, depth):
         """
         Assign system instance, set depth, and optionally perform setup.
@@ -38,6 +74,10 @@ class NonlinearBlockGS(NonlinearSolver):
                              desc='lower limit for Aitken relaxation factor')
         self.options.declare('aitken_max_factor', default=1.5,
                              desc='upper limit for Aitken relaxation factor')
+        self.options.declare('use_anderson', types=bool, default=False,
+                             desc='set to True to use Anderson acceleration')
+        self.options.declare('anderson_depth', types=int, default=5, lower=1,
+                             desc='number of previous iterations used by Anderson acceleration')
 
     def _iter_initialize(self):
         """
@@ -57,6 +97,19 @@ class NonlinearBlockGS(NonlinearSolver):
             self._aitken_work4 = self._system._outputs._clone()
             self._theta_n_1 = 1.
 
+        if self.options['use_anderson']:
+            if self.options['use_aitken']:
+                raise RuntimeError("NonlinearBlockGS in system '%s' cannot use both Aitken "
+                                   "relaxation and Anderson acceleration."
+                                   % self._system.pathname)
+
+            size = len(self._system._outputs._data)
+            self._anderson_q = np.zeros((0, size))
+            self._anderson_r = np.zeros((0, 0))
+            self._anderson_dg = np.zeros((0, size))
+            self._anderson_f = None
+            self._anderson_g = None
+
         return super(NonlinearBlockGS, self)._iter_initialize()
 
     def _iter_execute(self):
@@ -65,6 +118,7 @@ class NonlinearBlockGS(NonlinearSolver):
         """
         system = self._system
         use_aitken = self.options['use_aitken']
+        use_anderson = self.options['use_anderson']
 
         if use_aitken:
             outputs = self._system._outputs
@@ -82,6 +136,9 @@ class NonlinearBlockGS(NonlinearSolver):
             # store a copy of the outputs
             outputs_n.set_vec(outputs)
 
+        if use_anderson:
+            outputs_n = system._outputs._data.copy()
+
         self._solver_info.append_subsolver()
         for isub, subsys in enumerate(system._subsystems_myproc):
             system._transfer('nonlinear', 'fwd', isub)
@@ -121,6 +178,129 @@ class NonlinearBlockGS(NonlinearSolver):
             # save update to use in next iteration
             delta_outputs_n_1.set_vec(delta_outputs_n)
 
+        if use_anderson:
+            self._anderson_update(outputs_n)
+
+    def _inner(self, mat, vec):
+        """
+        Return the inner products of each row of mat with vec.
+
+        Parameters
+        ----------
+        mat : ndarray
+            2D array of local vector parts.
+        vec : ndarray
+            Local part of a vector.
+
+        Returns
+        -------
+        ndarray
+            The inner products.
+        """
+        prods = mat.dot(vec)
+        comm = self._system.comm
+        if comm.size > 1:
+            prods = comm.allreduce(prods)
+        return prods
+
+    def _anderson_update(self, outputs_n):
+        """
+        Replace the outputs of the Gauss-Seidel sweep with the Anderson accelerated iterate.
+
+        The Gauss-Seidel sweep is treated as a fixed point map x -> g(x) with residual
+        f = g(x) - x. The new iterate is g - dG gamma, where gamma minimizes || f - dF gamma ||
+        over the differences dF and dG of the last few residuals and sweeps. The least squares
+        problem is solved with a QR factorization of dF that is updated as columns are added
+        and removed, so each iteration only costs a few inner products.
+
+        Parameters
+        ----------
+        outputs_n : ndarray
+            Outputs before the Gauss-Seidel sweep.
+        """
+        data = self._system._outputs._data
+        g = data.copy()
+        f = g - outputs_n
+
+        if self._anderson_f is not None:
+            self._anderson_append(f - self._anderson_f, g - self._anderson_g)
+
+        self._anderson_f = f
+        self._anderson_g = g
+
+        if self._anderson_q.shape[0] > 0:
+            gamma = solve_triangular(self._anderson_r, self._inner(self._anderson_q, f))
+            data[:] = g - self._anderson_dg.T.dot(gamma)
+
+    def _anderson_append(self, df, dg):
+        """
+        Add a residual difference to the QR factorization, dropping the oldest if necessary.
+
+        Parameters
+        ----------
+        df : ndarray
+            Difference between the current and previous fixed point residuals.
+        dg : ndarray
+            Difference between the current and previous Gauss-Seidel iterates.
+        """
+        if self._anderson_q.shape[0] == self.options['anderson_depth']:
+            self._anderson_drop()
+
+        Q = self._anderson_q
+        R = self._anderson_r
+        k = Q.shape[0]
+
+        # Gram-Schmidt, repeated once to keep the rows of Q orthonormal.
+        v = df.copy()
+        r = np.zeros(k)
+        for i in range(2):
+            proj = self._inner(Q, v)
+            v -= Q.T.dot(proj)
+            r += proj
+        rho = np.sqrt(self._inner(v[np.newaxis, :], v)[0])
+
+        # skip differences that are (numerically) in the span of the stored ones
+        if rho <= 1e-12 * np.sqrt(self._inner(df[np.newaxis, :], df)[0]):
+            return
+
+        R_new = np.zeros((k + 1, k + 1))
+        R_new[:k, :k] = R
+        R_new[:k, k] = r
+        R_new[k, k] = rho
+
+        self._anderson_q = np.vstack((Q, v / rho))
+        self._anderson_r = R_new
+        self._anderson_dg = np.vstack((self._anderson_dg, dg))
+
+        # drop old differences while the least squares problem is badly conditioned
+        diag = np.abs(np.diag(self._anderson_r))
+        while diag.size > 1 and diag.max() > 1e10 * diag.min():
+            self._anderson_drop()
+            diag = np.abs(np.diag(self._anderson_r))
+
+    def _anderson_drop(self):
+        """
+        Remove the oldest difference from the QR factorization using Givens rotations.
+        """
+        Q = self._anderson_q
+        R = self._anderson_r[:, 1:]
+        k = Q.shape[0]
+
+        # R is now upper Hessenberg; rotate the subdiagonal away
+        for i in range(k - 1):
+            a, b = R[i, i], R[i + 1, i]
+            h = np.hypot(a, b)
+            if h == 0.:
+                continue
+            c, s = a / h, b / h
+            rot = np.array([[c, s], [-s, c]])
+            R[i:i + 2, i:] = rot.dot(R[i:i + 2, i:])
+            Q[i:i + 2] = rot.dot(Q[i:i + 2])
+
+        self._anderson_q = Q[:-1]
+        self._anderson_r = R[:-1]
+        self._anderson_dg = self._anderson_dg[1:]
+
     def _mpi_print_header(self):
         """
         Print header text before solving.
@@ -1,16 +1,63 @@
 """Define the NonlinearBlockJac class."""
 from openmdao.recorders.recording_iteration_stack import Recording
-from openmdao.solvers.solver import NonlinearSolver
+from openmdao.solvers.solver import NonlinearSolver, _subsystem_threads
+from openmdao.utils.concurrent import thread_map
 from openmdao.utils.mpi import multi_proc_fail_check
 
 
 class NonlinearBlockJac(NonlinearSolver):
     """
     Nonlinear block Jacobi solver.
+
+    Attributes
+    ----------
+    _num_threads : int or None
+        Number of threads used to run the subsystems, computed on the first iteration.
     """
 
     SOLVER = 'NL: NLBJ'
 
+    def __init__(self, **kwargs):
+        """
+        Initialize all attributes.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            options dictionary.
+        """
+        super(NonlinearBlockJac, self).__init__(**kwargs)
+
+        self._num_threads = None
+
+    def _declare_options(self):
+        """
+        Declare options before kwargs are processed in the init method.
+        """
+        super(NonlinearBlockJac, self)._declare_options()
+
+        self.options.declare('num_threads', types=int, default=1, lower=1,
+                             desc='Number of local threads used to run the subsystems. This '
+                                  'only helps when the subsystems spend most of their time in '
+                                  'code that releases the GIL. Subsystems are run serially '
+                                  'under MPI or when anything below this system has a '
+                                  'recorder.')
+
+    def _setup_solvers(self, system, depth):
+        """
+        Assign system instance, set depth, and optionally perform setup.
+
+        Parameters
+        ----------
+        system : <System>
+            pointer to the owning system.
+        depth : int
+            depth of the current system (already incremented).
+        """
+        super(NonlinearBlockJac, self)._setup_solvers(system, depth)
+
+        self._num_threads = None
+
     def _iter_execute(self):
         """
         Perform the operations in the iteration loop.
@@ -27,8 +74,11 @@ class NonlinearBlockJac(NonlinearSolver):
                     for subsys in system._subsystems_myproc:
                         subsys._solve_nonlinear()
             else:
-                for subsys in system._subsystems_myproc:
-                    subsys._solve_nonlinear()
+                if self._num_threads is None:
+                    self._num_threads = _subsystem_threads(system, self.options['num_threads'])
+
+                thread_map(lambda subsys: subsys._solve_nonlinear(),
+                           system._subsystems_myproc, self._num_threads)
 
             system._check_reconf_update()
             rec.abs = 0.0
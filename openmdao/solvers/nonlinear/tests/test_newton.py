@@ -736,6 +736,46 @@ class TestNewton(unittest.TestCase):
         prob.setup()
         prob.run_model()
 
+    def _run_jac_reuse(self, **options):
+        prob = Problem(model=SellarDerivatives(nonlinear_solver=NewtonSolver(**options),
+                                               linear_solver=DirectSolver()))
+        prob.setup(check=False)
+        prob.set_solver_print(level=0)
+
+        solver = prob.model.linear_solver
+        nlins = []
+        orig_linearize = solver._linearize
+
+        def counting_linearize():
+            nlins.append(1)
+            return orig_linearize()
+
+        solver._linearize = counting_linearize
+
+        prob.run_model()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+        return len(nlins), prob.model.nonlinear_solver._iter_count
+
+    def test_max_jac_reuse(self):
+        nlin, niter = self._run_jac_reuse()
+        self.assertEqual(nlin, niter)
+
+        nlin_reuse, niter_reuse = self._run_jac_reuse(max_jac_reuse=10, reuse_rate_tol=1.0)
+        self.assertEqual(nlin_reuse, 1)
+        self.assertTrue(niter_reuse > niter)
+
+        # at most 2 stale iterations after each fresh linearization
+        nlin_reuse, niter_reuse = self._run_jac_reuse(max_jac_reuse=2, reuse_rate_tol=1.0)
+        self.assertEqual(nlin_reuse, (niter_reuse + 2) // 3)
+
+    def test_max_jac_reuse_rate_fallback(self):
+        # no iteration converges fast enough to keep a stale linearization
+        nlin, niter = self._run_jac_reuse(max_jac_reuse=10, reuse_rate_tol=0.0)
+        self.assertEqual(nlin, niter)
+
     def test_err_on_maxiter(self):
         # Raise AnalysisError when it fails to converge
 
@@ -1011,6 +1051,25 @@ class TestNewtonFeatures(unittest.TestCase):
         prob.setup()
         prob.run_model()
 
+    def test_feature_max_jac_reuse(self):
+        from openmdao.api import Problem, NewtonSolver, DirectSolver
+        from openmdao.test_suite.components.sellar import SellarDerivatives
+
+        prob = Problem(model=SellarDerivatives())
+        model = prob.model
+
+        newton = model.nonlinear_solver = NewtonSolver()
+        model.linear_solver = DirectSolver()
+
+        newton.options['max_jac_reuse'] = 3
+        newton.options['reuse_rate_tol'] = 0.5
+
+        prob.setup()
+        prob.run_model()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
     def test_feature_err_on_maxiter(self):
         import numpy as np
 
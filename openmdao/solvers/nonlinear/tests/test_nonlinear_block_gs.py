@@ -300,5 +300,119 @@ class TestNLBGaussSeidel(unittest.TestCase):
         assert_rel_error(self, prob['y2'], 12.05848819, .00001)
         self.assertTrue(model.nonlinear_solver._iter_count == 5)
 
+    def test_NLBGS_Anderson(self):
+
+        prob = Problem(model=SellarDerivatives())
+        model = prob.model
+        model.nonlinear_solver = NonlinearBlockGS()
+
+        prob.setup()
+        model.nonlinear_solver.options['use_anderson'] = True
+        prob.run_model()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+        self.assertTrue(model.nonlinear_solver._iter_count == 4)
+
+    def _build_coupled_loop(self, **options):
+        prob = Problem()
+        model = prob.model
+
+        # strongly coupled loop whose Gauss-Seidel contraction factor is about 0.95
+        model.add_subsystem('c1', ExecComp('y1 = 0.9*y2 + 1.0 + 0.1*cos(y2)',
+                                           y1=np.ones(3), y2=np.ones(3)))
+        model.add_subsystem('c2', ExecComp('y2 = -1.05*y1 + 2.0',
+                                           y1=np.ones(3), y2=np.ones(3)))
+        model.connect('c1.y1', 'c2.y1')
+        model.connect('c2.y2', 'c1.y2')
+
+        model.nonlinear_solver = NonlinearBlockGS(maxiter=500, **options)
+
+        prob.set_solver_print(level=0)
+        prob.setup(check=False)
+        prob.run_model()
+
+        assert_rel_error(self, prob['c1.y1'], 1.48611469 * np.ones(3), 1e-6)
+        assert_rel_error(self, prob['c2.y2'], 0.43957958 * np.ones(3), 1e-6)
+
+        return model.nonlinear_solver._iter_count
+
+    def test_NLBGS_Anderson_coupled(self):
+        plain = self._build_coupled_loop()
+        aitken = self._build_coupled_loop(use_aitken=True)
+
+        for depth in (1, 2, 5):
+            anderson = self._build_coupled_loop(use_anderson=True, anderson_depth=depth)
+            self.assertTrue(anderson < aitken < plain)
+            self.assertTrue(anderson <= 6)
+
+    def test_NLBGS_Anderson_history(self):
+        prob = Problem()
+        model = prob.model
+
+        model.add_subsystem('px', IndepVarComp('x', np.array([1.0, 2.0, 3.0, 4.0])))
+        model.add_subsystem('c1', ExecComp('y1 = 0.5*sin(y2) + x', x=np.ones(4),
+                                           y1=np.ones(4), y2=np.ones(4)))
+        model.add_subsystem('c2', ExecComp('y2 = 0.8*cos(y1) - 0.3*y1', y1=np.ones(4),
+                                           y2=np.ones(4)))
+        model.connect('px.x', 'c1.x')
+        model.connect('c1.y1', 'c2.y1')
+        model.connect('c2.y2', 'c1.y2')
+
+        solver = model.nonlinear_solver = NonlinearBlockGS(use_anderson=True, anderson_depth=2,
+                                                           atol=1e-14, rtol=1e-14, maxiter=50)
+        prob.set_solver_print(level=0)
+        prob.setup(check=False)
+        prob.run_model()
+
+        y1 = prob['c1.y1']
+        y2 = prob['c2.y2']
+        assert_rel_error(self, y1, 0.5 * np.sin(y2) + np.array([1.0, 2.0, 3.0, 4.0]), 1e-10)
+        assert_rel_error(self, y2, 0.8 * np.cos(y1) - 0.3 * y1, 1e-10)
+
+        # the history never exceeds the requested depth and Q keeps orthonormal rows
+        Q = solver._anderson_q
+        self.assertTrue(Q.shape[0] <= 2)
+        assert_rel_error(self, Q.dot(Q.T), np.eye(Q.shape[0]), 1e-10)
+
+    def test_NLBGS_Aitken_and_Anderson(self):
+        prob = Problem(model=SellarDerivatives())
+        model = prob.model
+        model.nonlinear_solver = NonlinearBlockGS()
+
+        prob.setup()
+        model.nonlinear_solver.options['use_aitken'] = True
+        model.nonlinear_solver.options['use_anderson'] = True
+
+        with self.assertRaises(RuntimeError) as cm:
+            prob.run_model()
+
+        self.assertEqual(str(cm.exception),
+                         "NonlinearBlockGS in system '' cannot use both Aitken relaxation "
+                         "and Anderson acceleration.")
+
+    def test_feature_anderson(self):
+        import numpy as np
+
+        from openmdao.api import Problem, ExecComp, NonlinearBlockGS
+
+        prob = Problem()
+        model = prob.model
+
+        model.add_subsystem('c1', ExecComp('y1 = 0.9*y2 + 1.0 + 0.1*cos(y2)'))
+        model.add_subsystem('c2', ExecComp('y2 = -1.05*y1 + 2.0'))
+        model.connect('c1.y1', 'c2.y1')
+        model.connect('c2.y2', 'c1.y2')
+
+        model.nonlinear_solver = NonlinearBlockGS(maxiter=100)
+        model.nonlinear_solver.options['use_anderson'] = True
+        model.nonlinear_solver.options['anderson_depth'] = 3
+
+        prob.setup()
+        prob.run_model()
+
+        assert_rel_error(self, prob['c1.y1'], 1.48611469, 1e-6)
+        assert_rel_error(self, prob['c2.y2'], 0.43957958, 1e-6)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,11 @@
 """Test the Nonlinear Block Jacobi solver. """
 
+import os
+import threading
+import time
 import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
 
 import numpy as np
 
@@ -11,6 +16,7 @@ from openmdao.test_suite.components.ae_tests import AEComp, AEDriver
 from openmdao.test_suite.components.sellar import SellarDis1withDerivatives, SellarDis2withDerivatives
 from openmdao.utils.assert_utils import assert_rel_error
 from openmdao.utils.mpi import MPI
+from openmdao.recorders.sqlite_recorder import SqliteRecorder
 
 try:
     from openmdao.vectors.petsc_vector import PETScVector
@@ -155,6 +161,107 @@ class TestNLBlockJacobi(unittest.TestCase):
         assert_rel_error(self, prob['y2'], 12.05848819, .00001)
 
 
+class ThreadComp(ExplicitComponent):
+    """
+    Component that records the thread it runs on and sleeps, releasing the GIL.
+    """
+
+    def initialize(self):
+        self.threads = set()
+        self.options.declare('fail', types=bool, default=False)
+
+    def setup(self):
+        self.add_input('x', 1.0)
+        self.add_output('y', 1.0)
+
+    def compute(self, inputs, outputs):
+        self.threads.add(threading.current_thread().ident)
+        time.sleep(0.01)
+        if self.options['fail']:
+            raise AnalysisError('%s failed' % self.pathname)
+        outputs['y'] = 2.0 * inputs['x']
+
+
+class TestNLBlockJacobiThreads(unittest.TestCase):
+
+    def _build_model(self, num_threads, fail=False):
+        prob = Problem()
+        model = prob.model
+
+        model.add_subsystem('p', IndepVarComp('x', 3.0))
+        comps = []
+        for i in range(4):
+            comps.append(model.add_subsystem('c%d' % i, ThreadComp(fail=fail and i == 2)))
+            model.connect('p.x', 'c%d.x' % i)
+
+        model.nonlinear_solver = NonlinearBlockJac(num_threads=num_threads)
+
+        prob.set_solver_print(level=0)
+        prob.setup(check=False)
+
+        return prob, comps
+
+    def test_sellar_threads(self):
+        prob = Problem()
+        model = prob.model
+
+        model.add_subsystem('px', IndepVarComp('x', 1.0), promotes=['x'])
+        model.add_subsystem('pz', IndepVarComp('z', np.array([5.0, 2.0])), promotes=['z'])
+
+        model.add_subsystem('d1', SellarDis1withDerivatives(), promotes=['x', 'z', 'y1', 'y2'])
+        model.add_subsystem('d2', SellarDis2withDerivatives(), promotes=['z', 'y1', 'y2'])
+
+        model.add_subsystem('obj_cmp', ExecComp('obj = x**2 + z[1] + y1 + exp(-y2)',
+                                                z=np.array([0.0, 0.0]), x=0.0),
+                            promotes=['obj', 'x', 'z', 'y1', 'y2'])
+
+        model.linear_solver = LinearBlockGS()
+        model.nonlinear_solver = NonlinearBlockJac(num_threads=3, maxiter=100)
+
+        prob.setup(check=False)
+        prob.set_solver_print(level=0)
+        prob.run_model()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+        assert_rel_error(self, prob['obj'], 28.58830817, .00001)
+
+    def test_runs_on_threads(self):
+        prob, comps = self._build_model(2)
+        prob.run_model()
+
+        # explicit components also compute in apply_nonlinear, which is run on the main thread
+        main = threading.current_thread().ident
+        threads = set().union(*[comp.threads for comp in comps])
+        self.assertTrue(len(threads - {main}) > 0)
+
+        for i in range(4):
+            assert_rel_error(self, prob['c%d.y' % i], 6.0, 1e-12)
+
+    def test_serial_with_recorder(self):
+        prob, comps = self._build_model(2)
+        tempdir = mkdtemp()
+        try:
+            comps[1].add_recorder(SqliteRecorder(os.path.join(tempdir, 'cases.sql')))
+            prob.final_setup()
+            prob.run_model()
+            prob.cleanup()
+        finally:
+            rmtree(tempdir, ignore_errors=True)
+
+        main = threading.current_thread().ident
+        for comp in comps:
+            self.assertEqual(comp.threads, {main})
+
+    def test_analysis_error(self):
+        prob, comps = self._build_model(4, fail=True)
+
+        with self.assertRaises(AnalysisError) as cm:
+            prob.run_model()
+
+        self.assertEqual(str(cm.exception), 'c2 failed')
+
+
 @unittest.skipUnless(PETScVector, "PETSc is required.")
 class TestNonlinearBlockJacobiMPI(unittest.TestCase):
 
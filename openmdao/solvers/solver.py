@@ -747,6 +747,9 @@ class LinearSolver(Solver):
                              desc='Activates use of assembled jacobian by this solver.')
 
         self.supports.declare('assembled_jac', types=bool, default=True)
+        # solvers that set 'multi_rhs' must define _solve_multi_rhs(rhs, mode), which solves
+        # for a 2D array of scaled right-hand sides and returns the 2D array of solutions.
+        self.supports.declare('multi_rhs', types=bool, default=False)
 
     def _setup_solvers(self, system, depth):
         """
@@ -881,3 +884,37 @@ class BlockLinearSolver(LinearSolver):
         """
         super(BlockLinearSolver, self)._declare_options()
         self.supports['assembled_jac'] = False
+
+
+def _subsystem_threads(system, num_threads):
+    """
+    Return the number of threads that can be used to run the subsystems of a system.
+
+    Neither MPI communication nor case recording is thread-safe, so the subsystems are run
+    serially when running under MPI or when anything below the system has a recorder.
+
+    Parameters
+    ----------
+    system : <System>
+        The system whose subsystems are run.
+    num_threads : int
+        Number of threads requested.
+
+    Returns
+    -------
+    int
+        Number of threads to use, where 1 means serial execution.
+    """
+    if num_threads <= 1 or system.comm.size > 1:
+        return 1
+
+    for subsys in system.system_iter(recurse=True):
+        if subsys._rec_mgr.has_recorders():
+            return 1
+        for solver in (subsys._nonlinear_solver, subsys._linear_solver):
+            for slv in (solver, getattr(solver, 'linesearch', None),
+                        getattr(solver, 'precon', None)):
+                if slv is not None and slv._rec_mgr.has_recorders():
+                    return 1
+
+    return num_threads
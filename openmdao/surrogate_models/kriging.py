@@ -9,6 +9,17 @@ from openmdao.surrogate_models.surrogate_model import SurrogateModel
 
 MACHINE_EPSILON = np.finfo(np.double).eps
 
+# Tikhonov regularization of the correlation matrix, relative to its largest eigenvalue
+_TIKHONOV = 1e-8
+
+# smallest reciprocal condition number of the correlation matrix for which the regularization is
+# negligible, so that the Cholesky factorization can be used
+_MIN_RCOND = 1e-4
+
+# step in log(theta) of the finite difference gradient of the likelihood, used when the
+# correlation matrix is regularized
+_FD_STEP = 1e-3
+
 
 class KrigingSurrogate(SurrogateModel):
     """
@@ -33,8 +44,14 @@ class KrigingSurrogate(SurrogateModel):
         Nugget smoothing parameter for smoothing noisy data. Represents the variance
         of the input values. If nugget is an ndarray, it must be of the same length
         as the number of training points. Default: 10. * Machine Epsilon
+    R_inv_sqrt : ndarray
+        Matrix W such that W W^T is the inverse of the regularized correlation matrix of the
+        training points.
     sigma2 : ndarray
         Reduced likelihood parameter: sigma squared
+    subset_size : int or None
+        If given and there are more training points than this, the hyperparameters are
+        optimized using a random subset of this many training points.
     thetas : ndarray
         Kriging hyperparameters.
     X : ndarray
@@ -49,9 +66,11 @@ class KrigingSurrogate(SurrogateModel):
         Mean of training model response values, normalized.
     Y_std : ndarray
         Standard deviation of training model response values, normalized.
+    _x_train : ndarray or None
+        Training input values from the last training, used to detect appended samples.
     """
 
-    def __init__(self, nugget=10. * MACHINE_EPSILON, eval_rmse=False):
+    def __init__(self, nugget=10. * MACHINE_EPSILON, eval_rmse=False, subset_size=None):
         """
         Initialize all attributes.
 
@@ -65,6 +84,10 @@ class KrigingSurrogate(SurrogateModel):
         eval_rmse : bool
             Flag indicating whether the Root Mean Squared Error (RMSE) should be computed.
             Set to False by default.
+        subset_size : int or None
+            If given and there are more training points than this, the hyperparameters are
+            optimized using a random subset of this many training points, which makes training
+            with large sample sets affordable. The final model still uses all training points.
         """
         super(KrigingSurrogate, self).__init__()
 
@@ -77,6 +100,7 @@ class KrigingSurrogate(SurrogateModel):
 
         self.alpha = np.zeros(0)
         self.L = np.zeros(0)
+        self.R_inv_sqrt = np.zeros(0)
         self.sigma2 = np.zeros(0)
 
         # Normalized Training Values
@@ -88,11 +112,17 @@ class KrigingSurrogate(SurrogateModel):
         self.Y_std = np.zeros(0)
 
         self.eval_rmse = eval_rmse
+        self.subset_size = subset_size
+        self._x_train = None
 
     def train(self, x, y):
         """
         Train the surrogate model with the given set of inputs and outputs.
 
+        If the surrogate was previously trained and the new training inputs only append samples
+        to the previous ones, the hyperparameter optimization starts from the previous
+        hyperparameters.
+
         Parameters
         ----------
         x : array-like
@@ -121,21 +151,35 @@ class KrigingSurrogate(SurrogateModel):
         X = (x - X_mean) / X_std
         Y = (y - Y_mean) / Y_std
 
+        bounds = [(np.log(1e-5), np.log(1e5)) for _ in range(self.n_dims)]
+
+        x0 = 1e-1 * np.ones(self.n_dims)
+        x_old = self._x_train
+        if x_old is not None and x_old.shape[1] == self.n_dims and \
+                x_old.shape[0] <= self.n_samples and np.array_equal(x[:x_old.shape[0]], x_old):
+            # warm start, accounting for the change in the normalization of the inputs
+            x0 = np.clip(np.log(self.thetas) + 2. * np.log(X_std / self.X_std),
+                         bounds[0][0], bounds[0][1])
+
         self.X = X
         self.Y = Y
         self.X_mean, self.X_std = X_mean, X_std
         self.Y_mean, self.Y_std = Y_mean, Y_std
+        self._x_train = x.copy()
 
-        def _calcll(thetas):
-            """Calculate loglike (callback function)."""
-            loglike = self._calculate_reduced_likelihood_params(np.exp(thetas))[0]
-            return -loglike
+        samples = None
+        if self.subset_size is not None and self.n_samples > self.subset_size:
+            samples = np.sort(np.random.RandomState(0).choice(self.n_samples, self.subset_size,
+                                                              replace=False))
 
-        bounds = [(np.log(1e-5), np.log(1e5)) for _ in range(self.n_dims)]
+        def _calcll(thetas):
+            """Calculate loglike and its gradient (callback function)."""
+            loglike, params = self._calculate_reduced_likelihood_params(np.exp(thetas),
+                                                                        samples=samples,
+                                                                        compute_grad=True)
+            return -loglike, -params['grad']
 
-        optResult = minimize(_calcll, 1e-1 * np.ones(self.n_dims), method='slsqp',
-                             options={'eps': 1e-3},
-                             bounds=bounds)
+        optResult = minimize(_calcll, x0, method='slsqp', jac=True, bounds=bounds)
 
         if not optResult.success:
             raise ValueError(
@@ -144,12 +188,11 @@ class KrigingSurrogate(SurrogateModel):
         self.thetas = np.exp(optResult.x)
         _, params = self._calculate_reduced_likelihood_params()
         self.alpha = params['alpha']
-        self.U = params['U']
-        self.S_inv = params['S_inv']
-        self.Vh = params['Vh']
+        self.R_inv_sqrt = params['R_inv_sqrt']
         self.sigma2 = params['sigma2']
 
-    def _calculate_reduced_likelihood_params(self, thetas=None):
+    def _calculate_reduced_likelihood_params(self, thetas=None, samples=None,
+                                             compute_grad=False):
         """
         Calculate quantity with same maximum location as the log-likelihood for a given theta.
 
@@ -158,6 +201,11 @@ class KrigingSurrogate(SurrogateModel):
         thetas : ndarray, optional
             Given input correlation coefficients. If none given, uses self.thetas
             from training.
+        samples : ndarray or None
+            Indices of the training points to use. All of them are used if None.
+        compute_grad : bool
+            If True, also compute the gradient of the reduced likelihood with respect to the
+            logarithm of the thetas. It is only analytic if R is well conditioned.
 
         Returns
         -------
@@ -170,38 +218,77 @@ class KrigingSurrogate(SurrogateModel):
             thetas = self.thetas
 
         X, Y = self.X, self.Y
+        nugget = self.nugget
+        if samples is not None:
+            X, Y = X[samples], Y[samples]
+            if np.ndim(nugget) > 0:
+                nugget = np.asarray(nugget)[samples]
+        n_samples = X.shape[0]
         params = {}
 
         # Correlation Matrix
-        distances = np.zeros((self.n_samples, self.n_dims, self.n_samples))
-        for i in range(self.n_samples):
-            distances[i, :, i + 1:] = np.abs(X[i, ...] - X[i + 1:, ...]).T
-            distances[i + 1:, :, i] = distances[i, :, i + 1:].T
-
-        R = np.exp(-thetas.dot(np.square(distances)))
-        R[np.diag_indices_from(R)] = 1. + self.nugget
-
-        [U, S, Vh] = linalg.svd(R)
-
-        # Penrose-Moore Pseudo-Inverse:
-        # Given A = USV^* and Ax=b, the least-squares solution is
-        # x = V S^-1 U^* b.
-        # Tikhonov regularization is used to make the solution significantly
-        # more robust.
-        h = 1e-8 * S[0]
-        inv_factors = S / (S ** 2. + h ** 2.)
-
-        alpha = Vh.T.dot(np.einsum('j,kj,kl->jl', inv_factors, U, Y))
-        logdet = -np.sum(np.log(inv_factors))
-        sigma2 = np.dot(Y.T, alpha).sum(axis=0) / self.n_samples
-        reduced_likelihood = -(np.log(np.sum(sigma2)) +
-                               logdet / self.n_samples)
+        distances = np.zeros((n_samples, n_samples))
+        for theta, x_k in zip(thetas, X.T):
+            distances += theta * np.square(x_k[:, np.newaxis] - x_k)
+        R = np.exp(-distances)
+        R[np.diag_indices_from(R)] = 1. + nugget
+
+        # The correlation matrix is regularized by replacing each of its eigenvalues s with
+        # s + h^2 / s, where h is a small fraction of the largest eigenvalue. When R is well
+        # conditioned this has no effect, and the much cheaper Cholesky factorization is used.
+        try:
+            L = linalg.cholesky(R, lower=True)
+            rcond, _ = linalg.lapack.dpocon(L, np.max(np.sum(R, axis=0)), uplo='L')
+        except linalg.LinAlgError:
+            L, rcond = None, 0.
+
+        if rcond >= _MIN_RCOND:
+            alpha = linalg.cho_solve((L, True), Y)
+            R_inv_sqrt = linalg.solve_triangular(L, np.eye(n_samples), lower=True).T
+            logdet = 2. * np.sum(np.log(np.diag(L)))
+        else:
+            S, Q = linalg.eigh(R)
+            h = _TIKHONOV * S[-1]
+            S2h2 = S ** 2 + h ** 2
+            inv_factors = S / S2h2
+            R_inv_sqrt = Q * np.sqrt(np.maximum(inv_factors, 0.))
+            alpha = np.dot(Q * inv_factors, np.dot(Q.T, Y))
+            logdet = np.sum(np.log(S2h2 / np.abs(S)))
+
+        sigma2 = np.dot(Y.T, alpha).sum(axis=0) / n_samples
+        sigma2_sum = np.sum(sigma2)
+        reduced_likelihood = -(np.log(sigma2_sum) + logdet / n_samples)
+
+        if compute_grad and rcond < _MIN_RCOND:
+            # the regularized likelihood depends on eigenvalues of R that are at the level of
+            # round-off, so its analytic gradient is meaningless. Forward differences with a
+            # large step smooth out that noise.
+            grad = np.empty(len(thetas))
+            for k in range(len(thetas)):
+                step = np.zeros(len(thetas))
+                step[k] = _FD_STEP
+                loglike = self._calculate_reduced_likelihood_params(thetas * np.exp(step),
+                                                                    samples=samples)[0]
+                grad[k] = (loglike - reduced_likelihood) / _FD_STEP
+            params['grad'] = grad
+
+        elif compute_grad:
+            # sum(sigma2) = a^T R^-1 a / n, with a the sum of Y over the outputs. G holds the
+            # derivatives of reduced_likelihood wrt the entries of R.
+            a_inv = alpha.sum(axis=1)
+            G = (np.outer(a_inv, a_inv) / sigma2_sum - np.dot(R_inv_sqrt, R_inv_sqrt.T)) / \
+                n_samples
+            G *= R
+
+            # dR/dlog(theta_k) = -theta_k * (x_k_i - x_k_j)^2 * R
+            grad = np.empty(len(thetas))
+            for k, (theta, x_k) in enumerate(zip(thetas, X.T)):
+                grad[k] = -theta * np.sum(np.square(x_k[:, np.newaxis] - x_k) * G)
+            params['grad'] = grad
 
         params['alpha'] = alpha
         params['sigma2'] = sigma2 * np.square(self.Y_std)
-        params['S_inv'] = inv_factors
-        params['U'] = U
-        params['Vh'] = Vh
+        params['R_inv_sqrt'] = R_inv_sqrt
 
         return reduced_likelihood, params
 
@@ -223,18 +310,14 @@ class KrigingSurrogate(SurrogateModel):
         """
         super(KrigingSurrogate, self).predict(x)
 
-        thetas = self.thetas
         if isinstance(x, list):
             x = np.array(x)
         x = np.atleast_2d(x)
-        n_eval = x.shape[0]
 
         # Normalize input
         x_n = (x - self.X_mean) / self.X_std
 
-        r = np.zeros((n_eval, self.n_samples), dtype=x.dtype)
-        for r_i, x_i in zip(r, x_n):
-            r_i[:] = np.exp(-thetas.dot(np.square((x_i - self.X).T)))
+        r = self._correlation(x_n)
 
         # Scaled Predictor
         y_t = np.dot(r, self.alpha)
@@ -243,8 +326,9 @@ class KrigingSurrogate(SurrogateModel):
         y = self.Y_mean + self.Y_std * y_t
 
         if self.eval_rmse:
-            mse = (1. - np.dot(np.dot(r, self.Vh.T),
-                               np.einsum('j,kj,lk->jl', self.S_inv, self.U, r))) * self.sigma2
+            # only the diagonal of r R^-1 r^T is needed
+            mse = (1. - np.sum(np.square(np.dot(r, self.R_inv_sqrt)), axis=1))[:, np.newaxis] * \
+                self.sigma2
 
             # Forcing negative RMSE to zero if negative due to machine precision
             mse[mse < 0.] = 0.
@@ -252,6 +336,25 @@ class KrigingSurrogate(SurrogateModel):
 
         return y
 
+    def vectorized_predict(self, x):
+        """
+        Calculate predicted values of the response at several points.
+
+        Parameters
+        ----------
+        x : array-like
+            Array of shape (num_points, num_inputs) holding the points at which the surrogate
+            is evaluated.
+
+        Returns
+        -------
+        ndarray
+            Kriging prediction at each point.
+        ndarray, optional (if eval_rmse is True)
+            Root mean square of the prediction error at each point.
+        """
+        return KrigingSurrogate.predict(self, x)
+
     def linearize(self, x):
         """
         Calculate the jacobian of the Kriging surface at the requested point.
@@ -281,6 +384,59 @@ class KrigingSurrogate(SurrogateModel):
                         self.X_std, gradr.dot(self.alpha).T)
         return jac
 
+    def vectorized_linearize(self, x):
+        """
+        Calculate the jacobians of the Kriging surface at several points.
+
+        Parameters
+        ----------
+        x : array-like
+            Array of shape (num_points, num_inputs) holding the points at which the surrogate
+            Jacobian is evaluated.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (num_points, num_outputs, num_inputs) holding the Jacobian of the
+            surrogate outputs wrt inputs at each point.
+        """
+        x_n = (np.atleast_2d(x) - self.X_mean) / self.X_std
+        n_eval = x_n.shape[0]
+        n_outputs = self.alpha.shape[1]
+
+        r = self._correlation(x_n)
+
+        # sum_j r[i, j] * (x_n[i, k] - X[j, k]) * alpha[j, l], without forming the differences
+        # for every point and training point
+        r_alpha = r.dot(self.alpha)
+        X_alpha = np.einsum('jk,jl->jlk', self.X, self.alpha).reshape(self.n_samples, -1)
+        r_X_alpha = r.dot(X_alpha).reshape(n_eval, n_outputs, self.n_dims)
+        gradr_alpha = -2. * self.thetas * (x_n[:, np.newaxis, :] * r_alpha[:, :, np.newaxis] -
+                                           r_X_alpha)
+
+        return gradr_alpha * (self.Y_std[:, np.newaxis] / self.X_std)
+
+    def _correlation(self, x_n):
+        """
+        Compute the correlation of several normalized points with each training point.
+
+        Parameters
+        ----------
+        x_n : ndarray
+            Array of shape (num_points, num_inputs) holding the normalized points.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (num_points, num_samples) holding the correlations.
+        """
+        # accumulate one dimension at a time to avoid a (num_points, num_samples, num_inputs)
+        # temporary array
+        dist = np.zeros((x_n.shape[0], self.n_samples), dtype=x_n.dtype)
+        for theta, x_k, X_k in zip(self.thetas, x_n.T, self.X.T):
+            dist += theta * np.square(x_k[:, np.newaxis] - X_k)
+        return np.exp(-dist)
+
 
 class FloatKrigingSurrogate(KrigingSurrogate):
     """
@@ -305,3 +461,23 @@ class FloatKrigingSurrogate(KrigingSurrogate):
         """
         dist = super(FloatKrigingSurrogate, self).predict(x)
         return dist[0]  # mean value
+
+    def vectorized_predict(self, x):
+        """
+        Calculate predicted values of the response at several points.
+
+        Parameters
+        ----------
+        x : array-like
+            Array of shape (num_points, num_inputs) holding the points at which the surrogate
+            is evaluated.
+
+        Returns
+        -------
+        ndarray
+            Mean value of kriging prediction at each point.
+        """
+        dist = super(FloatKrigingSurrogate, self).vectorized_predict(x)
+        if isinstance(dist, tuple):
+            return dist[0]
+        return dist
@@ -5,6 +5,9 @@ https://github.com/SMarone/NDInterp
 """
 
 from collections import OrderedDict
+
+import numpy as np
+
 from openmdao.surrogate_models.surrogate_model import SurrogateModel
 from openmdao.surrogate_models.nn_interpolators.linear_interpolator import \
     LinearInterpolator
@@ -112,3 +115,43 @@ class NearestNeighbor(SurrogateModel):
         if jac.shape[0] == 1 and len(jac.shape) > 2:
             return jac[0, ...]
         return jac
+
+    def vectorized_predict(self, x, **kwargs):
+        """
+        Calculate predicted values of the response at several points.
+
+        Parameters
+        ----------
+        x : array-like
+            Array of shape (num_points, num_inputs) holding the points at which the surrogate
+            is evaluated.
+        **kwargs : dict
+            Additional keyword arguments passed to the interpolant.
+
+        Returns
+        -------
+        ndarray
+            Predicted values at each point.
+        """
+        super(NearestNeighbor, self).predict(x)
+        return self.interpolant(np.atleast_2d(x), **kwargs)
+
+    def vectorized_linearize(self, x, **kwargs):
+        """
+        Calculate the jacobians of the interpolant at several points.
+
+        Parameters
+        ----------
+        x : array-like
+            Array of shape (num_points, num_inputs) holding the points at which the surrogate
+            Jacobian is evaluated.
+        **kwargs : dict
+            Additional keyword arguments passed to the interpolant.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (num_points, num_outputs, num_inputs) holding the Jacobian of the
+            surrogate outputs wrt inputs at each point.
+        """
+        return self.interpolant.gradient(np.atleast_2d(x), **kwargs)
@@ -3,7 +3,9 @@
 import numpy as np
 
 from openmdao.surrogate_models.nn_interpolators.nn_base import NNBase
-from six.moves import range
+
+# relative size of the determinant below which the neighbors are considered collinear
+_COLLINEAR_TOL = 1e-12
 
 
 class LinearInterpolator(NNBase):
@@ -13,7 +15,7 @@ class LinearInterpolator(NNBase):
 
     def _find_hyperplane(self, neighbor_idx):
         """
-        Find hyperplane.
+        Find the hyperplane through the nearest neighbors of each prediction point.
 
         Parameters
         ----------
@@ -23,46 +25,29 @@ class LinearInterpolator(NNBase):
         Returns
         -------
         ndarray
-            Normal vector for the hyperplane.
+            ndarray of shape (num_points x independent dims x dependent dims) containing the
+            slopes of the hyperplanes.
         ndarray
-            Constant of the hyperplane.
+            Boolean ndarray of shape (num_points,) that is False where the neighbors are
+            collinear, so that no hyperplane is defined.
         """
-        # Extra Inputs for Finding the normal are found below
-        # Number of row vectors needed always dimensions - 1
-        indep_dims = self._indep_dims
-        dep_dims = self._dep_dims
-
-        # Number of Prediction Points
-        nppts = neighbor_idx.shape[0]
-
-        # Preallocate storage
-        pc = np.empty((nppts, dep_dims), dtype='float')
-        normal = np.empty((nppts, indep_dims + 1, dep_dims), dtype='float')
-        nvect = np.empty((nppts, indep_dims, indep_dims + 1), dtype='float')
-        trnd = np.concatenate((self._tp[neighbor_idx, :],
-                               self._tv[neighbor_idx, 0].reshape(nppts, indep_dims + 1, 1)),
-                              axis=2)
-        nvect[:, :, :-1] = trnd[:, 1:, :-1] - trnd[:, :-1, :-1]
-
-        for i in range(dep_dims):
-            # Planar vectors need both dep and ind dimensions
-            trnd[:, :, -1] = self._tv[neighbor_idx, i]
-
-            # Go through each neighbor
-            # Creates array[neighbor, dimension] from NN results
-            nvect[:, :, -1] = trnd[:, 1:, -1] - trnd[:, :-1, -1]
-
-            # Normal vector is in the null space of nvect.
-            # Since nvect is of size indep x (indep + 1),
-            # the normal vector will be the last entry in
-            # V in the U, Sigma, V = svd(nvect).
-            normal[:, :, i] = np.linalg.svd(nvect)[2][:, -1, :]
-
-            # Use the point of the closest neighbor to
-            # solve for pc - the constant of the n-dimensional plane.
-            pc[:, i] = np.einsum('ij,ij->i', trnd[:, 0, :], normal[:, :, i])
-
-        return normal, pc
+        tp = self._tp[neighbor_idx]
+        tv = self._tv[neighbor_idx]
+
+        # The hyperplane passes through the closest neighbor, and its slopes solve
+        # (x_j - x_0) . slopes = v_j - v_0 for the other neighbors, for all points at once.
+        dx = tp[:, 1:, :] - tp[:, :1, :]
+        dv = tv[:, 1:, :] - tv[:, :1, :]
+
+        # Hadamard's inequality bounds the determinant by the product of the row norms.
+        det = np.abs(np.linalg.det(dx))
+        good = det > _COLLINEAR_TOL * np.prod(np.linalg.norm(dx, axis=2), axis=1)
+
+        slopes = np.zeros((neighbor_idx.shape[0], self._indep_dims, self._dep_dims))
+        if np.any(good):
+            slopes[good] = np.linalg.solve(dx[good], dv[good])
+
+        return slopes, good
 
     def __call__(self, prediction_points):
         """
@@ -87,30 +72,18 @@ class LinearInterpolator(NNBase):
         # Linear interp only uses as many neighbors as it has dimensions
         points_needed = self._indep_dims + 1
 
-        # KData query takes (data, #ofneighbors) to determine closest
-        # training points to predicted data
-        ndist, nloc = self._KData.query(normalized_pts.real, points_needed)
-
-        normal, pc = self._find_hyperplane(nloc)
+        ndist, nloc = self._find_neighbors(normalized_pts, points_needed)
 
-        # Set all predictions from values on plane
-        predictions = np.einsum('ij,ijk->ik', normalized_pts,
-                                normal[:, :self._indep_dims, :]) - pc
+        slopes, good = self._find_hyperplane(nloc)
 
-        # Check to see if there are any collinear points and replace them
-        n0 = np.where(normal[:, -1, :] == 0)
-        predictions[n0, :] = self._tv[nloc[0, n0], :]
-
-        # Finish computation for the good normals
-        n = np.where(normal[:, -1, :] != 0)
-        predictions[n] /= -normal[:, -1, :][n]
+        # Set all predictions from values on plane. Where the neighbors are collinear, the value
+        # of the closest neighbor is used.
+        closest = nloc[:, 0]
+        predictions = self._tv[closest] + np.einsum('ij,ijk->ik',
+                                                    normalized_pts - self._tp[closest], slopes)
 
         # Rescale to original units
-        predictions = (predictions * self._tvr) + self._tvm
-
-        self._pt_cache = (normalized_pts, ndist, nloc)
-
-        return predictions
+        return (predictions * self._tvr) + self._tvm
 
     def gradient(self, prediciton_points):
         """
@@ -131,24 +104,11 @@ class LinearInterpolator(NNBase):
             prediciton_points.shape = (1, prediciton_points.shape[0])
 
         normPredPts = (prediciton_points - self._tpm) / self._tpr
-        nppts = normPredPts.shape[0]
-        gradient = np.zeros((nppts, self._dep_dims, self._indep_dims), dtype="float")
 
         # Linear interp only uses as many neighbors as it has dimensions
-        dims = self._indep_dims + 1
-
-        # Find the neighbors
-        if self._pt_cache is not None and \
-                np.allclose(self._pt_cache[0], normPredPts):
-            ndist, nloc = self._pt_cache[1:]
-        else:
-            ndist, nloc = self._KData.query(normPredPts.real, dims)
-
-        normal, pc = self._find_hyperplane(nloc)
-        if np.any(normal[:, -1, :]) == 0:
-            return gradient
-        gradient[:] = (-normal[:, :-1, :] / normal[:, -1, :]).squeeze().T
+        ndist, nloc = self._find_neighbors(normPredPts, self._indep_dims + 1)
 
-        grad = gradient * (self._tvr[:, np.newaxis] / self._tpr)
+        # the gradient is left at zero where the neighbors are collinear
+        slopes, good = self._find_hyperplane(nloc)
 
-        return grad
+        return slopes.transpose(0, 2, 1) * (self._tvr[:, np.newaxis] / self._tpr)
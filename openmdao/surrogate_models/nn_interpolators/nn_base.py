@@ -38,11 +38,13 @@ class NNBase(object):
         Number of training points
     _KData : scipy.spatial.cKDTree
         KDTree used for finding the nearest neighbors.
+    _num_workers : int
+        Number of workers used to query the KDTree.
     _pt_cache : tuple(ndarray, ndarray, ndarray)
         Internal cache of the last found neighbors.
     """
 
-    def __init__(self, training_points, training_values, num_leaves=2):
+    def __init__(self, training_points, training_values, num_leaves=None, num_workers=1):
         """
         Initialize nearest neighbor interpolant by scaling input to the unit hypercube.
 
@@ -54,8 +56,13 @@ class NNBase(object):
         training_values : ndarray
             ndarray of shape (num_points x dependent dims) containing training output values.
 
-        num_leaves : int
-            How many leaves the tree should have.
+        num_leaves : int or None
+            How many leaves the tree should have. If None, each leaf holds up to 16 points,
+            which keeps the queries fast for any number of training points.
+
+        num_workers : int
+            Number of workers used to find the nearest neighbors of many points in parallel.
+            If -1, all available CPUs are used.
         """
         # training_points and training_values are the known points and their
         # respective values which will be interpolated against.
@@ -79,8 +86,53 @@ class NNBase(object):
         self._ntpts = training_points.shape[0]
 
         # Make training data into a Tree
-        leavesz = ceil(self._ntpts / float(num_leaves))
+        if num_leaves is None:
+            leavesz = 16
+        else:
+            leavesz = ceil(self._ntpts / float(num_leaves))
         self._KData = cKDTree(self._tp, leafsize=leavesz)
+        self._num_workers = num_workers
 
         # Cache for gradients
         self._pt_cache = None
+
+    def _find_neighbors(self, normalized_pts, num_neighbors):
+        """
+        Find the nearest training points of each of the given points.
+
+        The neighbors found by the last query are reused if it was made for the same points.
+
+        Parameters
+        ----------
+        normalized_pts : ndarray
+            ndarray of shape (num_points x independent dims) containing normalized points.
+        num_neighbors : int
+            Number of neighbors to find.
+
+        Returns
+        -------
+        ndarray
+            ndarray of shape (num_points x num_neighbors) containing the distances to the
+            neighbors, sorted in increasing order.
+        ndarray
+            ndarray of shape (num_points x num_neighbors) containing the indices of the neighbors.
+        """
+        cache = self._pt_cache
+        if cache is not None and cache[0].shape == normalized_pts.shape and \
+                cache[2].shape[1] == num_neighbors and np.array_equal(cache[0], normalized_pts):
+            return cache[1:]
+
+        pts = normalized_pts.real
+        try:
+            ndist, nloc = self._KData.query(pts, num_neighbors, workers=self._num_workers)
+        except TypeError:
+            # older versions of scipy
+            ndist, nloc = self._KData.query(pts, num_neighbors, n_jobs=self._num_workers)
+
+        if num_neighbors == 1:
+            ndist = ndist[:, np.newaxis]
+            nloc = nloc[:, np.newaxis]
+
+        self._pt_cache = (normalized_pts.copy(), ndist, nloc)
+
+        return ndist, nloc
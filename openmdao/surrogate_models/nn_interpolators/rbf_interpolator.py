@@ -3,8 +3,7 @@
 import numpy as np
 
 from openmdao.surrogate_models.nn_interpolators.nn_base import NNBase
-from six.moves import range
-from scipy.sparse import csc_matrix
+from scipy.sparse import csr_matrix
 from scipy.sparse.linalg import spsolve
 
 
@@ -39,11 +38,9 @@ class RBFInterpolator(NNBase):
 
         Returns
         -------
-        ndarray
-            Evaluation of RBF polynomial.
+        csr_matrix
+            Evaluation of RBF polynomial, of shape (npp x number of training points).
         """
-        R = np.zeros((npp, self._ntpts), dtype="float")
-
         # Choose type of CRBF R matrix
         if self.rbf_family == -1:
             # Comp #1 - a
@@ -165,10 +162,10 @@ class RBFInterpolator(NNBase):
 
         Cb = np.polyval(cb_poly, T)
 
-        for i in range(npp):
-            R[i, neighbor_idx[i, :-1]] = Cf[i, :] * Cb[i, :]
-
-        return R
+        # each row only has entries for the neighbors of that point, except the farthest one
+        nnz = T.shape[1]
+        return csr_matrix(((Cf * Cb).ravel(), neighbor_idx[:, :-1].ravel(),
+                           np.arange(0, npp * nnz + 1, nnz)), shape=(npp, self._ntpts))
 
     def _find_dR(self, prediction_points, neighbor_idx, neighbor_dists):
         """
@@ -320,8 +317,8 @@ class RBFInterpolator(NNBase):
 
         return grad.reshape((prediction_points.shape[0], self._dep_dims, self._indep_dims))
 
-    def __init__(self, training_points, training_values, num_leaves=2, num_neighbors=5,
-                 rbf_family=2):
+    def __init__(self, training_points, training_values, num_leaves=None, num_neighbors=5,
+                 rbf_family=2, num_workers=1):
         """
         Initialize all attributes.
 
@@ -331,16 +328,20 @@ class RBFInterpolator(NNBase):
             ndarray of shape (num_points x independent dims) containing training input locations.
         training_values : ndarray
             ndarray of shape (num_points x dependent dims) containing training output values.
-        num_leaves : int
-            How many leaves the tree should have.
+        num_leaves : int or None
+            How many leaves the tree should have. If None, each leaf holds up to 16 points.
         num_neighbors : int
             The number of neighbors to use for interpolation.
         rbf_family : int
             Specifies the order of the radial basis function to be used.
             <-2> uses an 11th order, <-1> uses a 9th order, and any value from <0> to <4> uses an
             order equal to <floor((dimensions-1)/2) + (3*comp) +1>.
+        num_workers : int
+            Number of workers used to find the nearest neighbors of many points in parallel.
+            If -1, all available CPUs are used.
         """
-        super(RBFInterpolator, self).__init__(training_points, training_values, num_leaves)
+        super(RBFInterpolator, self).__init__(training_points, training_values, num_leaves,
+                                              num_workers)
 
         if self._ntpts < num_neighbors:
             raise ValueError('RBFInterpolator only given {0} training points, '
@@ -350,11 +351,11 @@ class RBFInterpolator(NNBase):
         self.rbf_family = rbf_family
 
         # For weights, first find the training points radial neighbors
-        tdist, tloc = self._KData.query(self._tp, num_neighbors)
+        tdist, tloc = self._find_neighbors(self._tp, num_neighbors)
         Tt = tdist[:, :-1] / tdist[:, -1:]
         # Next determine weight matrix
         Rt = self._find_R(self._ntpts, Tt, tloc)
-        weights = (spsolve(csc_matrix(Rt), self._tv))[..., np.newaxis]
+        weights = (spsolve(Rt.tocsc(), self._tv))[..., np.newaxis]
 
         self.N = num_neighbors
         self.weights = weights
@@ -380,23 +381,22 @@ class RBFInterpolator(NNBase):
         normalized_pts = (prediction_points - self._tpm) / self._tpr
         nppts = normalized_pts.shape[0]
         # Setup prediction points and find their radial neighbors
-        ndist, nloc = self._KData.query(normalized_pts, self.N)
+        ndist, nloc = self._find_neighbors(normalized_pts, self.N)
         # Check if complex step is being run
         if np.any(np.abs(normalized_pts[0, :].imag)) > 0:
             dimdiff = np.subtract(normalized_pts.reshape((nppts, 1, self._indep_dims)),
                                   self._tp[nloc, :])
             # KD Tree ignores imaginary part, muse redo ndist if complex
             ndist = np.sqrt(np.sum((dimdiff * dimdiff), axis=2))
+            self._pt_cache = (self._pt_cache[0], ndist, nloc)
 
         # Take farthest distance of each point
         Tp = ndist[:, :-1] / ndist[:, -1:]
 
         Rp = self._find_R(nppts, Tp, nloc)
-        predz = ((np.dot(Rp, self.weights[..., 0]) * self._tvr) +
+        predz = ((Rp.dot(self.weights[..., 0]) * self._tvr) +
                  self._tvm).reshape(nppts, self._dep_dims)
 
-        self._pt_cache = (normalized_pts, ndist, nloc)
-
         return predz
 
     def gradient(self, prediction_points):
@@ -419,11 +419,7 @@ class RBFInterpolator(NNBase):
 
         normalized_pts = (prediction_points - self._tpm) / self._tpr
         # Setup prediction points and find their radial neighbors
-        if self._pt_cache is not None and \
-                np.allclose(self._pt_cache[0], normalized_pts):
-            pdist, ploc = self._pt_cache[1:]
-        else:
-            pdist, ploc = self._KData.query(normalized_pts, self.N)
+        pdist, ploc = self._find_neighbors(normalized_pts, self.N)
 
         # Find Gradient
         grad = self._find_dR(normalized_pts[:, np.newaxis, :], ploc,
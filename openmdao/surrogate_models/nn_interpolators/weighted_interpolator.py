@@ -77,16 +77,7 @@ class WeightedInterpolator(NNBase):
         normalized_pts = (prediction_points - self._tpm) / self._tpr
 
         # Find them neigbors
-        # KData query takes (data, #ofneighbors) to determine closest
-        # training points to predicted data
-        ndist, nloc = self._KData.query(normalized_pts.real, num_neighbors)
-
-        # Setup problem
-
-        # Reshape ndist for 1D problems.
-        if len(ndist.shape) == 1:
-            ndist.shape = (1, ndist.shape[0])
-            nloc.shape = (1, nloc.shape[0])
+        ndist, nloc = self._find_neighbors(normalized_pts, num_neighbors)
 
         weights = self._get_weights(ndist, dist_eff)
 
@@ -95,8 +86,6 @@ class WeightedInterpolator(NNBase):
         wt = np.einsum('ijk,ij->ik', vals, weights)
         predz = ((wt / weight_sum[:, np.newaxis]) * self._tvr) + self._tvm
 
-        self._pt_cache = (normalized_pts, ndist, nloc)
-
         return predz
 
     def gradient(self, prediction_points, num_neighbors=5, dist_eff=0):
@@ -133,30 +122,21 @@ class WeightedInterpolator(NNBase):
 
         normalized_pts = (prediction_points - self._tpm) / self._tpr
 
-        if self._pt_cache is not None and \
-                np.allclose(self._pt_cache[0], normalized_pts):
-            ndist, nloc = self._pt_cache[1:]
-        else:
-            ndist, nloc = self._KData.query(normalized_pts, num_neighbors)
+        ndist, nloc = self._find_neighbors(normalized_pts, num_neighbors)
 
-        # Reshape ndist for 1D problems.
-        if len(ndist.shape) == 1:
-            ndist.shape = (1, ndist.shape[0])
-            nloc.shape = (1, nloc.shape[0])
-
-        dimdiff = normalized_pts - self._tp[nloc]
+        dimdiff = normalized_pts[:, np.newaxis, :] - self._tp[nloc]
 
         weights = np.power(ndist, -dist_eff)
         dweights = -dist_eff * \
             np.power(ndist[..., np.newaxis], -(dist_eff + 2)) * dimdiff
 
-        weight_sum = np.sum(weights, axis=1)
+        weight_sum = np.sum(weights, axis=1)[:, np.newaxis, np.newaxis]
 
         vals = self._tv[nloc]
 
         gradient = (weight_sum * np.einsum('ikj,ikl->ilj', dweights, vals)
                     - (np.einsum('ij,ijk->ik', weights, vals)[..., np.newaxis]
-                       * np.sum(dweights, axis=1))) / np.power(weight_sum, 2)
+                       * np.sum(dweights, axis=1)[:, np.newaxis, :])) / np.power(weight_sum, 2)
 
         grad = gradient * (self._tvr[..., np.newaxis] / self._tpr)
 
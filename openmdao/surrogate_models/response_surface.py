@@ -3,7 +3,7 @@
 Surrogate Model based on second order response surface equations.
 """
 
-from numpy import zeros, einsum
+from numpy import zeros, einsum, atleast_2d, triu_indices
 from numpy.dual import lstsq
 from openmdao.surrogate_models.surrogate_model import SurrogateModel
 from six.moves import range
@@ -47,10 +47,32 @@ class ResponseSurface(SurrogateModel):
         """
         super(ResponseSurface, self).train(x, y)
 
-        m = self.m = x.shape[0]
-        n = self.n = x.shape[1]
+        self.m = x.shape[0]
+        self.n = x.shape[1]
 
-        X = zeros((m, ((n + 1) * (n + 2)) // 2))
+        X = self._terms(x)
+
+        # Determine response surface equation coefficients (betas) using least
+        # squares
+        self.betas, rs, r, s = lstsq(X, y)
+
+    def _terms(self, x):
+        """
+        Compute the constant, linear and quadratic terms of the response surface equation.
+
+        Parameters
+        ----------
+        x : ndarray
+            Array of shape (num_points, n) holding the points.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (num_points, (n + 1) * (n + 2) / 2) holding the terms at each point.
+        """
+        m, n = x.shape
+
+        X = zeros((m, ((n + 1) * (n + 2)) // 2), dtype=x.dtype)
 
         # Modify X to include constant, squared terms and cross terms
 
@@ -69,9 +91,7 @@ class ResponseSurface(SurrogateModel):
             X_offset[:, :n - i] = einsum('i,ij->ij', x[:, i], x[:, i:])
             X_offset = X_offset[:, n - i:]
 
-        # Determine response surface equation coefficients (betas) using least
-        # squares
-        self.betas, rs, r, s = lstsq(X, y)
+        return X
 
     def predict(self, x):
         """
@@ -137,3 +157,50 @@ class ResponseSurface(SurrogateModel):
             beta_offset = beta_offset[n - i:, :]
 
         return jac.T
+
+    def vectorized_predict(self, x):
+        """
+        Calculate predicted values of the response at several points.
+
+        Parameters
+        ----------
+        x : array-like
+            Array of shape (num_points, num_inputs) holding the points at which the surrogate
+            is evaluated.
+
+        Returns
+        -------
+        ndarray
+            Predicted response at each point.
+        """
+        super(ResponseSurface, self).predict(x)
+
+        return self._terms(atleast_2d(x)).dot(self.betas)
+
+    def vectorized_linearize(self, x):
+        """
+        Calculate the jacobians of the response surface at several points.
+
+        Parameters
+        ----------
+        x : array-like
+            Array of shape (num_points, num_inputs) holding the points at which the surrogate
+            Jacobian is evaluated.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (num_points, num_outputs, num_inputs) holding the Jacobian of the
+            surrogate outputs wrt inputs at each point.
+        """
+        n = self.n
+        betas = self.betas
+
+        # the gradient is betas_linear + H x, with H the symmetric matrix of the quadratic
+        # coefficients (doubled on the diagonal)
+        H = zeros((n, n, betas.shape[1]))
+        rows, cols = triu_indices(n)
+        H[rows, cols] = betas[n + 1:]
+        H[cols, rows] += betas[n + 1:]
+
+        return betas[1:n + 1].T + einsum('ijk,pj->pki', H, atleast_2d(x))
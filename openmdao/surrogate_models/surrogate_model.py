@@ -50,10 +50,13 @@ class SurrogateModel(object):
         """
         Calculate predicted values of the response based on the current trained model.
 
+        Surrogates that can evaluate many points in a single call override this method.
+
         Parameters
         ----------
         x : array-like
-            Vectorized point(s) at which the surrogate is evaluated.
+            Array of shape (num_points, num_inputs) holding the points at which the surrogate
+            is evaluated.
         """
         pass
 
@@ -68,6 +71,21 @@ class SurrogateModel(object):
         """
         pass
 
+    def vectorized_linearize(self, x):
+        """
+        Calculate the jacobians of the interpolant at several points.
+
+        Surrogates that can linearize at many points in a single call override this method.
+        The jacobians are returned as an array of shape (num_points, num_outputs, num_inputs).
+
+        Parameters
+        ----------
+        x : array-like
+            Array of shape (num_points, num_inputs) holding the points at which the surrogate
+            Jacobian is evaluated.
+        """
+        pass
+
 
 class MultiFiSurrogateModel(SurrogateModel):
     """
@@ -6,6 +6,7 @@ import itertools
 import numpy as np
 
 from openmdao.api import KrigingSurrogate
+from openmdao.surrogate_models.kriging import _MIN_RCOND, _FD_STEP
 from openmdao.utils.assert_utils import assert_rel_error
 from six.moves import zip
 
@@ -149,5 +150,112 @@ class TestKrigingSurrogate(unittest.TestCase):
         jac = surrogate.linearize(np.array([[0.5, 0.5]]))
         assert_rel_error(self, jac, np.array([[1, 1], [1, -1], [1, 2]]), 5e-4)
 
+    def test_vectorized(self):
+        surrogate = KrigingSurrogate(eval_rmse=True)
+
+        x = np.array([[a, b] for a, b in
+                      itertools.product(np.linspace(0, 3, 6), repeat=2)])
+        y = np.array([[np.sin(a) * b, a * np.cos(b)] for a, b in x])
+
+        surrogate.train(x, y)
+
+        np.random.seed(5)
+        test_x = np.random.uniform(0, 3, (7, 2))
+
+        mu, sigma = surrogate.vectorized_predict(test_x)
+        jac = surrogate.vectorized_linearize(test_x)
+        self.assertEqual(mu.shape, (7, 2))
+        self.assertEqual(sigma.shape, (7, 2))
+        self.assertEqual(jac.shape, (7, 2, 2))
+
+        for x0, mu0, sigma0, jac0 in zip(test_x, mu, sigma, jac):
+            mu1, sigma1 = surrogate.predict(x0)
+            assert_rel_error(self, mu0, mu1[0], 1e-10)
+            assert_rel_error(self, sigma0, sigma1[0], 1e-8)
+            assert_rel_error(self, jac0, surrogate.linearize(x0), 1e-10)
+
+    def _check_likelihood_gradient(self, surrogate, thetas, regularized, tol):
+        thetas = np.array(thetas)
+
+        # make sure the intended branch is taken. The 1-norm condition number is what
+        # _calculate_reduced_likelihood_params estimates.
+        distances = sum(theta * np.square(x_k[:, np.newaxis] - x_k)
+                        for theta, x_k in zip(thetas, surrogate.X.T))
+        R = np.exp(-distances)
+        R[np.diag_indices_from(R)] = 1. + surrogate.nugget
+        rcond = 1. / np.linalg.cond(R, 1)
+        if regularized:
+            self.assertLess(rcond, 1e-2 * _MIN_RCOND)
+        else:
+            self.assertGreater(rcond, 1e2 * _MIN_RCOND)
+
+        _, params = surrogate._calculate_reduced_likelihood_params(thetas, compute_grad=True)
+
+        n = len(thetas)
+        fd = np.empty(n)
+        for k in range(n):
+            step = np.zeros(n)
+            step[k] = 1e-5 if not regularized else _FD_STEP
+            f_p = surrogate._calculate_reduced_likelihood_params(thetas * np.exp(step))[0]
+            f_m = surrogate._calculate_reduced_likelihood_params(thetas * np.exp(-step))[0]
+            fd[k] = (f_p - f_m) / (2. * step[k])
+
+        assert_rel_error(self, params['grad'], fd, tol)
+
+    def test_likelihood_gradient(self):
+        surrogate = KrigingSurrogate()
+
+        np.random.seed(0)
+        x = np.random.uniform(0, 1, (30, 3))
+        y = np.column_stack((np.sin(3 * x).sum(axis=1), x[:, 0] * x[:, 1]))
+        surrogate.train(x, y)
+
+        # analytic gradient with the Cholesky factorization
+        self._check_likelihood_gradient(surrogate, [5., 3., 8.], False, 1e-4)
+
+        # the regularized correlation matrix only has a forward difference gradient
+        self._check_likelihood_gradient(surrogate, [0.03, 0.015, 0.06], True, 1e-2)
+
+        x = np.linspace(0., 1., 20)[:, np.newaxis]
+        surrogate.train(x, np.sin(3. * x))
+        self._check_likelihood_gradient(surrogate, [3.], True, 1e-2)
+
+    def test_dense_1d(self):
+        # the correlation matrix is singular to working precision for most thetas, so the
+        # likelihood is dominated by round-off and only a smoothed gradient can be used
+        surrogate = KrigingSurrogate()
+        x = np.linspace(0., 10., 200)[:, np.newaxis]
+        surrogate.train(x, np.sin(x))
+
+        test_x = x[:-1] + 0.025
+        mu = surrogate.vectorized_predict(test_x)
+        assert_rel_error(self, mu, np.sin(test_x), 1e-3)
+
+    def test_subset_size(self):
+        surrogate = KrigingSurrogate(subset_size=20)
+
+        np.random.seed(1)
+        x = np.random.uniform(-5, 10, (60, 2))
+        y = np.array([[branin(case)] for case in x])
+        surrogate.train(x, y)
+
+        # all training points are still used by the model
+        assert_rel_error(self, surrogate.vectorized_predict(x), y, 1e-3)
+
+    def test_warm_start(self):
+        np.random.seed(2)
+        x = np.random.uniform(-5, 10, (40, 2))
+        y = np.array([[branin(case)] for case in x])
+
+        surrogate = KrigingSurrogate()
+        surrogate.train(x[:30], y[:30])
+        surrogate.train(x, y)
+
+        cold = KrigingSurrogate()
+        cold.train(x, y)
+
+        assert_rel_error(self, surrogate.thetas, cold.thetas, 1e-2)
+        assert_rel_error(self, surrogate.predict([2., 3.]), cold.predict([2., 3.]), 1e-3)
+
 if __name__ == "__main__":
     unittest.main()
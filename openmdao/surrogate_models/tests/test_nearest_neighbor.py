@@ -18,6 +18,58 @@ class TestNearestNeighbor(unittest.TestCase):
         self.assertEqual(expected_msg, str(cm.exception))
 
 
+class TestVectorized(unittest.TestCase):
+
+    def test_vectorized(self):
+        np.random.seed(3)
+        x = np.random.uniform(0, 1, (40, 2))
+        y = np.array([[np.sin(a) * b, a + b ** 2] for a, b in x])
+        test_x = np.random.uniform(.2, .8, (6, 2))
+
+        for interpolant_type in ['linear', 'weighted', 'rbf']:
+            surrogate = NearestNeighbor(interpolant_type=interpolant_type)
+            surrogate.train(x, y)
+
+            mu = surrogate.vectorized_predict(test_x)
+            jac = surrogate.vectorized_linearize(test_x)
+            self.assertEqual(mu.shape, (6, 2))
+            self.assertEqual(jac.shape, (6, 2, 2))
+
+            for x0, mu0, jac0 in zip(test_x, mu, jac):
+                assert_rel_error(self, mu0, surrogate.predict(x0.copy())[0], 1e-10)
+                assert_rel_error(self, jac0, surrogate.linearize(x0.copy()), 1e-10)
+
+    def test_num_workers(self):
+        np.random.seed(4)
+        x = np.random.uniform(0, 1, (60, 3))
+        y = np.column_stack((np.sin(3 * x).sum(axis=1), x[:, 0] * x[:, 2]))
+        test_x = np.random.uniform(.1, .9, (200, 3))
+
+        for interpolant_type in ['linear', 'weighted', 'rbf']:
+            serial = NearestNeighbor(interpolant_type=interpolant_type)
+            serial.train(x, y)
+            parallel = NearestNeighbor(interpolant_type=interpolant_type, num_workers=2)
+            parallel.train(x, y)
+
+            assert_rel_error(self, parallel.vectorized_predict(test_x),
+                             serial.vectorized_predict(test_x), 1e-15)
+            assert_rel_error(self, parallel.vectorized_linearize(test_x),
+                             serial.vectorized_linearize(test_x), 1e-15)
+
+    def test_linear_collinear(self):
+        # all the neighbors are collinear, so the closest training value is used
+        x = np.array([[0., 0.], [1., 1.], [2., 2.], [3., 3.]])
+        y = np.array([[0.], [1.], [4.], [9.]])
+
+        surrogate = NearestNeighbor(interpolant_type='linear')
+        surrogate.train(x, y)
+
+        test_x = np.array([[0.9, 1.2], [2.2, 2.], [2.9, 3.]])
+        assert_rel_error(self, surrogate.vectorized_predict(test_x), y[1:], 1e-15)
+        assert_rel_error(self, surrogate.vectorized_linearize(test_x), np.zeros((3, 1, 2)),
+                         1e-15)
+
+
 class TestLinearInterpolator1D(unittest.TestCase):
     def setUp(self):
         self.surrogate = NearestNeighbor(interpolant_type='linear')
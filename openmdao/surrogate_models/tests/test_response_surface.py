@@ -137,6 +137,26 @@ class TestResponseSurfaceSurrogate(unittest.TestCase):
         jac = surrogate.linearize(array([[0.5, 0.5]]))
         assert_rel_error(self, jac, array([[1, 1], [1, -1]]), 1e-5)
 
+    def test_vectorized(self):
+        surrogate = ResponseSurface()
+
+        x = array([[a, b, c] for a, b, c in
+                   itertools.product(linspace(0, 1, 4), repeat=3)])
+        y = array([[a * b + c ** 2 - b, sin(a) + a * c] for a, b, c in x])
+
+        surrogate.train(x, y)
+
+        test_x = array([[.1, .2, .3], [.5, .9, .4], [.8, .1, .7], [1.2, -.3, .2]])
+
+        mu = surrogate.vectorized_predict(test_x)
+        jac = surrogate.vectorized_linearize(test_x)
+        self.assertEqual(mu.shape, (4, 2))
+        self.assertEqual(jac.shape, (4, 2, 3))
+
+        for x0, mu0, jac0 in zip(test_x, mu, jac):
+            assert_rel_error(self, mu0, surrogate.predict(x0), 1e-12)
+            assert_rel_error(self, jac0, surrogate.linearize(x0), 1e-12)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,13 +3,13 @@ Routines to compute coloring for use with simultaneous derivatives.
 """
 from __future__ import division, print_function
 
+import hashlib
 import os
+import shutil
 import sys
 import time
 import warnings
 from collections import OrderedDict, defaultdict
-from itertools import combinations
-from distutils.version import LooseVersion
 
 from six import iteritems
 from six.moves import range
@@ -17,7 +17,7 @@ from six.moves import range
 import numpy as np
 from numpy.random import rand
 from scipy.sparse.compressed import get_index_dtype
-from scipy.sparse import coo_matrix
+from scipy.sparse import csc_matrix, csr_matrix, issparse
 
 from openmdao.jacobians.jacobian import Jacobian
 from openmdao.matrices.matrix import sparse_types
@@ -30,25 +30,8 @@ from openmdao.utils.mpi import MPI
 # new coloring and/or sparsity.
 _use_sparsity = True
 
-
-# numpy versions before 1.12 don't use the 'axis' arg passed to count_nonzero and always
-# return an int instead of an array of ints, so create our own function for those versions.
-if LooseVersion(np.__version__) >= LooseVersion("1.12"):
-    _count_nonzeros = np.count_nonzero
-else:
-    def _count_nonzeros(arr, axis=None):
-        if axis == 1:  # rows
-            count = np.empty(arr.shape[0], dtype=int)
-            for row in range(arr.shape[0]):
-                count[row] = np.count_nonzero(arr[row])
-        elif axis == 0:  # cols
-            count = np.empty(arr.shape[1], dtype=int)
-            for col in range(arr.shape[1]):
-                count[col] = np.count_nonzero(arr[:, col])
-        else:
-            return np.count_nonzero(arr)
-
-        return count
+# Directory where dynamically computed colorings are cached, keyed by a hash of model structure.
+_coloring_cache_dir = 'coloring_files'
 
 
 class _SubjacRandomizer(object):
@@ -113,7 +96,52 @@ class _SubjacRandomizer(object):
         self._orig_set_abs(key, subjac)
 
 
-def _order_by_ID(col_matrix):
+def _to_bool_csc(J):
+    """
+    Convert a dense or sparse jacobian sparsity matrix to a CSC matrix of ones.
+
+    Parameters
+    ----------
+    J : ndarray or sparse matrix
+        Jacobian sparsity matrix.
+
+    Returns
+    -------
+    csc_matrix
+        CSC matrix with sorted indices and a value of 1 at every nonzero location.
+    """
+    if issparse(J):
+        J = J.tocsc(copy=True)
+        J.eliminate_zeros()
+    else:
+        J = csc_matrix(J)
+    J.sort_indices()
+
+    return csc_matrix((np.ones(J.nnz, dtype=int), J.indices, J.indptr), shape=J.shape)
+
+
+def _remove_diag(mat):
+    """
+    Return the given square sparse matrix as CSR without any entries on its diagonal.
+
+    Parameters
+    ----------
+    mat : sparse matrix
+        Square sparse matrix.
+
+    Returns
+    -------
+    csr_matrix
+        The matrix minus its diagonal, with sorted indices.
+    """
+    mat = mat.tocoo()
+    keep = mat.row != mat.col
+    mat = csr_matrix((mat.data[keep], (mat.row[keep], mat.col[keep])), shape=mat.shape)
+    mat.sort_indices()
+    return mat
+
+
+def _order_by_ID(col_adj):
     """
     Return columns in order of incidence degree (ID).
 
@@ -121,15 +149,17 @@ def _order_by_ID(col_matrix):
 
     Parameters
     ----------
-    col_matrix : ndarray
-        Boolean array of column dependencies.
+    col_adj : csr_matrix
+        Sparse, symmetric column adjacency matrix.
 
     Yields
     ------
     int
         Column index.
     """
-    degrees = _count_nonzeros(col_matrix, axis=0)
+    indptr = col_adj.indptr
+    indices = col_adj.indices
+    degrees = np.diff(indptr)
     ncols = degrees.size
 
     if ncols == 0:
@@ -140,50 +170,101 @@ def _order_by_ID(col_matrix):
     start = degrees.argmax()
     yield start
 
-    colored_degrees = np.zeros(degrees.size, dtype=get_index_dtype(maxval=degrees[start]))
-    colored_degrees[col_matrix[start]] += 1
+    colored_degrees = np.zeros(ncols, dtype=get_index_dtype(maxval=ncols))
+    colored_degrees[indices[indptr[start]:indptr[start + 1]]] += 1
     colored_degrees[start] = -ncols  # ensure that this col will never have max degree again
 
     for i in range(ncols - 1):
         col = colored_degrees.argmax()
-        colored_degrees[col_matrix[col]] += 1
+        colored_degrees[indices[indptr[col]:indptr[col + 1]]] += 1
         colored_degrees[col] = -ncols  # ensure that this col will never have max degree again
         yield col
 
 
-def _J2col_matrix(J):
+def _order_by_LF(col_adj):
     """
-    Convert boolean jacobian sparsity matrix to a column adjacency matrix.
+    Return columns in largest first (LF) order, i.e., in order of decreasing degree.
 
     Parameters
     ----------
-    J : ndarray
-        Boolean jacobian sparsity matrix.
+    col_adj : csr_matrix
+        Sparse, symmetric column adjacency matrix.
 
     Returns
     -------
     ndarray
-        Column adjacency matrix.
+        Column indices.
     """
-    nrows, ncols = J.shape
+    # mergesort is stable, so ties are broken by column index
+    return np.argsort(-np.diff(col_adj.indptr), kind='mergesort')
+
+
+def _order_by_SL(col_adj):
+    """
+    Return columns in smallest last (SL) order.
+
+    The column of smallest degree is repeatedly removed from the adjacency graph and the
+    columns are colored in the reverse order of their removal.
+
+    Parameters
+    ----------
+    col_adj : csr_matrix
+        Sparse, symmetric column adjacency matrix.
+
+    Returns
+    -------
+    ndarray
+        Column indices.
+    """
+    indptr = col_adj.indptr
+    indices = col_adj.indices
+    degrees = np.diff(indptr).astype(int)
+    ncols = degrees.size
+
+    # removed columns can be decremented at most ncols times, so they'll never be picked again
+    removed = 2 * ncols + 1
+    order = np.empty(ncols, dtype=int)
 
-    col_matrix = np.zeros((ncols, ncols), dtype=bool)
+    for i in range(ncols):
+        col = degrees.argmin()
+        order[ncols - i - 1] = col
+        degrees[indices[indptr[col]:indptr[col + 1]]] -= 1
+        degrees[col] = removed
 
-    # mark col_matrix entries as True when nonzero row entries make them dependent
-    for row in range(nrows):
-        nzro = np.nonzero(J[row])[0]
-        for col in nzro:
-            col_matrix[col, nzro] = True
+    return order
 
-    # zero out diagonal (column is not adjacent to itself)
-    np.fill_diagonal(col_matrix, False)
 
-    return col_matrix
+_col_orderings = {
+    'ID': _order_by_ID,
+    'LF': _order_by_LF,
+    'SL': _order_by_SL,
+}
+
+
+def _J2col_matrix(J):
+    """
+    Convert jacobian sparsity matrix to a sparse column adjacency matrix.
+
+    Parameters
+    ----------
+    J : ndarray or sparse matrix
+        Jacobian sparsity matrix.
+
+    Returns
+    -------
+    csr_matrix
+        Column adjacency matrix.
+    """
+    J = _to_bool_csc(J)
+
+    # columns are adjacent when they share a nonzero row. Drop the diagonal since a column
+    # is not adjacent to itself.
+    return _remove_diag(J.T.dot(J))
 
 
 def _Jc2col_matrix_direct(J, Jc):
     """
-    Convert a partitioned jacobian sparsity matrix to a column adjacency matrix.
+    Convert a partitioned jacobian sparsity matrix to a sparse column adjacency matrix.
 
     This creates the column adjacency matrix used for direct jacobian determination
     as described in Coleman, T.F., Verma, A. (1998) The efficient Computation of Sparse Jacobian
@@ -192,90 +273,97 @@ def _Jc2col_matrix_direct(J, Jc):
 
     Parameters
     ----------
-    J : ndarray
-        Boolean jacobian sparsity matrix.
-    Jc : ndarray
-        Boolean sparsity matrix of a partition of J.
+    J : ndarray or sparse matrix
+        Jacobian sparsity matrix.
+    Jc : ndarray or sparse matrix
+        Sparsity matrix of a partition of J.
 
     Returns
     -------
-    ndarray
+    csr_matrix
         Column adjacency matrix.
     """
     assert J.shape == Jc.shape
 
-    nrows, ncols = J.shape
-
-    col_matrix = np.zeros((ncols, ncols), dtype=bool)
+    J = _to_bool_csc(J)
+    Jc = _to_bool_csc(Jc)
 
-    col_keep = _count_nonzeros(Jc, axis=0) > 0
+    # col1 and col2 are adjacent when they share a nonzero row of J and at least one of them is
+    # nonzero in that row of Jc.  Since Jc is a partition of J, that is (Jc.T J + J.T Jc).
+    JcTJ = Jc.T.dot(J)
 
-    # mark col_matrix[col1, col2] as True when Jc[row, col1] is True OR Jc[row, col2] is True
-    for row in range(nrows):
-        nzro = np.nonzero(J[row] & col_keep)[0]
-        for col1, col2 in combinations(nzro, 2):
-            if Jc[row, col1] or Jc[row, col2]:
-                col_matrix[col1, col2] = True
-                col_matrix[col2, col1] = True
+    return _remove_diag(JcTJ + JcTJ.T)
 
-    # zero out diagonal (column is not adjacent to itself)
-    np.fill_diagonal(col_matrix, False)
 
-    return col_matrix
-
-
-def _get_full_disjoint_cols(J):
+def _get_full_disjoint_cols(J, order='ID'):
     """
     Find sets of disjoint columns in J and their corresponding rows using a col adjacency matrix.
 
     Parameters
     ----------
-    J : ndarray
+    J : ndarray or sparse matrix
         The total jacobian.
+    order : str
+        Column ordering used by the greedy coloring ('ID', 'LF' or 'SL').
 
     Returns
     -------
     list
         List of lists of disjoint columns
     """
-    return _get_full_disjoint_col_matrix_cols(_J2col_matrix(J))
+    return _get_full_disjoint_col_matrix_cols(_J2col_matrix(J), order)
 
 
-def _get_full_disjoint_col_matrix_cols(col_matrix):
+def _get_full_disjoint_col_matrix_cols(col_adj, order='ID'):
     """
     Find sets of disjoint columns in a column intersection matrix.
 
     Parameters
     ----------
-    col_matrix : ndarray
-        Column intersection matrix
+    col_adj : csr_matrix
+        Sparse, symmetric column intersection matrix.
+    order : str
+        Column ordering used by the greedy coloring ('ID', 'LF' or 'SL').
 
     Returns
     -------
     list
         List of lists of disjoint columns
     """
+    try:
+        col_order = _col_orderings[order]
+    except KeyError:
+        raise ValueError("Coloring order '%s' is not one of %s." % (order, sorted(_col_orderings)))
+
     color_groups = []
-    _, ncols = col_matrix.shape
+    _, ncols = col_adj.shape
+    indptr = col_adj.indptr
+    indices = col_adj.indices
 
     # -1 indicates that a column has not been colored
     colors = np.full(ncols, -1, dtype=get_index_dtype(maxval=ncols))
 
-    for col in _order_by_ID(col_matrix):
-        neighbor_colors = set(colors[col_matrix[col]])
-        for color, grp in enumerate(color_groups):
-            if color not in neighbor_colors:
-                grp.append(col)
-                colors[col] = color
-                break
+    # forbidden[color] == col means that color is used by a neighbor of col
+    forbidden = np.full(ncols, -1, dtype=get_index_dtype(maxval=ncols))
+
+    for col in col_order(col_adj):
+        neighbor_colors = colors[indices[indptr[col]:indptr[col + 1]]]
+        forbidden[neighbor_colors[neighbor_colors >= 0]] = col
+
+        # pick the first existing color not used by any neighbor, else add a new one
+        allowed = np.nonzero(forbidden[:len(color_groups)] != col)[0]
+        if allowed.size > 0:
+            color = allowed[0]
+            color_groups[color].append(col)
         else:
-            colors[col] = len(color_groups)
+            color = len(color_groups)
             color_groups.append([col])
+        colors[col] = color
 
     return color_groups
 
 
-def _color_partition(J, Jpart):
+def _color_partition(J, Jpart, order='ID'):
     """
     Compute a single directional fwd coloring using partition Jpart.
 
@@ -283,10 +371,12 @@ def _color_partition(J, Jpart):
 
     Parameters
     ----------
-    J : ndarray
-        Dense jacobian sparsity matrix
-    Jpart : ndarray
+    J : ndarray or sparse matrix
+        Jacobian sparsity matrix
+    Jpart : ndarray or sparse matrix
         Partition of the jacobian sparsity matrix.
+    order : str
+        Column ordering used by the greedy coloring ('ID', 'LF' or 'SL').
 
     Returns
     -------
@@ -295,33 +385,32 @@ def _color_partition(J, Jpart):
     list
         List of nonzero rows for each column.
     """
+    Jpart = _to_bool_csc(Jpart)
     ncols = Jpart.shape[1]
-    col_nonzeros = _count_nonzeros(Jpart, axis=0)
-    row_nonzeros = _count_nonzeros(Jpart, axis=1)
-    col_keep = col_nonzeros > 0
-    row_keep = row_nonzeros > 0
+    col_keep = np.diff(Jpart.indptr) > 0
 
     # use this to map indices back to the full J indices.
     idxmap = np.arange(ncols, dtype=int)[col_keep]
 
     intersection_mat = _Jc2col_matrix_direct(J, Jpart)
-    intersection_mat = intersection_mat[col_keep]
-    intersection_mat = intersection_mat[:, col_keep]
+    intersection_mat = intersection_mat[idxmap][:, idxmap]
 
-    col_groups = _get_full_disjoint_col_matrix_cols(intersection_mat)
+    col_groups = _get_full_disjoint_col_matrix_cols(intersection_mat, order)
 
     for i, group in enumerate(col_groups):
-        col_groups[i] = sorted([idxmap[c] for c in group if col_keep[idxmap[c]]])
+        col_groups[i] = sorted([idxmap[c] for c in group])
     col_groups = _split_groups(col_groups)
 
     col2row = [None] * ncols
+    indptr = Jpart.indptr
+    indices = Jpart.indices
     for col in idxmap:
-        col2row[col] = [r for r in np.nonzero(Jpart[:, col])[0] if row_keep[r]]
+        col2row[col] = indices[indptr[col]:indptr[col + 1]]
 
     return [col_groups, col2row]
 
 
-def MNCO_bidir(J):
+def MNCO_bidir(J, order='ID'):
     """
     Compute bidirectional coloring using Minimum Nonzero Count Order (MNCO).
 
@@ -331,8 +420,10 @@ def MNCO_bidir(J):
 
     Parameters
     ----------
-    J : ndarray
-        Dense Jacobian sparsity matrix
+    J : ndarray or sparse matrix
+        Jacobian sparsity matrix
+    order : str
+        Column ordering used by the greedy coloring of each partition ('ID', 'LF' or 'SL').
 
     Returns
     -------
@@ -346,15 +437,19 @@ def MNCO_bidir(J):
                 col_maps is a list of nonzero cols for each row, or None for uncolored rows.
             dict['sparsity'] = a nested dict specifying subjac sparsity for each total derivative.
     """
+    J = _to_bool_csc(J)
+    Jcsr = J.tocsr()
+    Jcsr.sort_indices()
+
     nrows, ncols = J.shape
 
-    M_col_nonzeros = _count_nonzeros(J, axis=0)
-    M_row_nonzeros = _count_nonzeros(J, axis=1)
+    M_col_nonzeros = np.diff(J.indptr)
+    M_row_nonzeros = np.diff(Jcsr.indptr)
 
-    M = coo_matrix(J)
-    M_rows = M.row
-    M_cols = M.col
-    M = None  # we don't need sparse matrix data array, so clean up memory
+    # track which rows (moved to Jc) and columns (moved to Jr) have been removed from J
+    row_removed = np.zeros(nrows, dtype=bool)
+    col_removed = np.zeros(ncols, dtype=bool)
+    nnz_left = J.nnz
 
     Jc_rows = [None] * nrows
     Jr_cols = [None] * ncols
@@ -372,32 +467,32 @@ def MNCO_bidir(J):
     Jc_nz_max = 0   # max row nonzeros in Jc
     Jr_nz_max = 0   # max col nonzeros in Jr
 
-    while M_rows.size + M_cols.size > 0:
+    while nnz_left > 0:
         if Jr_nz_max + max(Jc_nz_max, nnz_r) < (Jc_nz_max + max(Jr_nz_max, nnz_c)):
-            Jc_rows[r] = M_cols[M_rows == r]
+            cols = Jcsr.indices[Jcsr.indptr[r]:Jcsr.indptr[r + 1]]
+            Jc_rows[r] = cols = cols[~col_removed[cols]]
             Jc_nz_max = max(nnz_r, Jc_nz_max)
 
-            keep = M_rows != r
-            M_rows = M_rows[keep]
-            M_cols = M_cols[keep]
+            row_removed[r] = True
+            nnz_left -= cols.size
 
             M_row_nonzeros[r] = ncols + 1  # make sure we don't pick this one again
-            M_col_nonzeros[Jc_rows[r]] -= 1
+            M_col_nonzeros[cols] -= 1
 
             r = M_row_nonzeros.argmin()
             nnz_r = M_row_nonzeros[r]
 
             row_i += 1
         else:
-            Jr_cols[c] = M_rows[M_cols == c]
+            rows = J.indices[J.indptr[c]:J.indptr[c + 1]]
+            Jr_cols[c] = rows = rows[~row_removed[rows]]
             Jr_nz_max = max(nnz_c, Jr_nz_max)
 
-            keep = M_cols != c
-            M_rows = M_rows[keep]
-            M_cols = M_cols[keep]
+            col_removed[c] = True
+            nnz_left -= rows.size
 
             M_col_nonzeros[c] = nrows + 1  # make sure we don't pick this one again
-            M_row_nonzeros[Jr_cols[c]] -= 1
+            M_row_nonzeros[rows] -= 1
 
             c = M_col_nonzeros.argmin()
             nnz_c = M_col_nonzeros[c]
@@ -407,30 +502,32 @@ def MNCO_bidir(J):
     coloring = {}
 
     nnz_Jc = nnz_Jr = 0
-    jac = np.zeros(J.shape, dtype=bool)
 
     if row_i > 0:
-        Jc = jac
         # build Jc and do fwd coloring on it
-        for i, cols in enumerate(Jc_rows):
-            if cols is not None:
-                Jc[i][cols] = True
-                nnz_Jc += len(cols)
+        rows = [np.full(cols.size, i, dtype=int) for i, cols in enumerate(Jc_rows)
+                if cols is not None]
+        cols = [cols for cols in Jc_rows if cols is not None]
+        rows = np.hstack(rows) if rows else np.zeros(0, dtype=int)
+        cols = np.hstack(cols) if cols else np.zeros(0, dtype=int)
+        nnz_Jc = rows.size
+        Jc = csc_matrix((np.ones(nnz_Jc, dtype=int), (rows, cols)), shape=J.shape)
 
-        coloring['fwd'] = _color_partition(J, Jc)
-        jac[:] = False
+        coloring['fwd'] = _color_partition(J, Jc, order)
 
     if col_i > 0:
-        Jr = jac
         # build Jr and do rev coloring
-        for i, rows in enumerate(Jr_cols):
-            if rows is not None:
-                Jr[rows, i] = True
-                nnz_Jr += len(rows)
+        cols = [np.full(rows.size, i, dtype=int) for i, rows in enumerate(Jr_cols)
+                if rows is not None]
+        rows = [rows for rows in Jr_cols if rows is not None]
+        rows = np.hstack(rows) if rows else np.zeros(0, dtype=int)
+        cols = np.hstack(cols) if cols else np.zeros(0, dtype=int)
+        nnz_Jr = rows.size
+        Jr = csc_matrix((np.ones(nnz_Jr, dtype=int), (rows, cols)), shape=J.shape)
 
-        coloring['rev'] = _color_partition(J.T, Jr.T)
+        coloring['rev'] = _color_partition(J.T, Jr.T, order)
 
-    if np.count_nonzero(J) != nnz_Jc + nnz_Jr:
+    if J.nnz != nnz_Jc + nnz_Jr:
         raise RuntimeError("Nonzero mismatch for J vs. Jc and Jr")
 
     # _check_coloring(J, coloring)
@@ -940,16 +1037,18 @@ def _split_groups(groups):
     return clists
 
 
-def _compute_coloring(J, mode):
+def _compute_coloring(J, mode, order='ID'):
     """
     Compute a good coloring in a specified dominant direction.
 
     Parameters
     ----------
-    J : ndarray
+    J : ndarray or sparse matrix
         The boolean total jacobian.
     mode : str
         The direction for solving for total derivatives.  If 'auto', use bidirectional coloring.
+    order : str
+        Column ordering used by the greedy coloring ('ID', 'LF' or 'SL').
 
     Returns
     -------
@@ -965,27 +1064,25 @@ def _compute_coloring(J, mode):
     """
     bidirectional = mode == 'auto'
     rev = mode == 'rev'
-    nrows, ncols = J.shape
 
     if bidirectional:
-        return MNCO_bidir(J)
+        return MNCO_bidir(J, order)
 
-    if rev:
-        J = J.T
-    col_groups = _split_groups(_get_full_disjoint_cols(J))
+    J = _to_bool_csc(J.T if rev else J)
+    col_groups = _split_groups(_get_full_disjoint_cols(J, order))
 
     full_slice = slice(None)
     col2rows = [full_slice] * J.shape[1]  # will contain list of nonzero rows for each column
     for lst in col_groups:
         for col in lst:
-            col2rows[col] = np.nonzero(J[:, col])[0]
+            col2rows[col] = J.indices[J.indptr[col]:J.indptr[col + 1]]
 
     return {mode: [col_groups, col2rows]}
 
 
 def get_simul_meta(problem, mode=None, repeats=1, tol=1.e-15, show_jac=False,
                    include_sparsity=True, setup=False, run_model=False, bool_jac=None,
-                   stream=sys.stdout):
+                   stream=sys.stdout, order='ID'):
     """
     Compute simultaneous derivative colorings for the given problem.
 
@@ -1012,6 +1109,9 @@ def get_simul_meta(problem, mode=None, repeats=1, tol=1.e-15, show_jac=False,
         If problem is not supplied, a previously computed boolean jacobian can be used.
     stream : file-like or None
         Stream where output coloring info will be written.
+    order : str
+        Column ordering used by the greedy coloring.  'ID' (incidence degree), 'LF' (largest
+        first) or 'SL' (smallest last).
 
     Returns
     -------
@@ -1058,7 +1158,7 @@ def get_simul_meta(problem, mode=None, repeats=1, tol=1.e-15, show_jac=False,
         raise RuntimeError("You must supply either problem or bool_jac to get_simul_meta().")
 
     start_time = time.time()
-    coloring = _compute_coloring(J, mode)
+    coloring = _compute_coloring(J, mode, order)
 
     coloring['time_coloring'] = time.time() - start_time
     coloring['time_sparsity'] = time_sparsity
@@ -1138,7 +1238,69 @@ def dynamic_sparsity(driver):
     driver._setup_tot_jac_sparsity()
 
 
-def dynamic_simul_coloring(driver, run_model=True, do_sparsity=False, show_jac=False):
+def _get_structure_hash(driver, do_sparsity=False):
+    """
+    Compute a hash of everything in the model structure that determines its coloring.
+
+    This includes the derivative mode, the design variables and responses, variable sizes,
+    connections, and the declared sparsity of every subjacobian.
+
+    Parameters
+    ----------
+    driver : <Driver>
+        The driver performing the optimization.
+    do_sparsity : bool
+        If True, the coloring includes the total jacobian sparsity.
+
+    Returns
+    -------
+    str
+        Hex digest of the structural hash.
+    """
+    problem = driver._problem
+    model = problem.model
+
+    data = [problem._orig_mode, do_sparsity]
+
+    for name, meta in iteritems(driver._designvars):
+        indices = meta['indices']
+        data.append((name, meta['size'], None if indices is None else list(indices)))
+
+    for name in driver._get_ordered_nl_responses():
+        meta = driver._responses[name]
+        indices = meta['indices']
+        data.append((name, meta['size'], None if indices is None else list(indices)))
+
+    for typ in ('input', 'output'):
+        sizes = np.sum(model._var_sizes['nonlinear'][typ], axis=0)
+        data.extend(zip(model._var_allprocs_abs_names[typ], sizes.tolist()))
+
+    data.append(sorted(iteritems(model._conn_global_abs_in2out)))
+
+    for s in model.system_iter(recurse=True, include_self=True):
+        data.append((s.pathname, type(s).__name__))
+
+    for key in sorted(model._subjacs_info):
+        meta = model._subjacs_info[key]
+        if meta['rows'] is not None:
+            data.append((key, list(meta['rows']), list(meta['cols'])))
+        elif isinstance(meta['value'], sparse_types):
+            subjac = meta['value'].tocoo()
+            data.append((key, list(subjac.row), list(subjac.col)))
+        else:
+            data.append((key, meta.get('shape')))
+
+    digest = hashlib.md5(repr(data).encode('utf-8')).hexdigest()
+
+    # local subjac info can differ between procs, so use the hash from the root proc.
+    if model.comm.size > 1:
+        digest = model.comm.bcast(digest, root=0)
+
+    return digest
+
+
+def dynamic_simul_coloring(driver, run_model=True, do_sparsity=False, show_jac=False,
+                           use_cache=False):
     """
     Compute simultaneous deriv coloring during runtime.
 
@@ -1152,16 +1314,35 @@ def dynamic_simul_coloring(driver, run_model=True, do_sparsity=False, show_jac=F
         If True, setup the total jacobian sparsity (needed by pyOptSparseDriver).
     show_jac : bool
         If True, display a visualization of the colored jacobian.
+    use_cache : bool
+        If True, reload a coloring saved by an earlier run of a model with the same structure
+        instead of recomputing it, and save a newly computed coloring for later runs.
     """
     problem = driver._problem
     driver._total_jac = None
 
+    if use_cache:
+        cache_file = os.path.join(_coloring_cache_dir,
+                                  'coloring_%s.json' % _get_structure_hash(driver, do_sparsity))
+        if os.path.isfile(cache_file):
+            driver.set_simul_deriv_color(cache_file)
+            driver._setup_simul_coloring()
+            if do_sparsity:
+                driver._setup_tot_jac_sparsity()
+            return
+
     # save the coloring.json file for later inspection
     with open("coloring.json", "w") as f:
         coloring = get_simul_meta(problem,
                                   repeats=driver.options['dynamic_derivs_repeats'],
                                   tol=1.e-15, include_sparsity=do_sparsity,
                                   setup=False, run_model=run_model, show_jac=show_jac, stream=f)
+
+    if use_cache and problem.comm.rank == 0:
+        if not os.path.isdir(_coloring_cache_dir):
+            os.makedirs(_coloring_cache_dir)
+        shutil.copyfile("coloring.json", cache_file)
+
     driver.set_simul_deriv_color(coloring)
     driver._setup_simul_coloring()
     if do_sparsity:
@@ -1190,6 +1371,10 @@ def _simul_coloring_setup_parser(parser):
                         help="Exclude the sparsity structure from the coloring data structure.")
     parser.add_argument('-p', '--profile', action='store_true', dest='profile',
                         help="Do profiling on the coloring process.")
+    parser.add_argument('--order', action='store', dest='order', default='ID',
+                        choices=sorted(_col_orderings),
+                        help="Column ordering used by the greedy coloring: incidence degree "
+                        "(ID), largest first (LF) or smallest last (SL).")
 
 
 def _simul_coloring_cmd(options):
@@ -1227,7 +1412,7 @@ def _simul_coloring_cmd(options):
                                         show_jac=options.show_jac,
                                         include_sparsity=not options.no_sparsity,
                                         setup=False, run_model=True,
-                                        stream=outfile)
+                                        stream=outfile, order=options.order)
 
         if sys.stdout.isatty():
             simul_coloring_summary(color_info, stream=sys.stdout)
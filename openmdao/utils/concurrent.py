@@ -1,14 +1,36 @@
 """
-Utilities for submitting function evaluations under MPI.
+Utilities for submitting function evaluations under MPI or on local threads.
 """
+import atexit
 import os
+import threading
 import traceback
 from itertools import chain, islice
+from multiprocessing.pool import ThreadPool
 
 from openmdao.utils.mpi import debug
 
 trace = os.environ.get('OPENMDAO_TRACE')
 
+# thread pools shared by everything that runs work on local threads, keyed by size
+_thread_pools = {}
+
+# keeps track of whether the current thread is one of the pool threads
+_thread_state = threading.local()
+
+
+def _close_thread_pools():
+    """
+    Close the thread pools and wait for their threads to finish.
+    """
+    for pool in _thread_pools.values():
+        pool.close()
+        pool.join()
+    _thread_pools.clear()
+
+
+atexit.register(_close_thread_pools)
+
 
 def concurrent_eval_lb(func, cases, comm, broadcast=False):
     """
@@ -252,3 +274,42 @@ def concurrent_eval(func, cases, comm, allgather=False, model_mpi=None):
                 results = None
 
     return results
+
+
+def thread_map(func, items, num_threads):
+    """
+    Apply the given function to each item using a pool of local threads.
+
+    This only gives a speedup if func spends most of its time in code that releases the GIL,
+    such as numpy/scipy routines or waiting on external processes. Calls made from within one
+    of the pool threads run serially, so nested use can't deadlock the pool.
+
+    Parameters
+    ----------
+    func : function
+        The function to execute. Exceptions raised by it are re-raised in the calling thread.
+    items : list
+        Items to pass to func.
+    num_threads : int
+        Number of threads. If 1 or less, func is executed serially.
+
+    Returns
+    -------
+    list
+        Return value of func for each item, in the same order as items.
+    """
+    if num_threads <= 1 or len(items) < 2 or getattr(_thread_state, 'in_pool', False):
+        return [func(item) for item in items]
+
+    pool = _thread_pools.get(num_threads)
+    if pool is None:
+        pool = _thread_pools[num_threads] = ThreadPool(num_threads)
+
+    def run(item):
+        _thread_state.in_pool = True
+        try:
+            return func(item)
+        finally:
+            _thread_state.in_pool = False
+
+    return pool.map(run, items, chunksize=1)
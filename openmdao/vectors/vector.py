@@ -548,7 +548,7 @@ class Vector(object):
         print('-' * 35)
         print()
 
-    def set_complex_step_mode(self, active):
+    def set_complex_step_mode(self, active, copy_data=True):
         """
         Turn on or off complex stepping mode.
 
@@ -559,8 +559,12 @@ class Vector(object):
         ----------
         active : bool
             Complex mode flag; set to True prior to commencing complex step.
+        copy_data : bool
+            If True, copy the real data into the complex array when turning complex step on.
+            Can be False if a vector containing this one has already done the copy, since
+            their complex arrays share memory.
         """
-        if active:
+        if active and copy_data:
             self._cplx_data[:] = self._data
 
         self._data, self._cplx_data = self._cplx_data, self._data